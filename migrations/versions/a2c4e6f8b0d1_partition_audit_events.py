@@ -0,0 +1,111 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""partition audit_events by month on PostgreSQL
+
+Rebuilds ``audit_events`` as a table range-partitioned on ``created_at``
+with one partition per month (from the oldest event to three months
+ahead) and a default partition, then copies the existing rows over.
+The primary key becomes ``(id, created_at)``, since PostgreSQL requires
+the partition key in unique constraints.  On other databases the table
+is left as is and retention deletes expired rows in batches.
+
+Downtime: the rows are copied with a single ``INSERT ... SELECT`` inside
+the migration's transaction, and ``audit_events`` stays locked until it
+commits.  Every request that writes an audit event blocks meanwhile, so
+run this migration in a maintenance window; budget roughly the time a
+full copy and index build of the table take on your hardware.
+
+Revision ID: a2c4e6f8b0d1
+Revises: f1b3d5e7a9c0
+Create Date: 2026-03-24 10:00:00.000000
+"""
+
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision: str = "a2c4e6f8b0d1"
+down_revision: Union[str, None] = "f1b3d5e7a9c0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_MONTHS_AHEAD = 3
+
+_INDEXES = {
+    "ix_audit_events_created_at_id": ["created_at", "id"],
+    "ix_audit_events_user_created": ["user_id", "created_at", "id"],
+    "ix_audit_events_type_created": ["event_type", "created_at", "id"],
+    "ix_audit_events_risk_created": ["risk_level", "created_at", "id"],
+    "ix_audit_events_conversation_created": ["conversation_id", "created_at", "id"],
+}
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def _month_start(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    value = value.astimezone(timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _rebuild(partitioned: bool) -> None:
+    """Move ``audit_events`` aside, recreate it and copy the rows back."""
+    bind = op.get_bind()
+    op.rename_table("audit_events", "audit_events_old")
+    op.execute("ALTER TABLE audit_events_old DROP CONSTRAINT IF EXISTS audit_events_pkey")
+    for name in _INDEXES:
+        op.drop_index(name, table_name="audit_events_old")
+
+    partition_by = " PARTITION BY RANGE (created_at)" if partitioned else ""
+    op.execute(
+        "CREATE TABLE audit_events (LIKE audit_events_old INCLUDING DEFAULTS)" + partition_by
+    )
+    op.execute("UPDATE audit_events_old SET created_at = now() WHERE created_at IS NULL")
+    op.execute("ALTER TABLE audit_events ALTER COLUMN created_at SET NOT NULL")
+    if partitioned:
+        op.execute("ALTER TABLE audit_events ADD PRIMARY KEY (id, created_at)")
+        oldest = bind.execute(sa.text("SELECT min(created_at) FROM audit_events_old")).scalar()
+        now = datetime.now(timezone.utc)
+        month = _month_start(oldest or now)
+        last = _add_months(_month_start(now), _MONTHS_AHEAD)
+        while month <= last:
+            end = _add_months(month, 1)
+            op.execute(
+                f"CREATE TABLE audit_events_p{month.year:04d}{month.month:02d} "
+                f"PARTITION OF audit_events "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+            )
+            month = end
+        op.execute("CREATE TABLE audit_events_default PARTITION OF audit_events DEFAULT")
+    else:
+        op.execute("ALTER TABLE audit_events ADD PRIMARY KEY (id)")
+    for name, columns in _INDEXES.items():
+        op.create_index(name, "audit_events", columns)
+
+    op.execute("INSERT INTO audit_events SELECT * FROM audit_events_old")
+    op.drop_table("audit_events_old")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        _rebuild(partitioned=True)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        _rebuild(partitioned=False)
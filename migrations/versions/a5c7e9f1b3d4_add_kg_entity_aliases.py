@@ -0,0 +1,43 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""add knowledge graph entity alias table
+
+Revision ID: a5c7e9f1b3d4
+Revises: f4b6d8e0a2c3
+Create Date: 2026-03-18 10:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision: str = "a5c7e9f1b3d4"
+down_revision: Union[str, None] = "f4b6d8e0a2c3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "kg_entity_aliases",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("entity_type", sa.String(100), nullable=False),
+        sa.Column("alias", sa.String(500), nullable=False),
+        sa.Column("entity_id", sa.String(255), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.UniqueConstraint("entity_type", "alias", name="uq_kg_entity_alias"),
+    )
+    op.create_index("ix_kg_entity_aliases_entity_id", "kg_entity_aliases", ["entity_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_kg_entity_aliases_entity_id", table_name="kg_entity_aliases")
+    op.drop_table("kg_entity_aliases")
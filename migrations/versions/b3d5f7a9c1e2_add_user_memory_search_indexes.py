@@ -0,0 +1,63 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""add user memory embeddings and search indexes
+
+Adds ``user_memories.embedding`` and a (user_id, created_at) index that
+replaces the single-column user_id index.  On PostgreSQL also adds a GIN
+full-text index on the content.  The embedding gets no HNSW index: memory
+search is per user, and post-filtering an approximate scan of the whole
+table loses most of a small user's rows, so distances are computed
+exactly over the user's newest memories instead.
+
+Revision ID: b3d5f7a9c1e2
+Revises: a2c4e6f8b0d1
+Create Date: 2026-03-25 10:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import pgvector.sqlalchemy
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision: str = "b3d5f7a9c1e2"
+down_revision: Union[str, None] = "a2c4e6f8b0d1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    op.add_column(
+        "user_memories",
+        sa.Column(
+            "embedding",
+            pgvector.sqlalchemy.vector.VECTOR(dim=1536).with_variant(sa.Text(), "sqlite"),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_user_memories_user_created", "user_memories", ["user_id", "created_at"]
+    )
+    op.drop_index(op.f("ix_user_memories_user_id"), table_name="user_memories")
+    if bind.dialect.name == "postgresql":
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_user_memories_content_fts "
+            "ON user_memories USING gin (to_tsvector('simple', content))"
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_user_memories_content_fts")
+    op.create_index(op.f("ix_user_memories_user_id"), "user_memories", ["user_id"])
+    op.drop_index("ix_user_memories_user_created", table_name="user_memories")
+    op.drop_column("user_memories", "embedding")
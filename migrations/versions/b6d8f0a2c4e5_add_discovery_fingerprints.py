@@ -0,0 +1,44 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""add discovery fingerprint table
+
+Revision ID: b6d8f0a2c4e5
+Revises: a5c7e9f1b3d4
+Create Date: 2026-03-19 10:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision: str = "b6d8f0a2c4e5"
+down_revision: Union[str, None] = "a5c7e9f1b3d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "discovery_fingerprints",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("discovery_type", sa.String(50), nullable=False),
+        sa.Column("scope", sa.String(64), nullable=False),
+        sa.Column("item_key", sa.String(512), nullable=False),
+        sa.Column("fingerprint", sa.String(64), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.UniqueConstraint(
+            "discovery_type", "scope", "item_key", name="uq_discovery_fingerprint_item"
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("discovery_fingerprints")
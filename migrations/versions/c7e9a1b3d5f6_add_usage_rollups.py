@@ -0,0 +1,70 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""add usage rollup tables
+
+Revision ID: c7e9a1b3d5f6
+Revises: b6d8f0a2c4e5
+Create Date: 2026-03-20 10:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision: str = "c7e9a1b3d5f6"
+down_revision: Union[str, None] = "b6d8f0a2c4e5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "usage_rollups",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("bucket", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("source", sa.String(20), nullable=False),
+        sa.Column("event_type", sa.String(50), nullable=False, server_default=""),
+        sa.Column("tool", sa.String(255), nullable=False, server_default=""),
+        sa.Column("user_id", sa.String(255), nullable=False, server_default=""),
+        sa.Column("model", sa.String(255), nullable=False, server_default=""),
+        sa.Column("workspace_id", sa.String(255), nullable=False, server_default=""),
+        sa.Column("event_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("input_tokens", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("output_tokens", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("cost_usd", sa.Float(), nullable=False, server_default="0"),
+        sa.UniqueConstraint(
+            "bucket",
+            "source",
+            "event_type",
+            "tool",
+            "user_id",
+            "model",
+            "workspace_id",
+            name="uq_usage_rollup_bucket_dims",
+        ),
+    )
+    op.create_index("ix_usage_rollups_bucket", "usage_rollups", ["bucket"])
+
+    op.create_table(
+        "usage_rollup_state",
+        sa.Column("name", sa.String(50), primary_key=True),
+        sa.Column("rolled_up_to", sa.DateTime(timezone=True), nullable=False),
+    )
+
+    # The rollup job and the dashboard tail scan messages by time.
+    op.create_index("ix_messages_created_at", "messages", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_messages_created_at", table_name="messages")
+    op.drop_table("usage_rollup_state")
+    op.drop_index("ix_usage_rollups_bucket", table_name="usage_rollups")
+    op.drop_table("usage_rollups")
@@ -0,0 +1,50 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""add priority, submitter and lease columns to jobs
+
+Revision ID: c7e9a1b3d5f7
+Revises: b4d6f8a0c2e4
+Create Date: 2026-03-12 10:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision: str = "c7e9a1b3d5f7"
+down_revision: Union[str, None] = "b4d6f8a0c2e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "jobs",
+        sa.Column("priority", sa.String(20), nullable=False, server_default="interactive"),
+    )
+    op.add_column("jobs", sa.Column("submitter", sa.String(255), nullable=True))
+    op.add_column("jobs", sa.Column("lease_owner", sa.String(255), nullable=True))
+    op.add_column(
+        "jobs", sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True)
+    )
+    op.add_column(
+        "jobs", sa.Column("attempts", sa.Integer(), nullable=False, server_default="0")
+    )
+    op.create_index("ix_jobs_lease_expires_at", "jobs", ["lease_expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_lease_expires_at", table_name="jobs")
+    op.drop_column("jobs", "attempts")
+    op.drop_column("jobs", "lease_expires_at")
+    op.drop_column("jobs", "lease_owner")
+    op.drop_column("jobs", "submitter")
+    op.drop_column("jobs", "priority")
@@ -0,0 +1,48 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""add spend ledger table
+
+Revision ID: d8f0b2c4e6a7
+Revises: c7e9a1b3d5f6
+Create Date: 2026-03-21 10:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision: str = "d8f0b2c4e6a7"
+down_revision: Union[str, None] = "c7e9a1b3d5f6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "spend_ledger",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("worker_id", sa.String(255), nullable=False),
+        sa.Column("day", sa.String(10), nullable=False),
+        sa.Column("user_id", sa.String(255), nullable=False, server_default=""),
+        sa.Column("model", sa.String(255), nullable=False, server_default=""),
+        sa.Column("cost_usd", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("input_tokens", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("output_tokens", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("call_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.UniqueConstraint("worker_id", "day", "user_id", "model", name="uq_spend_ledger_shard"),
+    )
+    op.create_index("ix_spend_ledger_day", "spend_ledger", ["day"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_spend_ledger_day", table_name="spend_ledger")
+    op.drop_table("spend_ledger")
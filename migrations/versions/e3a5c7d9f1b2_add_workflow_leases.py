@@ -0,0 +1,38 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""add scheduling lease columns to workflows
+
+Revision ID: e3a5c7d9f1b2
+Revises: c7e9a1b3d5f7
+Create Date: 2026-03-14 10:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision: str = "e3a5c7d9f1b2"
+down_revision: Union[str, None] = "c7e9a1b3d5f7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("workflows", sa.Column("lease_owner", sa.String(255), nullable=True))
+    op.add_column(
+        "workflows",
+        sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("workflows", "lease_expires_at")
+    op.drop_column("workflows", "lease_owner")
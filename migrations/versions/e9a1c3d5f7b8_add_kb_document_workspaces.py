@@ -0,0 +1,60 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""add knowledge document workspace membership table
+
+Revision ID: e9a1c3d5f7b8
+Revises: d8f0b2c4e6a7
+Create Date: 2026-03-22 10:00:00.000000
+"""
+
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision: str = "e9a1c3d5f7b8"
+down_revision: Union[str, None] = "d8f0b2c4e6a7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    membership = op.create_table(
+        "kb_document_workspaces",
+        sa.Column("document_id", sa.String(255), primary_key=True),
+        sa.Column("workspace_id", sa.String(255), primary_key=True),
+    )
+    op.create_index(
+        "ix_kb_document_workspaces_workspace_id", "kb_document_workspaces", ["workspace_id"]
+    )
+
+    # Backfill from the JSON ``workspace_ids`` column.
+    bind = op.get_bind()
+    documents = sa.table(
+        "kb_documents", sa.column("id", sa.String), sa.column("workspace_ids", sa.Text)
+    )
+    rows = []
+    for doc_id, raw in bind.execute(sa.select(documents.c.id, documents.c.workspace_ids)):
+        try:
+            workspace_ids = json.loads(raw) if isinstance(raw, str) else (raw or [])
+        except ValueError:
+            continue
+        if not isinstance(workspace_ids, list):
+            continue
+        for workspace_id in dict.fromkeys(ws for ws in workspace_ids if isinstance(ws, str) and ws):
+            rows.append({"document_id": doc_id, "workspace_id": workspace_id})
+    if rows:
+        op.bulk_insert(membership, rows)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_kb_document_workspaces_workspace_id", table_name="kb_document_workspaces")
+    op.drop_table("kb_document_workspaces")
@@ -0,0 +1,49 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""replace single-column audit indexes with keyset pagination indexes
+
+Revision ID: f1b3d5e7a9c0
+Revises: e9a1c3d5f7b8
+Create Date: 2026-03-23 10:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision: str = "f1b3d5e7a9c0"
+down_revision: Union[str, None] = "e9a1c3d5f7b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_SINGLE_COLUMN = ("user_id", "event_type", "conversation_id", "created_at")
+
+_COMPOSITE = {
+    "ix_audit_events_created_at_id": ["created_at", "id"],
+    "ix_audit_events_user_created": ["user_id", "created_at", "id"],
+    "ix_audit_events_type_created": ["event_type", "created_at", "id"],
+    "ix_audit_events_risk_created": ["risk_level", "created_at", "id"],
+    "ix_audit_events_conversation_created": ["conversation_id", "created_at", "id"],
+}
+
+
+def upgrade() -> None:
+    for name, columns in _COMPOSITE.items():
+        op.create_index(name, "audit_events", columns)
+    # Each single-column index is a prefix of a composite one.
+    for column in _SINGLE_COLUMN:
+        op.drop_index(op.f(f"ix_audit_events_{column}"), table_name="audit_events")
+
+
+def downgrade() -> None:
+    for column in _SINGLE_COLUMN:
+        op.create_index(op.f(f"ix_audit_events_{column}"), "audit_events", [column])
+    for name in _COMPOSITE:
+        op.drop_index(name, table_name="audit_events")
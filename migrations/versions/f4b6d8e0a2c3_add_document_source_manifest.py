@@ -0,0 +1,53 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""add document source sync manifest and change-feed cursors
+
+Revision ID: f4b6d8e0a2c3
+Revises: e3a5c7d9f1b2
+Create Date: 2026-03-16 10:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision: str = "f4b6d8e0a2c3"
+down_revision: Union[str, None] = "e3a5c7d9f1b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("document_sources", sa.Column("sync_cursors", sa.Text(), nullable=True))
+    op.create_table(
+        "document_source_manifest",
+        sa.Column("id", sa.String(255), primary_key=True),
+        sa.Column("source_id", sa.String(255), nullable=False),
+        sa.Column("container", sa.String(255), nullable=False),
+        sa.Column("key", sa.String(1024), nullable=False),
+        sa.Column("name", sa.String(1024), nullable=False, server_default=""),
+        sa.Column("document_id", sa.String(255), nullable=True),
+        sa.Column("etag", sa.String(255), nullable=False, server_default=""),
+        sa.Column("modified_at", sa.String(64), nullable=False, server_default=""),
+        sa.Column("size", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("content_hash", sa.String(64), nullable=False, server_default=""),
+        sa.Column("synced_at", sa.DateTime(timezone=True), nullable=False),
+        sa.UniqueConstraint("source_id", "container", "key", name="uq_source_manifest_object"),
+    )
+    op.create_index(
+        "ix_document_source_manifest_source_id", "document_source_manifest", ["source_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_document_source_manifest_source_id", table_name="document_source_manifest")
+    op.drop_table("document_source_manifest")
+    op.drop_column("document_sources", "sync_cursors")
@@ -38,7 +38,9 @@ class ContextEnricher:
     """Enriches the agent's context before each turn.
 
     Runs knowledge graph entity search and knowledge base (RAG) retrieval
-    in parallel via ``asyncio.gather`` for minimal latency.
+    in parallel via ``asyncio.gather`` for minimal latency.  With an
+    embedding provider the message is embedded once and the embedding is
+    shared by all lookups.
     """
 
     def __init__(
@@ -51,6 +53,7 @@ class ContextEnricher:
         entity_limit: int = 5,
         retrieval_top_k: int = 5,
         settings_repo: Any | None = None,
+        embedding_provider: Any | None = None,
     ) -> None:
         self._knowledge_graph = knowledge_graph
         self._retriever = retriever
@@ -59,6 +62,7 @@ class ContextEnricher:
         self._entity_limit = entity_limit
         self._retrieval_top_k = retrieval_top_k
         self._settings_repo = settings_repo
+        self._embedding_provider = embedding_provider
 
     async def enrich(
         self,
@@ -96,17 +100,20 @@ class ContextEnricher:
 
         try:
             async with asyncio.timeout(timeout_seconds):
+                query_embedding = await self._embed_query(message)
+                shared = {"query_embedding": query_embedding} if query_embedding else {}
                 entities, snippets, processes, memories = await asyncio.gather(
                     self._knowledge_graph.find_relevant_entities(
-                        message, limit=self._entity_limit
+                        message, limit=self._entity_limit, **shared
                     ),
                     self._retriever.retrieve(
                         message,
                         top_k=self._retrieval_top_k,
                         tag_filter=knowledge_tag_filter,
+                        **shared,
                     ),
                     self._search_processes(message),
-                    self._search_memories(message, user_id),
+                    self._search_memories(message, user_id, query_embedding),
                 )
         except TimeoutError:
             _logger.warning("Context enrichment timed out after %ds", timeout_seconds)
@@ -156,21 +163,27 @@ class ContextEnricher:
         matches.sort(key=lambda x: x[0], reverse=True)
         return [proc for _score, proc in matches[:3]]
 
-    async def _search_memories(self, message: str, user_id: str | None) -> list[Any]:
-        """Load recent memories + keyword-matched memories for the user."""
+    async def _embed_query(self, message: str) -> list[float] | None:
+        """Embed the turn's message once for all lookups; ``None`` if unavailable."""
+        if self._embedding_provider is None:
+            return None
+        try:
+            embeddings = await self._embedding_provider.embed([message])
+        except Exception:
+            _logger.debug("Failed to embed message for context enrichment.", exc_info=True)
+            return None
+        return list(embeddings[0]) if embeddings and len(embeddings[0]) else None
+
+    async def _search_memories(
+        self, message: str, user_id: str | None, query_embedding: list[float] | None = None
+    ) -> list[Any]:
+        """Load the newest memories followed by those most relevant to the message."""
         if self._memory_repo is None or user_id is None:
             return []
         try:
-            recent = await self._memory_repo.list_recent(user_id, limit=5)
-            searched = await self._memory_repo.search(user_id, message)
-            # Deduplicate by id, recent first
-            seen: set[str] = set()
-            combined: list[Any] = []
-            for m in recent + searched:
-                if m.id not in seen:
-                    seen.add(m.id)
-                    combined.append(m)
-            return combined[:10]
+            return await self._memory_repo.search(
+                user_id, message, query_embedding=query_embedding, limit=10, recent=5
+            )
         except Exception:
             _logger.debug("Failed to search user memories.", exc_info=True)
             return []
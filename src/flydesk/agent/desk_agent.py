@@ -43,6 +43,7 @@ if TYPE_CHECKING:
     from flydesk.files.models import FileUpload
     from flydesk.files.repository import FileUploadRepository
     from flydesk.files.storage import FileStorageProvider
+    from flydesk.llm.spend import SpendLedger
     from flydesk.settings.repository import SettingsRepository
     from flydesk.tools.custom_repository import CustomToolRepository
     from flydesk.tools.executor import ToolCall, ToolExecutor, ToolResult
@@ -209,6 +210,7 @@ class DeskAgent:
         custom_tool_repo: CustomToolRepository | None = None,
         sandbox_executor: SandboxExecutor | None = None,
         model_router: ModelRouter | None = None,
+        spend_ledger: SpendLedger | None = None,
     ) -> None:
         self._context_enricher = context_enricher
         self._prompt_builder = prompt_builder
@@ -231,6 +233,7 @@ class DeskAgent:
         self._custom_tool_repo = custom_tool_repo
         self._sandbox_executor = sandbox_executor
         self._model_router = model_router
+        self._spend_ledger = spend_ledger
         self._cached_llm_runtime: LLMRuntimeSettings | None = None
 
     # ------------------------------------------------------------------
@@ -503,7 +506,7 @@ class DeskAgent:
                 data=usage_data,
             )
             # Track daily spend for budget monitoring
-            await self._track_daily_spend(usage_data.get("cost_usd", 0.0))
+            await self._track_daily_spend(usage_data, session.user_id)
 
         # Final done event
         yield SSEEvent(
@@ -694,7 +697,7 @@ class DeskAgent:
                 event=SSEEventType.USAGE,
                 data=usage_data,
             )
-            await self._track_daily_spend(usage_data.get("cost_usd", 0.0))
+            await self._track_daily_spend(usage_data, session.user_id)
 
         # Done
         yield SSEEvent(
@@ -1160,14 +1163,28 @@ class DeskAgent:
             timing_tracker=timing_tracker,
         )
 
-    async def _track_daily_spend(self, cost_usd: float) -> None:
-        """Accumulate daily spend in settings for budget monitoring.
+    async def _track_daily_spend(self, usage_data: dict[str, Any], user_id: str) -> None:
+        """Accumulate daily spend for budget monitoring.
 
-        Uses :meth:`SettingsRepository.increment_app_setting` for an atomic
-        read-add-write inside a single DB transaction, avoiding TOCTOU races
-        when multiple requests track spend concurrently.
+        With a :class:`SpendLedger` the cost is added to the in-memory
+        accumulator, which a background task flushes to this worker's
+        ledger rows.  Without one it falls back to
+        :meth:`SettingsRepository.increment_app_setting` on a shared
+        ``daily_spend_<date>`` setting.
         """
-        if not isinstance(cost_usd, (int, float)) or cost_usd <= 0 or self._settings_repo is None:
+        cost_usd = usage_data.get("cost_usd", 0.0)
+        if not isinstance(cost_usd, (int, float)) or cost_usd <= 0:
+            return
+        if self._spend_ledger is not None:
+            self._spend_ledger.record(
+                cost_usd,
+                user_id=user_id,
+                model=str(usage_data.get("model") or ""),
+                input_tokens=usage_data.get("input_tokens", 0),
+                output_tokens=usage_data.get("output_tokens", 0),
+            )
+            return
+        if self._settings_repo is None:
             return
         try:
             from datetime import date
@@ -0,0 +1,248 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""Chat suggestion chips -- precomputed per workspace and role.
+
+Suggestions describe what data is available (registered systems, knowledge
+documents, discovered processes).  :class:`SuggestionService` builds them
+from a few count queries, keeps the rendered chips per workspace for both
+the admin and non-admin variants, and serves requests from memory.
+Snapshots are rebuilt in the background when catalog or knowledge changes
+are reported through :meth:`SuggestionService.invalidate`, and once they
+are older than the TTL (which also picks up process discovery and changes
+made by other workers).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+# Cap for the 2x3 grid.
+_MAX_SUGGESTIONS = 6
+
+
+class SuggestionItem(BaseModel):
+    """A single chat suggestion chip."""
+
+    icon: str
+    title: str
+    description: str
+    text: str
+
+
+def fallback_suggestions(is_admin: bool) -> list[SuggestionItem]:
+    """Static fallback when repos are unavailable."""
+    base: list[SuggestionItem] = [
+        SuggestionItem(icon="search", title="Explore Systems", description="View all registered systems and services", text="Show me all registered systems"),
+        SuggestionItem(icon="book-open", title="Knowledge Base", description="Search organizational knowledge", text="What information is available in the knowledge base?"),
+        SuggestionItem(icon="help-circle", title="Capabilities", description="Learn what I can do for you", text="What can you help me with?"),
+    ]
+    if is_admin:
+        base.insert(1, SuggestionItem(icon="heart-pulse", title="System Health", description="Review current status of all systems", text="Review system health"))
+    return base
+
+
+@dataclass(frozen=True)
+class SuggestionStats:
+    """The figures suggestions are rendered from."""
+
+    system_count: int = 0
+    system_names: tuple[str, ...] = ()
+    document_count: int = 0
+    process_count: int = 0
+    top_process: str = ""
+
+
+def render_suggestions(stats: SuggestionStats, is_admin: bool) -> list[SuggestionItem]:
+    """Render the suggestion chips for *stats* and the user's role."""
+    suggestions: list[SuggestionItem] = []
+
+    # 1. Systems suggestion (when systems exist)
+    if stats.system_count > 0:
+        system_names = ", ".join(stats.system_names[:3])
+        suffix = f" and {stats.system_count - 3} more" if stats.system_count > 3 else ""
+        suggestions.append(SuggestionItem(
+            icon="search",
+            title="Explore Systems",
+            description=f"{stats.system_count} registered: {system_names}{suffix}",
+            text="Show me all registered systems and their current status",
+        ))
+
+    # 2. Knowledge suggestion (when docs exist)
+    doc_count = stats.document_count
+    if doc_count > 0:
+        suggestions.append(SuggestionItem(
+            icon="book-open",
+            title="Knowledge Base",
+            description=f"Search across {doc_count} knowledge document{'s' if doc_count != 1 else ''}",
+            text="What information is available in the knowledge base?",
+        ))
+
+    # 3. Process suggestion (when processes discovered)
+    if stats.process_count > 0:
+        suggestions.append(SuggestionItem(
+            icon="git-branch",
+            title="Business Processes",
+            description=f"{stats.process_count} discovered — e.g. {stats.top_process}",
+            text="Show me the discovered business processes and how they work",
+        ))
+
+    # 4. Admin-specific suggestions
+    if is_admin:
+        suggestions.append(SuggestionItem(
+            icon="heart-pulse",
+            title="System Health",
+            description="Review current status of all systems",
+            text="Review system health and check for any issues",
+        ))
+        suggestions.append(SuggestionItem(
+            icon="shield",
+            title="Audit Events",
+            description="Check recent security and activity logs",
+            text="Show me recent audit events",
+        ))
+
+    # 5. Always include a capabilities suggestion
+    suggestions.append(SuggestionItem(
+        icon="help-circle",
+        title="Capabilities",
+        description="Learn what I can do for you",
+        text="What can you help me with?",
+    ))
+
+    return suggestions[:_MAX_SUGGESTIONS]
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    by_role: dict[bool, list[SuggestionItem]]
+    built_at: float
+
+
+class SuggestionService:
+    """Serve chat suggestions from per-workspace snapshots kept in memory.
+
+    Parameters
+    ----------
+    ttl_seconds:
+        Age after which a snapshot is rebuilt in the background; requests
+        keep receiving the previous snapshot meanwhile.
+    max_workspaces:
+        Workspaces whose snapshots are kept, least recently used first out.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        ttl_seconds: float = 60.0,
+        max_workspaces: int = 256,
+    ) -> None:
+        self._session_factory = session_factory
+        self._ttl = ttl_seconds
+        self._max_workspaces = max_workspaces
+        self._snapshots: OrderedDict[str | None, _Snapshot] = OrderedDict()
+        self._refreshing: dict[str | None, asyncio.Task[None]] = {}
+        # Workspaces invalidated while their refresh was already running.
+        self._dirty: set[str | None] = set()
+
+    async def get(self, *, is_admin: bool, workspace_id: str | None = None) -> list[SuggestionItem]:
+        """Return the suggestions for a role and workspace.
+
+        Only the first request for a workspace waits for a snapshot to be
+        built; later requests are answered from memory.
+        """
+        snapshot = self._snapshots.get(workspace_id)
+        if snapshot is None:
+            self._schedule(workspace_id)
+            task = self._refreshing.get(workspace_id)
+            if task is not None:
+                await asyncio.shield(task)
+            snapshot = self._snapshots.get(workspace_id)
+            if snapshot is None:
+                return fallback_suggestions(is_admin)
+        else:
+            self._snapshots.move_to_end(workspace_id)
+            if time.monotonic() - snapshot.built_at >= self._ttl:
+                self._schedule(workspace_id)
+        return list(snapshot.by_role[is_admin])
+
+    def invalidate(self) -> None:
+        """Rebuild every cached snapshot in the background."""
+        for workspace_id in list(self._snapshots):
+            self._schedule(workspace_id)
+
+    def warm(self) -> None:
+        """Start building the snapshot for requests without a workspace."""
+        self._schedule(None)
+
+    async def stop(self) -> None:
+        tasks = list(self._refreshing.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._refreshing.clear()
+
+    # -- Internal --
+
+    def _schedule(self, workspace_id: str | None) -> None:
+        task = self._refreshing.get(workspace_id)
+        if task is not None and not task.done():
+            self._dirty.add(workspace_id)
+            return
+        self._refreshing[workspace_id] = asyncio.get_running_loop().create_task(
+            self._refresh(workspace_id)
+        )
+
+    async def _refresh(self, workspace_id: str | None) -> None:
+        try:
+            while True:
+                self._dirty.discard(workspace_id)
+                try:
+                    stats = await self._load_stats(workspace_id)
+                except Exception:
+                    logger.debug("Failed to build chat suggestions.", exc_info=True)
+                    return
+                self._snapshots[workspace_id] = _Snapshot(
+                    by_role={role: render_suggestions(stats, role) for role in (False, True)},
+                    built_at=time.monotonic(),
+                )
+                self._snapshots.move_to_end(workspace_id)
+                while len(self._snapshots) > self._max_workspaces:
+                    self._snapshots.popitem(last=False)
+                if workspace_id not in self._dirty:
+                    return
+        finally:
+            self._refreshing.pop(workspace_id, None)
+
+    async def _load_stats(self, workspace_id: str | None) -> SuggestionStats:
+        from flydesk.catalog.repository import CatalogRepository
+        from flydesk.processes.repository import ProcessRepository
+
+        catalog_repo = CatalogRepository(self._session_factory)
+        process_repo = ProcessRepository(self._session_factory)
+        systems, system_count = await catalog_repo.list_systems(workspace_id=workspace_id, limit=3)
+        document_count = await catalog_repo.count_knowledge_documents(workspace_id=workspace_id)
+        process_count = await process_repo.count(workspace_id=workspace_id)
+        top = await process_repo.list(workspace_id=workspace_id, limit=1) if process_count else []
+        return SuggestionStats(
+            system_count=system_count,
+            system_names=tuple(s.name for s in systems),
+            document_count=document_count,
+            process_count=process_count,
+            top_process=top[0].name if top else "",
+        )
@@ -6,16 +6,21 @@
 #
 #     http://www.apache.org/licenses/LICENSE-2.0
 
-"""Audit Admin REST API -- query audit trail events."""
+"""Audit Admin REST API -- query and export audit trail events."""
 
 from __future__ import annotations
 
-from typing import Annotated
+import csv
+import io
+import json
+from collections.abc import AsyncIterator
+from typing import Annotated, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 
 from flydesk.api.deps import get_audit_logger
-from flydesk.audit.logger import AuditLogger
+from flydesk.audit.logger import AuditLogger, encode_cursor
 from flydesk.audit.models import AuditEvent
 from flydesk.rbac.guards import AuditRead
 
@@ -37,6 +42,7 @@ Logger = Annotated[AuditLogger, Depends(get_audit_logger)]
 @router.get("/events", dependencies=[AuditRead])
 async def query_events(
     logger: Logger,
+    response: Response,
     user_id: str | None = None,
     event_type: str | None = None,
     risk_level: str | None = None,
@@ -45,18 +51,108 @@ async def query_events(
     conversation_id: str | None = None,
     offset: int = Query(default=0, ge=0),
     limit: int = 50,
+    cursor: str | None = Query(
+        default=None, description="X-Next-Cursor of the previous page"
+    ),
 ) -> list[AuditEvent]:
-    """Query audit events with optional filters."""
+    """Query audit events with optional filters, newest first.
+
+    When the page is full, the ``X-Next-Cursor`` response header holds the
+    cursor for the next page.
+    """
     capped = min(limit, 500)
-    return await logger.query(
+    try:
+        events = await logger.query(
+            user_id=user_id,
+            event_type=event_type,
+            risk_level=risk_level,
+            date_from=date_from,
+            date_to=date_to,
+            conversation_id=conversation_id,
+            offset=offset,
+            limit=capped,
+            cursor=cursor,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    last = events[-1] if len(events) == capped else None
+    if last is not None and last.id and last.timestamp is not None:
+        response.headers["X-Next-Cursor"] = encode_cursor(last.timestamp, last.id)
+    return events
+
+
+_EXPORT_COLUMNS = [
+    "id",
+    "timestamp",
+    "event_type",
+    "user_id",
+    "conversation_id",
+    "system_id",
+    "endpoint_id",
+    "action",
+    "risk_level",
+    "ip_address",
+    "user_agent",
+    "detail",
+]
+
+# Leading characters that make spreadsheet applications evaluate a cell.
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_cell(value: object) -> object:
+    """Neutralise *value* against CSV formula injection by quoting it with ``'``."""
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+@router.get("/export", dependencies=[AuditRead])
+async def export_events(
+    logger: Logger,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    user_id: str | None = None,
+    event_type: str | None = None,
+    risk_level: str | None = None,
+    date_from: str | None = Query(default=None, description="ISO datetime lower bound"),
+    date_to: str | None = Query(default=None, description="ISO datetime upper bound"),
+    conversation_id: str | None = None,
+) -> StreamingResponse:
+    """Stream every matching audit event as NDJSON or CSV, newest first."""
+    events = logger.iter_events(
         user_id=user_id,
         event_type=event_type,
         risk_level=risk_level,
         date_from=date_from,
         date_to=date_to,
         conversation_id=conversation_id,
-        offset=offset,
-        limit=capped,
+    )
+
+    async def _ndjson() -> AsyncIterator[str]:
+        async for event in events:
+            yield event.model_dump_json() + "\n"
+
+    async def _csv() -> AsyncIterator[str]:
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(_EXPORT_COLUMNS)
+        async for event in events:
+            row = event.model_dump(mode="json")
+            row["detail"] = json.dumps(row["detail"], default=str)
+            writer.writerow([_csv_cell(row.get(column)) for column in _EXPORT_COLUMNS])
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+        yield buf.getvalue()
+
+    if format == "csv":
+        body, media_type = _csv(), "text/csv"
+    else:
+        body, media_type = _ndjson(), "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="audit-events.{format}"'},
     )
 
 
@@ -21,12 +21,16 @@ router = APIRouter(
 @router.get("/status")
 async def budget_status(request: Request) -> dict:
     config = getattr(request.app.state, "config", None)
+    spend_ledger = getattr(request.app.state, "spend_ledger", None)
     settings_repo = getattr(request.app.state, "settings_repo", None)
-    if config is None or settings_repo is None:
+    if config is None or (spend_ledger is None and settings_repo is None):
         return {"daily_limit": 0.0, "spent_today": 0.0, "percentage": 0.0, "status": "unavailable"}
 
-    today = date.today().isoformat()
-    spent_today = float(await settings_repo.get_app_setting(f"daily_spend_{today}") or "0")
+    if spend_ledger is not None:
+        spent_today = await spend_ledger.total()
+    else:
+        today = date.today().isoformat()
+        spent_today = float(await settings_repo.get_app_setting(f"daily_spend_{today}") or "0")
     daily_limit = config.daily_budget_limit
 
     if daily_limit > 0:
@@ -459,6 +459,7 @@ class DetectRequest(BaseModel):
     """Body for triggering system detection."""
 
     trigger: str = ""
+    full: bool = False  # re-analyse everything, not just what changed
 
 
 @router.post("/detect", dependencies=[CatalogWrite])
@@ -499,5 +500,6 @@ async def trigger_system_detection(request: Request, body: DetectRequest | None
         workspace_ids=workspace_ids or None,
         document_types=document_types or None,
         confidence_threshold=confidence_threshold,
+        full=bool(body and body.full),
     )
     return {"job_id": job.id, "status": job.status.value, "progress_pct": job.progress_pct}
@@ -17,6 +17,7 @@ from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
+from flydesk.agent.suggestions import SuggestionItem, SuggestionService, fallback_suggestions
 from flydesk.api.events import SSEEvent, SSEEventType
 
 router = APIRouter(prefix="/api/chat", tags=["chat"])
@@ -34,15 +35,6 @@ class ChatMessage(BaseModel):
     pattern: str | None = None
 
 
-class SuggestionItem(BaseModel):
-    """A single chat suggestion chip."""
-
-    icon: str
-    title: str
-    description: str
-    text: str
-
-
 class SuggestionsResponse(BaseModel):
     """Response payload for the suggestions endpoint."""
 
@@ -50,112 +42,35 @@ class SuggestionsResponse(BaseModel):
 
 
 # ---------------------------------------------------------------------------
-# Dynamic suggestion builder
+# Dynamic suggestions
 # ---------------------------------------------------------------------------
 
 
-async def _build_suggestions(request: Request, is_admin: bool) -> list[SuggestionItem]:
-    """Build contextual suggestions based on what data is actually seeded."""
-    from flydesk.catalog.repository import CatalogRepository
-    from flydesk.processes.repository import ProcessRepository
-
-    session_factory = getattr(request.app.state, "session_factory", None)
-    if session_factory is None:
-        return _fallback_suggestions(is_admin)
-
-    suggestions: list[SuggestionItem] = []
-
-    try:
-        catalog_repo = CatalogRepository(session_factory)
-        systems, _ = await catalog_repo.list_systems()
-        docs = await catalog_repo.list_knowledge_documents()
-        process_repo = ProcessRepository(session_factory)
-        processes = await process_repo.list(limit=50)
-    except Exception:
-        logger.debug("Failed to query repos for suggestions", exc_info=True)
-        return _fallback_suggestions(is_admin)
-
-    system_count = len(systems)
-    doc_count = len(docs)
-    process_count = len(processes)
-
-    # 1. Systems suggestion (when systems exist)
-    if system_count > 0:
-        system_names = ", ".join(s.name for s in systems[:3])
-        suffix = f" and {system_count - 3} more" if system_count > 3 else ""
-        suggestions.append(SuggestionItem(
-            icon="search",
-            title="Explore Systems",
-            description=f"{system_count} registered: {system_names}{suffix}",
-            text="Show me all registered systems and their current status",
-        ))
-
-    # 2. Knowledge suggestion (when docs exist)
-    if doc_count > 0:
-        suggestions.append(SuggestionItem(
-            icon="book-open",
-            title="Knowledge Base",
-            description=f"Search across {doc_count} knowledge document{'s' if doc_count != 1 else ''}",
-            text="What information is available in the knowledge base?",
-        ))
-
-    # 3. Process suggestion (when processes discovered)
-    if process_count > 0:
-        top_process = processes[0].name if processes else ""
-        suggestions.append(SuggestionItem(
-            icon="git-branch",
-            title="Business Processes",
-            description=f"{process_count} discovered — e.g. {top_process}",
-            text="Show me the discovered business processes and how they work",
-        ))
-
-    # 4. Admin-specific suggestions
-    if is_admin:
-        suggestions.append(SuggestionItem(
-            icon="heart-pulse",
-            title="System Health",
-            description="Review current status of all systems",
-            text="Review system health and check for any issues",
-        ))
-        suggestions.append(SuggestionItem(
-            icon="shield",
-            title="Audit Events",
-            description="Check recent security and activity logs",
-            text="Show me recent audit events",
-        ))
-
-    # 6. Always include a capabilities suggestion
-    suggestions.append(SuggestionItem(
-        icon="help-circle",
-        title="Capabilities",
-        description="Learn what I can do for you",
-        text="What can you help me with?",
-    ))
-
-    # Cap at 6 suggestions for the 2x3 grid
-    return suggestions[:6]
-
-
-def _fallback_suggestions(is_admin: bool) -> list[SuggestionItem]:
-    """Static fallback when repos are unavailable."""
-    base: list[SuggestionItem] = [
-        SuggestionItem(icon="search", title="Explore Systems", description="View all registered systems and services", text="Show me all registered systems"),
-        SuggestionItem(icon="book-open", title="Knowledge Base", description="Search organizational knowledge", text="What information is available in the knowledge base?"),
-        SuggestionItem(icon="help-circle", title="Capabilities", description="Learn what I can do for you", text="What can you help me with?"),
-    ]
-    if is_admin:
-        base.insert(1, SuggestionItem(icon="heart-pulse", title="System Health", description="Review current status of all systems", text="Review system health"))
-    return base
+def _suggestion_service(request: Request) -> SuggestionService | None:
+    """Return the app's suggestion service, creating it on first use."""
+    service = getattr(request.app.state, "suggestion_service", None)
+    if service is None:
+        session_factory = getattr(request.app.state, "session_factory", None)
+        if session_factory is None:
+            return None
+        service = SuggestionService(session_factory)
+        request.app.state.suggestion_service = service
+    return service
 
 
 @router.get("/suggestions", response_model=SuggestionsResponse)
-async def get_suggestions(request: Request) -> SuggestionsResponse:
+async def get_suggestions(
+    request: Request, workspace_id: str | None = None
+) -> SuggestionsResponse:
     """Return contextual suggestions based on seeded data and user role."""
     user_session = getattr(request.state, "user_session", None)
     roles: list[str] = list(user_session.roles) if user_session and hasattr(user_session, "roles") else []
     is_admin = "admin" in roles
 
-    items = await _build_suggestions(request, is_admin)
+    service = _suggestion_service(request)
+    if service is None:
+        return SuggestionsResponse(suggestions=fallback_suggestions(is_admin))
+    items = await service.get(is_admin=is_admin, workspace_id=workspace_id)
     return SuggestionsResponse(suggestions=items)
 
 
@@ -14,7 +14,7 @@ import uuid
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from pydantic import BaseModel
 
 from flydesk.api.deps import get_credential_store, get_kms
@@ -64,6 +64,13 @@ KMS = Annotated["KMSProvider", Depends(get_kms)]
 # ---------------------------------------------------------------------------
 
 
+def _invalidate_cached(kms: KMSProvider, credential: Credential) -> None:
+    """Drop any cached key material for a credential's previous ciphertext."""
+    invalidate = getattr(kms, "invalidate", None)
+    if invalidate is not None:
+        invalidate(credential.encrypted_value)
+
+
 def _strip_encrypted(credential: Credential) -> dict[str, Any]:
     """Return credential data without the encrypted_value field."""
     data = credential.model_dump(mode="json")
@@ -79,7 +86,9 @@ def _strip_encrypted(credential: Credential) -> dict[str, Any]:
 @router.get("/kms-status", dependencies=[CredentialsRead])
 async def kms_status(kms: KMS) -> dict[str, Any]:
     """Return current KMS provider status."""
-    provider_name = type(kms).__name__
+    envelope = hasattr(kms, "inner")
+    provider = getattr(kms, "inner", kms)
+    provider_name = type(provider).__name__
     # Map class names to friendly names
     friendly = {
         "FernetKMSProvider": "fernet",
@@ -91,11 +100,21 @@ async def kms_status(kms: KMS) -> dict[str, Any]:
     }
     return {
         "provider": friendly.get(provider_name, provider_name.lower()),
-        "is_dev_key": getattr(kms, "is_dev_key", False),
+        "is_dev_key": getattr(provider, "is_dev_key", False),
         "provider_class": provider_name,
+        "envelope_encryption": envelope,
     }
 
 
+@router.get("/oauth2-stats", dependencies=[CredentialsRead])
+async def oauth2_token_stats(request: Request) -> dict[str, Any]:
+    """Return OAuth2 token refresh counts, failures and latency per system."""
+    token_manager = getattr(request.app.state, "token_manager", None)
+    if token_manager is None:
+        return {}
+    return token_manager.stats()
+
+
 @router.get("", dependencies=[CredentialsRead])
 async def list_credentials(store: Store) -> list[dict[str, Any]]:
     """List all credentials (metadata only, encrypted values stripped)."""
@@ -140,11 +159,12 @@ async def update_credential(
         last_rotated=datetime.now(timezone.utc),
     )
     await store.update_credential(rotated)
+    _invalidate_cached(kms, existing)
     return _strip_encrypted(rotated)
 
 
 @router.delete("/{credential_id}", status_code=204, dependencies=[CredentialsWrite])
-async def delete_credential(credential_id: str, store: Store) -> Response:
+async def delete_credential(credential_id: str, store: Store, kms: KMS) -> Response:
     """Revoke and delete a credential."""
     existing = await store.get_credential(credential_id)
     if existing is None:
@@ -152,4 +172,5 @@ async def delete_credential(credential_id: str, store: Store) -> Response:
             status_code=404, detail=f"Credential {credential_id} not found"
         )
     await store.delete_credential(credential_id)
+    _invalidate_cached(kms, existing)
     return Response(status_code=204)
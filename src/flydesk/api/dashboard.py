@@ -10,7 +10,6 @@
 
 from __future__ import annotations
 
-import json
 import logging
 from datetime import datetime, timedelta, timezone
 from typing import Annotated, Any
@@ -27,6 +26,13 @@ from flydesk.api.deps import (
     get_session_factory,
 )
 from flydesk.audit.logger import AuditLogger
+from flydesk.audit.rollup import (
+    SOURCE_AUDIT,
+    SOURCE_CONVERSATIONS,
+    SOURCE_MESSAGES,
+    TOKEN_EVENT_TYPES,
+    UsageRollups,
+)
 from flydesk.catalog.repository import CatalogRepository
 from flydesk.llm.health import LLMHealthChecker
 from flydesk.llm.repository import LLMProviderRepository
@@ -148,7 +154,7 @@ async def get_stats(
     """Return aggregated system statistics."""
     # Catalog counts
     systems, _ = await catalog_repo.list_systems()
-    knowledge_docs = await catalog_repo.list_knowledge_documents()
+    knowledge_count = await catalog_repo.count_knowledge_documents()
 
     # LLM provider count
     providers = await llm_repo.list_providers()
@@ -201,7 +207,7 @@ async def get_stats(
         message_count=message_count,
         active_user_count=active_user_count,
         system_count=len(systems),
-        knowledge_doc_count=len(knowledge_docs),
+        knowledge_doc_count=knowledge_count,
         audit_event_count=audit_event_count,
         llm_provider_count=len(providers),
     )
@@ -310,8 +316,13 @@ async def get_analytics(
     session_factory: SessionFactory,
     days: int = 30,
 ) -> ConversationAnalytics:
-    """Return conversation analytics: messages per day, tool usage, etc."""
+    """Return conversation analytics: messages per day, tool usage, etc.
+
+    Figures come from the hourly usage rollups plus the raw rows newer
+    than the rollup watermark.
+    """
     cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    rollups = UsageRollups(session_factory)
 
     messages_per_day: list[DailyCount] = []
     avg_conversation_length: float = 0.0
@@ -319,69 +330,38 @@ async def get_analytics(
     top_event_types: list[EventTypeCount] = []
 
     try:
-        async with session_factory() as session:
-            # 1) Messages per day for the last N days
-            date_col = func.date(MessageRow.created_at)
-            stmt = (
-                select(date_col.label("day"), func.count().label("cnt"))
-                .where(MessageRow.created_at >= cutoff)
-                .group_by(date_col)
-                .order_by(date_col)
+        # 1) Messages per day for the last N days
+        per_day = await rollups.summarize(SOURCE_MESSAGES, ["day"], since=cutoff)
+        messages_per_day = [
+            DailyCount(date=day, count=counts.event_count)
+            for (day,), counts in sorted(per_day.items())
+        ]
+
+        # 2) Average conversation length (messages per conversation, all time)
+        messages = (await rollups.summarize(SOURCE_MESSAGES)).get(())
+        conversations = (await rollups.summarize(SOURCE_CONVERSATIONS)).get(())
+        if messages and conversations and conversations.event_count:
+            avg_conversation_length = round(
+                messages.event_count / conversations.event_count, 2
             )
-            result = await session.execute(stmt)
-            messages_per_day = [
-                DailyCount(date=str(row.day), count=row.cnt)
-                for row in result.all()
-            ]
-
-            # 2) Average conversation length (messages per conversation)
-            sub = (
-                select(
-                    MessageRow.conversation_id,
-                    func.count().label("msg_count"),
-                )
-                .group_by(MessageRow.conversation_id)
-                .subquery()
-            )
-            result = await session.execute(
-                select(func.avg(sub.c.msg_count))
-            )
-            avg_val = result.scalar()
-            avg_conversation_length = round(float(avg_val), 2) if avg_val else 0.0
-
-            # 3) Tool usage: GROUP BY action WHERE event_type = 'tool_call'
-            stmt = (
-                select(
-                    AuditEventRow.action.label("tool_name"),
-                    func.count().label("cnt"),
-                )
-                .where(AuditEventRow.event_type == "tool_call")
-                .where(AuditEventRow.created_at >= cutoff)
-                .group_by(AuditEventRow.action)
-                .order_by(func.count().desc())
-            )
-            result = await session.execute(stmt)
-            tool_usage = [
-                ToolUsageCount(tool_name=row.tool_name, count=row.cnt)
-                for row in result.all()
-            ]
-
-            # 4) Top event types: GROUP BY event_type, top 10
-            stmt = (
-                select(
-                    AuditEventRow.event_type.label("evt"),
-                    func.count().label("cnt"),
-                )
-                .where(AuditEventRow.created_at >= cutoff)
-                .group_by(AuditEventRow.event_type)
-                .order_by(func.count().desc())
-                .limit(10)
-            )
-            result = await session.execute(stmt)
-            top_event_types = [
-                EventTypeCount(event_type=row.evt, count=row.cnt)
-                for row in result.all()
-            ]
+
+        # 3) Tool usage: tool_call events by action
+        per_tool = await rollups.summarize(
+            SOURCE_AUDIT, ["tool"], since=cutoff, event_types=["tool_call"]
+        )
+        tool_usage = [
+            ToolUsageCount(tool_name=tool, count=counts.event_count)
+            for (tool,), counts in sorted(per_tool.items(), key=lambda i: -i[1].event_count)
+        ]
+
+        # 4) Top event types, top 10
+        per_type = await rollups.summarize(SOURCE_AUDIT, ["event_type"], since=cutoff)
+        top_event_types = [
+            EventTypeCount(event_type=event_type, count=counts.event_count)
+            for (event_type,), counts in sorted(
+                per_type.items(), key=lambda i: -i[1].event_count
+            )[:10]
+        ]
     except Exception:
         logger.debug("Failed to query analytics data.", exc_info=True)
 
@@ -428,30 +408,13 @@ async def get_token_usage(
     total_output_tokens = 0
 
     try:
-        async with session_factory() as session:
-            # Fetch agent_response audit events for the period.
-            # The detail column stores token counts; since it's Text in
-            # SQLite and JSONB in Postgres we parse in Python for portability.
-            stmt = (
-                select(AuditEventRow.detail)
-                .where(AuditEventRow.event_type.in_(["agent_response", "discovery_response"]))
-                .where(AuditEventRow.created_at >= cutoff)
-            )
-            result = await session.execute(stmt)
-
-            for (detail_raw,) in result.all():
-                detail = detail_raw
-                # SQLite stores JSON as text; Postgres returns dict.
-                if isinstance(detail, str):
-                    try:
-                        detail = json.loads(detail)
-                    except (json.JSONDecodeError, TypeError):
-                        continue
-                if not isinstance(detail, dict):
-                    continue
-
-                total_input_tokens += int(detail.get("input_tokens", 0))
-                total_output_tokens += int(detail.get("output_tokens", 0))
+        usage = await UsageRollups(session_factory).summarize(
+            SOURCE_AUDIT, since=cutoff, event_types=TOKEN_EVENT_TYPES
+        )
+        totals = usage.get(())
+        if totals is not None:
+            total_input_tokens = totals.input_tokens
+            total_output_tokens = totals.output_tokens
     except Exception:
         logger.debug("Failed to query token usage data.", exc_info=True)
 
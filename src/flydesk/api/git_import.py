@@ -11,19 +11,27 @@
 Exposes a unified set of endpoints for browsing and importing content from
 any configured Git provider (GitHub, GitLab, Bitbucket) via the
 ``GitProvider`` protocol and ``GitProviderFactory``.
+
+Imports run as ``git_import`` background jobs when a job runner is
+available; otherwise the selected files are fetched concurrently inside the
+request.
 """
 
 from __future__ import annotations
 
+import asyncio
 import dataclasses
 import logging
 import uuid
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
 
 from flydesk.api.deps import get_git_provider_repo, get_indexing_producer
+from flydesk.config import get_config
+from flydesk.jobs.models import Job
+from flydesk.jobs.runner import JobRunner
 from flydesk.knowledge.git_provider import GitProvider, GitProviderFactory
 from flydesk.knowledge.git_provider_repository import GitProviderRepository
 from flydesk.knowledge.queue import IndexingQueueProducer, IndexingTask
@@ -109,6 +117,46 @@ async def _make_provider(
     return GitProviderFactory.create(row.provider_type, token=effective_token, base_url=row.base_url)
 
 
+def git_indexing_task(
+    provider_id: str,
+    item: RepoImportItem,
+    path: str,
+    content: str,
+    sha: str,
+    *,
+    document_id: str | None = None,
+    extra_metadata: dict | None = None,
+) -> IndexingTask:
+    """Build the ``IndexingTask`` for one file imported from *item*."""
+    return IndexingTask(
+        document_id=document_id or str(uuid.uuid4()),
+        title=path.rsplit("/", 1)[-1].rsplit(".", 1)[0],
+        content=content,
+        document_type="other",
+        source=f"git://{item.owner}/{item.repo}/{path}@{item.branch}",
+        tags=item.tags + ["git-import", f"repo:{item.owner}/{item.repo}"],
+        metadata={
+            "provider": provider_id,
+            "repo": f"{item.owner}/{item.repo}",
+            "branch": item.branch,
+            "path": path,
+            "sha": sha,
+            **(extra_metadata or {}),
+        },
+    )
+
+
+async def _gather_bounded(coros: list, limit: int) -> list:
+    """Await *coros* with at most *limit* running at once, keeping their order."""
+    slots = asyncio.Semaphore(max(1, limit))
+
+    async def _run(coro):
+        async with slots:
+            return await coro
+
+    return await asyncio.gather(*(_run(c) for c in coros))
+
+
 # ---------------------------------------------------------------------------
 # Endpoints
 # ---------------------------------------------------------------------------
@@ -222,20 +270,23 @@ async def preview_files(
 ) -> list[dict]:
     """Preview content of selected files before importing."""
     provider = await _make_provider(repo, provider_id, token)
+
+    async def _preview(path: str) -> dict:
+        try:
+            content = await provider.get_file_content(
+                owner, repo_name, path, ref=body.branch
+            )
+            return dataclasses.asdict(content)
+        except Exception as exc:
+            logger.warning(
+                "Failed to preview %s/%s:%s — %s", owner, repo_name, path, exc
+            )
+            return {"path": path, "error": str(exc)}
+
     try:
-        results = []
-        for path in body.paths:
-            try:
-                content = await provider.get_file_content(
-                    owner, repo_name, path, ref=body.branch
-                )
-                results.append(dataclasses.asdict(content))
-            except Exception as exc:
-                logger.warning(
-                    "Failed to preview %s/%s:%s — %s", owner, repo_name, path, exc
-                )
-                results.append({"path": path, "error": str(exc)})
-        return results
+        return await _gather_bounded(
+            [_preview(path) for path in body.paths], get_config().git_import_concurrency
+        )
     finally:
         await provider.aclose()
 
@@ -245,45 +296,115 @@ async def import_repos(
     provider_id: str,
     token: str,
     body: MultiRepoImportRequest,
+    request: Request,
     repo: Repo,
     producer: Producer,
 ) -> dict:
     """Accept a multi-repo import request (cart).
 
-    Fetches file content from the Git provider and enqueues each file as an
-    ``IndexingTask`` for background indexing by the knowledge queue consumer.
+    When a job runner is available the import is submitted as a
+    ``git_import`` job, which downloads whole branches as archives where the
+    provider supports it, skips files whose blob SHA is unchanged since the
+    last import and reports progress; the response carries its ``job_id``.
+    Otherwise file content is fetched concurrently here and each file is
+    enqueued as an ``IndexingTask`` for the knowledge queue consumer.
     """
+    job_runner: JobRunner | None = getattr(request.app.state, "job_runner", None)
+    if job_runner is not None:
+        resolved = await _resolve_items(repo, provider_id, token, body.items)
+        job = await _submit_import_job(job_runner, request, repo, provider_id, token, body)
+        if job is not None:
+            return {
+                "status": "accepted",
+                "job_id": job.id,
+                "items": [
+                    {"path": path, "status": "queued"}
+                    for _item, paths in resolved
+                    for path in paths
+                ],
+            }
+
     provider = await _make_provider(repo, provider_id, token)
+
+    async def _import(item: RepoImportItem, path: str) -> dict:
+        try:
+            fc = await provider.get_file_content(
+                item.owner, item.repo, path, ref=item.branch
+            )
+            task = git_indexing_task(provider_id, item, path, fc.content, fc.sha)
+            await producer.enqueue(task)
+            return {"path": path, "document_id": task.document_id, "status": "queued"}
+        except Exception as exc:
+            logger.warning(
+                "Failed to import %s/%s:%s — %s", item.owner, item.repo, path, exc
+            )
+            return {"path": path, "error": str(exc), "status": "failed"}
+
     try:
-        results = []
-        for item in body.items:
-            for path in item.paths:
-                try:
-                    fc = await provider.get_file_content(
-                        item.owner, item.repo, path, ref=item.branch
-                    )
-                    task = IndexingTask(
-                        document_id=str(uuid.uuid4()),
-                        title=path.rsplit("/", 1)[-1].rsplit(".", 1)[0],
-                        content=fc.content,
-                        document_type="other",
-                        source=f"git://{item.owner}/{item.repo}/{path}@{item.branch}",
-                        tags=item.tags + ["git-import", f"repo:{item.owner}/{item.repo}"],
-                        metadata={
-                            "provider": provider_id,
-                            "repo": f"{item.owner}/{item.repo}",
-                            "branch": item.branch,
-                            "path": path,
-                            "sha": fc.sha,
-                        },
-                    )
-                    await producer.enqueue(task)
-                    results.append({"path": path, "document_id": task.document_id, "status": "queued"})
-                except Exception as exc:
-                    logger.warning(
-                        "Failed to import %s/%s:%s — %s", item.owner, item.repo, path, exc
-                    )
-                    results.append({"path": path, "error": str(exc), "status": "failed"})
+        resolved = [(item, await _resolve_paths(provider, item)) for item in body.items]
+        results = await _gather_bounded(
+            [_import(item, path) for item, paths in resolved for path in paths],
+            get_config().git_import_concurrency,
+        )
         return {"status": "accepted", "items": results}
     finally:
         await provider.aclose()
+
+
+async def _resolve_paths(provider: GitProvider, item: RepoImportItem) -> list[str]:
+    """Return the files to import for *item*; no paths selects the whole branch."""
+    if item.paths:
+        return item.paths
+    entries = await provider.list_tree(item.owner, item.repo, item.branch)
+    return [entry.path for entry in entries if entry.type == "blob"]
+
+
+async def _resolve_items(
+    repo: GitProviderRepository,
+    provider_id: str,
+    token: str,
+    items: list[RepoImportItem],
+) -> list[tuple[RepoImportItem, list[str]]]:
+    """Pair each item with its files, listing branches only where needed."""
+    if all(item.paths for item in items):
+        return [(item, item.paths) for item in items]
+    provider = await _make_provider(repo, provider_id, token)
+    try:
+        return [(item, await _resolve_paths(provider, item)) for item in items]
+    finally:
+        await provider.aclose()
+
+
+async def _submit_import_job(
+    job_runner: JobRunner,
+    request: Request,
+    repo: GitProviderRepository,
+    provider_id: str,
+    token: str,
+    body: MultiRepoImportRequest,
+) -> Job | None:
+    """Submit a ``git_import`` job, or return ``None`` if none is registered.
+
+    The token is stored encrypted in the job payload.
+    """
+    row = await repo.get_provider(provider_id)
+    if row is None or not row.is_active:
+        raise HTTPException(404, "Git provider not found or inactive")
+    if token == "stored" and row.auth_method == "pat" and not repo.decrypt_secret(row):
+        raise HTTPException(400, "No stored token found for this provider")
+
+    user_session = getattr(request.state, "user_session", None)
+    payload = {
+        "provider_id": provider_id,
+        "token": token if token == "stored" else repo.encrypt_token(token),
+        "items": [item.model_dump() for item in body.items],
+    }
+    try:
+        return await job_runner.submit(
+            "git_import",
+            payload,
+            submitter=user_session.user_id if user_session is not None else None,
+        )
+    except ValueError:
+        logger.info("No git_import job handler registered; importing inline")
+        return None
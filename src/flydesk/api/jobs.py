@@ -6,7 +6,7 @@
 #
 #     http://www.apache.org/licenses/LICENSE-2.0
 
-"""Jobs REST API -- list, detail, cancel, and stream progress for background jobs."""
+"""Jobs REST API -- list, detail, cancel, metrics, and stream progress for background jobs."""
 
 from __future__ import annotations
 
@@ -75,6 +75,12 @@ async def list_jobs(
     return [_job_to_dict(j) for j in jobs]
 
 
+@router.get("/metrics", dependencies=[JobsRead])
+async def job_metrics(runner: Runner) -> dict:
+    """Queue depth, running jobs, and queue wait times per job type."""
+    return await runner.stats()
+
+
 @router.get("/{job_id}", dependencies=[JobsRead])
 async def get_job(job_id: str, repo: JobRepo) -> dict:
     """Get details of a specific job."""
@@ -156,57 +162,75 @@ async def stream_job_progress(
     if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
+    # Live updates come from the runner's progress hub; the database is
+    # still polled (less often) to catch jobs run by another replica and
+    # cancellations.
+    runner = getattr(request.app.state, "job_runner", None)
+    hub = getattr(runner, "progress_hub", None)
+    poll_seconds = _HUB_POLL_SECONDS if hub is not None else _POLL_SECONDS
+
     async def _event_generator():
-        """Poll the job status and yield SSE events."""
-        last_pct = -1
-        last_msg = ""
-        while True:
-            if await request.is_disconnected():
-                break
-
-            current = await repo.get(job_id)
-            if current is None:
-                break
-
-            # Emit progress if changed
-            if current.progress_pct != last_pct or current.progress_message != last_msg:
-                last_pct = current.progress_pct
-                last_msg = current.progress_message
-                event = SSEEvent(
-                    event=SSEEventType.JOB_PROGRESS,
-                    data={
+        """Relay hub events, poll the job status, and yield SSE events."""
+        subscription = hub.subscribe(job_id) if hub is not None else None
+        last: tuple[int, str] | None = None
+        next_poll = 0.0
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                if await request.is_disconnected():
+                    break
+
+                if subscription is not None:
+                    live = await subscription.get(timeout=max(0.0, next_poll - loop.time()))
+                    if live is not None and live["status"] == JobStatus.RUNNING.value:
+                        if (live["progress_pct"], live["progress_message"]) != last:
+                            last = (live["progress_pct"], live["progress_message"])
+                            yield _progress_event(live).to_sse()
+                        if loop.time() < next_poll:
+                            continue
+                elif next_poll:
+                    await asyncio.sleep(poll_seconds)
+
+                next_poll = loop.time() + poll_seconds
+                current = await repo.get(job_id)
+                if current is None:
+                    break
+
+                # Emit progress if changed.  With a hub the persisted
+                # progress lags the live events, so only let it move forward.
+                stale = (
+                    subscription is not None
+                    and last is not None
+                    and current.progress_pct <= last[0]
+                )
+                if not stale and (current.progress_pct, current.progress_message) != last:
+                    last = (current.progress_pct, current.progress_message)
+                    yield _progress_event(_job_to_progress(current)).to_sse()
+
+                # Terminal state -- send done and close
+                if current.status in (
+                    JobStatus.COMPLETED,
+                    JobStatus.FAILED,
+                    JobStatus.CANCELLED,
+                ):
+                    done_data: dict = {
                         "job_id": current.id,
-                        "job_type": current.job_type,
                         "status": current.status.value,
-                        "progress_pct": current.progress_pct,
-                        "progress_message": current.progress_message,
-                    },
-                )
-                yield event.to_sse()
-
-            # Terminal state -- send done and close
-            if current.status in (
-                JobStatus.COMPLETED,
-                JobStatus.FAILED,
-                JobStatus.CANCELLED,
-            ):
-                done_data: dict = {
-                    "job_id": current.id,
-                    "status": current.status.value,
-                }
-                if current.result is not None:
-                    done_data["result"] = current.result
-                if current.error is not None:
-                    done_data["error"] = current.error
-
-                done_event = SSEEvent(
-                    event=SSEEventType.DONE,
-                    data=done_data,
-                )
-                yield done_event.to_sse()
-                break
-
-            await asyncio.sleep(0.5)
+                    }
+                    if current.result is not None:
+                        done_data["result"] = current.result
+                    if current.error is not None:
+                        done_data["error"] = current.error
+
+                    done_event = SSEEvent(
+                        event=SSEEventType.DONE,
+                        data=done_data,
+                    )
+                    yield done_event.to_sse()
+                    break
+        finally:
+            if subscription is not None:
+                subscription.close()
 
     return StreamingResponse(
         _event_generator(),
@@ -223,6 +247,24 @@ async def stream_job_progress(
 # Helpers
 # ---------------------------------------------------------------------------
 
+# Database poll interval for job streams, without and with a progress hub.
+_POLL_SECONDS = 0.5
+_HUB_POLL_SECONDS = 2.0
+
+
+def _job_to_progress(job: Job) -> dict:
+    return {
+        "job_id": job.id,
+        "job_type": job.job_type,
+        "status": job.status.value,
+        "progress_pct": job.progress_pct,
+        "progress_message": job.progress_message,
+    }
+
+
+def _progress_event(data: dict) -> SSEEvent:
+    return SSEEvent(event=SSEEventType.JOB_PROGRESS, data=data)
+
 
 def _job_to_dict(job: Job) -> dict:
     """Convert a Job domain model to a JSON-friendly dict."""
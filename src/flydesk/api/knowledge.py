@@ -54,6 +54,7 @@ from flydesk.api.deps import (
     get_knowledge_indexer,
 )
 from flydesk.knowledge.graph import KnowledgeGraph
+from flydesk.knowledge.graph_query import DEFAULT_PATH_FANOUT
 from flydesk.knowledge.importer import KnowledgeImporter
 from flydesk.knowledge.indexer import KnowledgeIndexer
 from flydesk.knowledge.models import DocumentType, KnowledgeDocument
@@ -175,6 +176,13 @@ class NeighborhoodResponse(BaseModel):
     relations: list[RelationResponse]
 
 
+class GraphPathResponse(BaseModel):
+    """API response for one path between two graph entities."""
+
+    entity_ids: list[str]
+    relations: list[RelationResponse]
+
+
 class GraphStatsResponse(BaseModel):
     """API response for graph statistics."""
 
@@ -218,6 +226,12 @@ def _strip_content(doc: KnowledgeDocument) -> dict[str, Any]:
     return data
 
 
+def _submitter(request: Request) -> str | None:
+    """User id used to share the job queue fairly between submitters."""
+    user_session = getattr(request.state, "user_session", None)
+    return user_session.user_id if user_session is not None else None
+
+
 # ---------------------------------------------------------------------------
 # Document Routes
 # ---------------------------------------------------------------------------
@@ -225,11 +239,22 @@ def _strip_content(doc: KnowledgeDocument) -> dict[str, Any]:
 
 @router.get("/documents", dependencies=[KnowledgeRead])
 async def list_documents(
-    store: DocStore, workspace_id: str | None = Query(default=None)
+    store: DocStore,
+    response: Response,
+    workspace_id: str | None = Query(default=None),
+    limit: int | None = Query(default=None, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
 ) -> list[dict[str, Any]]:
-    """List all knowledge documents (metadata only, content excluded)."""
-    documents = await store.list_documents(workspace_id=workspace_id)
-    return [_strip_content(d) for d in documents]
+    """List knowledge documents (metadata only, content excluded).
+
+    Without *limit* every document is returned; the total number of
+    matching documents is sent in the ``X-Total-Count`` header.
+    """
+    documents, total = await store.list_document_summaries(
+        workspace_id=workspace_id, limit=limit, offset=offset
+    )
+    response.headers["X-Total-Count"] = str(total)
+    return [d.model_dump(mode="json") for d in documents]
 
 
 @router.get("/documents/{document_id}", dependencies=[KnowledgeRead])
@@ -408,7 +433,7 @@ async def reindex_all(request: Request) -> dict[str, Any]:
     if job_runner is None:
         raise HTTPException(status_code=503, detail="Job runner not available")
     try:
-        job = await job_runner.submit("reindex", {})
+        job = await job_runner.submit("reindex", {}, submitter=_submitter(request))
     except ValueError as exc:
         raise HTTPException(status_code=503, detail=str(exc))
     return {"job_id": job.id, "status": job.status.value}
@@ -579,9 +604,17 @@ async def get_entity_neighborhood(
     entity_id: str,
     graph: Graph,
     depth: int = Query(default=1, ge=1, le=3),
+    relation_type: list[str] | None = Query(
+        default=None, description="Only follow relations of these types"
+    ),
+    max_fanout: int | None = Query(
+        default=None, ge=1, le=500, description="Max relations followed per entity and hop"
+    ),
 ) -> NeighborhoodResponse:
     """Get an entity and its neighbors up to the specified depth."""
-    neighborhood = await graph.get_entity_neighborhood(entity_id, depth=depth)
+    neighborhood = await graph.get_entity_neighborhood(
+        entity_id, depth=depth, relation_types=relation_type, max_fanout=max_fanout
+    )
     if not neighborhood.entities:
         raise HTTPException(
             status_code=404, detail=f"Entity {entity_id} not found"
@@ -595,6 +628,42 @@ async def get_entity_neighborhood(
     )
 
 
+@router.get("/graph/paths", dependencies=[KnowledgeRead])
+async def find_graph_paths(
+    graph: Graph,
+    source: str = Query(description="Start entity ID"),
+    target: str = Query(description="End entity ID"),
+    max_depth: int = Query(default=3, ge=1, le=5),
+    relation_type: list[str] | None = Query(
+        default=None, description="Only follow relations of these types"
+    ),
+    max_fanout: int = Query(
+        default=DEFAULT_PATH_FANOUT, ge=1, le=50,
+        description="Max relations followed per entity and hop",
+    ),
+    limit: int = Query(default=10, ge=1, le=50),
+) -> list[GraphPathResponse]:
+    """Find the shortest paths between two entities."""
+    paths = await graph.find_paths(
+        source,
+        target,
+        max_depth=max_depth,
+        relation_types=relation_type,
+        max_fanout=max_fanout,
+        limit=limit,
+    )
+    return [
+        GraphPathResponse(
+            entity_ids=p.entity_ids,
+            relations=[
+                RelationResponse(**asdict(r), label=_relation_label(r.relation_type))
+                for r in p.relations
+            ],
+        )
+        for p in paths
+    ]
+
+
 @router.post("/graph/entities", status_code=201, dependencies=[KnowledgeWrite])
 async def create_entity(body: EntityCreate, graph: Graph) -> EntityResponse:
     """Manually create a knowledge graph entity."""
@@ -695,7 +764,26 @@ async def trigger_kg_recompute(request: Request) -> dict:
             detail="KG extractor not available — ensure an LLM provider is configured",
         )
     try:
-        job = await job_runner.submit("kg_recompute", {})
+        job = await job_runner.submit("kg_recompute", {}, submitter=_submitter(request))
+    except ValueError as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+    return {"job_id": job.id, "status": job.status.value}
+
+
+@router.post("/graph/compact", dependencies=[KnowledgeWrite])
+async def trigger_kg_compact(request: Request) -> dict:
+    """Trigger a background job that merges duplicate graph entities.
+
+    Entities of the same type with the same normalised name, a shared
+    alias, or near-identical embeddings are folded into one canonical
+    entity and their relations rewired.  Returns a job ID for progress
+    tracking.
+    """
+    job_runner = getattr(request.app.state, "job_runner", None)
+    if job_runner is None:
+        raise HTTPException(status_code=503, detail="Job runner not available")
+    try:
+        job = await job_runner.submit("kg_compact", {}, submitter=_submitter(request))
     except ValueError as exc:
         raise HTTPException(status_code=503, detail=str(exc))
     return {"job_id": job.id, "status": job.status.value}
@@ -52,6 +52,7 @@ class DiscoverRequest(BaseModel):
     """Body for triggering process discovery."""
 
     trigger: str = ""
+    full: bool = False  # re-analyse everything, not just what changed
 
 
 class StepUpdate(BaseModel):
@@ -313,6 +314,7 @@ async def trigger_discovery(request: Request, body: DiscoverRequest | None = Non
         trigger, job_runner,
         workspace_ids=workspace_ids or None,
         document_types=document_types or None,
+        full=bool(body and body.full),
     )
     return {"job_id": job.id, "status": job.status.value, "progress_pct": job.progress_pct}
 
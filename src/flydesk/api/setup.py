@@ -1614,19 +1614,22 @@ async def clear_seed_data(request: Request) -> SeedResult:
         # ------------------------------------------------------------------
         # 2. Clear KG entities & relations
         # ------------------------------------------------------------------
-        from sqlalchemy import delete
-
-        from flydesk.models.knowledge import EntityRow, RelationRow
+        # Through the graph, so its traversal snapshot is dropped as well.
+        from flydesk.api.knowledge import get_knowledge_graph
 
-        async with session_factory() as session:
-            await session.execute(delete(RelationRow))
-            await session.execute(delete(EntityRow))
-            await session.commit()
+        graph_fn = request.app.dependency_overrides.get(
+            get_knowledge_graph, get_knowledge_graph
+        )
+        await graph_fn().clear()
         cleared.append("knowledge graph (entities + relations)")
 
         # ------------------------------------------------------------------
         # 3. Clear business processes (dependencies -> steps -> processes)
+        #    and the discovery fingerprints, so discovery starts from scratch
         # ------------------------------------------------------------------
+        from sqlalchemy import delete
+
+        from flydesk.models.discovery import DiscoveryFingerprintRow
         from flydesk.models.process import (
             BusinessProcessRow,
             ProcessDependencyRow,
@@ -1637,6 +1640,7 @@ async def clear_seed_data(request: Request) -> SeedResult:
             await session.execute(delete(ProcessDependencyRow))
             await session.execute(delete(ProcessStepRow))
             await session.execute(delete(BusinessProcessRow))
+            await session.execute(delete(DiscoveryFingerprintRow))
             await session.commit()
         cleared.append("business processes")
 
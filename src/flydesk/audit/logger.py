@@ -10,15 +10,17 @@
 
 from __future__ import annotations
 
+import base64
 import json
 import logging
 import re
+from collections.abc import AsyncGenerator
 from datetime import datetime, timezone
 from typing import Any
 
 _logger = logging.getLogger(__name__)
 
-from sqlalchemy import select
+from sqlalchemy import Select, and_, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from flydesk.audit.models import AuditEvent
@@ -35,6 +37,28 @@ def _to_json(value: Any) -> str | None:
         return None
     return json.dumps(value, default=str)
 
+
+def encode_cursor(timestamp: datetime, event_id: str) -> str:
+    """Return the opaque pagination cursor pointing just past an event."""
+    raw = json.dumps([timestamp.isoformat(), event_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Parse a cursor from :func:`encode_cursor`; raises ``ValueError`` if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, event_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        created_at = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError, UnicodeError) as exc:
+        raise ValueError(f"Invalid audit cursor: {cursor!r}") from exc
+    if not isinstance(event_id, str):
+        raise ValueError(f"Invalid audit cursor: {cursor!r}")
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at, event_id
+
+
 # Patterns for PII sanitization
 _EMAIL_PATTERN = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
 _PHONE_PATTERN = re.compile(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b')
@@ -70,7 +94,10 @@ class AuditLogger:
     async def get_event(self, event_id: str) -> AuditEvent | None:
         """Retrieve a single audit event by ID."""
         async with self._session_factory() as session:
-            row = await session.get(AuditEventRow, event_id)
+            result = await session.execute(
+                select(AuditEventRow).where(AuditEventRow.id == event_id)
+            )
+            row = result.scalars().first()
             if row is None:
                 return None
             return self._row_to_event(row)
@@ -86,40 +113,120 @@ class AuditLogger:
         conversation_id: str | None = None,
         limit: int = 50,
         offset: int = 0,
+        cursor: str | None = None,
     ) -> list[AuditEvent]:
-        """Query audit events with optional filters."""
+        """Query audit events with optional filters, newest first.
+
+        Pass the :func:`encode_cursor` value of the last event of a page as
+        *cursor* to continue after it; unlike *offset*, the cost of a page
+        does not grow with its depth.  Raises ``ValueError`` for a
+        malformed cursor.
+
+        ``date_from``/``date_to`` and the cursor bound ``created_at``, so on
+        PostgreSQL only the monthly partitions in range are scanned.
+        """
+        stmt = self._select(
+            user_id=user_id,
+            event_type=event_type,
+            risk_level=risk_level,
+            date_from=date_from,
+            date_to=date_to,
+            conversation_id=conversation_id,
+            after=decode_cursor(cursor) if cursor else None,
+        )
+        if offset > 0:
+            stmt = stmt.offset(offset)
+        stmt = stmt.limit(limit)
         async with self._session_factory() as session:
-            stmt = select(AuditEventRow).order_by(AuditEventRow.created_at.desc())
-            if user_id:
-                stmt = stmt.where(AuditEventRow.user_id == user_id)
-            if event_type:
-                stmt = stmt.where(AuditEventRow.event_type == event_type)
-            if risk_level:
-                stmt = stmt.where(AuditEventRow.risk_level == risk_level)
-            if conversation_id:
-                stmt = stmt.where(AuditEventRow.conversation_id == conversation_id)
-            if date_from:
-                try:
-                    dt_from = datetime.fromisoformat(date_from)
-                    if dt_from.tzinfo is None:
-                        dt_from = dt_from.replace(tzinfo=timezone.utc)
-                    stmt = stmt.where(AuditEventRow.created_at >= dt_from)
-                except (ValueError, TypeError):
-                    _logger.warning("Ignoring malformed date_from filter: %r", date_from)
-            if date_to:
-                try:
-                    dt_to = datetime.fromisoformat(date_to)
-                    if dt_to.tzinfo is None:
-                        dt_to = dt_to.replace(tzinfo=timezone.utc)
-                    stmt = stmt.where(AuditEventRow.created_at <= dt_to)
-                except (ValueError, TypeError):
-                    _logger.warning("Ignoring malformed date_to filter: %r", date_to)
-            if offset > 0:
-                stmt = stmt.offset(offset)
-            stmt = stmt.limit(limit)
             result = await session.execute(stmt)
             return [self._row_to_event(r) for r in result.scalars().all()]
 
+    async def iter_events(
+        self,
+        *,
+        user_id: str | None = None,
+        event_type: str | None = None,
+        risk_level: str | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        conversation_id: str | None = None,
+        batch_size: int = 500,
+    ) -> AsyncGenerator[AuditEvent, None]:
+        """Yield every matching event, newest first, *batch_size* rows per query.
+
+        Pages are read by keyset, so memory use is bounded by one batch and
+        no connection is held while the consumer processes a batch.
+        """
+        after: tuple[datetime, str] | None = None
+        while True:
+            stmt = self._select(
+                user_id=user_id,
+                event_type=event_type,
+                risk_level=risk_level,
+                date_from=date_from,
+                date_to=date_to,
+                conversation_id=conversation_id,
+                after=after,
+            ).limit(batch_size)
+            async with self._session_factory() as session:
+                rows = (await session.execute(stmt)).scalars().all()
+            for row in rows:
+                yield self._row_to_event(row)
+            if len(rows) < batch_size:
+                return
+            after = (rows[-1].created_at, rows[-1].id)
+
+    @staticmethod
+    def _select(
+        *,
+        user_id: str | None,
+        event_type: str | None,
+        risk_level: str | None,
+        date_from: str | None,
+        date_to: str | None,
+        conversation_id: str | None,
+        after: tuple[datetime, str] | None,
+    ) -> Select:
+        stmt = select(AuditEventRow).order_by(
+            AuditEventRow.created_at.desc(), AuditEventRow.id.desc()
+        )
+        if user_id:
+            stmt = stmt.where(AuditEventRow.user_id == user_id)
+        if event_type:
+            stmt = stmt.where(AuditEventRow.event_type == event_type)
+        if risk_level:
+            stmt = stmt.where(AuditEventRow.risk_level == risk_level)
+        if conversation_id:
+            stmt = stmt.where(AuditEventRow.conversation_id == conversation_id)
+        if date_from:
+            try:
+                dt_from = datetime.fromisoformat(date_from)
+                if dt_from.tzinfo is None:
+                    dt_from = dt_from.replace(tzinfo=timezone.utc)
+                stmt = stmt.where(AuditEventRow.created_at >= dt_from)
+            except (ValueError, TypeError):
+                _logger.warning("Ignoring malformed date_from filter: %r", date_from)
+        if date_to:
+            try:
+                dt_to = datetime.fromisoformat(date_to)
+                if dt_to.tzinfo is None:
+                    dt_to = dt_to.replace(tzinfo=timezone.utc)
+                stmt = stmt.where(AuditEventRow.created_at <= dt_to)
+            except (ValueError, TypeError):
+                _logger.warning("Ignoring malformed date_to filter: %r", date_to)
+        if after is not None:
+            created_at, event_id = after
+            stmt = stmt.where(
+                # Redundant with the keyset test, but a plain bound on the
+                # partition key lets PostgreSQL prune newer partitions.
+                AuditEventRow.created_at <= created_at,
+                or_(
+                    AuditEventRow.created_at < created_at,
+                    and_(AuditEventRow.created_at == created_at, AuditEventRow.id < event_id),
+                )
+            )
+        return stmt
+
     @classmethod
     def _sanitize(cls, data: dict[str, Any]) -> dict[str, Any]:
         """Sanitize PII from audit detail data."""
@@ -0,0 +1,268 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""Audit event retention and time partitioning.
+
+On PostgreSQL ``audit_events`` is range-partitioned by month on
+``created_at``.  :class:`AuditRetention` keeps the partitions for the next
+few months created ahead of the insert stream, and -- when
+``audit_retention_enabled`` is set -- enforces ``audit_retention_days`` by detaching and dropping whole partitions once
+every row in them has expired -- no large ``DELETE`` bloats the table or
+its indexes.  A default partition catches rows outside every monthly
+range; expired rows there are deleted in batches.
+
+Other databases (SQLite) and unpartitioned PostgreSQL tables fall back to
+deleting expired rows in small batches, one short transaction each.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import column, delete, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from flydesk.models.audit import AuditEventRow
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "audit_events"
+DEFAULT_PARTITION = "audit_events_default"
+_PARTITION_NAME = re.compile(r"^audit_events_p(\d{4})(\d{2})$")
+
+
+# ---------------------------------------------------------------------------
+# Partition naming
+# ---------------------------------------------------------------------------
+
+
+def month_start(value: datetime) -> datetime:
+    """Return the start (UTC) of the month containing *value*."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    value = value.astimezone(timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """Shift a :func:`month_start` value by *months*."""
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    """Return the name of the partition holding *month*."""
+    return f"{PARENT_TABLE}_p{month.year:04d}{month.month:02d}"
+
+
+def partition_month(name: str) -> datetime | None:
+    """Inverse of :func:`partition_name`; ``None`` for other tables."""
+    match = _PARTITION_NAME.match(name)
+    if match is None:
+        return None
+    return datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc)
+
+
+def partition_ddl(month: datetime) -> str:
+    """Return the ``CREATE TABLE`` statement for the partition of *month*."""
+    start = month_start(month)
+    end = add_months(start, 1)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(start)} PARTITION OF {PARENT_TABLE} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def expired_partitions(names: Iterable[str], cutoff: datetime) -> list[str]:
+    """Return the monthly partitions among *names* holding only rows before *cutoff*."""
+    expired = []
+    for name in names:
+        month = partition_month(name)
+        if month is not None and add_months(month, 1) <= cutoff:
+            expired.append(name)
+    return sorted(expired)
+
+
+# ---------------------------------------------------------------------------
+# Retention
+# ---------------------------------------------------------------------------
+
+
+class AuditRetention:
+    """Maintain audit partitions and remove events older than the retention.
+
+    Parameters
+    ----------
+    retention_days:
+        Age after which events are removed; ``0`` (the default) keeps
+        them forever.
+    interval_seconds:
+        How often the background job started by :meth:`start` runs.
+    months_ahead:
+        Monthly partitions kept created beyond the current month.
+    batch_size:
+        Rows deleted per transaction where whole partitions cannot be
+        dropped.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        retention_days: int = 0,
+        interval_seconds: int = 3600,
+        months_ahead: int = 3,
+        batch_size: int = 500,
+    ) -> None:
+        self._session_factory = session_factory
+        self._retention = timedelta(days=retention_days) if retention_days > 0 else None
+        self._interval = interval_seconds
+        self._months_ahead = months_ahead
+        self._batch_size = batch_size
+        self._running = False
+        self._task: asyncio.Task | None = None
+
+    # -- Background job --
+
+    async def start(self) -> None:
+        # Partitions must exist before the first event is written.
+        try:
+            await self.ensure_partitions()
+        except Exception:
+            logger.exception("Failed to create audit partitions")
+        self._running = True
+        self._task = asyncio.create_task(self._loop())
+        logger.info("Audit retention started (interval=%ds)", self._interval)
+
+    async def stop(self) -> None:
+        self._running = False
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self) -> None:
+        while self._running:
+            try:
+                await self.run()
+            except asyncio.CancelledError:
+                break
+            except Exception:
+                logger.exception("Audit retention failed")
+            await asyncio.sleep(self._interval)
+
+    # -- Maintenance --
+
+    async def run(self, now: datetime | None = None) -> None:
+        """Create upcoming partitions and remove expired events."""
+        now = now or datetime.now(timezone.utc)
+        partitioned = await self.ensure_partitions(now)
+        if self._retention is None:
+            return
+        cutoff = now - self._retention
+        if partitioned:
+            await self.drop_expired_partitions(cutoff)
+            deleted = await self.delete_expired(cutoff, table_name=DEFAULT_PARTITION)
+        else:
+            deleted = await self.delete_expired(cutoff)
+        if deleted:
+            logger.info("Deleted %d audit events older than %s", deleted, cutoff)
+
+    async def ensure_partitions(self, now: datetime | None = None) -> bool:
+        """Create the monthly partitions up to ``months_ahead`` months out.
+
+        Returns whether ``audit_events`` is partitioned; without
+        partitioning there is nothing to create.
+        """
+        async with self._session_factory() as session:
+            if not await self._is_partitioned(session):
+                return False
+            await session.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} "
+                    f"PARTITION OF {PARENT_TABLE} DEFAULT"
+                )
+            )
+            first = month_start(now or datetime.now(timezone.utc))
+            for offset in range(self._months_ahead + 1):
+                await session.execute(text(partition_ddl(add_months(first, offset))))
+            await session.commit()
+        return True
+
+    async def drop_expired_partitions(self, cutoff: datetime) -> list[str]:
+        """Detach and drop monthly partitions whose range ends before *cutoff*."""
+        async with self._session_factory() as session:
+            result = await session.execute(
+                text(
+                    "SELECT c.relname FROM pg_inherits i "
+                    "JOIN pg_class c ON c.oid = i.inhrelid "
+                    "WHERE i.inhparent = to_regclass(:parent)"
+                ),
+                {"parent": PARENT_TABLE},
+            )
+            names = expired_partitions(result.scalars().all(), cutoff)
+        for name in names:
+            # Detach first so the parent is locked only for the catalog
+            # update, not while the partition's files are removed.
+            async with self._session_factory() as session:
+                await session.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+                await session.commit()
+            async with self._session_factory() as session:
+                await session.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                await session.commit()
+            logger.info("Dropped expired audit partition %s", name)
+        return names
+
+    async def delete_expired(self, cutoff: datetime, *, table_name: str | None = None) -> int:
+        """Delete events created before *cutoff*, ``batch_size`` rows per transaction.
+
+        *table_name* restricts the deletion to one partition.  Returns the
+        number of rows deleted.
+        """
+        target: Any = (
+            table(table_name, column("id"), column("created_at"))
+            if table_name is not None
+            else AuditEventRow.__table__
+        )
+        deleted = 0
+        while True:
+            async with self._session_factory() as session:
+                ids = (
+                    await session.execute(
+                        select(target.c.id)
+                        .where(target.c.created_at < cutoff)
+                        .limit(self._batch_size)
+                    )
+                ).scalars().all()
+                if not ids:
+                    return deleted
+                await session.execute(delete(target).where(target.c.id.in_(ids)))
+                await session.commit()
+            deleted += len(ids)
+            if len(ids) < self._batch_size:
+                return deleted
+            # Let inserts and other tasks through between batches.
+            await asyncio.sleep(0)
+
+    @staticmethod
+    async def _is_partitioned(session: AsyncSession) -> bool:
+        if session.get_bind().dialect.name != "postgresql":
+            return False
+        result = await session.execute(
+            text(
+                "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+                "WHERE partrelid = to_regclass(:parent))"
+            ),
+            {"parent": PARENT_TABLE},
+        )
+        return bool(result.scalar())
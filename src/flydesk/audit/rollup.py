@@ -0,0 +1,444 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""Hourly usage rollups for dashboard analytics.
+
+Audit events and chat messages are aggregated per UTC hour into
+``usage_rollups``, keyed by source, event type, tool, user, model and
+workspace.  A background job advances a watermark over closed hours;
+queries read the rollups up to the watermark and aggregate only the raw
+rows around it (the partial hour at the start of the range and the tail
+since the watermark), so dashboard cost no longer grows with history.
+
+Daily figures are sums of hourly buckets -- a 30-day range reads at most
+720 buckets per dimension combination.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, fields
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from flydesk.models.audit import AuditEventRow
+from flydesk.models.conversation import ConversationRow, MessageRow
+from flydesk.models.usage import UsageRollupRow, UsageRollupStateRow
+
+logger = logging.getLogger(__name__)
+
+# Audit event types whose detail carries token usage.
+TOKEN_EVENT_TYPES = ("agent_response", "discovery_response")
+
+SOURCE_AUDIT = "audit"
+SOURCE_MESSAGES = "messages"
+SOURCE_CONVERSATIONS = "conversations"
+
+# Dimensions a summary can be grouped by.  "day" groups hourly buckets by date.
+DIMENSIONS = ("day", "event_type", "tool", "user_id", "model", "workspace_id")
+
+_STATE_NAME = "usage"
+# Hours are rolled up only once they closed this long ago, so rows from
+# transactions still in flight at the hour boundary are not missed.
+_SETTLE = timedelta(minutes=5)
+# Raw rows aggregated per rollup transaction.
+_ROLLUP_WINDOW = timedelta(days=1)
+# Values per ``IN (...)`` clause.
+_IN_CHUNK = 500
+
+
+# ---------------------------------------------------------------------------
+# Counters
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class UsageCounts:
+    """Summed counters for one group of a usage summary."""
+
+    event_count: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+
+    def add(self, other: UsageCounts) -> None:
+        self.event_count += other.event_count
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.cost_usd += other.cost_usd
+
+
+@dataclass(frozen=True)
+class _Key:
+    bucket: datetime
+    source: str
+    event_type: str = ""
+    tool: str = ""
+    user_id: str = ""
+    model: str = ""
+    workspace_id: str = ""
+
+    def project(self, dimensions: Sequence[str]) -> tuple[str, ...]:
+        return tuple(
+            self.bucket.date().isoformat() if dim == "day" else getattr(self, dim)
+            for dim in dimensions
+        )
+
+
+_KEY_COLUMNS = [f.name for f in fields(_Key)]
+
+
+def _aware(value: datetime) -> datetime:
+    """SQLite returns naive datetimes; all stored times are UTC."""
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def floor_hour(value: datetime) -> datetime:
+    """Return the start of the hour containing *value*."""
+    return _aware(value).replace(minute=0, second=0, microsecond=0)
+
+
+def _ceil_hour(value: datetime) -> datetime:
+    floored = floor_hour(value)
+    return floored if floored == _aware(value) else floored + timedelta(hours=1)
+
+
+def _parse_detail(raw: Any) -> dict[str, Any]:
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except (json.JSONDecodeError, TypeError):
+            return {}
+    return raw if isinstance(raw, dict) else {}
+
+
+def _int(value: Any) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _float(value: Any) -> float:
+    try:
+        return float(value or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+# ---------------------------------------------------------------------------
+# Raw aggregation
+# ---------------------------------------------------------------------------
+
+
+async def _aggregate_raw(
+    session: AsyncSession,
+    start: datetime,
+    end: datetime,
+    sources: Iterable[str],
+) -> dict[_Key, UsageCounts]:
+    """Aggregate raw rows created in ``[start, end)`` into hourly keys."""
+    wanted = set(sources)
+    counts: dict[_Key, UsageCounts] = {}
+
+    def _bump(key: _Key, **values: Any) -> None:
+        counter = counts.setdefault(key, UsageCounts())
+        counter.event_count += 1
+        counter.input_tokens += values.get("input_tokens", 0)
+        counter.output_tokens += values.get("output_tokens", 0)
+        counter.cost_usd += values.get("cost_usd", 0.0)
+
+    if SOURCE_AUDIT in wanted:
+        # Only token-bearing events need their detail loaded.
+        detail = case(
+            (AuditEventRow.event_type.in_(TOKEN_EVENT_TYPES), AuditEventRow.detail),
+            else_=None,
+        )
+        result = await session.execute(
+            select(
+                AuditEventRow.created_at,
+                AuditEventRow.event_type,
+                AuditEventRow.user_id,
+                AuditEventRow.action,
+                detail,
+            ).where(AuditEventRow.created_at >= start, AuditEventRow.created_at < end)
+        )
+        for created_at, event_type, user_id, action, raw_detail in result.all():
+            data = _parse_detail(raw_detail) if raw_detail is not None else {}
+            key = _Key(
+                bucket=floor_hour(created_at),
+                source=SOURCE_AUDIT,
+                event_type=event_type,
+                tool=action if event_type == "tool_call" else "",
+                user_id=user_id or "",
+                model=str(data.get("model") or ""),
+                workspace_id=str(data.get("workspace_id") or ""),
+            )
+            _bump(
+                key,
+                input_tokens=_int(data.get("input_tokens")),
+                output_tokens=_int(data.get("output_tokens")),
+                cost_usd=_float(data.get("cost_usd")),
+            )
+
+    if wanted & {SOURCE_MESSAGES, SOURCE_CONVERSATIONS}:
+        result = await session.execute(
+            select(MessageRow.created_at, MessageRow.conversation_id, ConversationRow.user_id)
+            .outerjoin(ConversationRow, ConversationRow.id == MessageRow.conversation_id)
+            .where(MessageRow.created_at >= start, MessageRow.created_at < end)
+        )
+        first_seen: dict[str, tuple[datetime, str]] = {}
+        for created_at, conversation_id, user_id in result.all():
+            bucket = floor_hour(created_at)
+            if SOURCE_MESSAGES in wanted:
+                _bump(_Key(bucket=bucket, source=SOURCE_MESSAGES, user_id=user_id or ""))
+            seen = first_seen.get(conversation_id)
+            if seen is None or bucket < seen[0]:
+                first_seen[conversation_id] = (bucket, user_id or "")
+
+        if SOURCE_CONVERSATIONS in wanted and first_seen:
+            # A conversation counts in the hour of its first message.
+            ids = sorted(first_seen)
+            for offset in range(0, len(ids), _IN_CHUNK):
+                older = await session.execute(
+                    select(MessageRow.conversation_id)
+                    .where(
+                        MessageRow.conversation_id.in_(ids[offset : offset + _IN_CHUNK]),
+                        MessageRow.created_at < start,
+                    )
+                    .distinct()
+                )
+                for conversation_id in older.scalars():
+                    first_seen.pop(conversation_id, None)
+            for bucket, user_id in first_seen.values():
+                _bump(_Key(bucket=bucket, source=SOURCE_CONVERSATIONS, user_id=user_id))
+
+    return counts
+
+
+# ---------------------------------------------------------------------------
+# Rollups
+# ---------------------------------------------------------------------------
+
+
+class UsageRollups:
+    """Maintain and query hourly usage rollups.
+
+    Parameters
+    ----------
+    interval_seconds:
+        How often the background job started by :meth:`start` rolls up
+        newly closed hours.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        interval_seconds: int = 300,
+    ) -> None:
+        self._session_factory = session_factory
+        self._interval = interval_seconds
+        self._running = False
+        self._task: asyncio.Task | None = None
+
+    # -- Background job --
+
+    async def start(self) -> None:
+        self._running = True
+        self._task = asyncio.create_task(self._loop())
+        logger.info("Usage rollups started (interval=%ds)", self._interval)
+
+    async def stop(self) -> None:
+        self._running = False
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self) -> None:
+        while self._running:
+            try:
+                await self.roll_up()
+            except asyncio.CancelledError:
+                break
+            except Exception:
+                logger.exception("Usage rollup failed")
+            await asyncio.sleep(self._interval)
+
+    # -- Maintenance --
+
+    async def roll_up(self, now: datetime | None = None) -> int:
+        """Roll raw rows of closed hours into ``usage_rollups``.
+
+        Each window is written in the same transaction that advances the
+        watermark, and the watermark row is locked while doing so, so
+        concurrent replicas never count an hour twice.  Returns the number
+        of hours rolled up.
+        """
+        target = floor_hour((now or datetime.now(timezone.utc)) - _SETTLE)
+        hours = 0
+        while True:
+            async with self._session_factory() as session:
+                state = await session.get(UsageRollupStateRow, _STATE_NAME, with_for_update=True)
+                if state is not None:
+                    start = _aware(state.rolled_up_to)
+                else:
+                    start = await self._earliest(session) or target
+                if start >= target:
+                    if state is None:
+                        session.add(UsageRollupStateRow(name=_STATE_NAME, rolled_up_to=target))
+                        await session.commit()
+                    return hours
+
+                end = min(start + _ROLLUP_WINDOW, target)
+                counts = await _aggregate_raw(
+                    session, start, end, (SOURCE_AUDIT, SOURCE_MESSAGES, SOURCE_CONVERSATIONS)
+                )
+                session.add_all(
+                    UsageRollupRow(
+                        **{name: getattr(key, name) for name in _KEY_COLUMNS},
+                        event_count=counter.event_count,
+                        input_tokens=counter.input_tokens,
+                        output_tokens=counter.output_tokens,
+                        cost_usd=round(counter.cost_usd, 6),
+                    )
+                    for key, counter in counts.items()
+                )
+                if state is None:
+                    session.add(UsageRollupStateRow(name=_STATE_NAME, rolled_up_to=end))
+                else:
+                    state.rolled_up_to = end
+                await session.commit()
+            hours += int((end - start) / timedelta(hours=1))
+            logger.debug("Rolled up usage for %s .. %s (%d groups)", start, end, len(counts))
+
+    @staticmethod
+    async def _earliest(session: AsyncSession) -> datetime | None:
+        candidates = [
+            (await session.execute(select(func.min(AuditEventRow.created_at)))).scalar(),
+            (await session.execute(select(func.min(MessageRow.created_at)))).scalar(),
+        ]
+        present = [_aware(value) for value in candidates if value is not None]
+        return floor_hour(min(present)) if present else None
+
+    async def watermark(self) -> datetime | None:
+        """Return the time up to which raw rows are reflected in the rollups."""
+        async with self._session_factory() as session:
+            state = await session.get(UsageRollupStateRow, _STATE_NAME)
+            return _aware(state.rolled_up_to) if state is not None else None
+
+    # -- Queries --
+
+    async def summarize(
+        self,
+        source: str,
+        dimensions: Sequence[str] = (),
+        *,
+        since: datetime | None = None,
+        event_types: Sequence[str] | None = None,
+        now: datetime | None = None,
+    ) -> dict[tuple[str, ...], UsageCounts]:
+        """Sum usage of *source* since *since*, grouped by *dimensions*.
+
+        Returns ``{dimension values: counts}``; with no dimensions the only
+        key is ``()``.  Buckets before the watermark come from the rollups,
+        the rest from the raw tables.
+        """
+        unknown = set(dimensions) - set(DIMENSIONS)
+        if unknown:
+            msg = f"Unknown usage dimensions: {sorted(unknown)}"
+            raise ValueError(msg)
+        now = _aware(now or datetime.now(timezone.utc))
+        since = _aware(since) if since is not None else None
+        wanted_types = set(event_types) if event_types is not None else None
+
+        summary: dict[tuple[str, ...], UsageCounts] = {}
+
+        def _merge(group: tuple[str, ...], counter: UsageCounts) -> None:
+            summary.setdefault(group, UsageCounts()).add(counter)
+
+        async with self._session_factory() as session:
+            state = await session.get(UsageRollupStateRow, _STATE_NAME)
+            watermark = _aware(state.rolled_up_to) if state is not None else None
+
+            raw_ranges: list[tuple[datetime, datetime]] = []
+            if watermark is None or (since is not None and since >= watermark):
+                raw_ranges.append((since or datetime.min.replace(tzinfo=timezone.utc), now))
+            else:
+                rolled_from = _ceil_hour(since) if since is not None else None
+                if since is not None and since < min(rolled_from, watermark):
+                    raw_ranges.append((since, min(rolled_from, watermark)))
+                raw_ranges.append((watermark, now))
+                for group, counter in await self._read_rollups(
+                    session, source, dimensions, rolled_from, watermark, event_types
+                ):
+                    _merge(group, counter)
+
+            for start, end in raw_ranges:
+                if start >= end:
+                    continue
+                for key, counter in (await _aggregate_raw(session, start, end, (source,))).items():
+                    if key.source != source:
+                        continue
+                    if wanted_types is not None and key.event_type not in wanted_types:
+                        continue
+                    _merge(key.project(dimensions), counter)
+
+        return summary
+
+    @staticmethod
+    async def _read_rollups(
+        session: AsyncSession,
+        source: str,
+        dimensions: Sequence[str],
+        start: datetime | None,
+        end: datetime,
+        event_types: Sequence[str] | None,
+    ) -> list[tuple[tuple[str, ...], UsageCounts]]:
+        columns = [
+            func.date(UsageRollupRow.bucket) if dim == "day" else getattr(UsageRollupRow, dim)
+            for dim in dimensions
+        ]
+        stmt = select(
+            *columns,
+            func.sum(UsageRollupRow.event_count),
+            func.sum(UsageRollupRow.input_tokens),
+            func.sum(UsageRollupRow.output_tokens),
+            func.sum(UsageRollupRow.cost_usd),
+        ).where(UsageRollupRow.source == source, UsageRollupRow.bucket < end)
+        if start is not None:
+            stmt = stmt.where(UsageRollupRow.bucket >= start)
+        if event_types is not None:
+            stmt = stmt.where(UsageRollupRow.event_type.in_(list(event_types)))
+        if columns:
+            stmt = stmt.group_by(*columns)
+
+        rows: list[tuple[tuple[str, ...], UsageCounts]] = []
+        width = len(columns)
+        for row in (await session.execute(stmt)).all():
+            if row[width] is None:
+                continue  # SUM over no rows
+            rows.append(
+                (
+                    tuple(str(value) for value in row[:width]),
+                    UsageCounts(
+                        event_count=_int(row[width]),
+                        input_tokens=_int(row[width + 1]),
+                        output_tokens=_int(row[width + 2]),
+                        cost_usd=_float(row[width + 3]),
+                    ),
+                )
+            )
+        return rows
@@ -15,10 +15,16 @@ from flydesk.models.local_user import LocalUserRow
 
 
 class LocalUserRepository:
-    """CRUD operations for local user accounts."""
+    """CRUD operations for local user accounts.
+
+    Every change to a user's role or active flag bumps :attr:`version`,
+    which callers holding derived data (such as cached user sessions with
+    merged local roles) compare to detect the change.
+    """
 
     def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
         self._session_factory = session_factory
+        self.version = 0
 
     async def create_user(
         self,
@@ -42,6 +48,7 @@ class LocalUserRepository:
             session.add(row)
             await session.commit()
             await session.refresh(row)
+        self.version += 1
         return row
 
     async def get_by_username(self, username: str) -> LocalUserRow | None:
@@ -105,7 +112,8 @@ class LocalUserRepository:
                     setattr(user, key, value)
             await session.commit()
             await session.refresh(user)
-            return user
+        self.version += 1
+        return user
 
     async def deactivate_user(self, user_id: str) -> bool:
         """Set a user's is_active flag to False. Returns True if the user existed."""
@@ -115,7 +123,8 @@ class LocalUserRepository:
                 return False
             user.is_active = False
             await session.commit()
-            return True
+        self.version += 1
+        return True
 
     async def update_password(self, user_id: str, password_hash: str) -> bool:
         """Replace a user's password hash. Returns True if the user existed."""
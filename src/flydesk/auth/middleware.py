@@ -6,15 +6,17 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Any, Callable
 
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from flydesk.auth.models import UserSession
 
@@ -43,12 +45,69 @@ PUBLIC_PATH_PREFIXES = (
 )
 
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    """Extract and validate JWT from Authorization header or cookie."""
+# Resolved sessions are reused for at most this long (and never past the
+# token's own expiry), bounding how stale merged local roles can get.
+_SESSION_CACHE_TTL_SECONDS = 60.0
+_SESSION_CACHE_MAX_ENTRIES = 10_000
+
+
+class _SessionCache:
+    """Bounded LRU of resolved :class:`UserSession` objects keyed by token hash.
+
+    Entries remember the role and local user repository versions they were
+    resolved under, so a role edit or a local user change (deactivation,
+    new role) makes every cached session resolve again.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[UserSession, float, Any]] = OrderedDict()
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, role_version: Any) -> UserSession | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        session, expires_at, version = entry
+        if time.monotonic() >= expires_at or version != role_version:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return session
+
+    def put(self, key: str, session: UserSession, role_version: Any) -> None:
+        if self._ttl <= 0:
+            return
+        remaining = (session.token_expires_at - datetime.now(timezone.utc)).total_seconds()
+        if remaining <= 0:
+            return
+        self._entries[key] = (session, time.monotonic() + min(self._ttl, remaining), role_version)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class AuthMiddleware:
+    """Extract and validate JWT from Authorization header or cookie.
+
+    A pure ASGI middleware, so streaming (SSE) responses are passed through
+    without the buffering and task overhead of ``BaseHTTPMiddleware``.
+    The :class:`UserSession` resolved for a token (claims, merged local
+    roles, permissions and access scopes) is cached by token hash for up
+    to *session_cache_ttl* seconds, never beyond the token's ``exp``;
+    ``0`` disables the cache.
+    """
 
     def __init__(
         self,
-        app: Any,
+        app: ASGIApp,
         *,
         roles_claim: str = "roles",
         permissions_claim: str = "permissions",
@@ -57,8 +116,10 @@ class AuthMiddleware(BaseHTTPMiddleware):
         provider_profile: OIDCProviderProfile | None = None,
         local_jwt_secret: str | None = None,
         oidc_repo: OIDCProviderRepository | None = None,
+        session_cache_ttl: float = _SESSION_CACHE_TTL_SECONDS,
+        session_cache_size: int = _SESSION_CACHE_MAX_ENTRIES,
     ) -> None:
-        super().__init__(app)
+        self.app = app
         self._roles_claim = roles_claim
         self._permissions_claim = permissions_claim
         self._token_decoder = token_decoder
@@ -68,13 +129,31 @@ class AuthMiddleware(BaseHTTPMiddleware):
         self._oidc_repo = oidc_repo
         self._provider_cache: dict[str, tuple[OIDCClient, OIDCProviderProfile, float]] = {}
         self._cache_ttl = 300  # 5 minutes
+        self._sessions = _SessionCache(session_cache_ttl, session_cache_size)
 
-    async def dispatch(self, request: Request, call_next: Any) -> Response:
-        """Process each request, enforcing JWT auth on non-public paths."""
-        # Skip auth for public paths (prefix match)
-        if any(request.url.path.startswith(p) for p in PUBLIC_PATH_PREFIXES):
-            return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Enforce JWT auth on non-public HTTP paths."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
+        # Skip auth for public paths (prefix match)
+        path: str = scope.get("path", "")
+        if any(path.startswith(p) for p in PUBLIC_PATH_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        outcome = await self._authenticate(request)
+        if isinstance(outcome, Response):
+            await outcome(scope, receive, send)
+            return
+
+        request.state.user_session = outcome
+        await self.app(scope, receive, send)
+
+    async def _authenticate(self, request: Request) -> UserSession | Response:
+        """Resolve the request's :class:`UserSession`, or a 401 response."""
         # Lazily resolve oidc_repo from app.state (created in lifespan)
         if self._oidc_repo is None:
             self._oidc_repo = getattr(request.app.state, "oidc_repo", None)
@@ -94,6 +173,18 @@ class AuthMiddleware(BaseHTTPMiddleware):
                 content={"detail": "Missing or invalid Authorization header"},
             )
 
+        role_repo = getattr(request.app.state, "role_repo", None)
+        local_user_repo = getattr(request.app.state, "local_user_repo", None)
+        role_version = (
+            getattr(role_repo, "version", None),
+            getattr(local_user_repo, "version", None),
+        )
+        cache_key = self._sessions.key(token)
+        cached = self._sessions.get(cache_key, role_version)
+        if cached is not None:
+            # Each request still gets its own session id.
+            return cached.model_copy(update={"session_id": str(uuid.uuid4())})
+
         try:
             claims, resolved_profile = await self._decode_token(token)
         except Exception:
@@ -136,7 +227,6 @@ class AuthMiddleware(BaseHTTPMiddleware):
         # Merge local user roles for SSO-authenticated users.
         # Local JWTs already carry the correct role; only OIDC tokens need merging.
         if claims.get("iss") != "flydesk-local":
-            local_user_repo = getattr(request.app.state, "local_user_repo", None)
             if local_user_repo and session.email:
                 local_user = await local_user_repo.get_by_email(session.email)
                 if (
@@ -149,7 +239,6 @@ class AuthMiddleware(BaseHTTPMiddleware):
                     )
 
         # Resolve OIDC roles to local permissions and access scopes via RoleRepository
-        role_repo = getattr(request.app.state, "role_repo", None)
         if role_repo is not None:
             resolved = await role_repo.get_permissions_for_roles(session.roles)
             access_scopes = await role_repo.get_access_scopes_for_roles(session.roles)
@@ -157,8 +246,8 @@ class AuthMiddleware(BaseHTTPMiddleware):
                 update={"permissions": resolved, "access_scopes": access_scopes},
             )
 
-        request.state.user_session = session
-        return await call_next(request)
+        self._sessions.put(cache_key, session, role_version)
+        return session
 
     async def _resolve_oidc_provider(
         self, issuer: str
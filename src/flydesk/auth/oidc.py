@@ -6,6 +6,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import base64
 import hashlib
 import logging
@@ -26,6 +27,10 @@ _ALGORITHMS = ["RS256", "RS384", "RS512", "ES256", "ES384", "ES512"]
 # Cache TTL for the discovery document (1 hour)
 _DISCOVERY_TTL_SECONDS = 3600
 
+# Within this many seconds of the JWKS cache expiring, requests keep using the
+# cached keys while a background task fetches fresh ones.
+_JWKS_REFRESH_AHEAD_SECONDS = 300
+
 
 @dataclass(frozen=True)
 class OIDCDiscoveryDocument:
@@ -58,6 +63,16 @@ class OIDCClient:
     _jwks_cache: tuple[float, dict[str, Any] | None] = field(
         default=(0.0, None), init=False, repr=False
     )
+    # Signing keys parsed from the cached JWKS: (source JWKS, kid -> key)
+    _signing_keys: tuple[dict[str, Any] | None, dict[str, jwt.PyJWK]] = field(
+        default=(None, {}), init=False, repr=False
+    )
+    _jwks_lock: asyncio.Lock = field(
+        default_factory=asyncio.Lock, init=False, repr=False, compare=False
+    )
+    _jwks_refresh: asyncio.Task[None] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     # -- Discovery --
 
@@ -88,21 +103,59 @@ class OIDCClient:
     # -- JWKS --
 
     async def fetch_jwks(self) -> dict[str, Any]:
-        """Fetch the JSON Web Key Set from the JWKS URI."""
-        now = time.monotonic()
-        cached_ts, cached_jwks = self._jwks_cache
-        if cached_jwks is not None and (now - cached_ts) < _DISCOVERY_TTL_SECONDS:
-            return cached_jwks
+        """Fetch the JSON Web Key Set from the JWKS URI, caching for 1 hour.
 
+        Close to expiry the cached keys are still returned while a
+        background task refreshes them, so steady traffic never waits on
+        the issuer.  Concurrent fetches of an empty cache share one request.
+        """
+        cached_ts, cached_jwks = self._jwks_cache
+        if cached_jwks is not None:
+            age = time.monotonic() - cached_ts
+            if age < _DISCOVERY_TTL_SECONDS - _JWKS_REFRESH_AHEAD_SECONDS:
+                return cached_jwks
+            if age < _DISCOVERY_TTL_SECONDS:
+                self._schedule_jwks_refresh()
+                return cached_jwks
+
+        async with self._jwks_lock:
+            # Another request may have fetched the keys while we waited.
+            cached_ts, cached_jwks = self._jwks_cache
+            if cached_jwks is not None and (time.monotonic() - cached_ts) < _DISCOVERY_TTL_SECONDS:
+                return cached_jwks
+            return await self._download_jwks()
+
+    async def _download_jwks(self) -> dict[str, Any]:
         doc = await self.discover()
         async with httpx.AsyncClient() as client:
             resp = await client.get(doc.jwks_uri, timeout=10.0)
             resp.raise_for_status()
             jwks = resp.json()
 
-        self._jwks_cache = (now, jwks)
+        self._jwks_cache = (time.monotonic(), jwks)
         return jwks
 
+    def _schedule_jwks_refresh(self) -> None:
+        if self._jwks_refresh is not None and not self._jwks_refresh.done():
+            return
+        self._jwks_refresh = asyncio.get_running_loop().create_task(self._refresh_jwks())
+
+    async def _refresh_jwks(self) -> None:
+        try:
+            async with self._jwks_lock:
+                await self._download_jwks()
+        except Exception:
+            # Keep serving the cached keys; the next request past expiry retries.
+            logger.warning("Background JWKS refresh for %s failed.", self.issuer_url, exc_info=True)
+
+    def _signing_key(self, jwks: dict[str, Any], kid: str | None) -> jwt.PyJWK | None:
+        """Return the key for *kid*, parsing each fetched JWKS only once."""
+        source, keys = self._signing_keys
+        if source is not jwks:
+            keys = {k.key_id: k for k in jwt.PyJWKSet.from_dict(jwks).keys}
+            self._signing_keys = (jwks, keys)
+        return keys.get(kid)
+
     # -- Token validation --
 
     async def validate_token(self, token: str) -> dict[str, Any]:
@@ -112,7 +165,6 @@ class OIDCClient:
         claims: ``exp``, ``iss``, and ``aud``.
         """
         jwks = await self.fetch_jwks()
-        signing_keys = jwt.PyJWKSet.from_dict(jwks)
 
         try:
             header = jwt.get_unverified_header(token)
@@ -121,21 +173,13 @@ class OIDCClient:
             raise jwt.exceptions.InvalidTokenError(msg) from exc
 
         kid = header.get("kid")
-        key = None
-        for jwk in signing_keys.keys:
-            if jwk.key_id == kid:
-                key = jwk
-                break
+        key = self._signing_key(jwks, kid)
 
         if key is None:
             # Refresh JWKS in case keys were rotated
             self._jwks_cache = (0.0, None)
             jwks = await self.fetch_jwks()
-            signing_keys = jwt.PyJWKSet.from_dict(jwks)
-            for jwk in signing_keys.keys:
-                if jwk.key_id == kid:
-                    key = jwk
-                    break
+            key = self._signing_key(jwks, kid)
             if key is None:
                 msg = f"No matching key found for kid={kid}"
                 raise jwt.exceptions.InvalidTokenError(msg)
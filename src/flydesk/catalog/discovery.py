@@ -15,6 +15,7 @@ discover external systems that should be added to the service catalog.
 
 from __future__ import annotations
 
+import functools
 import json
 import logging
 import uuid
@@ -27,12 +28,24 @@ from pydantic import BaseModel, Field
 
 from flydesk.audit.logger import AuditLogger
 from flydesk.audit.models import AuditEvent, AuditEventType
+from flydesk.catalog.discovery_state import (
+    DiscoveryUnit,
+    changed_units,
+    discovery_scope,
+    entity_cluster_units,
+    load_fingerprints,
+    make_unit,
+    pack_units,
+    run_passes,
+    save_fingerprints,
+)
 from flydesk.catalog.enums import AuthType, HttpMethod, RiskLevel, SystemStatus
 from flydesk.catalog.models import AuthConfig, ExternalSystem, ServiceEndpoint
 from flydesk.jobs.handlers import ProgressCallback
 
 if TYPE_CHECKING:
     from flydesk.agent.genai_bridge import DeskAgentFactory
+    from flydesk.catalog.discovery_state import DiscoveryFingerprintStore
     from flydesk.catalog.repository import CatalogRepository
     from flydesk.jobs.models import Job
     from flydesk.jobs.runner import JobRunner
@@ -49,8 +62,12 @@ _PROMPTS_DIR = Path(__file__).parent / "discovery_prompts"
 
 # Discovery tuning constants
 _DISCOVERY_ENTITY_LIMIT = 200  # max KG entities loaded for context
+_DISCOVERY_RELATION_FANOUT = 50  # max KG relations followed per entity for context
 _DISCOVERY_MAX_TOKENS = 16_384  # max LLM output tokens for system discovery
 _HIGH_CONFIDENCE_THRESHOLD = 0.8  # bypass endpoint/URL checks if confidence >= this
+_DISCOVERY_CHUNK_CHARS = 120_000  # context characters per LLM pass
+_DISCOVERY_CONCURRENCY = 3  # LLM passes run in parallel
+_FINGERPRINT_TYPE = "system"  # discovery_type of stored fingerprints
 
 
 class DiscoveredEndpoint(BaseModel):
@@ -133,6 +150,12 @@ class SystemDiscoveryEngine:
     4. Parse the structured JSON response into ``ExternalSystem`` models
     5. Merge with existing systems (skip existing, never overwrite)
     6. Persist via ``CatalogRepository``
+
+    With a *fingerprint_store*, each run only analyses the documents and
+    entity clusters that changed since the last successful run.  Context
+    larger than *chunk_chars* is split into several LLM passes (at most
+    *max_concurrency* in flight), each of which sees the existing catalog
+    systems; their results are deduplicated before the merge.
     """
 
     def __init__(
@@ -143,11 +166,17 @@ class SystemDiscoveryEngine:
         *,
         audit_logger: AuditLogger | None = None,
         prompts_dir: Path | None = None,
+        fingerprint_store: DiscoveryFingerprintStore | None = None,
+        chunk_chars: int = _DISCOVERY_CHUNK_CHARS,
+        max_concurrency: int = _DISCOVERY_CONCURRENCY,
     ) -> None:
         self._agent_factory = agent_factory
         self._catalog_repo = catalog_repo
         self._knowledge_graph = knowledge_graph
         self._audit_logger = audit_logger
+        self._fingerprint_store = fingerprint_store
+        self._chunk_chars = chunk_chars
+        self._max_concurrency = max_concurrency
 
         templates_path = prompts_dir or _PROMPTS_DIR
         self._jinja_env = Environment(
@@ -208,6 +237,7 @@ class SystemDiscoveryEngine:
         document_types: list[str] | None = None,
         knowledge_documents: list[KnowledgeDocument] | None = None,
         confidence_threshold: float = 0.5,
+        full: bool = False,
     ) -> Job:
         """Submit a system discovery job to the background job runner.
 
@@ -218,6 +248,7 @@ class SystemDiscoveryEngine:
             document_types: Optional list of document types to include.
             knowledge_documents: Optional pre-loaded KB documents to include in context.
             confidence_threshold: Minimum confidence score for discovered systems.
+            full: Analyse all context, not just what changed since the last run.
 
         Returns:
             The created ``Job`` domain object for tracking.
@@ -231,6 +262,8 @@ class SystemDiscoveryEngine:
             payload["knowledge_document_ids"] = [d.id for d in knowledge_documents]
         if confidence_threshold != 0.5:
             payload["confidence_threshold"] = confidence_threshold
+        if full:
+            payload["full"] = True
         return await job_runner.submit("system_discovery", payload)
 
     # ------------------------------------------------------------------
@@ -279,17 +312,52 @@ class SystemDiscoveryEngine:
             f"{len(context.documents)} documents",
         )
 
-        # 2. Build prompt
+        # 2. Keep only the context that changed since the last successful run;
+        #    explicitly requested documents are always analysed.
+        units = self._context_units(context)
+        scope = discovery_scope(workspace_ids, document_types)
+        previous = await load_fingerprints(self._fingerprint_store, _FINGERPRINT_TYPE, scope)
+        forced = [f"document:{d.id}" for d in knowledge_documents or []]
+        pending = units if payload.get("full") else changed_units(units, previous, always=forced)
+        if previous and not pending:
+            await on_progress(100, "No changes since the last discovery — nothing to analyze")
+            return {
+                "status": "skipped",
+                "reason": "unchanged",
+                "systems_discovered": 0,
+            }
+        if len(pending) < len(units):
+            await on_progress(
+                22, f"{len(pending)} of {len(units)} context items changed since the last discovery",
+            )
+
+        # 3. Build prompts (one per chunk of context, each with the catalog)
         system_prompt = self._render_system_prompt(trigger)
-        user_prompt = self._render_context_prompt(context)
-        prompt_size = len(system_prompt) + len(user_prompt)
-        await on_progress(
-            25,
-            f"Sending {prompt_size:,} characters of context to LLM for analysis...",
+        chunks = pack_units(pending, self._chunk_chars) or [[]]
+        user_prompts = [
+            self._render_context_prompt(self._context_from_units(chunk, context.systems))
+            for chunk in chunks
+        ]
+        prompt_size = sum(len(system_prompt) + len(p) for p in user_prompts)
+        if len(user_prompts) > 1:
+            message = (
+                f"Sending {prompt_size:,} characters of context to LLM "
+                f"in {len(user_prompts)} parallel passes..."
+            )
+        else:
+            message = f"Sending {prompt_size:,} characters of context to LLM for analysis..."
+        await on_progress(25, message)
+
+        # 4. Call LLM per chunk, then reduce
+        discovery_result, usage_data, failed = await run_passes(
+            user_prompts,
+            functools.partial(self._call_llm_pass, system_prompt),
+            self._reduce_results,
+            on_progress,
+            max_concurrency=self._max_concurrency,
+            start_pct=25,
+            span_pct=30,
         )
-
-        # 3. Call LLM
-        discovery_result, usage_data = await self._call_llm(system_prompt, user_prompt)
         if discovery_result is None:
             await on_progress(100, "No LLM provider configured — discovery skipped")
             return {
@@ -346,6 +414,12 @@ class SystemDiscoveryEngine:
             except Exception:
                 logger.warning("Failed to auto-link documents to discovered systems.", exc_info=True)
 
+        # 5c. Remember what was analysed; failed passes are retried next run
+        failed_keys = {u.key for i in failed for u in chunks[i]}
+        await save_fingerprints(
+            self._fingerprint_store, _FINGERPRINT_TYPE, scope, units, previous, failed_keys
+        )
+
         if self._audit_logger and usage_data:
             try:
                 await self._audit_logger.log(AuditEvent(
@@ -366,6 +440,9 @@ class SystemDiscoveryEngine:
             "systems_discovered": stats["discovered"],
             "systems_created": stats["created"],
             "systems_skipped": stats["skipped"],
+            "context_items_analyzed": len(pending),
+            "context_items_total": len(units),
+            "llm_passes": len(user_prompts),
             "input_tokens": usage_data.get("input_tokens", 0),
             "output_tokens": usage_data.get("output_tokens", 0),
             "cost_usd": usage_data.get("cost_usd", 0.0),
@@ -410,6 +487,7 @@ class SystemDiscoveryEngine:
             entities = await self._knowledge_graph.list_entities(limit=_DISCOVERY_ENTITY_LIMIT)
             ctx.entities = [
                 {
+                    "id": e.id,
                     "name": e.name,
                     "entity_type": e.entity_type,
                     "confidence": e.confidence,
@@ -417,22 +495,23 @@ class SystemDiscoveryEngine:
                 }
                 for e in entities
             ]
-            # Gather relations for each entity (first-degree)
+            # Gather first-degree relations of all entities in one traversal
+            graph = await self._knowledge_graph.get_neighborhoods(
+                [e.id for e in entities], depth=1, max_fanout=_DISCOVERY_RELATION_FANOUT
+            )
             seen_relations: set[tuple[str, str, str]] = set()
-            for entity in entities:
-                graph = await self._knowledge_graph.get_entity_neighborhood(entity.id, depth=1)
-                for rel in graph.relations:
-                    key = (rel.source_id, rel.target_id, rel.relation_type)
-                    if key not in seen_relations:
-                        seen_relations.add(key)
-                        ctx.relations.append(
-                            {
-                                "source_id": rel.source_id,
-                                "target_id": rel.target_id,
-                                "relation_type": rel.relation_type,
-                                "properties": rel.properties,
-                            }
-                        )
+            for rel in graph.relations:
+                key = (rel.source_id, rel.target_id, rel.relation_type)
+                if key not in seen_relations:
+                    seen_relations.add(key)
+                    ctx.relations.append(
+                        {
+                            "source_id": rel.source_id,
+                            "target_id": rel.target_id,
+                            "relation_type": rel.relation_type,
+                            "properties": rel.properties,
+                        }
+                    )
         except Exception:
             logger.warning("Failed to gather knowledge graph context.", exc_info=True)
 
@@ -442,18 +521,9 @@ class SystemDiscoveryEngine:
             from flydesk.server import DEFAULT_WORKSPACE_ID as _SYSTEM_WS
 
             if workspace_ids:
-                all_docs = []
-                for ws_id in workspace_ids:
-                    ws_docs = await self._catalog_repo.list_knowledge_documents(workspace_id=ws_id)
-                    all_docs.extend(ws_docs)
-                # Deduplicate by ID
-                seen_doc_ids: set[str] = set()
-                documents = []
-                for doc in all_docs:
-                    doc_id = getattr(doc, "id", None)
-                    if doc_id and doc_id not in seen_doc_ids:
-                        seen_doc_ids.add(doc_id)
-                        documents.append(doc)
+                documents = await self._catalog_repo.list_knowledge_documents(
+                    workspace_ids=workspace_ids
+                )
             else:
                 documents = await self._catalog_repo.list_knowledge_documents()
                 # Exclude documents that belong *only* to the system workspace
@@ -471,6 +541,7 @@ class SystemDiscoveryEngine:
 
             ctx.documents = [
                 {
+                    "id": getattr(doc, "id", ""),
                     "title": getattr(doc, "title", ""),
                     "document_type": str(getattr(doc, "document_type", "other")),
                     "tags": getattr(doc, "tags", []),
@@ -488,6 +559,7 @@ class SystemDiscoveryEngine:
                 if doc.title not in existing_titles:
                     ctx.documents.append(
                         {
+                            "id": doc.id,
                             "title": doc.title,
                             "document_type": str(doc.document_type),
                             "tags": doc.tags,
@@ -517,10 +589,72 @@ class SystemDiscoveryEngine:
             documents=context.documents,
         )
 
+    # ------------------------------------------------------------------
+    # Incremental state
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _context_units(context: SystemDiscoveryContext) -> list[DiscoveryUnit]:
+        """Split *context* into documents and entity-type clusters.
+
+        Existing catalog systems are reference data sent with every pass,
+        so they are not units of their own.
+        """
+        units = [
+            make_unit(f"document:{d.get('id') or d.get('title', '')}", d)
+            for d in context.documents
+        ]
+        units.extend(entity_cluster_units(context.entities, context.relations))
+        return units
+
+    @staticmethod
+    def _context_from_units(
+        units: list[DiscoveryUnit],
+        systems: list[ExistingSystemContext],
+    ) -> SystemDiscoveryContext:
+        """Rebuild a prompt context from *units* plus the existing *systems*."""
+        ctx = SystemDiscoveryContext(systems=list(systems))
+        for unit in units:
+            if unit.key.startswith("document:"):
+                ctx.documents.append(unit.payload)
+            else:
+                ctx.entities.extend(unit.payload["entities"])
+                ctx.relations.extend(unit.payload["relations"])
+        return ctx
+
     # ------------------------------------------------------------------
     # LLM interaction
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _reduce_results(results: list[SystemDiscoveryResult]) -> SystemDiscoveryResult:
+        """Deduplicate systems found by several passes by case-insensitive name.
+
+        The highest-confidence candidate wins; evidence, tags and endpoints
+        of the other candidates are merged into it.
+        """
+        merged: dict[str, DiscoveredSystem] = {}
+        for result in results:
+            for system in result.systems:
+                key = system.name.lower()
+                kept = merged.get(key)
+                if kept is None:
+                    merged[key] = system.model_copy(deep=True)
+                    continue
+                if system.confidence > kept.confidence:
+                    system = system.model_copy(deep=True)
+                    kept, system = system, kept
+                    merged[key] = kept
+                kept.base_url = kept.base_url or system.base_url
+                kept.evidence.extend(e for e in system.evidence if e not in kept.evidence)
+                kept.tags.extend(t for t in system.tags if t not in kept.tags)
+                seen = {(ep.method.upper(), ep.path, ep.name) for ep in kept.endpoints}
+                for ep in system.endpoints:
+                    if (ep.method.upper(), ep.path, ep.name) not in seen:
+                        seen.add((ep.method.upper(), ep.path, ep.name))
+                        kept.endpoints.append(ep)
+        return SystemDiscoveryResult(systems=list(merged.values()))
+
     async def _call_llm(
         self,
         system_prompt: str,
@@ -532,6 +666,20 @@ class SystemDiscoveryEngine:
         Result is ``None`` if no LLM provider is configured.
         Raises no exceptions -- returns an empty result on parse errors.
         """
+        result, usage_data, _ = await self._call_llm_pass(system_prompt, user_prompt)
+        return result, usage_data
+
+    async def _call_llm_pass(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+    ) -> tuple[SystemDiscoveryResult | None, dict[str, Any], bool]:
+        """Run one LLM pass; like ``_call_llm`` plus a success flag.
+
+        The flag is ``False`` when the call raised or the response could
+        not be parsed, so the caller knows the pass did not analyse its
+        context.
+        """
         # System discovery generates large JSON responses -- use a higher token
         # limit than the default chat agent to avoid truncation.
         agent = await self._agent_factory.create_agent(
@@ -540,7 +688,7 @@ class SystemDiscoveryEngine:
         )
         if agent is None:
             logger.warning("No LLM provider configured; system discovery skipped.")
-            return None, {}
+            return None, {}, False
 
         usage_data: dict[str, Any] = {}
         try:
@@ -549,17 +697,26 @@ class SystemDiscoveryEngine:
             output_text = str(result.output)
         except Exception:
             logger.exception("LLM call failed during system discovery.")
-            return SystemDiscoveryResult(systems=[]), usage_data
+            return SystemDiscoveryResult(systems=[]), usage_data, False
 
-        return self._parse_llm_response(output_text), usage_data
+        parsed = self._try_parse_llm_response(output_text)
+        if parsed is None:
+            return SystemDiscoveryResult(systems=[]), usage_data, False
+        return parsed, usage_data, True
 
-    @staticmethod
-    def _parse_llm_response(text: str) -> SystemDiscoveryResult:
+    @classmethod
+    def _parse_llm_response(cls, text: str) -> SystemDiscoveryResult:
         """Parse the LLM's text response as JSON into a ``SystemDiscoveryResult``.
 
         Handles common LLM formatting quirks like markdown code blocks.
         Returns an empty result on malformed responses.
         """
+        parsed = cls._try_parse_llm_response(text)
+        return parsed if parsed is not None else SystemDiscoveryResult(systems=[])
+
+    @staticmethod
+    def _try_parse_llm_response(text: str) -> SystemDiscoveryResult | None:
+        """Like ``_parse_llm_response`` but returns ``None`` on malformed responses."""
         cleaned = text.strip()
 
         # Strip markdown code blocks if present
@@ -575,13 +732,13 @@ class SystemDiscoveryEngine:
             data = json.loads(cleaned)
         except json.JSONDecodeError:
             logger.warning("Failed to parse LLM response as JSON: %s...", cleaned[:200])
-            return SystemDiscoveryResult(systems=[])
+            return None
 
         try:
             return SystemDiscoveryResult.model_validate(data)
         except Exception:
             logger.warning("LLM JSON did not match SystemDiscoveryResult schema.", exc_info=True)
-            return SystemDiscoveryResult(systems=[])
+            return None
 
     # ------------------------------------------------------------------
     # Domain model conversion
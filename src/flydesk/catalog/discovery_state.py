@@ -0,0 +1,356 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""Incremental discovery state -- context unit fingerprints and chunking.
+
+Process and system discovery split their gathered context into *units*
+(one per catalog system, one per document, one per entity-type cluster of
+the knowledge graph).  Each unit carries a fingerprint of its rendered
+content; the fingerprints of the last successful run are stored per
+discovery type and scope so the next run only analyses the units that
+changed.  Units that do need analysis are packed into character-bounded
+chunks, each of which becomes one LLM pass.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from flydesk.knowledge.entity_resolution import normalize_entity_type
+from flydesk.models.discovery import DiscoveryFingerprintRow
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Values per ``IN (...)`` clause.
+_IN_CHUNK = 500
+
+
+# ---------------------------------------------------------------------------
+# Units
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class DiscoveryUnit:
+    """One independently fingerprinted piece of discovery context.
+
+    Attributes:
+        key: Stable identity, e.g. ``"system:<id>"`` or ``"entities:service"``.
+        fingerprint: SHA-256 of the unit's canonical JSON form.
+        size: Length of that JSON form, used as the chunking budget cost.
+        payload: The context object(s) the unit renders into the prompt.
+    """
+
+    key: str
+    fingerprint: str
+    size: int
+    payload: Any = field(default=None, compare=False, repr=False)
+
+
+def _canonical_json(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, default=str, separators=(",", ":"))
+
+
+def fingerprint(value: Any) -> str:
+    """Return a stable SHA-256 hex digest of a JSON-serialisable *value*."""
+    return hashlib.sha256(_canonical_json(value).encode("utf-8")).hexdigest()
+
+
+def make_unit(key: str, value: Any, payload: Any = None) -> DiscoveryUnit:
+    """Build a unit whose fingerprint and size are derived from *value*.
+
+    *payload* defaults to *value*; pass it when the prompt needs a
+    different object (e.g. a dataclass) than the one being fingerprinted.
+    """
+    encoded = _canonical_json(value)
+    return DiscoveryUnit(
+        key=key,
+        fingerprint=hashlib.sha256(encoded.encode("utf-8")).hexdigest(),
+        size=len(encoded),
+        payload=value if payload is None else payload,
+    )
+
+
+def entity_cluster_units(
+    entities: Sequence[dict[str, Any]],
+    relations: Sequence[dict[str, Any]],
+) -> list[DiscoveryUnit]:
+    """Group knowledge graph context into one unit per normalised entity type.
+
+    Each relation joins the cluster of its source entity, or of its target
+    when the source is outside the gathered entities.  The unit payload is
+    ``{"entities": [...], "relations": [...]}``.
+    """
+    clusters: dict[str, dict[str, list[dict[str, Any]]]] = {}
+    cluster_of: dict[str, str] = {}
+    for entity in entities:
+        entity_type = normalize_entity_type(str(entity.get("entity_type", ""))) or "unknown"
+        cluster = clusters.setdefault(entity_type, {"entities": [], "relations": []})
+        cluster["entities"].append(entity)
+        if entity.get("id"):
+            cluster_of[entity["id"]] = entity_type
+    for relation in relations:
+        entity_type = cluster_of.get(relation.get("source_id", "")) or cluster_of.get(
+            relation.get("target_id", "")
+        )
+        if entity_type is not None:
+            clusters[entity_type]["relations"].append(relation)
+    return [
+        make_unit(f"entities:{entity_type}", cluster)
+        for entity_type, cluster in sorted(clusters.items())
+    ]
+
+
+def discovery_scope(
+    workspace_ids: Sequence[str] | None = None,
+    document_types: Sequence[str] | None = None,
+) -> str:
+    """Return the fingerprint of a run's filters.
+
+    Runs with different workspace or document-type filters see different
+    context, so each filter combination keeps its own fingerprints.
+    """
+    return fingerprint(
+        {"workspaces": sorted(workspace_ids or []), "types": sorted(document_types or [])}
+    )
+
+
+def changed_units(
+    units: Iterable[DiscoveryUnit],
+    previous: dict[str, str],
+    *,
+    always: Iterable[str] = (),
+) -> list[DiscoveryUnit]:
+    """Return the units whose fingerprint differs from *previous*.
+
+    Keys in *always* are returned regardless of their fingerprint.
+    """
+    forced = set(always)
+    return [
+        unit for unit in units
+        if unit.key in forced or previous.get(unit.key) != unit.fingerprint
+    ]
+
+
+def pack_units(units: Sequence[DiscoveryUnit], max_chars: int) -> list[list[DiscoveryUnit]]:
+    """Pack *units*, in order, into chunks of at most *max_chars* characters.
+
+    A unit larger than the budget gets a chunk of its own rather than being
+    split, so related context is never torn across LLM passes.
+    """
+    chunks: list[list[DiscoveryUnit]] = []
+    current: list[DiscoveryUnit] = []
+    used = 0
+    for unit in units:
+        if current and used + unit.size > max_chars:
+            chunks.append(current)
+            current, used = [], 0
+        current.append(unit)
+        used += unit.size
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+async def run_bounded(
+    calls: Sequence[Callable[[], Awaitable[T]]],
+    limit: int,
+) -> list[T]:
+    """Await *calls* with at most *limit* in flight; results keep call order."""
+    semaphore = asyncio.Semaphore(max(limit, 1))
+
+    async def _run(call: Callable[[], Awaitable[T]]) -> T:
+        async with semaphore:
+            return await call()
+
+    return list(await asyncio.gather(*(_run(call) for call in calls)))
+
+
+async def run_passes(
+    user_prompts: Sequence[str],
+    call_pass: Callable[[str], Awaitable[tuple[T | None, dict[str, Any], bool]]],
+    reduce: Callable[[list[T]], T],
+    on_progress: Callable[[int, str], Awaitable[None]],
+    *,
+    max_concurrency: int,
+    start_pct: int,
+    span_pct: int,
+) -> tuple[T | None, dict[str, Any], list[int]]:
+    """Map *user_prompts* over parallel LLM passes and *reduce* the results.
+
+    *call_pass* runs one pass and returns ``(result, usage, ok)``.  With
+    several prompts, progress moves from *start_pct* by *span_pct* as the
+    passes complete.  Returns ``(result, usage_data, failed)`` where
+    *failed* holds the indexes of passes that did not produce a usable
+    response; the result is ``None`` when no pass returned one.
+    """
+    if len(user_prompts) == 1:
+        result, usage_data, ok = await call_pass(user_prompts[0])
+        return result, usage_data, [] if ok else [0]
+
+    total = len(user_prompts)
+    done = 0
+
+    async def _pass(user_prompt: str) -> tuple[T | None, dict[str, Any], bool]:
+        nonlocal done
+        outcome = await call_pass(user_prompt)
+        done += 1
+        await on_progress(start_pct + span_pct * done // total, f"LLM pass {done}/{total} complete")
+        return outcome
+
+    outcomes = await run_bounded(
+        [functools.partial(_pass, p) for p in user_prompts], max_concurrency,
+    )
+    results = [result for result, _, _ in outcomes if result is not None]
+    if not results:
+        return None, {}, []
+    failed = [i for i, (_, _, ok) in enumerate(outcomes) if not ok]
+    return reduce(results), combine_usage(usage for _, usage, _ in outcomes), failed
+
+
+def combine_usage(usages: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """Sum the token counts and cost of several LLM passes."""
+    combined: dict[str, Any] = {}
+    for usage in usages:
+        if not usage:
+            continue
+        for key in ("input_tokens", "output_tokens", "total_tokens"):
+            combined[key] = combined.get(key, 0) + usage.get(key, 0)
+        combined["cost_usd"] = round(combined.get("cost_usd", 0.0) + usage.get("cost_usd", 0.0), 6)
+        if usage.get("model"):
+            combined["model"] = usage["model"]
+    return combined
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+
+class DiscoveryFingerprintStore:
+    """Persist unit fingerprints of the last successful discovery run."""
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        self._session_factory = session_factory
+
+    async def load(self, discovery_type: str, scope: str) -> dict[str, str]:
+        """Return ``{item key: fingerprint}`` recorded for *discovery_type* and *scope*."""
+        async with self._session_factory() as session:
+            result = await session.execute(
+                select(DiscoveryFingerprintRow.item_key, DiscoveryFingerprintRow.fingerprint).where(
+                    DiscoveryFingerprintRow.discovery_type == discovery_type,
+                    DiscoveryFingerprintRow.scope == scope,
+                )
+            )
+            return {key: value for key, value in result.all()}
+
+    async def save(
+        self,
+        discovery_type: str,
+        scope: str,
+        fingerprints: dict[str, str],
+        *,
+        removed: Iterable[str] = (),
+    ) -> None:
+        """Upsert *fingerprints* and delete the *removed* keys in one transaction."""
+        removed_keys = sorted(set(removed) - set(fingerprints))
+        keys = sorted(fingerprints)
+        async with self._session_factory() as session:
+            for start in range(0, len(removed_keys), _IN_CHUNK):
+                await session.execute(
+                    delete(DiscoveryFingerprintRow).where(
+                        DiscoveryFingerprintRow.discovery_type == discovery_type,
+                        DiscoveryFingerprintRow.scope == scope,
+                        DiscoveryFingerprintRow.item_key.in_(
+                            removed_keys[start : start + _IN_CHUNK]
+                        ),
+                    )
+                )
+
+            existing: dict[str, DiscoveryFingerprintRow] = {}
+            for start in range(0, len(keys), _IN_CHUNK):
+                result = await session.execute(
+                    select(DiscoveryFingerprintRow).where(
+                        DiscoveryFingerprintRow.discovery_type == discovery_type,
+                        DiscoveryFingerprintRow.scope == scope,
+                        DiscoveryFingerprintRow.item_key.in_(keys[start : start + _IN_CHUNK]),
+                    )
+                )
+                existing.update({row.item_key: row for row in result.scalars().all()})
+
+            for key in keys:
+                row = existing.get(key)
+                if row is None:
+                    session.add(
+                        DiscoveryFingerprintRow(
+                            discovery_type=discovery_type,
+                            scope=scope,
+                            item_key=key,
+                            fingerprint=fingerprints[key],
+                        )
+                    )
+                elif row.fingerprint != fingerprints[key]:
+                    row.fingerprint = fingerprints[key]
+            await session.commit()
+
+    async def clear(self, discovery_type: str | None = None) -> None:
+        """Forget recorded fingerprints so the next run analyses everything."""
+        async with self._session_factory() as session:
+            stmt = delete(DiscoveryFingerprintRow)
+            if discovery_type is not None:
+                stmt = stmt.where(DiscoveryFingerprintRow.discovery_type == discovery_type)
+            await session.execute(stmt)
+            await session.commit()
+
+
+async def load_fingerprints(
+    store: DiscoveryFingerprintStore | None, discovery_type: str, scope: str
+) -> dict[str, str]:
+    """Load the fingerprints of the last run; empty (analyse everything) on failure."""
+    if store is None:
+        return {}
+    try:
+        return await store.load(discovery_type, scope)
+    except Exception:
+        logger.warning("Failed to load discovery fingerprints; analyzing everything.", exc_info=True)
+        return {}
+
+
+async def save_fingerprints(
+    store: DiscoveryFingerprintStore | None,
+    discovery_type: str,
+    scope: str,
+    units: Sequence[DiscoveryUnit],
+    previous: dict[str, str],
+    failed_keys: set[str],
+) -> None:
+    """Record *units* as analysed, except *failed_keys*, and forget vanished ones."""
+    if store is None:
+        return
+    current = {u.key for u in units}
+    try:
+        await store.save(
+            discovery_type,
+            scope,
+            {u.key: u.fingerprint for u in units if u.key not in failed_keys},
+            removed=[key for key in previous if key not in current],
+        )
+    except Exception:
+        logger.warning("Failed to save discovery fingerprints.", exc_info=True)
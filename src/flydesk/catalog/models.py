@@ -39,6 +39,32 @@ class RetryPolicy(BaseModel):
     backoff_factor: float = 1.0
 
 
+class CachePolicy(BaseModel):
+    """Response caching policy for a READ-risk endpoint.
+
+    ``ttl_seconds`` is an upper bound: when ``respect_cache_control`` is set,
+    a shorter upstream ``max-age`` wins and ``no-store`` disables caching.
+    """
+
+    enabled: bool = True
+    ttl_seconds: int = Field(default=60, ge=0)
+    respect_cache_control: bool = True
+
+
+class ResponseLimits(BaseModel):
+    """Streaming limits for large upstream responses.
+
+    Bodies up to ``max_bytes`` are parsed in full.  Larger bodies are consumed
+    incrementally and replaced by a bounded preview plus summary statistics;
+    with ``spill_to_disk`` the raw body is also written to a local file.
+    """
+
+    max_bytes: int = Field(default=10_000_000, gt=0)
+    preview_items: int = Field(default=50, ge=0)
+    preview_chars: int = Field(default=8_000, ge=0)
+    spill_to_disk: bool = False
+
+
 class CredentialMapping(BaseModel):
     """Maps a credential value to a request location."""
 
@@ -114,6 +140,8 @@ class ServiceEndpoint(BaseModel):
     rate_limit: RateLimit | None = None
     timeout_seconds: float = 30.0
     retry_policy: RetryPolicy | None = None
+    cache_policy: CachePolicy | None = None
+    response_limits: ResponseLimits | None = None
     tags: list[str] = Field(default_factory=list)
 
     # GraphQL-specific fields
@@ -7,9 +7,10 @@
 from __future__ import annotations
 
 import json
+from collections.abc import AsyncGenerator, Sequence
 from typing import Any
 
-from sqlalchemy import String as SAString, cast, delete, func, select, update
+from sqlalchemy import delete, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from flydesk.catalog.enums import SystemStatus
@@ -22,6 +23,9 @@ from flydesk.models.catalog import (
     SystemTagRow,
 )
 
+# Values per ``IN (...)`` clause.
+_IN_CHUNK = 500
+
 
 def _to_json(value: Any) -> str | None:
     """Serialize a Python object to a JSON string for SQLite Text columns.
@@ -251,6 +255,12 @@ class CatalogRepository:
                 retry_policy=_to_json(
                     endpoint.retry_policy.model_dump() if endpoint.retry_policy else None
                 ),
+                cache_policy=_to_json(
+                    endpoint.cache_policy.model_dump() if endpoint.cache_policy else None
+                ),
+                response_limits=_to_json(
+                    endpoint.response_limits.model_dump() if endpoint.response_limits else None
+                ),
                 tags=_to_json(endpoint.tags),
                 protocol_type=endpoint.protocol_type.value,
                 graphql_query=endpoint.graphql_query,
@@ -279,6 +289,27 @@ class CatalogRepository:
             )
             return [self._row_to_endpoint(r) for r in result.scalars().all()]
 
+    async def list_endpoints_for_systems(
+        self, system_ids: Sequence[str]
+    ) -> dict[str, list[ServiceEndpoint]]:
+        """Return the endpoints of several systems, keyed by system id.
+
+        Every requested id is present in the result, with an empty list
+        for systems that have no endpoints.
+        """
+        ids = list(dict.fromkeys(system_ids))
+        endpoints: dict[str, list[ServiceEndpoint]] = {system_id: [] for system_id in ids}
+        async with self._session_factory() as session:
+            for start in range(0, len(ids), _IN_CHUNK):
+                result = await session.execute(
+                    select(ServiceEndpointRow).where(
+                        ServiceEndpointRow.system_id.in_(ids[start : start + _IN_CHUNK])
+                    )
+                )
+                for row in result.scalars().all():
+                    endpoints[row.system_id].append(self._row_to_endpoint(row))
+        return endpoints
+
     async def list_active_endpoints(self) -> list[ServiceEndpoint]:
         """List all endpoints whose parent system is ACTIVE."""
         async with self._session_factory() as session:
@@ -326,6 +357,12 @@ class CatalogRepository:
             row.retry_policy = _to_json(
                 endpoint.retry_policy.model_dump() if endpoint.retry_policy else None
             )
+            row.cache_policy = _to_json(
+                endpoint.cache_policy.model_dump() if endpoint.cache_policy else None
+            )
+            row.response_limits = _to_json(
+                endpoint.response_limits.model_dump() if endpoint.response_limits else None
+            )
             row.tags = _to_json(endpoint.tags)
             row.protocol_type = endpoint.protocol_type.value
             row.graphql_query = endpoint.graphql_query
@@ -431,79 +468,191 @@ class CatalogRepository:
 
     # -- Knowledge Documents --
 
-    async def list_knowledge_documents(self, *, workspace_id: str | None = None) -> list:
-        """Return all knowledge documents, optionally filtered by workspace."""
+    @staticmethod
+    def _knowledge_document_filters(
+        *,
+        workspace_id: str | None = None,
+        workspace_ids: Sequence[str] | None = None,
+        document_type: str | None = None,
+        status: str | None = None,
+    ) -> list:
+        from flydesk.knowledge.membership import in_workspaces
+        from flydesk.models.knowledge_base import KnowledgeDocumentRow
+
+        scope = list(workspace_ids or [])
+        if workspace_id is not None:
+            scope.append(workspace_id)
+        filters = []
+        if scope:
+            filters.append(in_workspaces(scope))
+        if document_type is not None:
+            filters.append(KnowledgeDocumentRow.document_type == str(document_type))
+        if status is not None:
+            filters.append(KnowledgeDocumentRow.status == str(status))
+        return filters
+
+    @staticmethod
+    def _row_to_knowledge_document(row: Any):
         from flydesk.knowledge.models import DocumentStatus, DocumentType, KnowledgeDocument
+
+        return KnowledgeDocument(
+            id=row.id,
+            title=row.title,
+            content=row.content,
+            document_type=DocumentType(row.document_type) if row.document_type else DocumentType.OTHER,
+            status=DocumentStatus(row.status) if row.status else DocumentStatus.DRAFT,
+            source=row.source,
+            workspace_ids=_from_json(row.workspace_ids) if row.workspace_ids else [],
+            tags=_from_json(row.tags) if row.tags else [],
+            metadata=_from_json(row.metadata_) if row.metadata_ else {},
+        )
+
+    async def list_knowledge_documents(
+        self,
+        *,
+        workspace_id: str | None = None,
+        workspace_ids: Sequence[str] | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list:
+        """Return knowledge documents with their content, optionally filtered by workspace.
+
+        Documents in any of *workspace_ids* (or in *workspace_id*) are
+        returned once each.  Prefer :meth:`list_knowledge_document_summaries`
+        when the content is not needed and :meth:`iter_knowledge_documents`
+        for bulk reads.
+        """
         from flydesk.models.knowledge_base import KnowledgeDocumentRow
 
         async with self._session_factory() as session:
-            stmt = select(KnowledgeDocumentRow)
-            if workspace_id is not None:
-                stmt = stmt.where(
-                    cast(KnowledgeDocumentRow.workspace_ids, SAString).contains(f'"{workspace_id}"')
+            stmt = select(KnowledgeDocumentRow).where(
+                *self._knowledge_document_filters(
+                    workspace_id=workspace_id, workspace_ids=workspace_ids
                 )
+            )
+            if limit is not None:
+                stmt = stmt.order_by(KnowledgeDocumentRow.id).limit(limit).offset(offset)
             result = await session.execute(stmt)
-            return [
-                KnowledgeDocument(
-                    id=r.id,
-                    title=r.title,
-                    content=r.content,
-                    document_type=DocumentType(r.document_type) if r.document_type else DocumentType.OTHER,
-                    status=DocumentStatus(r.status) if r.status else DocumentStatus.DRAFT,
-                    source=r.source,
-                    workspace_ids=_from_json(r.workspace_ids) if r.workspace_ids else [],
-                    tags=_from_json(r.tags) if r.tags else [],
-                    metadata=_from_json(r.metadata_) if r.metadata_ else {},
+            return [self._row_to_knowledge_document(r) for r in result.scalars().all()]
+
+    async def list_knowledge_document_summaries(
+        self,
+        *,
+        workspace_id: str | None = None,
+        document_type: str | None = None,
+        status: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> tuple[list, int]:
+        """Return document metadata without content. Returns (items, total_count)."""
+        from flydesk.knowledge.models import DocumentStatus, DocumentType, KnowledgeDocumentSummary
+        from flydesk.models.knowledge_base import KnowledgeDocumentRow
+
+        filters = self._knowledge_document_filters(
+            workspace_id=workspace_id, document_type=document_type, status=status
+        )
+        async with self._session_factory() as session:
+            stmt = (
+                select(
+                    KnowledgeDocumentRow.id,
+                    KnowledgeDocumentRow.title,
+                    KnowledgeDocumentRow.document_type,
+                    KnowledgeDocumentRow.status,
+                    KnowledgeDocumentRow.source,
+                    KnowledgeDocumentRow.workspace_ids,
+                    KnowledgeDocumentRow.tags,
+                    KnowledgeDocumentRow.metadata_,
                 )
-                for r in result.scalars().all()
-            ]
+                .where(*filters)
+                .order_by(KnowledgeDocumentRow.title, KnowledgeDocumentRow.id)
+            )
+            if limit is not None:
+                stmt = stmt.limit(limit).offset(offset)
+            rows = (await session.execute(stmt)).all()
+            if limit is None and offset == 0:
+                total = len(rows)
+            else:
+                total = (
+                    await session.execute(
+                        select(func.count()).select_from(KnowledgeDocumentRow).where(*filters)
+                    )
+                ).scalar() or 0
+        items = [
+            KnowledgeDocumentSummary(
+                id=r.id,
+                title=r.title,
+                document_type=DocumentType(r.document_type) if r.document_type else DocumentType.OTHER,
+                status=DocumentStatus(r.status) if r.status else DocumentStatus.DRAFT,
+                source=r.source,
+                workspace_ids=_from_json(r.workspace_ids) if r.workspace_ids else [],
+                tags=_from_json(r.tags) if r.tags else [],
+                metadata=_from_json(r.metadata_) if r.metadata_ else {},
+            )
+            for r in rows
+        ]
+        return items, total
+
+    async def count_knowledge_documents(self, *, workspace_id: str | None = None) -> int:
+        """Return the number of knowledge documents, optionally filtered by workspace."""
+        from flydesk.models.knowledge_base import KnowledgeDocumentRow
+
+        async with self._session_factory() as session:
+            stmt = select(func.count()).select_from(KnowledgeDocumentRow).where(
+                *self._knowledge_document_filters(workspace_id=workspace_id)
+            )
+            return (await session.execute(stmt)).scalar() or 0
+
+    async def iter_knowledge_documents(
+        self,
+        *,
+        workspace_ids: Sequence[str] | None = None,
+        after_id: str | None = None,
+        batch_size: int = 100,
+    ) -> AsyncGenerator:
+        """Yield knowledge documents with their content, *batch_size* rows per query.
+
+        Documents are read in id order using keyset pagination, so only one
+        batch is held in memory and no session stays open between batches.
+        *after_id* starts the stream after that document id.
+        """
+        from flydesk.models.knowledge_base import KnowledgeDocumentRow
+
+        filters = self._knowledge_document_filters(workspace_ids=workspace_ids)
+        after = after_id
+        while True:
+            stmt = select(KnowledgeDocumentRow).where(*filters)
+            if after is not None:
+                stmt = stmt.where(KnowledgeDocumentRow.id > after)
+            stmt = stmt.order_by(KnowledgeDocumentRow.id).limit(batch_size)
+            async with self._session_factory() as session:
+                rows = (await session.execute(stmt)).scalars().all()
+            for row in rows:
+                yield self._row_to_knowledge_document(row)
+            if len(rows) < batch_size:
+                return
+            after = rows[-1].id
 
     async def get_knowledge_document(self, document_id: str):
         """Retrieve a knowledge document by ID."""
-        from flydesk.knowledge.models import DocumentStatus, DocumentType, KnowledgeDocument
         from flydesk.models.knowledge_base import KnowledgeDocumentRow
 
         async with self._session_factory() as session:
             row = await session.get(KnowledgeDocumentRow, document_id)
             if row is None:
                 return None
-            return KnowledgeDocument(
-                id=row.id,
-                title=row.title,
-                content=row.content,
-                document_type=DocumentType(row.document_type) if row.document_type else DocumentType.OTHER,
-                status=DocumentStatus(row.status) if row.status else DocumentStatus.DRAFT,
-                source=row.source,
-                workspace_ids=_from_json(row.workspace_ids) if row.workspace_ids else [],
-                tags=_from_json(row.tags) if row.tags else [],
-                metadata=_from_json(row.metadata_) if row.metadata_ else {},
-            )
+            return self._row_to_knowledge_document(row)
 
     async def get_knowledge_documents_by_ids(self, doc_ids: list[str]) -> list:
         """Retrieve multiple knowledge documents by their IDs in a single query."""
         if not doc_ids:
             return []
-        from flydesk.knowledge.models import DocumentStatus, DocumentType, KnowledgeDocument
         from flydesk.models.knowledge_base import KnowledgeDocumentRow
 
         async with self._session_factory() as session:
             result = await session.execute(
                 select(KnowledgeDocumentRow).where(KnowledgeDocumentRow.id.in_(doc_ids))
             )
-            return [
-                KnowledgeDocument(
-                    id=row.id,
-                    title=row.title,
-                    content=row.content,
-                    document_type=DocumentType(row.document_type) if row.document_type else DocumentType.OTHER,
-                    status=DocumentStatus(row.status) if row.status else DocumentStatus.DRAFT,
-                    source=row.source,
-                    workspace_ids=_from_json(row.workspace_ids) if row.workspace_ids else [],
-                    tags=_from_json(row.tags) if row.tags else [],
-                    metadata=_from_json(row.metadata_) if row.metadata_ else {},
-                )
-                for row in result.scalars().all()
-            ]
+            return [self._row_to_knowledge_document(row) for row in result.scalars().all()]
 
     async def update_knowledge_document(
         self, document_id: str, *, title=None, document_type=None, tags=None, content=None, status=None, workspace_ids=None
@@ -511,7 +660,7 @@ class CatalogRepository:
         """Update a knowledge document's metadata and optionally content."""
         import json as _json
 
-        from flydesk.knowledge.models import DocumentStatus, DocumentType, KnowledgeDocument
+        from flydesk.knowledge.membership import set_document_workspaces
         from flydesk.models.knowledge_base import KnowledgeDocumentRow
 
         async with self._session_factory() as session:
@@ -530,19 +679,10 @@ class CatalogRepository:
                 row.status = str(status)
             if workspace_ids is not None:
                 row.workspace_ids = _json.dumps(workspace_ids)
+                await set_document_workspaces(session, document_id, workspace_ids)
             await session.commit()
             await session.refresh(row)
-            return KnowledgeDocument(
-                id=row.id,
-                title=row.title,
-                content=row.content,
-                document_type=DocumentType(row.document_type) if row.document_type else DocumentType.OTHER,
-                status=DocumentStatus(row.status) if row.status else DocumentStatus.DRAFT,
-                source=row.source,
-                workspace_ids=_from_json(row.workspace_ids) if row.workspace_ids else [],
-                tags=_from_json(row.tags) if row.tags else [],
-                metadata=_from_json(row.metadata_) if row.metadata_ else {},
-            )
+            return self._row_to_knowledge_document(row)
 
     # -- Tags --
 
@@ -737,6 +877,8 @@ class CatalogRepository:
             rate_limit=_from_json_or_none(row.rate_limit),
             timeout_seconds=row.timeout_seconds,
             retry_policy=_from_json_or_none(row.retry_policy),
+            cache_policy=_from_json_or_none(row.cache_policy),
+            response_limits=_from_json_or_none(row.response_limits),
             tags=_from_json(row.tags),
             protocol_type=row.protocol_type or "rest",
             graphql_query=row.graphql_query,
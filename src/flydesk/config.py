@@ -63,6 +63,16 @@ class DeskConfig(BaseSettings):
     agent_instructions: str | None = None
     max_turns_per_conversation: int = 200
     max_tools_per_turn: int = 10
+    tool_response_cache_max_entries: int = 1000
+    tool_response_max_bytes: int = 10_000_000  # 0 = parse bodies whole (no streaming)
+    tool_response_spill_dir: str = ""  # "" = system temp directory
+    tool_response_spill_retention_hours: int = 24
+    oauth2_refresh_ahead_seconds: int = 300
+    oauth2_shared_token_cache: bool = False  # share tokens across workers via redis_url
+    sandbox_pool_size: int = 2  # pre-warmed sandbox workers; 0 = one interpreter per call
+    sandbox_max_concurrency: int = 16
+    sandbox_max_executions_per_worker: int = 500
+    sandbox_memory_limit_mb: int = 1024  # 0 = no limit
 
     # -- LLM Fallback Models --
     llm_fallback_models: dict[str, list[str]] = {}
@@ -74,9 +84,41 @@ class DeskConfig(BaseSettings):
 
     # -- Queue --
     queue_backend: Literal["memory", "redis"] = "memory"
+    indexing_batch_size: int = 32  # tasks indexed together in one job
+    indexing_batch_wait_ms: int = 250  # how long to wait for a batch to fill
+    indexing_consumers: int = 1  # parallel consumer loops per process
+    indexing_reclaim_idle_ms: int = 60_000  # redis: reclaim tasks pending this long
+    indexing_max_deliveries: int = 5  # redis: dead-letter after this many deliveries
+    source_sync_concurrency: int = 8  # parallel downloads per document source sync
+    git_import_concurrency: int = 8  # parallel file fetches per git import
+    git_import_archive_threshold: int = 25  # changed files at which a branch archive is downloaded
 
     # -- Jobs --
     job_timeout_seconds: int = 3600
+    job_max_concurrency: int = 4
+    job_type_concurrency: dict[str, int] = {
+        "kg_recompute": 1,
+        "kg_compact": 1,
+        "process_discovery": 1,
+        "system_discovery": 1,
+        "reindex": 1,
+    }
+    job_bulk_types: list[str] = [
+        "kg_recompute", "kg_compact", "process_discovery", "system_discovery", "reindex"
+    ]
+    job_bulk_share: int = 4  # interactive dispatches before a waiting bulk job goes next
+    job_progress_interval_seconds: float = 2.0  # min seconds between progress writes
+    job_progress_milestone_pct: int = 10  # always persist when crossing these steps
+    job_queue_backend: Literal["memory", "database"] = "memory"
+    job_lease_seconds: int = 60
+    job_poll_interval_seconds: float = 5.0
+    job_max_attempts: int = 3  # claims allowed before a job whose lease keeps expiring fails
+
+    # -- Workflows --
+    workflow_scheduler_max_interval_seconds: int = 30  # longest sleep between schedule checks
+    workflow_scheduler_page_size: int = 100
+    workflow_scheduler_concurrency: int = 10
+    workflow_scheduler_lease_seconds: int = 300
 
     # -- Knowledge --
     max_knowledge_tokens: int = 4000  # deprecated: use LLMRuntimeSettings.max_knowledge_tokens
@@ -92,6 +134,9 @@ class DeskConfig(BaseSettings):
     chunk_overlap: int = 50
     chunking_mode: Literal["fixed", "structural", "auto"] = "auto"
     auto_kg_extract: bool = True
+    kg_recompute_concurrency: int = 4  # parallel LLM extractions during a KG recompute
+    kg_embedding_batch_size: int = 64  # entities embedded per call during a KG recompute
+    kg_entity_similarity_threshold: float = 0.92  # embedding similarity that merges same-type entities
 
     # -- Vector Store --
     vector_store: VectorStoreType = VectorStoreType.SQLITE
@@ -113,8 +158,13 @@ class DeskConfig(BaseSettings):
     vault_token: str = ""
     vault_transit_key: str = "flydesk"
     vault_mount_point: str = "transit"
+    kms_envelope_encryption: bool = False  # aws/gcp/azure/vault only
+    kms_cache_ttl_seconds: int = 300
     jwt_secret_key: str = ""
-    audit_retention_days: int = 365
+    auth_session_cache_ttl_seconds: int = 60  # 0 disables the session cache
+    audit_retention_enabled: bool = False  # opt in to deleting expired audit events
+    audit_retention_days: int = 365  # 0 keeps audit events forever
+    audit_retention_interval_seconds: int = 3600  # partition upkeep and retention cadence
     rate_limit_per_user: int = 60
 
     # -- GitHub Integration --
@@ -125,6 +175,10 @@ class DeskConfig(BaseSettings):
 
     # -- Analysis --
     auto_analyze: bool = False
+    discovery_chunk_chars: int = 120_000  # context characters per discovery LLM pass
+    discovery_concurrency: int = 3  # discovery LLM passes run in parallel
+    usage_rollup_interval_seconds: int = 300  # dashboard usage rollup job cadence
+    suggestions_cache_ttl_seconds: int = 60  # chat suggestion snapshots are rebuilt after this
 
     # -- Docs --
     docs_path: str = "docs"
@@ -138,6 +192,7 @@ class DeskConfig(BaseSettings):
     daily_budget_limit: float = 0.0  # 0 = unlimited
     budget_alert_warning: float = 0.8
     budget_alert_critical: float = 0.95
+    spend_flush_interval_seconds: int = 10  # spend ledger write cadence per worker
 
     # -- Middleware --
     cost_guard_enabled: bool = False
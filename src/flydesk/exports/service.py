@@ -6,7 +6,12 @@
 #
 #     http://www.apache.org/licenses/LICENSE-2.0
 
-"""Export service -- generates CSV, JSON and PDF exports."""
+"""Export service -- generates CSV, JSON and PDF exports.
+
+Source data carrying a ``spill_id`` (the summary of an oversized tool
+response) is exported as the full spilled upstream body, copied from the
+spill file without loading it into memory.
+"""
 
 from __future__ import annotations
 
@@ -46,9 +51,12 @@ class ExportService:
         self,
         repo: ExportRepository,
         storage: FileStorageProvider,
+        *,
+        spill_dir: str | None = None,
     ) -> None:
         self._repo = repo
         self._storage = storage
+        self._spill_dir = spill_dir
 
     # ------------------------------------------------------------------
     # Public generators
@@ -174,6 +182,11 @@ class ExportService:
             filename: str
             actual_format = fmt.value
 
+            spill_id = source_data.get("spill_id")
+            if isinstance(spill_id, str) and spill_id:
+                await self._export_spill(record, spill_id, source_data)
+                return record
+
             if fmt == ExportFormat.CSV:
                 file_bytes, row_count = self.generate_csv(source_data, template)
                 content_type = "text/csv"
@@ -223,6 +236,50 @@ class ExportService:
     # Private helpers
     # ------------------------------------------------------------------
 
+    async def _export_spill(
+        self, record: ExportRecord, spill_id: str, summary: dict[str, Any]
+    ) -> None:
+        """Store the spilled upstream body as the export file.
+
+        The body keeps its upstream format (JSON, XML, CSV or text),
+        whatever format was requested.
+        """
+        from flydesk.tools.response_stream import open_spill
+
+        source, spill_format = open_spill(spill_id, self._spill_dir)
+        content_type = {
+            "json": "application/json",
+            "xml": "application/xml",
+            "csv": "text/csv",
+        }.get(spill_format, "text/plain")
+        filename = f"{record.id}.{spill_format}"
+        try:
+            store_file = getattr(self._storage, "store_file", None)
+            if store_file is not None:
+                file_path = await store_file(filename, source, content_type)
+            else:
+                file_path = await self._storage.store(filename, source.read(), content_type)
+            file_size = source.tell()
+        finally:
+            source.close()
+
+        record.status = ExportStatus.COMPLETED
+        record.file_path = file_path
+        record.file_size = file_size
+        record.row_count = self._summary_row_count(summary)
+        record.completed_at = datetime.now(timezone.utc)
+        await self._repo.update_export(record)
+
+    @staticmethod
+    def _summary_row_count(summary: dict[str, Any]) -> int | None:
+        """Row count recorded in a response summary, if any."""
+        if isinstance(summary.get("row_count"), int):
+            return summary["row_count"]
+        counts = summary.get("counts")
+        if isinstance(counts, dict) and counts:
+            return max((v for v in counts.values() if isinstance(v, int)), default=None)
+        return None
+
     @staticmethod
     def _normalize_data(
         source_data: dict[str, Any],
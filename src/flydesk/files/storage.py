@@ -11,8 +11,9 @@
 from __future__ import annotations
 
 import os
+import shutil
 import uuid
-from typing import Protocol, runtime_checkable
+from typing import BinaryIO, Protocol, runtime_checkable
 
 
 @runtime_checkable
@@ -48,6 +49,14 @@ class LocalFileStorage:
             f.write(content)
         return path
 
+    async def store_file(self, filename: str, source: BinaryIO, content_type: str) -> str:
+        """Copy *source* into local storage in chunks and return its path."""
+        ext = os.path.splitext(filename)[1]
+        path = os.path.join(self._base_dir, f"{uuid.uuid4()}{ext}")
+        with open(path, "wb") as f:
+            shutil.copyfileobj(source, f)
+        return path
+
     async def retrieve(self, storage_path: str) -> bytes:
         """Read a file from local storage."""
         # If storage_path is relative, resolve against base_dir
@@ -0,0 +1,389 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""Git import job handler -- imports repository files into the knowledge base.
+
+For each repository in the import cart the branch tree is listed once to
+learn every file's blob SHA.  Files whose SHA matches the one recorded on
+the document from the previous import are skipped.  The rest are downloaded
+as a single branch archive when the provider supports it
+(:class:`~flydesk.knowledge.git_provider.GitArchiveProvider`) and enough
+files changed, or fetched with bounded concurrency otherwise, and each file
+is enqueued for indexing as soon as it arrives.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import tempfile
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from flydesk.api.git_import import RepoImportItem, _ensure_adapters_loaded, git_indexing_task
+from flydesk.jobs.handlers import ProgressCallback, ShouldPauseCallback
+from flydesk.knowledge.git_provider import (
+    GitArchiveProvider,
+    GitProvider,
+    GitProviderFactory,
+    is_rate_limited,
+    read_archive,
+)
+from flydesk.knowledge.git_provider_repository import GitProviderRepository
+from flydesk.knowledge.queue import IndexingQueueProducer
+
+if TYPE_CHECKING:
+    from flydesk.knowledge.indexer import KnowledgeIndexer
+
+logger = logging.getLogger(__name__)
+
+# Attempts per file when the provider answers with a rate-limit error.
+_MAX_FETCH_ATTEMPTS = 3
+
+# Archives are spooled in memory up to this size, then on disk.
+_ARCHIVE_SPOOL_BYTES = 16 * 1024 * 1024
+
+# Failures listed individually in the job result.
+_MAX_REPORTED_FAILURES = 50
+
+
+class ArchiveTooLarge(Exception):
+    """Raised when a branch archive exceeds the configured size limit."""
+
+
+class _BoundedSpool:
+    """Temporary file that refuses to grow beyond *limit* bytes."""
+
+    def __init__(self, limit: int) -> None:
+        self._file = tempfile.SpooledTemporaryFile(max_size=_ARCHIVE_SPOOL_BYTES)
+        self._limit = limit
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self.size += len(data)
+        if self.size > self._limit:
+            raise ArchiveTooLarge(f"Archive exceeds {self._limit} bytes")
+        return self._file.write(data)
+
+    def rewind(self):
+        self._file.seek(0)
+        return self._file
+
+    def close(self) -> None:
+        self._file.close()
+
+
+@dataclass
+class _Existing:
+    """Documents created for one file by earlier imports."""
+
+    document_ids: list[str] = field(default_factory=list)
+    sha: str = ""
+    content_hash: str = ""
+
+
+@dataclass
+class _Tally:
+    """Per-job counters and progress reporting."""
+
+    on_progress: ProgressCallback
+    total: int = 0
+    done: int = 0
+    counts: dict[str, int] = field(
+        default_factory=lambda: {"added": 0, "updated": 0, "unchanged": 0, "failed": 0}
+    )
+    failures: list[dict[str, str]] = field(default_factory=list)
+    archives: int = 0
+
+    async def record(self, outcome: str, repo: str, path: str, error: str = "") -> None:
+        self.counts[outcome] += 1
+        if error and len(self.failures) < _MAX_REPORTED_FAILURES:
+            self.failures.append({"repo": repo, "path": path, "error": error})
+        self.done += 1
+        pct = 10 + int(85 * self.done / max(self.total, 1))
+        await self.on_progress(pct, f"Imported {self.done}/{self.total} files")
+
+
+class GitImportJobHandler:
+    """Imports files from Git repositories under the ``"git_import"`` job type.
+
+    The job *payload* carries ``provider_id``, ``token`` (encrypted with
+    :meth:`GitProviderRepository.encrypt_token`, or the ``"stored"``
+    sentinel) and ``items``, a list of
+    :class:`~flydesk.api.git_import.RepoImportItem` dicts.  An item with no
+    ``paths`` imports every importable file on its branch.
+
+    Parameters
+    ----------
+    indexer:
+        Used to look up documents from earlier imports and to delete the
+        old version of a changed file.  Without it every file is imported.
+    producer:
+        Indexing queue that imported files are enqueued on.
+    max_concurrency:
+        Files fetched from the provider at the same time.
+    archive_threshold:
+        Changed files in one repository at which the whole branch is
+        downloaded as an archive instead.
+    max_archive_bytes:
+        Largest archive downloaded before falling back to per-file fetches.
+    """
+
+    def __init__(
+        self,
+        provider_repo: GitProviderRepository,
+        *,
+        indexer: KnowledgeIndexer | None = None,
+        producer: IndexingQueueProducer | None = None,
+        max_concurrency: int = 8,
+        archive_threshold: int = 25,
+        max_archive_bytes: int = 512 * 1024 * 1024,
+    ) -> None:
+        self._provider_repo = provider_repo
+        self._indexer = indexer
+        self._producer = producer
+        self._max_concurrency = max(1, max_concurrency)
+        self._archive_threshold = max(1, archive_threshold)
+        self._max_archive_bytes = max_archive_bytes
+
+    def set_indexing_producer(self, producer: IndexingQueueProducer) -> None:
+        """Set the queue imported files are enqueued on (wired after startup)."""
+        self._producer = producer
+
+    # -- JobHandler protocol ---------------------------------------------------
+
+    async def execute(
+        self,
+        job_id: str,
+        payload: dict,
+        on_progress: ProgressCallback,
+        checkpoint: dict | None = None,
+        should_pause: ShouldPauseCallback = lambda: False,
+    ) -> dict:
+        """Execute a git import as a background job (JobHandler protocol)."""
+        provider_id = payload.get("provider_id", "")
+        if not provider_id:
+            return {"error": "Missing provider_id in payload"}
+        if self._producer is None:
+            return {"error": "Indexing queue not available"}
+
+        try:
+            provider = await self._open_provider(provider_id, payload.get("token", ""))
+        except ValueError as exc:
+            await on_progress(0, str(exc))
+            return {"error": str(exc), "provider_id": provider_id}
+
+        items = [RepoImportItem(**item) for item in payload.get("items", [])]
+        try:
+            await on_progress(5, f"Listing {len(items)} repositories")
+            result = await self.import_items(provider, provider_id, items, on_progress)
+        finally:
+            await provider.aclose()
+        await on_progress(100, "Import complete")
+        return result
+
+    # -- Import ----------------------------------------------------------------
+
+    async def import_items(
+        self,
+        provider: GitProvider,
+        provider_id: str,
+        items: list[RepoImportItem],
+        on_progress: ProgressCallback,
+    ) -> dict[str, Any]:
+        """Import every repository in *items* and return a summary."""
+        tally = _Tally(on_progress)
+        plans: list[tuple[RepoImportItem, dict[str, str]]] = []
+        for item in items:
+            repo_name = f"{item.owner}/{item.repo}"
+            try:
+                shas = await self._list_shas(provider, item)
+            except Exception as exc:
+                logger.warning("Failed to list %s@%s", repo_name, item.branch, exc_info=True)
+                tally.total += len(item.paths)
+                for path in item.paths:
+                    await tally.record("failed", repo_name, path, str(exc))
+                continue
+            plans.append((item, shas))
+            tally.total += len(shas)
+
+        slots = asyncio.Semaphore(self._max_concurrency)
+        for item, shas in plans:
+            await self._import_repo(provider, provider_id, item, shas, slots, tally)
+
+        return {
+            "provider_id": provider_id,
+            "repos": len(items),
+            "files": tally.total,
+            **tally.counts,
+            "archives": tally.archives,
+            "failures": tally.failures,
+        }
+
+    async def _import_repo(
+        self,
+        provider: GitProvider,
+        provider_id: str,
+        item: RepoImportItem,
+        shas: dict[str, str],
+        slots: asyncio.Semaphore,
+        tally: _Tally,
+    ) -> None:
+        repo_name = f"{item.owner}/{item.repo}"
+        existing = await self._existing_documents(item)
+
+        pending: list[str] = []
+        for path, sha in shas.items():
+            previous = existing.get(path)
+            if previous is not None and sha and previous.sha == sha:
+                await tally.record("unchanged", repo_name, path)
+            else:
+                pending.append(path)
+
+        if isinstance(provider, GitArchiveProvider) and len(pending) >= self._archive_threshold:
+            pending = await self._import_from_archive(
+                provider, provider_id, item, pending, shas, existing, tally
+            )
+
+        async def _fetch_one(path: str) -> None:
+            try:
+                async with slots:
+                    fc = await self._fetch_file(provider, item, path)
+                outcome = await self._store(
+                    provider_id, item, path, fc.content, fc.sha or shas.get(path, ""),
+                    existing.get(path),
+                )
+            except Exception as exc:
+                logger.warning("Failed to import %s:%s", repo_name, path, exc_info=True)
+                await tally.record("failed", repo_name, path, str(exc))
+                return
+            await tally.record(outcome, repo_name, path)
+
+        await asyncio.gather(*(_fetch_one(path) for path in pending))
+
+    async def _import_from_archive(
+        self,
+        provider: GitArchiveProvider,
+        provider_id: str,
+        item: RepoImportItem,
+        paths: list[str],
+        shas: dict[str, str],
+        existing: dict[str, _Existing],
+        tally: _Tally,
+    ) -> list[str]:
+        """Import *paths* from the branch archive; returns paths still to fetch."""
+        repo_name = f"{item.owner}/{item.repo}"
+        spool = _BoundedSpool(self._max_archive_bytes)
+        remaining = set(paths)
+        try:
+            await provider.download_archive(item.owner, item.repo, item.branch, spool)
+            tally.archives += 1
+            # Decompression runs off the event loop, one member at a time.
+            members = read_archive(spool.rewind(), paths)
+            while (member := await asyncio.to_thread(next, members, None)) is not None:
+                path, data = member
+                remaining.discard(path)
+                try:
+                    outcome = await self._store(
+                        provider_id, item, path, data.decode("utf-8"), shas.get(path, ""),
+                        existing.get(path),
+                    )
+                except Exception as exc:
+                    logger.warning("Failed to import %s:%s", repo_name, path, exc_info=True)
+                    await tally.record("failed", repo_name, path, str(exc))
+                    continue
+                await tally.record(outcome, repo_name, path)
+        except Exception:
+            logger.warning(
+                "Archive import of %s@%s failed; fetching %d files individually",
+                repo_name, item.branch, len(remaining), exc_info=True,
+            )
+        finally:
+            spool.close()
+        return [path for path in paths if path in remaining]
+
+    async def _fetch_file(self, provider: GitProvider, item: RepoImportItem, path: str):
+        for attempt in range(1, _MAX_FETCH_ATTEMPTS + 1):
+            try:
+                return await provider.get_file_content(item.owner, item.repo, path, ref=item.branch)
+            except Exception as exc:
+                if attempt == _MAX_FETCH_ATTEMPTS or not is_rate_limited(exc):
+                    raise
+                # The adapter's RateLimitGate holds the retry until the reset.
+                logger.info("Rate limited fetching %s; retrying (%d)", path, attempt)
+
+    async def _store(
+        self,
+        provider_id: str,
+        item: RepoImportItem,
+        path: str,
+        content: str,
+        sha: str,
+        previous: _Existing | None,
+    ) -> str:
+        """Enqueue one file for indexing unless its content is unchanged."""
+        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        if previous is not None and previous.content_hash == content_hash:
+            return "unchanged"
+
+        document_id = None
+        if previous is not None:
+            # Chunks are keyed by random ids, so the old version must go first.
+            for old_id in previous.document_ids:
+                await self._indexer.delete_document(old_id)
+            document_id = previous.document_ids[0]
+        task = git_indexing_task(
+            provider_id, item, path, content, sha,
+            document_id=document_id,
+            extra_metadata={"content_hash": content_hash},
+        )
+        await self._producer.enqueue(task)
+        return "updated" if previous is not None else "added"
+
+    # -- Lookups ---------------------------------------------------------------
+
+    async def _list_shas(self, provider: GitProvider, item: RepoImportItem) -> dict[str, str]:
+        """Map each path to import to its blob SHA (``""`` when unknown)."""
+        entries = await provider.list_tree(item.owner, item.repo, item.branch)
+        tree = {entry.path: entry.sha for entry in entries if entry.type == "blob"}
+        if not item.paths:
+            return tree
+        return {path: tree.get(path, "") for path in item.paths}
+
+    async def _existing_documents(self, item: RepoImportItem) -> dict[str, _Existing]:
+        if self._indexer is None:
+            return {}
+        prefix = f"git://{item.owner}/{item.repo}/"
+        suffix = f"@{item.branch}"
+        existing: dict[str, _Existing] = {}
+        for doc_id, source, metadata in await self._indexer.find_documents_by_source(prefix):
+            if not source.endswith(suffix):
+                continue
+            entry = existing.setdefault(source[len(prefix) : -len(suffix)], _Existing())
+            entry.document_ids.append(doc_id)
+            entry.sha = entry.sha or str(metadata.get("sha") or "")
+            entry.content_hash = entry.content_hash or str(metadata.get("content_hash") or "")
+        return existing
+
+    async def _open_provider(self, provider_id: str, token: str) -> GitProvider:
+        row = await self._provider_repo.get_provider(provider_id)
+        if row is None or not row.is_active:
+            raise ValueError(f"Git provider {provider_id} not found or inactive")
+        if token == "stored":
+            effective_token = (
+                self._provider_repo.decrypt_secret(row) if row.auth_method == "pat" else token
+            )
+        else:
+            effective_token = self._provider_repo.decrypt_token(token)
+        if not effective_token:
+            raise ValueError("No usable token for this Git provider")
+        _ensure_adapters_loaded(row.provider_type)
+        return GitProviderFactory.create(
+            row.provider_type, token=effective_token, base_url=row.base_url
+        )
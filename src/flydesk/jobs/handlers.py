@@ -10,6 +10,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, Callable, Coroutine, Protocol, runtime_checkable
@@ -21,7 +22,7 @@ from flydesk.knowledge.queue import IndexingTask
 if TYPE_CHECKING:
     from flydesk.catalog.discovery import SystemDiscoveryEngine
     from flydesk.catalog.repository import CatalogRepository
-    from flydesk.knowledge.graph import KnowledgeGraph
+    from flydesk.knowledge.graph import Entity, KnowledgeGraph, Relation
     from flydesk.knowledge.kg_extractor import KGExtractor
     from flydesk.processes.discovery import ProcessDiscoveryEngine
 
@@ -78,7 +79,8 @@ class JobHandler(Protocol):
 class IndexingJobHandler:
     """Wraps the existing ``KnowledgeIndexer`` as a ``JobHandler``.
 
-    The payload is expected to be a serialised ``IndexingTask``.
+    The payload is expected to be a serialised ``IndexingTask``, or
+    ``{"tasks": [...]}`` holding a batch of them that is indexed together.
     """
 
     def __init__(self, indexer: KnowledgeIndexer) -> None:
@@ -92,11 +94,60 @@ class IndexingJobHandler:
         checkpoint: dict | None = None,
         should_pause: ShouldPauseCallback = lambda: False,
     ) -> dict:
-        """Index a single knowledge document."""
+        """Index a single knowledge document or a batch of them."""
+        if "tasks" in payload:
+            tasks = [IndexingTask.model_validate(t) for t in payload["tasks"]]
+            await on_progress(10, f"Indexing {len(tasks)} documents")
+            try:
+                await self._indexer.index_documents([self._to_document(t) for t in tasks])
+            except Exception:
+                logger.warning(
+                    "Indexing batch of %d failed; indexing documents individually",
+                    len(tasks), exc_info=True,
+                )
+                return await self._index_individually(tasks, on_progress)
+            await on_progress(100, "Indexing complete")
+            return {"document_ids": [t.document_id for t in tasks], "documents": len(tasks)}
+
         task = IndexingTask.model_validate(payload)
         await on_progress(10, f"Indexing document {task.document_id}")
+        await self._indexer.index_document(self._to_document(task))
 
-        doc = KnowledgeDocument(
+        await on_progress(100, "Indexing complete")
+        return {"document_id": task.document_id, "title": task.title}
+
+    async def _index_individually(
+        self, tasks: list[IndexingTask], on_progress: ProgressCallback
+    ) -> dict:
+        """Index *tasks* one at a time so only the documents that raise fail.
+
+        Raises the last error when no document could be indexed.
+        """
+        indexed: list[str] = []
+        failed: dict[str, str] = {}
+        last_error: Exception | None = None
+        for i, task in enumerate(tasks):
+            try:
+                await self._indexer.index_document(self._to_document(task))
+            except Exception as exc:
+                logger.exception("Failed to index document %s", task.document_id)
+                failed[task.document_id] = str(exc)
+                last_error = exc
+            else:
+                indexed.append(task.document_id)
+            await on_progress(
+                10 + int(90 * (i + 1) / len(tasks)), f"Indexed {i + 1}/{len(tasks)} documents"
+            )
+        if not indexed and last_error is not None:
+            raise last_error
+        result: dict[str, Any] = {"document_ids": indexed, "documents": len(indexed)}
+        if failed:
+            result["failed"] = failed
+        return result
+
+    @staticmethod
+    def _to_document(task: IndexingTask) -> KnowledgeDocument:
+        return KnowledgeDocument(
             id=task.document_id,
             title=task.title,
             content=task.content,
@@ -106,10 +157,6 @@ class IndexingJobHandler:
             metadata=task.metadata,
             workspace_ids=task.workspace_ids,
         )
-        await self._indexer.index_document(doc)
-
-        await on_progress(100, "Indexing complete")
-        return {"document_id": task.document_id, "title": task.title}
 
 
 class ReindexJobHandler:
@@ -215,7 +262,7 @@ class KGExtractSingleHandler:
         should_pause: ShouldPauseCallback = lambda: False,
     ) -> dict:
         """Extract entities/relations from a single document and upsert into the KG."""
-        from flydesk.knowledge.graph import Entity, Relation
+        from flydesk.knowledge.entity_resolution import remap_relations
 
         doc_id = payload["document_id"]
         doc = await self._catalog_repo.get_knowledge_document(doc_id)
@@ -238,37 +285,18 @@ class KGExtractSingleHandler:
             logger.warning("KG extraction failed for doc '%s'.", doc_title, exc_info=True)
             return {"document_id": doc_id, "entities": 0, "relations": 0, "error": True}
 
-        entities_added = 0
-        relations_added = 0
-
-        for ent_dict in entities:
-            entity = Entity(
-                id=ent_dict["id"],
-                entity_type=ent_dict["entity_type"],
-                name=ent_dict["name"],
-                properties=ent_dict.get("properties", {}),
-                source_system=ent_dict.get("source_system"),
-                confidence=ent_dict.get("confidence", 1.0),
-            )
-            await self._knowledge_graph.upsert_entity(entity)
-            entities_added += 1
-
-        for rel_dict in relations:
-            relation = Relation(
-                source_id=rel_dict["source_id"],
-                target_id=rel_dict["target_id"],
-                relation_type=rel_dict["relation_type"],
-                properties=rel_dict.get("properties", {}),
-                confidence=rel_dict.get("confidence", 1.0),
-            )
-            await self._knowledge_graph.add_relation(relation)
-            relations_added += 1
+        mapping = await self._knowledge_graph.upsert_entities(
+            [_to_entity(e) for e in entities], resolve=True
+        )
+        await self._knowledge_graph.add_relations(
+            remap_relations([_to_relation(r) for r in relations], mapping)
+        )
 
         await on_progress(100, "Extraction complete")
         return {
             "document_id": doc_id,
-            "entities": entities_added,
-            "relations": relations_added,
+            "entities": len(entities),
+            "relations": len(relations),
         }
 
 
@@ -276,9 +304,21 @@ class KGRecomputeHandler:
     """Recomputes the knowledge graph by extracting entities and relations
     from all knowledge documents via ``KGExtractor``.
 
-    Iterates every document in the knowledge base, calls the LLM-based
-    extractor for each, and upserts the resulting entities and relations
-    into the ``KnowledgeGraph``.  Progress is reported per document.
+    Documents are extracted up to *max_concurrency* at a time and their
+    results consumed in document order, so progress and checkpoints still
+    advance one document at a time.  Entities and relations are buffered
+    and written with :meth:`KnowledgeGraph.upsert_entities` and
+    :meth:`KnowledgeGraph.add_relations` once *flush_size* entities have
+    accumulated, and always before a checkpoint is returned.
+
+    Parameters
+    ----------
+    max_concurrency:
+        LLM extractions running at the same time.
+    flush_size:
+        Buffered entities that trigger a write to the graph.
+    embed_batch_size:
+        Entities embedded per ``embed`` call.
     """
 
     def __init__(
@@ -286,10 +326,17 @@ class KGRecomputeHandler:
         catalog_repo: CatalogRepository,
         knowledge_graph: KnowledgeGraph,
         extractor: KGExtractor,
+        *,
+        max_concurrency: int = 4,
+        flush_size: int = 200,
+        embed_batch_size: int = 64,
     ) -> None:
         self._catalog_repo = catalog_repo
         self._knowledge_graph = knowledge_graph
         self._extractor = extractor
+        self._max_concurrency = max(1, max_concurrency)
+        self._flush_size = max(1, flush_size)
+        self._embed_batch_size = max(1, embed_batch_size)
 
     async def execute(
         self,
@@ -300,108 +347,194 @@ class KGRecomputeHandler:
         should_pause: ShouldPauseCallback = lambda: False,
     ) -> dict | ExecutionResult:
         """Extract entities/relations from all documents and upsert into the KG."""
-        from flydesk.knowledge.graph import Entity, Relation
+        from flydesk.knowledge.entity_resolution import remap_relations
 
         await on_progress(0, "Loading knowledge documents")
 
-        docs = await self._catalog_repo.list_knowledge_documents()
-        total = len(docs)
+        total = await self._catalog_repo.count_knowledge_documents()
 
         if total == 0:
             await on_progress(100, "No documents to process")
             return {"entities_added": 0, "relations_added": 0, "documents_processed": 0}
 
-        # Restore state from checkpoint if resuming.
-        start_index = 0
+        # Restore state from checkpoint if resuming.  Checkpoints record
+        # the last processed document id, so documents added or deleted
+        # while the job was paused do not shift the resume position.
+        last_id: str | None = None
+        skip = 0
+        processed = 0
         entities_added = 0
         relations_added = 0
         if checkpoint is not None:
-            start_index = checkpoint.get("current_index", 0)
+            last_id = checkpoint.get("last_id")
+            if last_id is None:
+                # Checkpoints written before ids were recorded.
+                skip = checkpoint.get("current_index", 0)
+            processed = checkpoint.get("documents_processed", skip)
             entities_added = checkpoint.get("entities_added", 0)
             relations_added = checkpoint.get("relations_added", 0)
 
-        for i in range(start_index, total):
-            doc = docs[i]
-            doc_title = getattr(doc, "title", "Untitled")
-            doc_content = getattr(doc, "content", "")
+        slots = asyncio.Semaphore(self._max_concurrency)
 
-            if not doc_content:
-                logger.debug("Skipping empty document: %s", doc_title)
-                pct = int((i + 1) / total * 100)
-                await on_progress(pct, f"Skipped {doc_title} (empty)")
-                if should_pause():
-                    return ExecutionResult(
-                        result={},
-                        checkpoint={
-                            "current_index": i + 1,
-                            "entities_added": entities_added,
-                            "relations_added": relations_added,
-                        },
-                    )
-                continue
+        async def _extract(doc: Any) -> tuple[list[dict], list[dict]] | None:
+            async with slots:
+                return await self._extractor.extract_from_document(
+                    getattr(doc, "content", ""), getattr(doc, "title", "Untitled")
+                )
 
-            try:
-                entities, relations = await self._extractor.extract_from_document(
-                    doc_content, doc_title
+        # Documents are streamed in id order from the checkpoint on; only
+        # those within the extraction window are held in memory.
+        # Extractions start lazily, keeping at most max_concurrency ahead
+        # of the document being consumed so a pause wastes little LLM work.
+        stream = self._catalog_repo.iter_knowledge_documents(after_id=last_id)
+        for _ in range(skip):
+            if await anext(stream, None) is None:
+                break
+        docs: dict[int, Any] = {}
+        pending: dict[int, asyncio.Task] = {}
+        next_to_start = 0
+        exhausted = False
+
+        async def _fill(upto: int) -> None:
+            nonlocal next_to_start, exhausted
+            while not exhausted and next_to_start < upto:
+                doc = await anext(stream, None)
+                if doc is None:
+                    exhausted = True
+                    break
+                docs[next_to_start] = doc
+                if getattr(doc, "content", ""):
+                    pending[next_to_start] = asyncio.create_task(_extract(doc))
+                next_to_start += 1
+
+        entity_buffer: list[Entity] = []
+        relation_buffer: list[Relation] = []
+
+        async def _flush() -> None:
+            mapping: dict[str, str] = {}
+            if entity_buffer:
+                mapping = await self._knowledge_graph.upsert_entities(
+                    list(entity_buffer),
+                    embed_batch_size=self._embed_batch_size,
+                    resolve=True,
                 )
-            except Exception:
-                logger.warning("Extraction failed for '%s'.", doc_title, exc_info=True)
-                pct = int((i + 1) / total * 100)
-                await on_progress(pct, f"Extraction failed for {doc_title}")
+                entity_buffer.clear()
+            if relation_buffer:
+                await self._knowledge_graph.add_relations(
+                    remap_relations(relation_buffer, mapping)
+                )
+                relation_buffer.clear()
+
+        try:
+            i = 0
+            while True:
+                await _fill(i + self._max_concurrency)
+                doc = docs.pop(i, None)
+                if doc is None:
+                    break
+                doc_title = getattr(doc, "title", "Untitled")
+                processed += 1
+                # Documents added since the count was taken may push past it.
+                pct = min(100, int(processed / total * 100))
+
+                task = pending.pop(i, None)
+                if task is None:
+                    logger.debug("Skipping empty document: %s", doc_title)
+                    await on_progress(pct, f"Skipped {doc_title} (empty)")
+                else:
+                    try:
+                        entities, relations = await task
+                    except Exception:
+                        logger.warning("Extraction failed for '%s'.", doc_title, exc_info=True)
+                        await on_progress(pct, f"Extraction failed for {doc_title}")
+                    else:
+                        entity_buffer.extend(_to_entity(e) for e in entities)
+                        relation_buffer.extend(_to_relation(r) for r in relations)
+                        entities_added += len(entities)
+                        relations_added += len(relations)
+                        if len(entity_buffer) >= self._flush_size:
+                            await _flush()
+                        await on_progress(
+                            pct,
+                            f"Processed {processed}/{total} documents "
+                            f"({entities_added} entities, {relations_added} relations)",
+                        )
+
                 if should_pause():
+                    await _flush()
                     return ExecutionResult(
                         result={},
                         checkpoint={
-                            "current_index": i + 1,
+                            "last_id": doc.id,
+                            "documents_processed": processed,
                             "entities_added": entities_added,
                             "relations_added": relations_added,
                         },
                     )
-                continue
-
-            for ent_dict in entities:
-                entity = Entity(
-                    id=ent_dict["id"],
-                    entity_type=ent_dict["entity_type"],
-                    name=ent_dict["name"],
-                    properties=ent_dict.get("properties", {}),
-                    source_system=ent_dict.get("source_system"),
-                    confidence=ent_dict.get("confidence", 1.0),
-                )
-                await self._knowledge_graph.upsert_entity(entity)
-                entities_added += 1
-
-            for rel_dict in relations:
-                relation = Relation(
-                    source_id=rel_dict["source_id"],
-                    target_id=rel_dict["target_id"],
-                    relation_type=rel_dict["relation_type"],
-                    properties=rel_dict.get("properties", {}),
-                    confidence=rel_dict.get("confidence", 1.0),
-                )
-                await self._knowledge_graph.add_relation(relation)
-                relations_added += 1
+                i += 1
 
-            pct = int((i + 1) / total * 100)
-            await on_progress(
-                pct,
-                f"Processed {i + 1}/{total} documents ({entities_added} entities, {relations_added} relations)",
-            )
-
-            if should_pause():
-                return ExecutionResult(
-                    result={},
-                    checkpoint={
-                        "current_index": i + 1,
-                        "entities_added": entities_added,
-                        "relations_added": relations_added,
-                    },
-                )
+            await _flush()
+        finally:
+            for task in pending.values():
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending.values(), return_exceptions=True)
+            await stream.aclose()
 
         return ExecutionResult(
             result={
                 "entities_added": entities_added,
                 "relations_added": relations_added,
-                "documents_processed": total,
+                "documents_processed": processed,
             },
         )
+
+
+class KGCompactHandler:
+    """Wraps ``KnowledgeGraph.compact_entities`` as a ``JobHandler``.
+
+    A one-off maintenance job that merges duplicate entities created before
+    entity resolution was enabled and rewires their relations.
+    """
+
+    def __init__(self, knowledge_graph: KnowledgeGraph) -> None:
+        self._knowledge_graph = knowledge_graph
+
+    async def execute(
+        self,
+        job_id: str,
+        payload: dict,
+        on_progress: ProgressCallback,
+        checkpoint: dict | None = None,
+        should_pause: ShouldPauseCallback = lambda: False,
+    ) -> dict:
+        """Merge duplicate entities across the whole graph."""
+        await on_progress(0, "Compacting knowledge graph entities")
+        stats = await self._knowledge_graph.compact_entities(on_progress)
+        await on_progress(100, f"Merged {stats['entities_merged']} duplicate entities")
+        return stats
+
+
+def _to_entity(data: dict) -> Entity:
+    from flydesk.knowledge.graph import Entity
+
+    return Entity(
+        id=data["id"],
+        entity_type=data["entity_type"],
+        name=data["name"],
+        properties=data.get("properties", {}),
+        source_system=data.get("source_system"),
+        confidence=data.get("confidence", 1.0),
+    )
+
+
+def _to_relation(data: dict) -> Relation:
+    from flydesk.knowledge.graph import Relation
+
+    return Relation(
+        source_id=data["source_id"],
+        target_id=data["target_id"],
+        relation_type=data["relation_type"],
+        properties=data.get("properties", {}),
+        confidence=data.get("confidence", 1.0),
+    )
@@ -27,6 +27,13 @@ class JobStatus(StrEnum):
     PAUSED = "paused"
 
 
+class JobPriority(StrEnum):
+    """Dispatch lane for a background job."""
+
+    INTERACTIVE = "interactive"  # short, user-facing work (indexing, single extractions)
+    BULK = "bulk"  # long-running sweeps (full KG recompute, discovery, reindex)
+
+
 class Job(BaseModel):
     """Domain representation of a background job."""
 
@@ -42,3 +49,6 @@ class Job(BaseModel):
     completed_at: datetime | None = None
     payload: dict = Field(default_factory=dict)
     checkpoint: dict | None = None
+    priority: JobPriority = JobPriority.INTERACTIVE
+    submitter: str | None = None
+    attempts: int = 0
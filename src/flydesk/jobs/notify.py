@@ -0,0 +1,162 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""Cross-replica wakeups for the database job queue.
+
+When a job is submitted on one replica, idle workers on every replica are
+woken through PostgreSQL ``LISTEN/NOTIFY`` or Redis pub/sub instead of
+discovering it on their next poll.  Notifications are best-effort: a lost
+wakeup only delays a job until the next poll.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, Protocol
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession, async_sessionmaker
+
+    from flydesk.config import DeskConfig
+
+logger = logging.getLogger(__name__)
+
+JOBS_CHANNEL = "flydesk_jobs"
+
+
+class JobNotifier(Protocol):
+    """Publishes and subscribes to "new job available" wakeups."""
+
+    async def start(self, on_wakeup: Callable[[], None]) -> None: ...
+
+    async def publish(self) -> None: ...
+
+    async def stop(self) -> None: ...
+
+
+class LocalJobNotifier:
+    """Single-process notifier; other replicas rely on polling."""
+
+    def __init__(self) -> None:
+        self._on_wakeup: Callable[[], None] | None = None
+
+    async def start(self, on_wakeup: Callable[[], None]) -> None:
+        self._on_wakeup = on_wakeup
+
+    async def publish(self) -> None:
+        if self._on_wakeup is not None:
+            self._on_wakeup()
+
+    async def stop(self) -> None:
+        self._on_wakeup = None
+
+
+class PostgresJobNotifier:
+    """Wakeups via PostgreSQL ``LISTEN/NOTIFY`` on a dedicated connection."""
+
+    def __init__(self, engine: AsyncEngine, channel: str = JOBS_CHANNEL) -> None:
+        self._engine = engine
+        self._channel = channel
+        self._conn: AsyncConnection | None = None
+        self._driver: Any = None
+        self._listener: Callable[..., None] | None = None
+
+    async def start(self, on_wakeup: Callable[[], None]) -> None:
+        self._listener = lambda *_args: on_wakeup()
+        try:
+            self._conn = await self._engine.connect()
+            raw = await self._conn.get_raw_connection()
+            self._driver = raw.driver_connection
+            await self._driver.add_listener(self._channel, self._listener)
+        except Exception:
+            logger.warning("Could not LISTEN on %s; falling back to polling", self._channel, exc_info=True)
+            await self.stop()
+
+    async def publish(self) -> None:
+        from sqlalchemy import text
+
+        try:
+            async with self._engine.begin() as conn:
+                await conn.execute(text("SELECT pg_notify(:channel, '')"), {"channel": self._channel})
+        except Exception:
+            logger.debug("pg_notify failed", exc_info=True)
+
+    async def stop(self) -> None:
+        if self._driver is not None and self._listener is not None:
+            try:
+                await self._driver.remove_listener(self._channel, self._listener)
+            except Exception:
+                logger.debug("remove_listener failed", exc_info=True)
+        if self._conn is not None:
+            await self._conn.close()
+        self._conn = None
+        self._driver = None
+
+
+class RedisJobNotifier:
+    """Wakeups via Redis pub/sub."""
+
+    def __init__(self, url: str, channel: str = JOBS_CHANNEL) -> None:
+        self._url = url
+        self._channel = channel
+        self._client: Any = None
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self, on_wakeup: Callable[[], None]) -> None:
+        import redis.asyncio as aioredis  # type: ignore[import-not-found]
+
+        self._client = aioredis.from_url(self._url)
+        self._task = asyncio.create_task(self._listen(on_wakeup))
+
+    async def publish(self) -> None:
+        if self._client is None:
+            return
+        try:
+            await self._client.publish(self._channel, "1")
+        except Exception:
+            logger.debug("Redis publish failed", exc_info=True)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    async def _listen(self, on_wakeup: Callable[[], None]) -> None:
+        while True:
+            try:
+                pubsub = self._client.pubsub()
+                await pubsub.subscribe(self._channel)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        on_wakeup()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Redis job wakeup subscription failed; retrying", exc_info=True)
+                await asyncio.sleep(5)
+
+
+def create_job_notifier(
+    config: DeskConfig, session_factory: async_sessionmaker[AsyncSession]
+) -> JobNotifier:
+    """Pick Redis when ``redis_url`` is set, else LISTEN/NOTIFY on PostgreSQL."""
+    if config.redis_url:
+        return RedisJobNotifier(config.redis_url)
+    engine = session_factory.kw.get("bind")
+    if engine is not None and engine.dialect.name == "postgresql":
+        return PostgresJobNotifier(engine)
+    return LocalJobNotifier()
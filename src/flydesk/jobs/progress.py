@@ -0,0 +1,178 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""Coalesced job progress persistence and SSE fan-out.
+
+Handlers may report progress once per document or system.  Writing each
+report to the database costs a commit, so :class:`ProgressThrottle` keeps the
+latest state in memory and persists it only every few seconds, when a
+percentage milestone is crossed, or when the job finishes.  Live updates go to
+SSE subscribers through :class:`ProgressHub`, whose per-subscriber buffers
+drop intermediate updates for slow clients instead of growing without bound.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# Job statuses after which no further events are published for a job.
+TERMINAL_STATUSES = frozenset({"completed", "failed", "cancelled", "paused"})
+
+
+# ---------------------------------------------------------------------------
+# Broadcast hub
+# ---------------------------------------------------------------------------
+
+
+class ProgressSubscription:
+    """A subscriber's bounded view of progress events for one job.
+
+    When the buffer is full the oldest event is dropped, so a slow client
+    skips intermediate progress but always receives the latest state.
+    """
+
+    def __init__(self, hub: ProgressHub, job_id: str | None, buffer_size: int) -> None:
+        self._hub = hub
+        self.job_id = job_id
+        self._events: deque[dict] = deque(maxlen=max(1, buffer_size))
+        self._ready = asyncio.Event()
+        self.dropped = 0
+
+    def _push(self, event: dict) -> None:
+        if len(self._events) == self._events.maxlen:
+            self.dropped += 1
+        self._events.append(event)
+        self._ready.set()
+
+    async def get(self, timeout: float | None = None) -> dict | None:
+        """Return the next event, or ``None`` if *timeout* elapses first."""
+        if not self._events:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+            except (asyncio.TimeoutError, TimeoutError):
+                return None
+        return self._events.popleft()
+
+    def close(self) -> None:
+        self._hub._unsubscribe(self)
+
+    def __enter__(self) -> ProgressSubscription:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class ProgressHub:
+    """In-process broadcast of job progress events to SSE subscribers.
+
+    Parameters
+    ----------
+    buffer_size:
+        Events buffered per subscriber before the oldest is dropped.
+    """
+
+    def __init__(self, *, buffer_size: int = 16) -> None:
+        self._buffer_size = buffer_size
+        self._subscribers: dict[str | None, set[ProgressSubscription]] = {}
+
+    def subscribe(self, job_id: str | None = None) -> ProgressSubscription:
+        """Subscribe to events for *job_id*, or for every job when ``None``."""
+        subscription = ProgressSubscription(self, job_id, self._buffer_size)
+        self._subscribers.setdefault(job_id, set()).add(subscription)
+        return subscription
+
+    def publish(self, event: dict) -> None:
+        """Deliver *event* (which must carry ``job_id``) without blocking."""
+        for key in (event.get("job_id"), None):
+            for subscription in self._subscribers.get(key, ()):
+                subscription._push(event)
+
+    def subscriber_count(self) -> int:
+        return sum(len(subs) for subs in self._subscribers.values())
+
+    def _unsubscribe(self, subscription: ProgressSubscription) -> None:
+        subs = self._subscribers.get(subscription.job_id)
+        if subs is None:
+            return
+        subs.discard(subscription)
+        if not subs:
+            del self._subscribers[subscription.job_id]
+
+
+# ---------------------------------------------------------------------------
+# Persistence throttle
+# ---------------------------------------------------------------------------
+
+
+class ProgressThrottle:
+    """Coalesce progress reports for one job into occasional database writes.
+
+    The latest ``(pct, message)`` is always kept in memory.  It is written
+    through *persist* when ``interval`` seconds have passed since the last
+    write, when the percentage crosses a multiple of ``milestone_pct``, on
+    100%, and on :meth:`flush`.
+
+    Parameters
+    ----------
+    persist:
+        Async callable ``(pct, message)`` that stores the progress.
+    interval:
+        Minimum seconds between writes that are not milestones.
+    milestone_pct:
+        Step at which a crossed percentage is always written; ``0`` disables.
+    """
+
+    def __init__(
+        self,
+        persist: Callable[[int, str], Awaitable[None]],
+        *,
+        interval: float = 2.0,
+        milestone_pct: int = 10,
+    ) -> None:
+        self._persist = persist
+        self._interval = max(0.0, interval)
+        self._milestone = max(0, milestone_pct)
+        self.pct = 0
+        self.message = ""
+        self._persisted: tuple[int, str] | None = None
+        self._persisted_at = float("-inf")
+        self.writes = 0
+
+    @property
+    def dirty(self) -> bool:
+        return self._persisted != (self.pct, self.message)
+
+    async def update(self, pct: int, message: str) -> None:
+        """Record progress and persist it if a write is due."""
+        previous = self._persisted[0] if self._persisted else 0
+        self.pct, self.message = pct, message
+        due = (
+            pct >= 100
+            or time.monotonic() - self._persisted_at >= self._interval
+            or (self._milestone and pct // self._milestone > previous // self._milestone)
+        )
+        if due:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Persist the latest progress if it has not been written yet."""
+        if not self.dirty:
+            return
+        state = (self.pct, self.message)
+        await self._persist(*state)
+        self._persisted = state
+        self._persisted_at = time.monotonic()
+        self.writes += 1
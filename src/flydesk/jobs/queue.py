@@ -0,0 +1,224 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""In-process job queue with priority lanes, fair scheduling and concurrency caps."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass, field
+
+from flydesk.jobs.models import JobPriority
+
+# Submitter key used for jobs without an explicit submitter (recovery, triggers).
+SYSTEM_SUBMITTER = "system"
+
+
+@dataclass
+class QueuedJob:
+    """A job id waiting in (or dispatched from) a :class:`JobQueue`."""
+
+    job_id: str
+    job_type: str
+    priority: JobPriority
+    submitter: str
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class _WaitStats:
+    """Queue wait-time statistics for one job type."""
+
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    last_seconds: float = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.last_seconds = seconds
+
+    def to_dict(self) -> dict:
+        return {
+            "dispatched": self.count,
+            "avg_wait_seconds": round(self.total_seconds / self.count, 3) if self.count else 0.0,
+            "max_wait_seconds": round(self.max_seconds, 3),
+            "last_wait_seconds": round(self.last_seconds, 3),
+        }
+
+
+class JobQueue:
+    """Dispatch queue for :class:`~flydesk.jobs.runner.JobRunner`.
+
+    Jobs wait in one of two lanes.  ``interactive`` jobs are preferred, but
+    after ``bulk_share`` consecutive interactive dispatches a waiting
+    ``bulk`` job gets a turn so bulk work is never starved.  Within a lane
+    submitters are served round-robin, and each submitter's jobs are FIFO.
+    A job is only dispatched while a global slot is free and its job type
+    is below its concurrency cap; jobs blocked by a cap are skipped over,
+    not waited on.
+
+    Parameters
+    ----------
+    max_concurrency:
+        Jobs that may run at once across all types.
+    type_limits:
+        Optional per-``job_type`` concurrency caps.
+    bulk_share:
+        Interactive dispatches after which a waiting bulk job goes next.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = 4,
+        type_limits: dict[str, int] | None = None,
+        bulk_share: int = 4,
+    ) -> None:
+        self._max_concurrency = max(1, max_concurrency)
+        self._type_limits = dict(type_limits or {})
+        self._bulk_share = max(1, bulk_share)
+        self._lanes: dict[JobPriority, OrderedDict[str, deque[QueuedJob]]] = {
+            priority: OrderedDict() for priority in JobPriority
+        }
+        self._running: Counter[str] = Counter()
+        self._interactive_streak = 0
+        self._wait: dict[str, _WaitStats] = {}
+        self._changed = asyncio.Condition()
+
+    # -- Producer side -------------------------------------------------------
+
+    async def put(self, entry: QueuedJob) -> None:
+        lane = self._lanes[entry.priority]
+        lane.setdefault(entry.submitter, deque()).append(entry)
+        async with self._changed:
+            self._changed.notify_all()
+
+    # -- Consumer side -------------------------------------------------------
+
+    async def get(self) -> QueuedJob:
+        """Wait for the next dispatchable job and reserve a slot for it.
+
+        The caller must call :meth:`task_done` once the job has finished.
+        """
+        async with self._changed:
+            while True:
+                entry = self._pick()
+                if entry is not None:
+                    break
+                await self._changed.wait()
+        self.mark_started(entry)
+        return entry
+
+    async def wait_for_slot(self) -> None:
+        """Wait until fewer than ``max_concurrency`` jobs are running."""
+        async with self._changed:
+            while sum(self._running.values()) >= self._max_concurrency:
+                await self._changed.wait()
+
+    def saturated_types(self) -> set[str]:
+        """Job types currently at their concurrency cap."""
+        return {t for t in self._type_limits if not self._has_capacity(t)}
+
+    def mark_started(self, entry: QueuedJob) -> None:
+        """Account for *entry* as running, including jobs claimed elsewhere.
+
+        The caller must call :meth:`task_done` once the job has finished.
+        """
+        self._running[entry.job_type] += 1
+        self._wait.setdefault(entry.job_type, _WaitStats()).record(
+            max(0.0, time.monotonic() - entry.enqueued_at)
+        )
+
+    async def task_done(self, entry: QueuedJob) -> None:
+        """Release the slot reserved for *entry*."""
+        self._running[entry.job_type] -= 1
+        if self._running[entry.job_type] <= 0:
+            del self._running[entry.job_type]
+        async with self._changed:
+            self._changed.notify_all()
+
+    # -- Metrics -------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return sum(len(q) for lane in self._lanes.values() for q in lane.values())
+
+    def stats(self) -> dict:
+        """Queue depth, running counts and wait times, overall and per job type."""
+        now = time.monotonic()
+        queued: Counter[str] = Counter()
+        oldest: dict[str, float] = {}
+        lanes: dict[str, int] = {}
+        for priority, lane in self._lanes.items():
+            lanes[priority.value] = sum(len(q) for q in lane.values())
+            for q in lane.values():
+                for entry in q:
+                    queued[entry.job_type] += 1
+                    age = now - entry.enqueued_at
+                    oldest[entry.job_type] = max(oldest.get(entry.job_type, 0.0), age)
+
+        job_types: dict[str, dict] = {}
+        for job_type in sorted(set(queued) | set(self._running) | set(self._wait)):
+            job_types[job_type] = {
+                "queued": queued[job_type],
+                "running": self._running[job_type],
+                "limit": self._type_limits.get(job_type),
+                "oldest_queued_seconds": round(oldest.get(job_type, 0.0), 3),
+                **self._wait.get(job_type, _WaitStats()).to_dict(),
+            }
+        return {
+            "max_concurrency": self._max_concurrency,
+            "running": sum(self._running.values()),
+            "queued": sum(lanes.values()),
+            "lanes": lanes,
+            "job_types": job_types,
+        }
+
+    # -- Selection -----------------------------------------------------------
+
+    def _pick(self) -> QueuedJob | None:
+        if sum(self._running.values()) >= self._max_concurrency:
+            return None
+        bulk_turn = self._interactive_streak >= self._bulk_share
+        order = (
+            (JobPriority.BULK, JobPriority.INTERACTIVE)
+            if bulk_turn
+            else (JobPriority.INTERACTIVE, JobPriority.BULK)
+        )
+        for priority in order:
+            entry = self._pick_from(self._lanes[priority])
+            if entry is None:
+                continue
+            if priority is JobPriority.INTERACTIVE:
+                self._interactive_streak += 1
+            else:
+                self._interactive_streak = 0
+            return entry
+        return None
+
+    def _pick_from(self, lane: OrderedDict[str, deque[QueuedJob]]) -> QueuedJob | None:
+        """Take the first eligible job, serving submitters round-robin."""
+        for submitter in list(lane):
+            pending = lane[submitter]
+            for index, entry in enumerate(pending):
+                if self._has_capacity(entry.job_type):
+                    del pending[index]
+                    # Move the submitter to the back of the rotation.
+                    lane.move_to_end(submitter)
+                    if not pending:
+                        del lane[submitter]
+                    return entry
+        return None
+
+    def _has_capacity(self, job_type: str) -> bool:
+        limit = self._type_limits.get(job_type)
+        return limit is None or self._running[job_type] < limit
@@ -15,16 +15,20 @@ import logging
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
-from sqlalchemy import delete, select
+from sqlalchemy import and_, case, delete, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from flydesk.jobs.models import Job, JobStatus
+from flydesk.jobs.models import Job, JobPriority, JobStatus
 from flydesk.models.job import JobRow
 
 logger = logging.getLogger(__name__)
 
 _UNSET = object()
 
+# A claim re-checks its condition in the UPDATE, so on databases without
+# SKIP LOCKED (SQLite) a lost race just moves on to the next candidate.
+_CLAIM_ATTEMPTS = 5
+
 
 def _to_json(value: Any) -> str | None:
     """Serialize a Python object to a JSON string for SQLite Text columns."""
@@ -61,6 +65,8 @@ class JobRepository:
                 error=job.error,
                 payload_json=_to_json(job.payload),
                 checkpoint_json=_to_json(job.checkpoint),
+                priority=job.priority.value,
+                submitter=job.submitter,
                 created_at=job.created_at,
                 started_at=job.started_at,
                 completed_at=job.completed_at,
@@ -123,6 +129,9 @@ class JobRepository:
                 row.completed_at = completed_at
             if checkpoint is not _UNSET:
                 row.checkpoint_json = _to_json(checkpoint)
+            if status != JobStatus.RUNNING:
+                row.lease_owner = None
+                row.lease_expires_at = None
             await session.commit()
 
     async def update_progress(
@@ -141,6 +150,121 @@ class JobRepository:
             row.progress_message = progress_message
             await session.commit()
 
+    # -- Leases (database queue backend) ------------------------------------
+
+    async def claim_next(
+        self,
+        worker_id: str,
+        *,
+        job_types: list[str],
+        lease_seconds: float,
+    ) -> Job | None:
+        """Atomically claim the next runnable job of one of *job_types*.
+
+        Pending jobs are claimable, as are running jobs whose lease has
+        expired (their worker crashed or stopped heartbeating).  Interactive
+        jobs are claimed before bulk jobs, oldest first.  On PostgreSQL the
+        candidate row is locked with ``FOR UPDATE SKIP LOCKED`` so concurrent
+        workers never contend for the same row; on SQLite the conditional
+        UPDATE alone guarantees a job is claimed only once.
+        """
+        if not job_types:
+            return None
+        now = datetime.now(timezone.utc)
+        claimable = and_(
+            JobRow.job_type.in_(job_types),
+            or_(
+                JobRow.status == JobStatus.PENDING.value,
+                and_(
+                    JobRow.status == JobStatus.RUNNING.value,
+                    or_(JobRow.lease_expires_at.is_(None), JobRow.lease_expires_at < now),
+                ),
+            ),
+        )
+        candidates = (
+            select(JobRow.id)
+            .where(claimable)
+            .order_by(
+                case((JobRow.priority == JobPriority.INTERACTIVE.value, 0), else_=1),
+                JobRow.created_at,
+            )
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        async with self._session_factory() as session:
+            for _ in range(_CLAIM_ATTEMPTS):
+                job_id = (await session.execute(candidates)).scalar_one_or_none()
+                if job_id is None:
+                    await session.rollback()
+                    return None
+                result = await session.execute(
+                    update(JobRow)
+                    .where(JobRow.id == job_id, claimable)
+                    .values(
+                        status=JobStatus.RUNNING.value,
+                        lease_owner=worker_id,
+                        lease_expires_at=now + timedelta(seconds=lease_seconds),
+                        attempts=JobRow.attempts + 1,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                await session.commit()
+                if result.rowcount == 1:
+                    row = await session.get(JobRow, job_id, populate_existing=True)
+                    return self._row_to_job(row) if row is not None else None
+        return None
+
+    async def renew_lease(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        """Extend *worker_id*'s lease on a running job.
+
+        Returns ``False`` when the lease is no longer held -- the job was
+        cancelled, paused or finished, or another worker reclaimed it.
+        """
+        async with self._session_factory() as session:
+            result = await session.execute(
+                update(JobRow)
+                .where(
+                    JobRow.id == job_id,
+                    JobRow.lease_owner == worker_id,
+                    JobRow.status == JobStatus.RUNNING.value,
+                )
+                .values(
+                    lease_expires_at=datetime.now(timezone.utc) + timedelta(seconds=lease_seconds)
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+            return result.rowcount == 1
+
+    async def release_lease(self, job_id: str, worker_id: str) -> bool:
+        """Return a job still leased by *worker_id* to the pending state."""
+        async with self._session_factory() as session:
+            result = await session.execute(
+                update(JobRow)
+                .where(
+                    JobRow.id == job_id,
+                    JobRow.lease_owner == worker_id,
+                    JobRow.status == JobStatus.RUNNING.value,
+                )
+                .values(status=JobStatus.PENDING.value, lease_owner=None, lease_expires_at=None)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+            return result.rowcount == 1
+
+    async def pending_counts(self) -> dict[str, dict[str, int]]:
+        """Number of pending jobs per job type and priority lane."""
+        async with self._session_factory() as session:
+            result = await session.execute(
+                select(JobRow.job_type, JobRow.priority, func.count())
+                .where(JobRow.status == JobStatus.PENDING.value)
+                .group_by(JobRow.job_type, JobRow.priority)
+            )
+            counts: dict[str, dict[str, int]] = {}
+            for job_type, priority, count in result.all():
+                counts.setdefault(job_type, {})[priority] = count
+            return counts
+
     async def cleanup_old(self, max_age_days: int = 30) -> int:
         """Delete completed/failed/cancelled jobs older than *max_age_days*.
 
@@ -174,6 +298,9 @@ class JobRepository:
             error=row.error,
             payload=_from_json(row.payload_json) or {},
             checkpoint=_from_json(row.checkpoint_json),
+            priority=JobPriority(row.priority or JobPriority.INTERACTIVE.value),
+            submitter=row.submitter,
+            attempts=row.attempts or 0,
             created_at=row.created_at,
             started_at=row.started_at,
             completed_at=row.completed_at,
@@ -12,13 +12,19 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
+import socket
+import time
 import uuid
 from datetime import datetime, timezone
 
 from flydesk.config import DeskConfig
 from flydesk.jobs.dead_letter import DeadLetterRepository
 from flydesk.jobs.handlers import ExecutionResult, JobHandler, ProgressCallback
-from flydesk.jobs.models import Job, JobStatus
+from flydesk.jobs.models import Job, JobPriority, JobStatus
+from flydesk.jobs.notify import JobNotifier, LocalJobNotifier
+from flydesk.jobs.progress import ProgressHub, ProgressThrottle
+from flydesk.jobs.queue import SYSTEM_SUBMITTER, JobQueue, QueuedJob
 from flydesk.jobs.repository import JobRepository
 
 logger = logging.getLogger(__name__)
@@ -27,11 +33,25 @@ logger = logging.getLogger(__name__)
 class JobRunner:
     """Manages job submission, queuing, and dispatching to typed handlers.
 
-    Uses an internal ``asyncio.Queue`` for job dispatching, similar to the
-    existing indexing queue infrastructure.
-
-    Progress updates are persisted in the database *and* broadcast to any
-    registered SSE listeners via the ``on_sse_progress`` callback.
+    Jobs are dispatched from a :class:`JobQueue` to a pool of concurrent
+    workers: up to ``job_max_concurrency`` jobs run at once, each job type
+    may be capped by ``job_type_concurrency``, and long-running types listed
+    in ``job_bulk_types`` run in the bulk lane so they cannot hold up short
+    interactive jobs.
+
+    With ``job_queue_backend="database"`` the queue lives in the ``jobs``
+    table instead of process memory, so any replica may run any job: workers
+    claim jobs atomically with a lease (``job_lease_seconds``) that they renew
+    while the job runs, and a job whose worker crashed becomes claimable
+    again once its lease expires.  Idle workers are woken by *notifier*
+    (PostgreSQL ``LISTEN/NOTIFY`` or Redis) and otherwise poll every
+    ``job_poll_interval_seconds``.
+
+    Progress updates are coalesced before they are persisted (at most every
+    ``job_progress_interval_seconds``, on ``job_progress_milestone_pct``
+    steps, and when the job finishes) and every update is broadcast to SSE
+    subscribers through :attr:`progress_hub`.  The ``on_sse_progress`` queue,
+    if given, additionally receives every update.
     """
 
     def __init__(
@@ -41,17 +61,30 @@ class JobRunner:
         config: DeskConfig | None = None,
         on_sse_progress: asyncio.Queue | None = None,
         dead_letter: DeadLetterRepository | None = None,
+        notifier: JobNotifier | None = None,
+        progress_hub: ProgressHub | None = None,
     ) -> None:
         self._repo = repo
         self._config = config or DeskConfig()
+        self._shared_queue = self._config.job_queue_backend == "database"
+        self._notifier = notifier or LocalJobNotifier()
+        self._worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._wakeup = asyncio.Event()
+        self._claimed: dict[str, QueuedJob] = {}
         self._dead_letter = dead_letter
         self._handlers: dict[str, JobHandler] = {}
-        self._queue: asyncio.Queue[str] = asyncio.Queue()
+        self._queue = JobQueue(
+            max_concurrency=self._config.job_max_concurrency,
+            type_limits=self._config.job_type_concurrency,
+            bulk_share=self._config.job_bulk_share,
+        )
         self._running = False
         self._task: asyncio.Task[None] | None = None
+        self._workers: set[asyncio.Task[None]] = set()
         self._pause_requests: set[str] = set()
         # Optional queue where SSE progress events are published for streaming.
         self._sse_queue: asyncio.Queue | None = on_sse_progress
+        self._progress_hub = progress_hub or ProgressHub()
 
     # -- Handler registration ------------------------------------------------
 
@@ -62,9 +95,20 @@ class JobRunner:
 
     # -- Submission ----------------------------------------------------------
 
-    async def submit(self, job_type: str, payload: dict) -> Job:
+    async def submit(
+        self,
+        job_type: str,
+        payload: dict,
+        *,
+        priority: JobPriority | None = None,
+        submitter: str | None = None,
+    ) -> Job:
         """Create a new pending job and enqueue it for processing.
 
+        *priority* defaults to the lane configured for *job_type*; *submitter*
+        (typically a user id) is used to share the queue fairly between
+        callers.
+
         Returns the newly created ``Job`` domain object.
         """
         if job_type not in self._handlers:
@@ -76,17 +120,58 @@ class JobRunner:
             status=JobStatus.PENDING,
             payload=payload,
             created_at=datetime.now(timezone.utc),
+            priority=priority or self.priority_for(job_type),
+            submitter=submitter,
         )
         await self._repo.create(job)
-        await self._queue.put(job.id)
+        if self._shared_queue:
+            await self._notifier.publish()
+        else:
+            await self._enqueue(job.id, job_type, priority=job.priority, submitter=submitter)
         logger.debug("Submitted job %s (type=%s)", job.id, job_type)
         return job
 
+    def priority_for(self, job_type: str) -> JobPriority:
+        """Default lane for *job_type*."""
+        if job_type in self._config.job_bulk_types:
+            return JobPriority.BULK
+        return JobPriority.INTERACTIVE
+
+    async def stats(self) -> dict:
+        """Queue depth, running jobs and queue wait times per job type.
+
+        With the database backend, queued counts cover every replica while
+        running counts and wait times are for this worker only.
+        """
+        stats = self._queue.stats()
+        stats["backend"] = self._config.job_queue_backend
+        if not self._shared_queue:
+            return stats
+        stats["worker_id"] = self._worker_id
+        lanes = {p.value: 0 for p in JobPriority}
+        for job_type, by_lane in (await self._repo.pending_counts()).items():
+            entry = stats["job_types"].setdefault(
+                job_type,
+                {"queued": 0, "running": 0, "limit": self._config.job_type_concurrency.get(job_type)},
+            )
+            entry["queued"] = sum(by_lane.values())
+            for lane, count in by_lane.items():
+                lanes[lane] = lanes.get(lane, 0) + count
+        stats["lanes"] = lanes
+        stats["queued"] = sum(lanes.values())
+        return stats
+
     # -- Lifecycle -----------------------------------------------------------
 
     async def start(self) -> None:
         """Start the background consumer loop and recover interrupted jobs."""
         self._running = True
+        if self._shared_queue:
+            # Pending jobs and expired leases are picked up by the claim loop.
+            await self._notifier.start(self._wakeup.set)
+            self._task = asyncio.create_task(self._claim_loop())
+            logger.info("JobRunner started (database queue, worker=%s)", self._worker_id)
+            return
         self._task = asyncio.create_task(self._consume_loop())
         logger.info("JobRunner started")
 
@@ -99,7 +184,7 @@ class JobRunner:
                     if status == JobStatus.RUNNING:
                         # Reset to pending — it was interrupted mid-execution
                         await self._repo.update_status(job.id, JobStatus.PENDING)
-                    await self._queue.put(job.id)
+                    await self._enqueue(job.id, job.job_type)
                     recovered += 1
                 else:
                     # No handler registered — mark as failed
@@ -112,21 +197,32 @@ class JobRunner:
             logger.info("Recovered %d interrupted job(s)", recovered)
 
     async def stop(self) -> None:
-        """Gracefully stop the consumer loop."""
+        """Stop dispatching and cancel jobs that are still running."""
         self._running = False
-        if self._task is not None:
-            self._task.cancel()
-            try:
-                await self._task
-            except asyncio.CancelledError:
-                pass
-            self._task = None
+        tasks = [t for t in (self._task, *self._workers) if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._workers.clear()
+        if self._shared_queue:
+            # Hand interrupted jobs back so another replica can pick them up
+            # immediately rather than after their lease expires.
+            for job_id in list(self._claimed):
+                await self._repo.release_lease(job_id, self._worker_id)
+            self._claimed.clear()
+            await self._notifier.stop()
         logger.info("JobRunner stopped")
 
     @property
     def is_running(self) -> bool:
         return self._running
 
+    @property
+    def progress_hub(self) -> ProgressHub:
+        """Broadcast hub carrying live progress for jobs run by this process."""
+        return self._progress_hub
+
     # -- Pause / Resume ------------------------------------------------------
 
     def request_pause(self, job_id: str) -> None:
@@ -142,21 +238,134 @@ class JobRunner:
     async def resume(self, job_id: str) -> None:
         """Re-enqueue a paused job for execution."""
         await self._repo.update_status(job_id, JobStatus.PENDING)
-        await self._queue.put(job_id)
+        if self._shared_queue:
+            await self._notifier.publish()
+            return
+        job = await self._repo.get(job_id)
+        if job is not None:
+            await self._enqueue(job_id, job.job_type)
 
     # -- Internal consumer ---------------------------------------------------
 
+    async def _enqueue(
+        self,
+        job_id: str,
+        job_type: str,
+        *,
+        priority: JobPriority | None = None,
+        submitter: str | None = None,
+    ) -> None:
+        await self._queue.put(
+            QueuedJob(
+                job_id=job_id,
+                job_type=job_type,
+                priority=priority or self.priority_for(job_type),
+                submitter=submitter or SYSTEM_SUBMITTER,
+            )
+        )
+
     async def _consume_loop(self) -> None:
-        """Main consumer loop -- pulls job IDs and dispatches to handlers."""
+        """Main dispatch loop -- starts a worker task for each dispatchable job."""
         while self._running:
             try:
-                job_id = await asyncio.wait_for(self._queue.get(), timeout=1.0)
-            except (asyncio.TimeoutError, TimeoutError):
-                continue
+                entry = await self._queue.get()
             except asyncio.CancelledError:
                 break
+            worker = asyncio.create_task(self._run_worker(entry))
+            self._workers.add(worker)
+            worker.add_done_callback(self._workers.discard)
+
+    async def _claim_loop(self) -> None:
+        """Dispatch loop for the database backend -- claims jobs as slots free up."""
+        while self._running:
+            await self._queue.wait_for_slot()
+            self._wakeup.clear()
+            job_types = [t for t in self._handlers if t not in self._queue.saturated_types()]
+            try:
+                job = await self._repo.claim_next(
+                    self._worker_id,
+                    job_types=job_types,
+                    lease_seconds=self._config.job_lease_seconds,
+                )
+            except Exception:
+                logger.exception("Failed to claim a job")
+                job = None
+            if job is None:
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(), timeout=self._config.job_poll_interval_seconds
+                    )
+                except (asyncio.TimeoutError, TimeoutError):
+                    pass
+                continue
+
+            created = job.created_at
+            if created.tzinfo is None:
+                # SQLite drops the offset; timestamps are stored in UTC.
+                created = created.replace(tzinfo=timezone.utc)
+            waited = max(0.0, (datetime.now(timezone.utc) - created).total_seconds())
+            entry = QueuedJob(
+                job_id=job.id,
+                job_type=job.job_type,
+                priority=job.priority,
+                submitter=job.submitter or SYSTEM_SUBMITTER,
+                enqueued_at=time.monotonic() - waited,
+            )
+            self._queue.mark_started(entry)
+            self._claimed[job.id] = entry
+            worker = asyncio.create_task(self._run_claimed(entry, job))
+            self._workers.add(worker)
+            worker.add_done_callback(self._workers.discard)
+
+    async def _run_claimed(self, entry: QueuedJob, job: Job) -> None:
+        heartbeat = asyncio.create_task(self._heartbeat(job.id, asyncio.current_task()))
+        try:
+            if job.attempts > self._config.job_max_attempts:
+                await self._fail(
+                    job,
+                    f"Job {job.id} abandoned after {job.attempts - 1} expired lease(s)",
+                    "lease_expired",
+                )
+                return
+            await self._execute_job(job.id)
+        except asyncio.CancelledError:
+            if self._running:
+                logger.warning("Job %s stopped: lease lost", job.id)
+            else:
+                raise
+        except Exception:
+            logger.exception("Unhandled error while running job %s", job.id)
+        finally:
+            heartbeat.cancel()
+            if self._running:
+                self._claimed.pop(job.id, None)
+            await self._queue.task_done(entry)
+            self._wakeup.set()
+
+    async def _heartbeat(self, job_id: str, execution: asyncio.Task | None) -> None:
+        """Renew the lease on *job_id*; cancel *execution* if it is lost."""
+        interval = max(self._config.job_lease_seconds / 3, 0.05)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                held = await self._repo.renew_lease(
+                    job_id, self._worker_id, self._config.job_lease_seconds
+                )
+            except Exception:
+                logger.warning("Lease renewal for job %s failed", job_id, exc_info=True)
+                continue
+            if not held:
+                if execution is not None:
+                    execution.cancel()
+                return
 
-            await self._execute_job(job_id)
+    async def _run_worker(self, entry: QueuedJob) -> None:
+        try:
+            await self._execute_job(entry.job_id)
+        except Exception:
+            logger.exception("Unhandled error while running job %s", entry.job_id)
+        finally:
+            await self._queue.task_done(entry)
 
     async def _execute_job(self, job_id: str) -> None:
         """Load, execute, and finalise a single job."""
@@ -187,9 +396,16 @@ class JobRunner:
         now = datetime.now(timezone.utc)
         await self._repo.update_status(job_id, JobStatus.RUNNING, started_at=now)
 
-        # Build progress callback
+        # Build progress callback; writes are coalesced by the throttle.
+        progress = ProgressThrottle(
+            lambda pct, message: self._repo.update_progress(job_id, pct, message),
+            interval=self._config.job_progress_interval_seconds,
+            milestone_pct=self._config.job_progress_milestone_pct,
+        )
+
         async def _on_progress(pct: int, message: str) -> None:
-            await self._repo.update_progress(job_id, pct, message)
+            await progress.update(pct, message)
+            self._publish_progress(job, JobStatus.RUNNING, pct, message)
             if self._sse_queue is not None:
                 await self._sse_queue.put(
                     {
@@ -215,18 +431,22 @@ class JobRunner:
             # Handle pause: handler returned an ExecutionResult with checkpoint
             if isinstance(raw_result, ExecutionResult) and raw_result.is_paused:
                 self.clear_pause_request(job_id)
+                await progress.flush()
                 await self._repo.update_status(
                     job_id, JobStatus.PAUSED,
                     checkpoint=raw_result.checkpoint,
                 )
+                self._publish_progress(job, JobStatus.PAUSED, progress.pct, progress.message)
                 logger.info("Job %s paused with checkpoint", job_id)
                 return
 
             result = raw_result.result if isinstance(raw_result, ExecutionResult) else raw_result
 
             # Re-check status — job may have been cancelled while running
+            await progress.flush()
             current = await self._repo.get(job_id)
             if current and current.status == JobStatus.CANCELLED:
+                self._publish_progress(job, JobStatus.CANCELLED, progress.pct, progress.message)
                 logger.info("Job %s was cancelled during execution", job_id)
                 return
             await self._repo.update_status(
@@ -237,40 +457,46 @@ class JobRunner:
             )
             # Only set generic "Complete" if the handler didn't already send
             # its own 100% message (which is more descriptive).
-            current_job = await self._repo.get(job_id)
-            if current_job is None or current_job.progress_pct < 100:
-                await self._repo.update_progress(job_id, 100, "Complete")
+            if progress.pct < 100:
+                await progress.update(100, "Complete")
+            self._publish_progress(job, JobStatus.COMPLETED, progress.pct, progress.message)
             logger.info("Job %s completed successfully", job_id)
         except (asyncio.TimeoutError, TimeoutError):
             error_msg = (
                 f"Job {job_id} timed out after {self._config.job_timeout_seconds}s"
             )
             logger.error(error_msg)
-            await self._repo.update_status(
-                job_id,
-                JobStatus.FAILED,
-                error=error_msg,
-                completed_at=datetime.now(timezone.utc),
-            )
-            if self._dead_letter:
-                await self._dead_letter.add(
-                    source_type="job",
-                    source_id=job_id,
-                    payload={"job_type": str(getattr(job, "job_type", "")), "error_context": "timeout"},
-                    error=error_msg,
-                )
+            await progress.flush()
+            await self._fail(job, error_msg, "timeout")
         except Exception as exc:
             logger.exception("Job %s failed", job_id)
-            await self._repo.update_status(
-                job_id,
-                JobStatus.FAILED,
-                error=str(exc),
-                completed_at=datetime.now(timezone.utc),
+            await progress.flush()
+            await self._fail(job, str(exc), "execution_failure")
+
+    def _publish_progress(self, job: Job, status: JobStatus, pct: int, message: str) -> None:
+        self._progress_hub.publish(
+            {
+                "job_id": job.id,
+                "job_type": job.job_type,
+                "status": status.value,
+                "progress_pct": pct,
+                "progress_message": message,
+            }
+        )
+
+    async def _fail(self, job: Job, error: str, context: str) -> None:
+        """Mark *job* failed and record it in the dead-letter queue."""
+        await self._repo.update_status(
+            job.id,
+            JobStatus.FAILED,
+            error=error,
+            completed_at=datetime.now(timezone.utc),
+        )
+        self._publish_progress(job, JobStatus.FAILED, job.progress_pct, job.progress_message)
+        if self._dead_letter:
+            await self._dead_letter.add(
+                source_type="job",
+                source_id=job.id,
+                payload={"job_type": str(job.job_type), "error_context": context},
+                error=error,
             )
-            if self._dead_letter:
-                await self._dead_letter.add(
-                    source_type="job",
-                    source_id=job_id,
-                    payload={"job_type": str(getattr(job, "job_type", "")), "error_context": "execution_failure"},
-                    error=str(exc),
-                )
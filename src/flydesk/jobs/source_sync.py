@@ -6,27 +6,94 @@
 #
 #     http://www.apache.org/licenses/LICENSE-2.0
 
-"""Source sync job handler -- detects new/changed files in cloud sources."""
+"""Source sync job handler -- incremental sync of cloud document sources.
+
+Each sync compares the provider's listing against a per-source manifest of
+what was imported last time (``document_source_manifest``).  Only objects
+whose ETag/version, modification time or size changed are downloaded, and
+only those whose content hash actually changed are enqueued for indexing;
+objects that disappeared are deleted from the knowledge base.  Drives that
+expose a change feed (:class:`~flydesk.knowledge.document_source.DriveChangeFeed`)
+are read incrementally from the cursor stored at the previous sync.
+"""
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import logging
+import mimetypes
+import uuid
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from pathlib import PurePosixPath
+from typing import TYPE_CHECKING, Any
 
 from flydesk.api.document_sources import _ensure_adapters_loaded
+from flydesk.files.extractor import ContentExtractor
 from flydesk.jobs.handlers import ProgressCallback
 from flydesk.knowledge.document_source import (
     BlobStorageProvider,
     DocumentSourceFactory,
+    DriveChangeFeed,
     DriveProvider,
 )
-from flydesk.knowledge.document_source_repository import DocumentSourceRepository
+from flydesk.knowledge.document_source_repository import (
+    DocumentSourceRepository,
+    ManifestEntry,
+)
+from flydesk.knowledge.queue import IndexingQueueProducer, IndexingTask
+
+if TYPE_CHECKING:
+    from flydesk.knowledge.indexer import KnowledgeIndexer
 
 logger = logging.getLogger(__name__)
 
+# Text formats the content extractor does not claim by MIME type.
+_TEXT_EXTENSIONS = frozenset({".md", ".txt", ".json", ".yaml", ".yml"})
+
+# Google Workspace files are downloaded in their export format.
+_GOOGLE_EXPORT_TYPES = {
+    "application/vnd.google-apps.document": (
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    ),
+    "application/vnd.google-apps.spreadsheet": (
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    ),
+    "application/vnd.google-apps.presentation": "application/pdf",
+}
+
+
+@dataclass
+class _RemoteObject:
+    """An object as reported by the provider listing."""
+
+    container: str
+    key: str
+    name: str
+    etag: str = ""
+    modified_at: str = ""
+    size: int = 0
+    content_type: str = ""
+    is_drive: bool = False
+
+    @property
+    def manifest_key(self) -> tuple[str, str]:
+        return (self.container, self.key)
+
+
+@dataclass
+class _Listing:
+    """Objects seen (all of them, or only changes) and removals for one sync."""
+
+    seen: dict[tuple[str, str], _RemoteObject] = field(default_factory=dict)
+    removed: set[tuple[str, str]] = field(default_factory=set)
+    cursors: dict[str, str] = field(default_factory=dict)
+
 
 class SourceSyncHandler:
-    """Syncs document sources by detecting new/changed files.
+    """Syncs document sources by importing new/changed files.
 
     Conforms to the :class:`~flydesk.jobs.handlers.JobHandler` protocol so it
     can be registered with the :class:`~flydesk.jobs.runner.JobRunner` under
@@ -35,10 +102,37 @@ class SourceSyncHandler:
     When executed via the job runner the *payload* must contain a
     ``"source_id"`` key.  The handler can also be called directly through
     :meth:`sync_source` for ad-hoc / cron-based sync.
+
+    Without an indexing producer the handler only detects changes: it
+    reports them but neither downloads anything nor advances the manifest.
+
+    Parameters
+    ----------
+    indexer:
+        Used to delete documents for objects that were removed or replaced.
+    producer:
+        Indexing queue that changed objects are enqueued on.
+    max_concurrent_downloads:
+        Objects downloaded from the provider at the same time.
     """
 
-    def __init__(self, source_repo: DocumentSourceRepository) -> None:
+    def __init__(
+        self,
+        source_repo: DocumentSourceRepository,
+        *,
+        indexer: KnowledgeIndexer | None = None,
+        producer: IndexingQueueProducer | None = None,
+        max_concurrent_downloads: int = 8,
+    ) -> None:
         self._source_repo = source_repo
+        self._indexer = indexer
+        self._producer = producer
+        self._max_downloads = max(1, max_concurrent_downloads)
+        self._extractor = ContentExtractor()
+
+    def set_indexing_producer(self, producer: IndexingQueueProducer) -> None:
+        """Set the queue changed objects are enqueued on (wired after startup)."""
+        self._producer = producer
 
     # -- JobHandler protocol ---------------------------------------------------
 
@@ -76,37 +170,276 @@ class SourceSyncHandler:
         adapter = DocumentSourceFactory.create(row.source_type, config)
 
         try:
-            file_count = 0
-            if isinstance(adapter, BlobStorageProvider):
-                containers = await adapter.list_containers()
-                for container in containers:
-                    objects = await adapter.list_objects(container.name)
-                    file_count += len(objects)
-            elif isinstance(adapter, DriveProvider):
-                drives = await adapter.list_drives()
-                for drive in drives:
-                    items = await adapter.list_items(drive.id)
-                    file_count += len([i for i in items if not i.is_folder])
+            manifest = await self._source_repo.get_manifest(source_id)
+            listing = await self._list(adapter, manifest, _decode_cursors(row))
 
+            changed = [
+                obj
+                for key, obj in listing.seen.items()
+                if (entry := manifest.get(key)) is None
+                or not entry.matches(obj.etag, obj.modified_at, obj.size)
+            ]
+            removed = [key for key in listing.removed if key in manifest]
+            files = (set(manifest) | set(listing.seen)) - listing.removed
             now = datetime.now(timezone.utc)
-            await self._source_repo.update_last_sync(source_id, now)
-
-            return {
+            summary: dict[str, Any] = {
                 "source_id": source_id,
                 "source_type": row.source_type,
-                "files_found": file_count,
-                "synced_at": now.isoformat(),
+                "files_found": len(files),
+                "changed": len(changed),
+                "removed": len(removed),
             }
+
+            if self._producer is None:
+                await self._source_repo.update_last_sync(source_id, now)
+                summary["synced_at"] = now.isoformat()
+                return summary
+
+            counts, upserts, failed_containers = await self._import(
+                adapter, source_id, row.source_type, changed, manifest
+            )
+            for key in removed:
+                await self._delete_document(manifest[key].document_id)
+
+            # A change feed only reports a change once, so keep the old cursor
+            # for drives with failed downloads and see them again next time.
+            previous = _decode_cursors(row)
+            cursors = {
+                drive: previous.get(drive, "") if drive in failed_containers else cursor
+                for drive, cursor in listing.cursors.items()
+            }
+            await self._source_repo.save_sync_state(
+                source_id,
+                upserts=upserts,
+                removed=removed,
+                cursors={**previous, **cursors} if cursors else None,
+                synced_at=now,
+            )
+            summary.update(counts)
+            summary["synced_at"] = now.isoformat()
+            return summary
         except Exception as exc:
             logger.exception("Sync failed for source %s", source_id)
             return {"error": str(exc), "source_id": source_id}
         finally:
             await adapter.aclose()
 
+    # -- Listing ---------------------------------------------------------------
+
+    async def _list(
+        self,
+        adapter: BlobStorageProvider | DriveProvider,
+        manifest: dict[tuple[str, str], ManifestEntry],
+        cursors: dict[str, str],
+    ) -> _Listing:
+        listing = _Listing()
+        if isinstance(adapter, BlobStorageProvider):
+            # Object stores have no change feed; a metadata listing is cheap
+            # and compared against the manifest without downloading anything.
+            for container in await adapter.list_containers():
+                objects = await adapter.list_objects(container.name)
+                for obj in objects:
+                    remote = _RemoteObject(
+                        container=container.name,
+                        key=obj.key,
+                        name=obj.key,
+                        etag=obj.etag,
+                        modified_at=obj.last_modified,
+                        size=obj.size,
+                        content_type=obj.content_type,
+                    )
+                    listing.seen[remote.manifest_key] = remote
+                listing.removed |= _missing(manifest, container.name, listing.seen)
+        elif isinstance(adapter, DriveProvider):
+            for drive in await adapter.list_drives():
+                if isinstance(adapter, DriveChangeFeed):
+                    await self._list_drive_changes(
+                        adapter, drive.id, manifest, cursors.get(drive.id), listing
+                    )
+                    continue
+                for item in await adapter.list_items(drive.id):
+                    if not item.is_folder:
+                        remote = _from_drive_item(drive.id, item)
+                        listing.seen[remote.manifest_key] = remote
+                listing.removed |= _missing(manifest, drive.id, listing.seen)
+        return listing
+
+    async def _list_drive_changes(
+        self,
+        adapter: DriveChangeFeed,
+        drive_id: str,
+        manifest: dict[tuple[str, str], ManifestEntry],
+        cursor: str | None,
+        listing: _Listing,
+    ) -> None:
+        changes = None
+        if cursor:
+            try:
+                changes = await adapter.list_changes(drive_id, cursor)
+            except Exception:
+                # Expired or invalid cursor: fall back to a full enumeration.
+                logger.warning(
+                    "Change feed cursor for drive %s rejected; resyncing", drive_id,
+                    exc_info=True,
+                )
+        full = changes is None
+        if changes is None:
+            changes = await adapter.list_changes(drive_id, None)
+
+        for item in changes.items:
+            remote = _from_drive_item(drive_id, item)
+            listing.seen[remote.manifest_key] = remote
+        listing.removed |= {(drive_id, item_id) for item_id in changes.removed_ids}
+        if full:
+            listing.removed |= _missing(manifest, drive_id, listing.seen)
+        if changes.cursor:
+            listing.cursors[drive_id] = changes.cursor
+
+    # -- Import ----------------------------------------------------------------
+
+    async def _import(
+        self,
+        adapter: BlobStorageProvider | DriveProvider,
+        source_id: str,
+        source_type: str,
+        changed: list[_RemoteObject],
+        manifest: dict[tuple[str, str], ManifestEntry],
+    ) -> tuple[dict[str, int], list[ManifestEntry], set[str]]:
+        """Download *changed* objects with bounded parallelism and enqueue them."""
+        slots = asyncio.Semaphore(self._max_downloads)
+        counts = {"added": 0, "updated": 0, "unchanged": 0, "skipped": 0, "failed": 0}
+        upserts: list[ManifestEntry] = []
+        failed_containers: set[str] = set()
+
+        async def _sync_one(obj: _RemoteObject) -> None:
+            try:
+                async with slots:
+                    if obj.is_drive:
+                        content = await adapter.get_file_content(obj.container, obj.key)
+                    else:
+                        content = await adapter.get_object_content(obj.container, obj.key)
+                outcome, entry = await self._enqueue(
+                    source_id, source_type, obj, content, manifest.get(obj.manifest_key)
+                )
+            except Exception:
+                logger.warning(
+                    "Failed to sync %s/%s from source %s", obj.container, obj.name, source_id,
+                    exc_info=True,
+                )
+                counts["failed"] += 1
+                failed_containers.add(obj.container)
+                return
+            counts[outcome] += 1
+            upserts.append(entry)
+
+        await asyncio.gather(*(_sync_one(obj) for obj in changed))
+        return counts, upserts, failed_containers
+
+    async def _enqueue(
+        self,
+        source_id: str,
+        source_type: str,
+        obj: _RemoteObject,
+        content: bytes,
+        previous: ManifestEntry | None,
+    ) -> tuple[str, ManifestEntry]:
+        """Enqueue *obj* for indexing unless its content is unchanged."""
+        entry = ManifestEntry(
+            container=obj.container,
+            key=obj.key,
+            name=obj.name,
+            document_id=previous.document_id if previous else None,
+            etag=obj.etag,
+            modified_at=obj.modified_at,
+            size=obj.size,
+            content_hash=hashlib.sha256(content).hexdigest(),
+        )
+        if previous is not None and previous.content_hash == entry.content_hash:
+            return "unchanged", entry
+
+        text = await self._to_text(obj, content)
+        if not text or not text.strip():
+            logger.info("No text extracted from %s/%s; skipping", obj.container, obj.name)
+            return "skipped", entry
+
+        # Chunks are keyed by random ids, so the old version must go first.
+        await self._delete_document(entry.document_id)
+        entry.document_id = entry.document_id or str(uuid.uuid4())
+        name = PurePosixPath(obj.name).name
+        await self._producer.enqueue(
+            IndexingTask(
+                document_id=entry.document_id,
+                title=name.rsplit(".", 1)[0] if "." in name else name,
+                content=text.strip(),
+                document_type="other",
+                source=f"{source_type}://{obj.container}/{obj.name}",
+                tags=["source-sync", f"source:{source_id}"],
+                metadata={
+                    "source_id": source_id,
+                    "container": obj.container,
+                    "key": obj.key,
+                    "etag": obj.etag,
+                    "modified_at": obj.modified_at,
+                },
+            )
+        )
+        return ("updated" if previous is not None else "added"), entry
+
+    async def _to_text(self, obj: _RemoteObject, content: bytes) -> str | None:
+        content_type = (
+            _GOOGLE_EXPORT_TYPES.get(obj.content_type)
+            or obj.content_type
+            or mimetypes.guess_type(obj.name)[0]
+            or ""
+        )
+        text = await self._extractor.extract(obj.name, content, content_type)
+        if text is None and PurePosixPath(obj.name).suffix.lower() in _TEXT_EXTENSIONS:
+            text = content.decode("utf-8", errors="replace")
+        return text
+
+    async def _delete_document(self, document_id: str | None) -> None:
+        if document_id and self._indexer is not None:
+            await self._indexer.delete_document(document_id)
+
+
+def _from_drive_item(drive_id: str, item: Any) -> _RemoteObject:
+    return _RemoteObject(
+        container=drive_id,
+        key=item.id,
+        name=f"{item.path}/{item.name}".lstrip("/") if item.path else item.name,
+        etag=item.etag,
+        modified_at=item.modified_at,
+        size=item.size,
+        content_type=item.mime_type,
+        is_drive=True,
+    )
+
+
+def _missing(
+    manifest: dict[tuple[str, str], ManifestEntry],
+    container: str,
+    seen: dict[tuple[str, str], _RemoteObject],
+) -> set[tuple[str, str]]:
+    """Manifest keys in *container* that a full listing no longer reports."""
+    return {key for key in manifest if key[0] == container and key not in seen}
+
+
+def _decode_cursors(row: Any) -> dict[str, str]:
+    raw = getattr(row, "sync_cursors", None)
+    if not isinstance(raw, str) or not raw:
+        return {}
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return {}
+
 
-async def run_sync_for_all(source_repo: DocumentSourceRepository) -> list[dict]:
+async def run_sync_for_all(
+    source_repo: DocumentSourceRepository,
+    handler: SourceSyncHandler | None = None,
+) -> list[dict]:
     """Run sync for all enabled sources.  Called by the scheduler."""
-    handler = SourceSyncHandler(source_repo)
+    handler = handler or SourceSyncHandler(source_repo)
     rows = await source_repo.list_sync_enabled()
     results: list[dict] = []
     for row in rows:
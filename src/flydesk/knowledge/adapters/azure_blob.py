@@ -94,6 +94,7 @@ class AzureBlobAdapter:
                         else ""
                     ),
                     content_type=blob.get("content_type", ""),
+                    etag=str(blob.get("etag") or "").strip('"'),
                 )
             )
         return objects
@@ -97,6 +97,7 @@ class GCSAdapter:
                         blob.updated.isoformat() if blob.updated else ""
                     ),
                     content_type=blob.content_type or "",
+                    etag=str(blob.generation or blob.etag or ""),
                 )
             )
         return objects
@@ -18,6 +18,7 @@ from pathlib import PurePosixPath
 from flydesk.knowledge.document_source import (
     IMPORTABLE_EXTENSIONS,
     DocumentSourceFactory,
+    DriveChanges,
     DriveInfo,
     DriveItem,
 )
@@ -41,6 +42,11 @@ _GOOGLE_EXPORT_MAP: dict[str, tuple[str, str]] = {
 }
 
 
+_FOLDER_MIME = "application/vnd.google-apps.folder"
+
+_FILE_FIELDS = "id, name, mimeType, size, modifiedTime, parents, md5Checksum, version"
+
+
 class GoogleDriveAdapter:
     """Adapter for Google Drive API v3."""
 
@@ -129,7 +135,7 @@ class GoogleDriveAdapter:
             while True:
                 kwargs: dict = {
                     "q": query,
-                    "fields": "nextPageToken, files(id, name, mimeType, size, modifiedTime, parents)",
+                    "fields": f"nextPageToken, files({_FILE_FIELDS})",
                     "pageSize": 100,
                     "pageToken": page_token,
                 }
@@ -142,7 +148,7 @@ class GoogleDriveAdapter:
                 response = service.files().list(**kwargs).execute()
                 for f in response.get("files", []):
                     mime = f.get("mimeType", "")
-                    is_folder = mime == "application/vnd.google-apps.folder"
+                    is_folder = mime == _FOLDER_MIME
                     name = f.get("name", "")
 
                     # For Google Docs, check if the export format is importable.
@@ -153,17 +159,7 @@ class GoogleDriveAdapter:
                     elif not is_folder and not self._is_importable(name):
                         continue
 
-                    items.append(
-                        DriveItem(
-                            id=f["id"],
-                            name=name,
-                            path="",
-                            is_folder=is_folder,
-                            size=int(f.get("size", 0)),
-                            modified_at=f.get("modifiedTime", ""),
-                            mime_type=mime,
-                        )
-                    )
+                    items.append(self._to_drive_item(f))
                 page_token = response.get("nextPageToken")
                 if not page_token:
                     break
@@ -171,6 +167,112 @@ class GoogleDriveAdapter:
             logger.exception("Failed to list Google Drive items")
         return items
 
+    def _accepts(self, f: dict) -> bool:
+        """Whether a changed file is an importable file inside the synced folder."""
+        mime = f.get("mimeType", "")
+        if mime == _FOLDER_MIME or f.get("trashed"):
+            return False
+        if self._folder_id and self._folder_id not in f.get("parents", []):
+            return False
+        if self._is_google_doc(mime):
+            return _GOOGLE_EXPORT_MAP[mime][1].lower() in IMPORTABLE_EXTENSIONS
+        return self._is_importable(f.get("name", ""))
+
+    async def list_changes(
+        self, drive_id: str, cursor: str | None = None
+    ) -> DriveChanges:
+        """Read the Drive changes feed; *cursor* is a changes page token.
+
+        Without a cursor, every file in the synced folder (or the whole
+        drive when no folder is configured) is listed, and the current start
+        page token is returned as the cursor for the next sync.
+        """
+        service = self._get_service()
+        shared = bool(drive_id and drive_id != "root")
+        drive_kwargs: dict = (
+            {"driveId": drive_id, "supportsAllDrives": True} if shared else {}
+        )
+
+        if cursor is None:
+            start = service.changes().getStartPageToken(**drive_kwargs).execute()
+            if self._folder_id:
+                items = [i for i in await self.list_items(drive_id) if not i.is_folder]
+            else:
+                items = self._list_all_files(service, drive_id if shared else "")
+            return DriveChanges(
+                items=items, removed_ids=[], cursor=start["startPageToken"]
+            )
+
+        items: list[DriveItem] = []
+        removed: list[str] = []
+        page_token: str | None = cursor
+        while True:
+            kwargs: dict = {
+                "pageToken": page_token,
+                "pageSize": 100,
+                "includeRemoved": True,
+                "fields": (
+                    "nextPageToken, newStartPageToken, "
+                    f"changes(fileId, removed, file({_FILE_FIELDS}, trashed))"
+                ),
+                **drive_kwargs,
+            }
+            if shared:
+                kwargs["includeItemsFromAllDrives"] = True
+            response = service.changes().list(**kwargs).execute()
+            for change in response.get("changes", []):
+                f = change.get("file") or {}
+                if change.get("removed") or not self._accepts(f):
+                    removed.append(change["fileId"])
+                else:
+                    items.append(self._to_drive_item(f))
+            if response.get("newStartPageToken"):
+                return DriveChanges(
+                    items=items,
+                    removed_ids=removed,
+                    cursor=response["newStartPageToken"],
+                )
+            page_token = response.get("nextPageToken")
+
+    def _list_all_files(self, service, drive_id: str) -> list[DriveItem]:
+        items: list[DriveItem] = []
+        page_token = None
+        while True:
+            kwargs: dict = {
+                "q": f"trashed = false and mimeType != '{_FOLDER_MIME}'",
+                "fields": f"nextPageToken, files({_FILE_FIELDS})",
+                "pageSize": 1000,
+                "pageToken": page_token,
+            }
+            if drive_id:
+                kwargs.update(
+                    driveId=drive_id,
+                    includeItemsFromAllDrives=True,
+                    supportsAllDrives=True,
+                    corpora="drive",
+                )
+            response = service.files().list(**kwargs).execute()
+            items.extend(
+                self._to_drive_item(f) for f in response.get("files", []) if self._accepts(f)
+            )
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                return items
+
+    @staticmethod
+    def _to_drive_item(f: dict) -> DriveItem:
+        return DriveItem(
+            id=f["id"],
+            name=f.get("name", ""),
+            path="",
+            is_folder=f.get("mimeType", "") == _FOLDER_MIME,
+            size=int(f.get("size", 0)),
+            modified_at=f.get("modifiedTime", ""),
+            mime_type=f.get("mimeType", ""),
+            # Workspace documents have no checksum; their version still bumps.
+            etag=f.get("md5Checksum") or str(f.get("version", "")),
+        )
+
     async def get_file_content(self, drive_id: str, item_id: str) -> bytes:
         service = self._get_service()
 
@@ -16,6 +16,7 @@ from pathlib import PurePosixPath
 from flydesk.knowledge.document_source import (
     IMPORTABLE_EXTENSIONS,
     DocumentSourceFactory,
+    DriveChanges,
     DriveInfo,
     DriveItem,
 )
@@ -121,21 +122,52 @@ class OneDriveAdapter:
                 name = item.get("name", "")
                 if not is_folder and not self._is_importable(name):
                     continue
-                items.append(
-                    DriveItem(
-                        id=item["id"],
-                        name=name,
-                        path=item.get("parentReference", {}).get("path", ""),
-                        is_folder=is_folder,
-                        size=item.get("size", 0),
-                        modified_at=item.get("lastModifiedDateTime", ""),
-                        mime_type=item.get("file", {}).get("mimeType", ""),
-                    )
-                )
+                items.append(self._to_drive_item(item))
         except Exception:
             logger.exception("Failed to list OneDrive items")
         return items
 
+    async def list_changes(
+        self, drive_id: str, cursor: str | None = None
+    ) -> DriveChanges:
+        """Read the Graph delta feed for *drive_id*; *cursor* is a delta link."""
+        client = await self._get_http_client()
+        url = cursor or f"/drives/{drive_id}/root/delta"
+        items: list[DriveItem] = []
+        removed: list[str] = []
+        while True:
+            response = await client.get(url)
+            response.raise_for_status()
+            data = response.json()
+            for item in data.get("value", []):
+                if "folder" in item or "root" in item:
+                    continue
+                if "deleted" in item or not self._is_importable(item.get("name", "")):
+                    removed.append(item["id"])
+                    continue
+                items.append(self._to_drive_item(item))
+            next_link = data.get("@odata.nextLink")
+            if next_link:
+                url = next_link
+                continue
+            return DriveChanges(
+                items=items, removed_ids=removed, cursor=data.get("@odata.deltaLink", "")
+            )
+
+    @staticmethod
+    def _to_drive_item(item: dict) -> DriveItem:
+        return DriveItem(
+            id=item["id"],
+            name=item.get("name", ""),
+            path=item.get("parentReference", {}).get("path", ""),
+            is_folder="folder" in item,
+            size=item.get("size", 0),
+            modified_at=item.get("lastModifiedDateTime", ""),
+            mime_type=item.get("file", {}).get("mimeType", ""),
+            # cTag only changes with the content; eTag also on metadata edits.
+            etag=item.get("cTag") or item.get("eTag", ""),
+        )
+
     async def get_file_content(self, drive_id: str, item_id: str) -> bytes:
         client = await self._get_http_client()
         response = await client.get(
@@ -99,6 +99,7 @@ class S3Adapter:
                             else ""
                         ),
                         content_type=obj.get("ContentType", ""),
+                        etag=obj.get("ETag", "").strip('"'),
                     )
                 )
         return objects
@@ -22,6 +22,7 @@ from flydesk.knowledge.git_provider import (
     GitProviderFactory,
     GitRepo,
     GitTreeEntry,
+    RateLimitGate,
 )
 from flydesk.knowledge.github import IMPORTABLE_EXTENSIONS
 
@@ -53,10 +54,12 @@ class BitbucketAdapter:
         headers: dict[str, str] = {"Accept": "application/json"}
         if token:
             headers["Authorization"] = f"Bearer {token}"
+        self.rate_limit = RateLimitGate()
         self._client = httpx.AsyncClient(
             base_url=self._base_url,
             headers=headers,
             timeout=30.0,
+            event_hooks=self.rate_limit.event_hooks,
         )
 
     # -- helpers -----------------------------------------------------------
@@ -40,6 +40,7 @@ class StorageObject:
     size: int
     last_modified: str
     content_type: str = ""
+    etag: str = ""
 
 
 # ---------------------------------------------------------------------------
@@ -63,6 +64,20 @@ class DriveItem:
     size: int = 0
     modified_at: str = ""
     mime_type: str = ""
+    etag: str = ""
+
+
+@dataclass
+class DriveChanges:
+    """Result of reading a drive's change feed.
+
+    With no cursor the feed enumerates every file in the drive; afterwards
+    it returns only the files changed or removed since *cursor* was issued.
+    """
+
+    items: list[DriveItem]
+    removed_ids: list[str]
+    cursor: str
 
 
 # ---------------------------------------------------------------------------
@@ -92,6 +107,13 @@ class DriveProvider(Protocol):
     async def aclose(self) -> None: ...
 
 
+@runtime_checkable
+class DriveChangeFeed(Protocol):
+    """Optional drive capability: incremental listing through a change feed."""
+
+    async def list_changes(self, drive_id: str, cursor: str | None = None) -> DriveChanges: ...
+
+
 # ---------------------------------------------------------------------------
 # Factory
 # ---------------------------------------------------------------------------
@@ -20,7 +20,7 @@ from cryptography.fernet import Fernet
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from flydesk.models.document_source import DocumentSourceRow
+from flydesk.models.document_source import DocumentSourceManifestRow, DocumentSourceRow
 from flydesk.security.kms import _DEV_FERNET_KEY
 
 logger = logging.getLogger(__name__)
@@ -45,6 +45,30 @@ class DocumentSource:
     updated_at: str | None
 
 
+# Manifest keys looked up per query, well under driver bind-parameter limits.
+_MANIFEST_LOOKUP_CHUNK = 500
+
+
+@dataclass
+class ManifestEntry:
+    """What a source sync last saw for one object (see ``document_source_manifest``)."""
+
+    container: str
+    key: str
+    name: str = ""
+    document_id: str | None = None
+    etag: str = ""
+    modified_at: str = ""
+    size: int = 0
+    content_hash: str = ""
+
+    def matches(self, etag: str, modified_at: str, size: int) -> bool:
+        """Whether a listing fingerprint shows the object as unchanged."""
+        if etag and self.etag:
+            return etag == self.etag
+        return (modified_at, size) == (self.modified_at, self.size)
+
+
 # Keys that are safe to show in summaries
 _SAFE_CONFIG_KEYS = {
     "bucket",
@@ -215,7 +239,92 @@ class DocumentSourceRepository:
 
     async def delete(self, source_id: str) -> None:
         async with self._session_factory() as session:
+            await session.execute(
+                delete(DocumentSourceManifestRow).where(
+                    DocumentSourceManifestRow.source_id == source_id
+                )
+            )
             await session.execute(
                 delete(DocumentSourceRow).where(DocumentSourceRow.id == source_id)
             )
             await session.commit()
+
+    # -- Sync manifest ---------------------------------------------------------
+
+    async def get_manifest(self, source_id: str) -> dict[tuple[str, str], ManifestEntry]:
+        """Return the sync manifest of *source_id*, keyed by ``(container, key)``."""
+        async with self._session_factory() as session:
+            result = await session.execute(
+                select(DocumentSourceManifestRow).where(
+                    DocumentSourceManifestRow.source_id == source_id
+                )
+            )
+            return {
+                (row.container, row.key): ManifestEntry(
+                    container=row.container,
+                    key=row.key,
+                    name=row.name,
+                    document_id=row.document_id,
+                    etag=row.etag,
+                    modified_at=row.modified_at,
+                    size=row.size,
+                    content_hash=row.content_hash,
+                )
+                for row in result.scalars().all()
+            }
+
+    async def save_sync_state(
+        self,
+        source_id: str,
+        *,
+        upserts: list[ManifestEntry],
+        removed: list[tuple[str, str]],
+        cursors: dict[str, str] | None,
+        synced_at: datetime,
+    ) -> None:
+        """Apply manifest changes, change-feed cursors and ``last_sync_at`` atomically."""
+        async with self._session_factory() as session:
+            row = await session.get(DocumentSourceRow, source_id)
+            if row is None:
+                return
+            row.last_sync_at = synced_at
+            if cursors is not None:
+                row.sync_cursors = json.dumps(cursors)
+
+            keys = removed + [(e.container, e.key) for e in upserts]
+            existing: dict[tuple[str, str], DocumentSourceManifestRow] = {}
+            for container in {c for c, _ in keys}:
+                container_keys = [k for c, k in keys if c == container]
+                for start in range(0, len(container_keys), _MANIFEST_LOOKUP_CHUNK):
+                    result = await session.execute(
+                        select(DocumentSourceManifestRow).where(
+                            DocumentSourceManifestRow.source_id == source_id,
+                            DocumentSourceManifestRow.container == container,
+                            DocumentSourceManifestRow.key.in_(
+                                container_keys[start : start + _MANIFEST_LOOKUP_CHUNK]
+                            ),
+                        )
+                    )
+                    existing.update({(m.container, m.key): m for m in result.scalars().all()})
+
+            for key in removed:
+                if key in existing:
+                    await session.delete(existing.pop(key))
+            for entry in upserts:
+                manifest_row = existing.get((entry.container, entry.key))
+                if manifest_row is None:
+                    manifest_row = DocumentSourceManifestRow(
+                        id=str(uuid.uuid4()),
+                        source_id=source_id,
+                        container=entry.container,
+                        key=entry.key,
+                    )
+                    session.add(manifest_row)
+                manifest_row.name = entry.name
+                manifest_row.document_id = entry.document_id
+                manifest_row.etag = entry.etag
+                manifest_row.modified_at = entry.modified_at
+                manifest_row.size = entry.size
+                manifest_row.content_hash = entry.content_hash
+                manifest_row.synced_at = synced_at
+            await session.commit()
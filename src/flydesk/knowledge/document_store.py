@@ -11,7 +11,7 @@
 from __future__ import annotations
 
 from flydesk.catalog.repository import CatalogRepository
-from flydesk.knowledge.models import DocumentType, KnowledgeDocument
+from flydesk.knowledge.models import DocumentType, KnowledgeDocument, KnowledgeDocumentSummary
 
 
 class CatalogDocumentStore:
@@ -25,6 +25,17 @@ class CatalogDocumentStore:
     ) -> list[KnowledgeDocument]:
         return await self._repo.list_knowledge_documents(workspace_id=workspace_id)
 
+    async def list_document_summaries(
+        self,
+        *,
+        workspace_id: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> tuple[list[KnowledgeDocumentSummary], int]:
+        return await self._repo.list_knowledge_document_summaries(
+            workspace_id=workspace_id, limit=limit, offset=offset
+        )
+
     async def get_document(self, document_id: str) -> KnowledgeDocument | None:
         return await self._repo.get_knowledge_document(document_id)
 
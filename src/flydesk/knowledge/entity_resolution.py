@@ -0,0 +1,302 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""Entity resolution -- map extracted entities onto canonical graph entities.
+
+Extraction produces one entity per mention.  Resolution collapses those
+mentions onto a single canonical row in three stages:
+
+1. **Blocking** -- entities are only ever compared within the same
+   normalised type, and embedding candidates are pre-filtered by shared
+   name tokens so the comparison set stays small.
+2. **Exact match** -- a normalised ``(type, name)`` key is looked up in the
+   alias table (and within the current batch).  Canonical ids are derived
+   from this key, so the same surface form always yields the same id.
+3. **Similarity match** -- remaining entities are compared by embedding
+   cosine similarity against same-type candidates and merged above a
+   threshold.  The new surface form is recorded as an alias so the next
+   mention resolves by exact match.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import re
+import unicodedata
+import uuid
+from collections.abc import Iterable, Sequence
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from flydesk.models.knowledge import EntityAliasRow, EntityRow
+
+if TYPE_CHECKING:
+    from flydesk.knowledge.graph import Entity, Relation
+
+_logger = logging.getLogger(__name__)
+
+# Fixed namespace so canonical ids are stable across processes and releases.
+_ENTITY_NAMESPACE = uuid.UUID("6f1c2d7e-3a4b-5c6d-8e9f-0a1b2c3d4e5f")
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+_MIN_TOKEN_LENGTH = 3
+
+# Values per ``IN (...)`` clause.
+_IN_CHUNK = 500
+
+
+# ---------------------------------------------------------------------------
+# Normalisation
+# ---------------------------------------------------------------------------
+
+
+def normalize_entity_type(entity_type: str) -> str:
+    """Normalise an entity type for blocking (``"Service "`` -> ``"service"``)."""
+    return entity_type.strip().lower()
+
+
+def normalize_entity_name(name: str) -> str:
+    """Normalise an entity name into its alias key.
+
+    Applies Unicode NFKC folding and case folding, spells out ``&``,
+    replaces punctuation with spaces, collapses whitespace and drops a
+    leading article, so ``"The Payments-Service"`` and
+    ``"payments service"`` share a key.
+    """
+    value = unicodedata.normalize("NFKC", name).casefold().replace("&", " and ")
+    value = _WHITESPACE.sub(" ", _PUNCTUATION.sub(" ", value)).strip()
+    if value.startswith("the "):
+        value = value[4:]
+    return value
+
+
+def canonical_entity_id(name: str, entity_type: str) -> str:
+    """Return the stable id for an entity with *name* and *entity_type*."""
+    key = f"{normalize_entity_type(entity_type)}:{normalize_entity_name(name)}"
+    return str(uuid.uuid5(_ENTITY_NAMESPACE, key))
+
+
+def blocking_tokens(name: str) -> list[str]:
+    """Return the distinctive tokens of a normalised *name*, longest first."""
+    tokens = {t for t in normalize_entity_name(name).split() if len(t) >= _MIN_TOKEN_LENGTH}
+    return sorted(tokens, key=lambda t: (-len(t), t))
+
+
+# ---------------------------------------------------------------------------
+# Vectors
+# ---------------------------------------------------------------------------
+
+
+def parse_embedding(value: Any) -> list[float] | None:
+    """Return a stored embedding as a list (JSON text on SQLite, array on pgvector)."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return None
+    try:
+        vector = [float(v) for v in value]
+    except (TypeError, ValueError):
+        return None
+    return vector or None
+
+
+def cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
+    """Cosine similarity of two vectors; 0.0 when either is empty or zero."""
+    if len(a) != len(b) or not a:
+        return 0.0
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+# ---------------------------------------------------------------------------
+# Relations
+# ---------------------------------------------------------------------------
+
+
+def remap_relations(relations: Iterable[Relation], mapping: dict[str, str]) -> list[Relation]:
+    """Point relation endpoints at their canonical entities.
+
+    Relations that only became self-loops because both endpoints resolved
+    to the same entity are dropped.
+    """
+    remapped: list[Relation] = []
+    for relation in relations:
+        source = mapping.get(relation.source_id, relation.source_id)
+        target = mapping.get(relation.target_id, relation.target_id)
+        if source == target and relation.source_id != relation.target_id:
+            continue
+        relation.source_id = source
+        relation.target_id = target
+        remapped.append(relation)
+    return remapped
+
+
+# ---------------------------------------------------------------------------
+# Resolver
+# ---------------------------------------------------------------------------
+
+
+class EntityResolver:
+    """Resolve incoming entities to canonical entity ids.
+
+    Parameters
+    ----------
+    similarity_threshold:
+        Minimum embedding cosine similarity for two same-type entities
+        with different names to be treated as the same entity.
+    max_candidates:
+        Upper bound on stored entities compared per incoming entity.
+    """
+
+    def __init__(
+        self,
+        *,
+        similarity_threshold: float = 0.92,
+        max_candidates: int = 200,
+    ) -> None:
+        self.similarity_threshold = similarity_threshold
+        self._max_candidates = max_candidates
+
+    async def resolve(
+        self,
+        session: AsyncSession,
+        entities: Sequence[Entity],
+        embeddings: dict[str, list[float]],
+    ) -> dict[str, str]:
+        """Return ``{incoming id: canonical id}`` for *entities*.
+
+        An id that already exists in the graph resolves to itself.  Other
+        entities resolve, in order, through the alias table, an earlier
+        entity in the batch with the same normalised key, or the most
+        similar stored entity of the same type; anything else is a new
+        canonical entity.
+        """
+        mapping: dict[str, str] = {}
+        if not entities:
+            return mapping
+
+        ids = [e.id for e in entities]
+        existing: set[str] = set()
+        for start in range(0, len(ids), _IN_CHUNK):
+            result = await session.execute(
+                select(EntityRow.id).where(EntityRow.id.in_(ids[start : start + _IN_CHUNK]))
+            )
+            existing.update(result.scalars())
+
+        keys = {e.id: self._key(e) for e in entities}
+        aliases = await self._load_aliases(session, set(keys.values()))
+
+        batch: dict[tuple[str, str], str] = {}
+        for entity in entities:
+            key = keys[entity.id]
+            if entity.id in existing:
+                target = entity.id
+            elif key in aliases:
+                target = aliases[key]
+            elif key in batch:
+                target = batch[key]
+            else:
+                target = await self._match_by_embedding(
+                    session, entity, embeddings.get(entity.id)
+                ) or entity.id
+            mapping[entity.id] = target
+            batch.setdefault(key, target)
+        return mapping
+
+    def alias_rows(
+        self, entities: Sequence[Entity], mapping: dict[str, str]
+    ) -> dict[tuple[str, str], str]:
+        """Return the ``(type, alias) -> entity id`` pairs implied by *mapping*."""
+        pairs: dict[tuple[str, str], str] = {}
+        for entity in entities:
+            key = self._key(entity)
+            if key[1]:
+                pairs.setdefault(key, mapping.get(entity.id, entity.id))
+        return pairs
+
+    async def record_aliases(
+        self, session: AsyncSession, pairs: dict[tuple[str, str], str]
+    ) -> int:
+        """Insert the alias pairs that are not stored yet; returns the count added."""
+        if not pairs:
+            return 0
+        stored = await self._load_aliases(session, set(pairs))
+        added = 0
+        for (entity_type, alias), entity_id in pairs.items():
+            if (entity_type, alias) in stored:
+                continue
+            session.add(EntityAliasRow(entity_type=entity_type, alias=alias, entity_id=entity_id))
+            added += 1
+        return added
+
+    # -- Internal --
+
+    @staticmethod
+    def _key(entity: Entity) -> tuple[str, str]:
+        return normalize_entity_type(entity.entity_type), normalize_entity_name(entity.name)
+
+    @staticmethod
+    async def _load_aliases(
+        session: AsyncSession, keys: set[tuple[str, str]]
+    ) -> dict[tuple[str, str], str]:
+        aliases = sorted({alias for _, alias in keys})
+        found: dict[tuple[str, str], str] = {}
+        for start in range(0, len(aliases), _IN_CHUNK):
+            result = await session.execute(
+                select(
+                    EntityAliasRow.entity_type, EntityAliasRow.alias, EntityAliasRow.entity_id
+                ).where(EntityAliasRow.alias.in_(aliases[start : start + _IN_CHUNK]))
+            )
+            for entity_type, alias, entity_id in result.all():
+                if (entity_type, alias) in keys:
+                    found[(entity_type, alias)] = entity_id
+        return found
+
+    async def _match_by_embedding(
+        self,
+        session: AsyncSession,
+        entity: Entity,
+        embedding: list[float] | None,
+    ) -> str | None:
+        """Return the most similar same-type stored entity above the threshold."""
+        tokens = blocking_tokens(entity.name)
+        if not embedding or not tokens:
+            return None
+        stmt = (
+            select(EntityRow.id, EntityRow.embedding)
+            .where(
+                func.lower(EntityRow.entity_type) == normalize_entity_type(entity.entity_type),
+                EntityRow.embedding.is_not(None),
+                or_(*(EntityRow.name.ilike(f"%{token}%") for token in tokens)),
+            )
+            .order_by(EntityRow.mention_count.desc())
+            .limit(self._max_candidates)
+        )
+        best_id: str | None = None
+        best_score = self.similarity_threshold
+        for candidate_id, stored in (await session.execute(stmt)).all():
+            vector = parse_embedding(stored)
+            if vector is None:
+                continue
+            score = cosine_similarity(embedding, vector)
+            if score >= best_score:
+                best_id, best_score = candidate_id, score
+        if best_id is not None:
+            _logger.debug(
+                "Resolved entity '%s' to %s (similarity %.3f)", entity.name, best_id, best_score
+            )
+        return best_id
@@ -10,14 +10,23 @@
 
 Defines a ``GitProvider`` protocol and vendor-neutral dataclasses that allow
 Firefly Desk to interact with GitHub, GitLab, and Bitbucket through a single
-interface.
+interface.  Providers that can serve a whole branch as one download also
+implement ``GitArchiveProvider``, and adapters share a ``RateLimitGate`` that
+holds back requests while the provider reports its rate limit as exhausted.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import tarfile
+import time
+from collections.abc import Collection, Iterator
 from dataclasses import dataclass, field
-from typing import Protocol, runtime_checkable
+from email.utils import parsedate_to_datetime
+from typing import IO, Protocol, runtime_checkable
+
+import httpx
 
 logger = logging.getLogger(__name__)
 
@@ -132,6 +141,129 @@ class GitProvider(Protocol):
         ...
 
 
+@runtime_checkable
+class GitArchiveProvider(Protocol):
+    """Optional capability: download a whole ref as a gzipped tarball."""
+
+    async def download_archive(
+        self, owner: str, repo: str, ref: str, dest: IO[bytes]
+    ) -> None:
+        """Stream the ``.tar.gz`` archive of *ref* into *dest*."""
+        ...
+
+
+def read_archive(
+    fileobj: IO[bytes], paths: Collection[str]
+) -> Iterator[tuple[str, bytes]]:
+    """Yield ``(path, content)`` for the members of a ``.tar.gz`` in *paths*.
+
+    Provider archives wrap the tree in a single top-level directory
+    (``<repo>-<sha>/``), which is stripped before matching.  The archive is
+    read as a stream, so members are yielded in archive order.
+    """
+    wanted = set(paths)
+    with tarfile.open(fileobj=fileobj, mode="r|gz") as archive:
+        for member in archive:
+            if not wanted:
+                return
+            if not member.isfile():
+                continue
+            _, _, path = member.name.partition("/")
+            if path not in wanted:
+                continue
+            extracted = archive.extractfile(member)
+            if extracted is None:
+                continue
+            wanted.discard(path)
+            yield path, extracted.read()
+
+
+# ---------------------------------------------------------------------------
+# Rate limiting
+# ---------------------------------------------------------------------------
+
+
+class RateLimitGate:
+    """Pause outgoing requests while a provider's rate limit is exhausted.
+
+    Attach to an ``httpx.AsyncClient`` through :attr:`event_hooks`.  Every
+    response is inspected for ``Retry-After`` and for the remaining/reset
+    headers used by GitHub (``X-RateLimit-*``) and GitLab (``RateLimit-*``);
+    once the provider reports no requests left, later requests wait until the
+    reset time (capped at *max_wait* seconds) instead of failing.
+
+    Parameters
+    ----------
+    max_wait:
+        Longest single pause, in seconds.
+    """
+
+    def __init__(self, *, max_wait: float = 60.0) -> None:
+        self._max_wait = max_wait
+        self._resume_at = 0.0
+
+    @property
+    def event_hooks(self) -> dict[str, list]:
+        return {"request": [self.before_request], "response": [self.after_response]}
+
+    async def before_request(self, request: httpx.Request) -> None:
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            logger.info("Git provider rate limit reached; waiting %.1fs", delay)
+            await asyncio.sleep(delay)
+
+    async def after_response(self, response: httpx.Response) -> None:
+        self.observe(response.status_code, response.headers)
+
+    def observe(self, status_code: int, headers: httpx.Headers | dict) -> float:
+        """Record the pause implied by a response; returns it in seconds."""
+        delay = _rate_limit_delay(status_code, httpx.Headers(headers))
+        if delay > 0:
+            delay = min(delay, self._max_wait)
+            self._resume_at = max(self._resume_at, time.monotonic() + delay)
+        return delay
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    """True if *exc* is an HTTP error caused by a provider rate limit."""
+    if not isinstance(exc, httpx.HTTPStatusError):
+        return False
+    response = exc.response
+    if response.status_code == 429:
+        return True
+    return response.status_code == 403 and _rate_limit_delay(403, response.headers) > 0
+
+
+def _rate_limit_delay(status_code: int, headers: httpx.Headers) -> float:
+    retry_after = headers.get("retry-after")
+    if retry_after and status_code in (403, 429, 503):
+        return _parse_retry_after(retry_after)
+    for prefix in ("x-ratelimit-", "ratelimit-"):
+        remaining = headers.get(f"{prefix}remaining")
+        reset = headers.get(f"{prefix}reset")
+        if remaining is None or reset is None:
+            continue
+        try:
+            if int(remaining) > 0:
+                return 0.0
+            return max(1.0, float(reset) - time.time())
+        except ValueError:
+            continue
+    # Rate limited without telling us for how long.
+    return 1.0 if status_code == 429 else 0.0
+
+
+def _parse_retry_after(value: str) -> float:
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return 1.0
+
+
 # ---------------------------------------------------------------------------
 # Factory
 # ---------------------------------------------------------------------------
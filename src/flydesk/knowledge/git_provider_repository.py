@@ -183,6 +183,14 @@ class GitProviderRepository:
         """Decrypt the client_secret for a provider row."""
         return self._decrypt(row.client_secret_encrypted)
 
+    def encrypt_token(self, token: str) -> str:
+        """Encrypt an access token so it can be stored in a job payload."""
+        return self._encrypt(token)  # type: ignore[return-value]
+
+    def decrypt_token(self, ciphertext: str) -> str | None:
+        """Decrypt a token produced by :meth:`encrypt_token`."""
+        return self._decrypt(ciphertext)
+
     def parse_scopes(self, row: GitProviderRow) -> list[str]:
         """Parse the JSON scopes stored on a row."""
         if row.scopes is None:
@@ -14,6 +14,7 @@ import base64
 import logging
 from dataclasses import dataclass, field
 from pathlib import PurePosixPath
+from typing import IO
 
 import httpx
 
@@ -88,6 +89,8 @@ class GitHubClient:
     """
 
     def __init__(self, token: str | None = None) -> None:
+        from flydesk.knowledge.git_provider import RateLimitGate
+
         self._token = token
         headers: dict[str, str] = {
             "Accept": "application/vnd.github+json",
@@ -95,10 +98,12 @@ class GitHubClient:
         }
         if token:
             headers["Authorization"] = f"Bearer {token}"
+        self.rate_limit = RateLimitGate()
         self._client = httpx.AsyncClient(
             base_url=GITHUB_API_BASE,
             headers=headers,
             timeout=30.0,
+            event_hooks=self.rate_limit.event_hooks,
         )
 
     @property
@@ -242,6 +247,20 @@ class GitHubClient:
             size=data.get("size", 0),
         )
 
+    async def download_archive(
+        self, owner: str, repo: str, ref: str, dest: IO[bytes]
+    ) -> None:
+        """Stream the tarball of *ref* into *dest*.
+
+        GitHub answers with a redirect to a short-lived ``codeload`` URL.
+        """
+        async with self._client.stream(
+            "GET", f"/repos/{owner}/{repo}/tarball/{ref}", follow_redirects=True
+        ) as resp:
+            resp.raise_for_status()
+            async for chunk in resp.aiter_bytes():
+                dest.write(chunk)
+
 
 # ---------------------------------------------------------------------------
 # OAuth code exchange (standalone function)
@@ -414,6 +433,11 @@ class GitHubAdapter:
         gh_fc = await self._client.get_file_content(owner, repo, path, ref=ref)
         return self._to_file_content(gh_fc)
 
+    async def download_archive(
+        self, owner: str, repo: str, ref: str, dest: IO[bytes]
+    ) -> None:
+        await self._client.download_archive(owner, repo, ref, dest)
+
     async def aclose(self) -> None:
         await self._client.aclose()
 
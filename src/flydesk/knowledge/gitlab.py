@@ -14,6 +14,7 @@ import base64
 import logging
 import urllib.parse
 from pathlib import PurePosixPath
+from typing import IO
 
 import httpx
 
@@ -24,6 +25,7 @@ from flydesk.knowledge.git_provider import (
     GitProviderFactory,
     GitRepo,
     GitTreeEntry,
+    RateLimitGate,
 )
 
 logger = logging.getLogger(__name__)
@@ -56,10 +58,12 @@ class GitLabAdapter:
         headers: dict[str, str] = {"Accept": "application/json"}
         if token:
             headers["PRIVATE-TOKEN"] = token
+        self.rate_limit = RateLimitGate()
         self._client = httpx.AsyncClient(
             base_url=api_base,
             headers=headers,
             timeout=30.0,
+            event_hooks=self.rate_limit.event_hooks,
         )
 
     # -- helpers -----------------------------------------------------------
@@ -200,6 +204,20 @@ class GitLabAdapter:
             size=data.get("size", 0),
         )
 
+    async def download_archive(
+        self, owner: str, repo: str, ref: str, dest: IO[bytes]
+    ) -> None:
+        """Stream the ``.tar.gz`` archive of *ref* into *dest*."""
+        project_id = self._project_id(owner, repo)
+        async with self._client.stream(
+            "GET",
+            f"/projects/{project_id}/repository/archive.tar.gz",
+            params={"sha": ref},
+        ) as resp:
+            resp.raise_for_status()
+            async for chunk in resp.aiter_bytes():
+                dest.write(chunk)
+
     async def aclose(self) -> None:
         """Release underlying HTTP resources."""
         await self._client.aclose()
@@ -12,17 +12,36 @@ from __future__ import annotations
 
 import json
 import logging
+import math
 import uuid
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
 from typing import Any
 
-from sqlalchemy import delete, func, select, text
+from sqlalchemy import delete, func, or_, select, text, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from flydesk.models.knowledge import EntityRow, RelationRow
+from flydesk.knowledge.entity_resolution import (
+    EntityResolver,
+    blocking_tokens,
+    cosine_similarity,
+    normalize_entity_name,
+    normalize_entity_type,
+    parse_embedding,
+)
+from flydesk.knowledge.graph_query import DEFAULT_PATH_FANOUT, GraphPath, GraphTraversal
+from flydesk.models.knowledge import EntityAliasRow, EntityRow, RelationRow
 
 _logger = logging.getLogger(__name__)
 
+# Ids per ``IN (...)`` clause when loading rows for a bulk upsert.
+_BULK_CHUNK = 500
+
+# Compaction skips embedding comparison for blocking tokens shared by more
+# entities than this -- such tokens ("service", "team") are not distinctive.
+_COMPACT_MAX_BLOCK = 200
+
 
 def _escape_like(value: str) -> str:
     """Escape SQL LIKE/ILIKE wildcard characters."""
@@ -69,44 +88,331 @@ class KnowledgeGraph:
         self,
         session_factory: async_sessionmaker[AsyncSession],
         embedding_provider: Any | None = None,
+        *,
+        similarity_threshold: float = 0.92,
     ) -> None:
         self._session_factory = session_factory
         self._embedding_provider = embedding_provider
+        self._resolver = EntityResolver(similarity_threshold=similarity_threshold)
+        self._traversal = GraphTraversal(session_factory)
+
+    async def upsert_entity(self, entity: Entity, *, resolve: bool = False) -> str:
+        """Insert or update an entity. On update, increment mention_count.
+
+        Returns the id the entity was stored under (see :meth:`upsert_entities`).
+        """
+        mapping = await self.upsert_entities([entity], resolve=resolve)
+        return mapping.get(entity.id, entity.id)
+
+    async def upsert_entities(
+        self,
+        entities: list[Entity],
+        *,
+        embed_batch_size: int = 64,
+        resolve: bool = False,
+    ) -> dict[str, str]:
+        """Insert or update several entities in one transaction.
+
+        Equivalent to calling :meth:`upsert_entity` for each entity in order:
+        the last occurrence of an id wins and every repeat counts as a
+        mention.  Embeddings are generated with one ``embed`` call per
+        *embed_batch_size* distinct entities.
+
+        With *resolve*, entities are first matched to canonical entities
+        (see :class:`~flydesk.knowledge.entity_resolution.EntityResolver`).
+        An entity resolved to a different canonical is merged into it: the
+        canonical keeps its name and embedding, gains the mentions, the
+        higher confidence and any property keys it lacks.
+
+        Returns ``{entity id: stored id}`` for every distinct input id.
+        """
+        if not entities:
+            return {}
+        latest: dict[str, Entity] = {}
+        mentions: dict[str, int] = {}
+        first_count: dict[str, int] = {}
+        for entity in entities:
+            latest[entity.id] = entity
+            mentions[entity.id] = mentions.get(entity.id, 0) + 1
+            first_count.setdefault(entity.id, entity.mention_count)
+
+        embeddings = await self._embed_entities(list(latest.values()), embed_batch_size)
 
-    async def upsert_entity(self, entity: Entity) -> None:
-        """Insert or update an entity. On update, increment mention_count."""
         async with self._session_factory() as session:
-            existing = await session.get(EntityRow, entity.id)
-            if existing:
-                existing.name = entity.name
-                existing.properties = self._to_json(entity.properties)
-                existing.confidence = entity.confidence
-                existing.mention_count = existing.mention_count + 1
-                row = existing
-            else:
-                row = EntityRow(
-                    id=entity.id,
-                    entity_type=entity.entity_type,
-                    name=entity.name,
-                    properties=self._to_json(entity.properties),
-                    source_system=entity.source_system,
-                    confidence=entity.confidence,
-                    mention_count=entity.mention_count,
+            mapping = {entity_id: entity_id for entity_id in latest}
+            if resolve:
+                mapping = await self._resolver.resolve(
+                    session, list(latest.values()), embeddings
+                )
+
+            existing: dict[str, EntityRow] = {}
+            ids = sorted(set(latest) | set(mapping.values()))
+            for start in range(0, len(ids), _BULK_CHUNK):
+                result = await session.execute(
+                    select(EntityRow).where(EntityRow.id.in_(ids[start : start + _BULK_CHUNK]))
                 )
-                session.add(row)
-
-            # Generate embedding if provider available
-            if self._embedding_provider:
-                try:
-                    embed_text = f"{entity.name} ({entity.entity_type}): {entity.properties}"
-                    embeddings = await self._embedding_provider.embed([embed_text])
-                    if embeddings and embeddings[0]:
-                        row.embedding = self._serialize_embedding(embeddings[0])
-                except Exception:
-                    _logger.debug("Failed to embed entity %s", entity.id)
+                existing.update({row.id: row for row in result.scalars()})
+
+            for entity_id, entity in latest.items():
+                target = mapping[entity_id]
+                if target != entity_id:
+                    canonical = existing.get(target)
+                    if canonical is not None:
+                        self._merge_into(canonical, entity, mentions[entity_id])
+                        continue
+                    # Stale alias: the canonical row is gone, store as-is.
+                    mapping[entity_id] = entity_id
+                row = existing.get(entity_id)
+                if row is not None:
+                    row.name = entity.name
+                    row.properties = self._to_json(entity.properties)
+                    row.confidence = entity.confidence
+                    row.mention_count = row.mention_count + mentions[entity_id]
+                else:
+                    row = EntityRow(
+                        id=entity.id,
+                        entity_type=entity.entity_type,
+                        name=entity.name,
+                        properties=self._to_json(entity.properties),
+                        source_system=entity.source_system,
+                        confidence=entity.confidence,
+                        mention_count=first_count[entity_id] + mentions[entity_id] - 1,
+                    )
+                    session.add(row)
+                    existing[entity_id] = row
+                if entity_id in embeddings:
+                    row.embedding = self._serialize_embedding(embeddings[entity_id])
 
             await session.commit()
 
+        if resolve:
+            await self._record_aliases(self._resolver.alias_rows(list(latest.values()), mapping))
+        return mapping
+
+    def _merge_into(self, row: EntityRow, entity: Entity, mentions: int) -> None:
+        """Fold a duplicate *entity* into its canonical *row*."""
+        properties = self._from_json(row.properties) or {}
+        row.properties = self._to_json({**entity.properties, **properties})
+        row.confidence = max(row.confidence, entity.confidence)
+        row.mention_count = row.mention_count + mentions
+
+    async def _record_aliases(self, pairs: dict[tuple[str, str], str]) -> None:
+        """Store new aliases; a concurrent writer claiming one first is harmless."""
+        if not pairs:
+            return
+        async with self._session_factory() as session:
+            try:
+                await self._resolver.record_aliases(session, pairs)
+                await session.commit()
+            except IntegrityError:
+                await session.rollback()
+                _logger.debug("Alias already recorded by a concurrent writer", exc_info=True)
+
+    async def _embed_entities(
+        self, entities: list[Entity], batch_size: int
+    ) -> dict[str, list[float]]:
+        """Embed *entities* in batches; entities whose batch fails are skipped."""
+        if not self._embedding_provider:
+            return {}
+        embeddings: dict[str, list[float]] = {}
+        batch_size = max(1, batch_size)
+        for start in range(0, len(entities), batch_size):
+            batch = entities[start : start + batch_size]
+            texts = [f"{e.name} ({e.entity_type}): {e.properties}" for e in batch]
+            try:
+                vectors = await self._embedding_provider.embed(texts)
+            except Exception:
+                _logger.debug("Failed to embed %d entities", len(batch), exc_info=True)
+                continue
+            for entity, vector in zip(batch, vectors or []):
+                if vector:
+                    embeddings[entity.id] = vector
+        return embeddings
+
+    async def compact_entities(
+        self,
+        on_progress: Callable[[int, str], Awaitable[None]] | None = None,
+    ) -> dict[str, int]:
+        """Merge duplicate entities already stored in the graph.
+
+        Entities are grouped per normalised type.  Within a type, entities
+        sharing a normalised name or an alias are merged, as are entities
+        that share a blocking token and whose embeddings are at least
+        ``similarity_threshold`` similar.  Each group keeps its most
+        mentioned entity (oldest first on ties); relations are rewired onto
+        it, duplicate triples and merge-induced self-loops are removed, and
+        every merged name is recorded as an alias.
+        """
+        stats = {
+            "entities_merged": 0,
+            "relations_rewired": 0,
+            "relations_removed": 0,
+            "aliases_added": 0,
+        }
+        async with self._session_factory() as session:
+            result = await session.execute(select(EntityRow.entity_type).distinct())
+            types: dict[str, list[str]] = {}
+            for raw_type in result.scalars():
+                types.setdefault(normalize_entity_type(raw_type), []).append(raw_type)
+
+        for index, (entity_type, raw_types) in enumerate(sorted(types.items())):
+            async with self._session_factory() as session:
+                group_stats = await self._compact_type(session, entity_type, raw_types)
+                await session.commit()
+            for key, value in group_stats.items():
+                stats[key] += value
+            if on_progress is not None:
+                pct = int((index + 1) / len(types) * 100)
+                await on_progress(pct, f"Compacted {index + 1}/{len(types)} entity types")
+        self._traversal.invalidate()
+        return stats
+
+    async def _compact_type(
+        self, session: AsyncSession, entity_type: str, raw_types: list[str]
+    ) -> dict[str, int]:
+        """Merge the duplicates of one normalised entity type."""
+        rows = list(
+            (
+                await session.execute(
+                    select(EntityRow).where(EntityRow.entity_type.in_(raw_types))
+                )
+            ).scalars()
+        )
+        by_id = {row.id: row for row in rows}
+        parent = {row.id: row.id for row in rows}
+
+        def find(entity_id: str) -> str:
+            while parent[entity_id] != entity_id:
+                parent[entity_id] = parent[parent[entity_id]]
+                entity_id = parent[entity_id]
+            return entity_id
+
+        def union(a: str, b: str) -> None:
+            root_a, root_b = find(a), find(b)
+            if root_a != root_b:
+                parent[root_b] = root_a
+
+        # Exact: same normalised name, or a name already aliased to an entity.
+        keys = {row.id: normalize_entity_name(row.name) for row in rows}
+        first_by_key: dict[str, str] = {}
+        for entity_id, key in keys.items():
+            union(first_by_key.setdefault(key, entity_id), entity_id)
+        alias_result = await session.execute(
+            select(EntityAliasRow.alias, EntityAliasRow.entity_id).where(
+                EntityAliasRow.entity_type == entity_type
+            )
+        )
+        for alias, target in alias_result.all():
+            if alias in first_by_key and target in parent:
+                union(target, first_by_key[alias])
+
+        # Similar: one unit vector per name, compared within token blocks.
+        vectors: dict[str, list[float]] = {}
+        for key, entity_id in first_by_key.items():
+            vector = parse_embedding(by_id[entity_id].embedding)
+            norm = math.sqrt(sum(v * v for v in vector)) if vector else 0.0
+            if norm:
+                vectors[entity_id] = [v / norm for v in vector]
+        blocks: dict[str, list[str]] = {}
+        for entity_id in vectors:
+            for token in blocking_tokens(by_id[entity_id].name):
+                blocks.setdefault(token, []).append(entity_id)
+        threshold = self._resolver.similarity_threshold
+        for members in blocks.values():
+            if len(members) > _COMPACT_MAX_BLOCK:
+                continue
+            for i, a in enumerate(members):
+                for b in members[i + 1 :]:
+                    if find(a) != find(b) and cosine_similarity(vectors[a], vectors[b]) >= threshold:
+                        union(a, b)
+
+        clusters: dict[str, list[EntityRow]] = {}
+        for row in rows:
+            clusters.setdefault(find(row.id), []).append(row)
+
+        remap: dict[str, str] = {}
+        aliases: dict[tuple[str, str], str] = {}
+        for members in clusters.values():
+            canonical = min(members, key=self._canonical_rank)
+            for row in members:
+                if keys[row.id]:
+                    aliases.setdefault((entity_type, keys[row.id]), canonical.id)
+                if row is canonical:
+                    continue
+                remap[row.id] = canonical.id
+                self._merge_into(canonical, self._row_to_entity(row), row.mention_count)
+
+        stats = {
+            "entities_merged": len(remap),
+            "relations_rewired": 0,
+            "relations_removed": 0,
+            "aliases_added": 0,
+        }
+        if remap:
+            rewired, removed = await self._rewire_relations(session, remap)
+            stats["relations_rewired"] = rewired
+            stats["relations_removed"] = removed
+            merged = list(remap)
+            for start in range(0, len(merged), _BULK_CHUNK):
+                chunk = merged[start : start + _BULK_CHUNK]
+                for old_id in chunk:
+                    await session.execute(
+                        update(EntityAliasRow)
+                        .where(EntityAliasRow.entity_id == old_id)
+                        .values(entity_id=remap[old_id])
+                    )
+                await session.execute(delete(EntityRow).where(EntityRow.id.in_(chunk)))
+        stats["aliases_added"] = await self._resolver.record_aliases(session, aliases)
+        return stats
+
+    @staticmethod
+    def _canonical_rank(row: EntityRow) -> tuple[Any, ...]:
+        """Sort key choosing a cluster's canonical: most mentions, then oldest."""
+        created = row.created_at.timestamp() if row.created_at else float("inf")
+        return (-row.mention_count, created, row.id)
+
+    async def _rewire_relations(
+        self, session: AsyncSession, remap: dict[str, str]
+    ) -> tuple[int, int]:
+        """Point relations of merged entities at their canonicals.
+
+        Returns ``(rewired, removed)``: relations moved to a canonical, and
+        relations deleted because the move duplicated an existing triple or
+        turned them into a self-loop.
+        """
+        touched = sorted(set(remap) | set(remap.values()))
+        rows: dict[str, RelationRow] = {}
+        for start in range(0, len(touched), _BULK_CHUNK):
+            chunk = touched[start : start + _BULK_CHUNK]
+            result = await session.execute(
+                select(RelationRow).where(
+                    or_(RelationRow.source_id.in_(chunk), RelationRow.target_id.in_(chunk))
+                )
+            )
+            rows.update({row.id: row for row in result.scalars()})
+
+        # Relations that need no change claim their triple first.
+        ordered = sorted(
+            rows.values(),
+            key=lambda r: (r.source_id in remap or r.target_id in remap, r.id),
+        )
+        seen: set[tuple[str, str, str]] = set()
+        rewired = removed = 0
+        for row in ordered:
+            source = remap.get(row.source_id, row.source_id)
+            target = remap.get(row.target_id, row.target_id)
+            triple = (source, target, row.relation_type)
+            self_loop = source == target and row.source_id != row.target_id
+            if self_loop or triple in seen:
+                await session.delete(row)
+                removed += 1
+                continue
+            seen.add(triple)
+            if (source, target) != (row.source_id, row.target_id):
+                row.source_id, row.target_id = source, target
+                rewired += 1
+        return rewired, removed
+
     async def get_entity(self, entity_id: str) -> Entity | None:
         """Get an entity by ID."""
         async with self._session_factory() as session:
@@ -117,41 +423,67 @@ class KnowledgeGraph:
 
     async def add_relation(self, relation: Relation) -> None:
         """Add a relation between two entities (upsert — skips duplicates)."""
+        await self.add_relations([relation])
+
+    async def add_relations(self, relations: list[Relation]) -> None:
+        """Add several relations in one transaction.
+
+        A relation whose ``(source_id, target_id, relation_type)`` triple
+        already exists updates that row's properties and confidence; within
+        *relations* the last occurrence of a triple wins.
+        """
+        if not relations:
+            return
+        latest: dict[tuple[str, str, str], Relation] = {
+            (r.source_id, r.target_id, r.relation_type): r for r in relations
+        }
         async with self._session_factory() as session:
-            # Check for an existing relation with the same triple
-            existing = (
-                await session.execute(
+            existing: dict[tuple[str, str, str], RelationRow] = {}
+            source_ids = sorted({key[0] for key in latest})
+            for start in range(0, len(source_ids), _BULK_CHUNK):
+                result = await session.execute(
                     select(RelationRow).where(
-                        RelationRow.source_id == relation.source_id,
-                        RelationRow.target_id == relation.target_id,
-                        RelationRow.relation_type == relation.relation_type,
+                        RelationRow.source_id.in_(source_ids[start : start + _BULK_CHUNK])
                     )
                 )
-            ).scalar_one_or_none()
-            if existing is not None:
-                # Update properties and confidence on the existing row
-                existing.properties = self._to_json(relation.properties)
-                existing.confidence = relation.confidence
-            else:
-                row = RelationRow(
-                    source_id=relation.source_id,
-                    target_id=relation.target_id,
-                    relation_type=relation.relation_type,
-                    properties=self._to_json(relation.properties),
-                    confidence=relation.confidence,
-                )
-                session.add(row)
+                for row in result.scalars():
+                    key = (row.source_id, row.target_id, row.relation_type)
+                    if key in latest:
+                        existing.setdefault(key, row)
+
+            for key, relation in latest.items():
+                row = existing.get(key)
+                if row is not None:
+                    # Update properties and confidence on the existing row
+                    row.properties = self._to_json(relation.properties)
+                    row.confidence = relation.confidence
+                else:
+                    session.add(
+                        RelationRow(
+                            source_id=relation.source_id,
+                            target_id=relation.target_id,
+                            relation_type=relation.relation_type,
+                            properties=self._to_json(relation.properties),
+                            confidence=relation.confidence,
+                        )
+                    )
             await session.commit()
+        self._traversal.invalidate()
 
     async def find_relevant_entities(
-        self, query: str, *, limit: int = 5
+        self, query: str, *, limit: int = 5, query_embedding: list[float] | None = None
     ) -> list[Entity]:
-        """Find entities semantically or by name (case-insensitive LIKE fallback)."""
+        """Find entities semantically or by name (case-insensitive LIKE fallback).
+
+        *query_embedding* is used instead of embedding *query* when given.
+        """
         if self._embedding_provider:
             try:
-                query_embeddings = await self._embedding_provider.embed([query])
-                if query_embeddings and query_embeddings[0]:
-                    results = await self._find_by_embedding(query_embeddings[0], limit)
+                if query_embedding is None:
+                    query_embeddings = await self._embedding_provider.embed([query])
+                    query_embedding = query_embeddings[0] if query_embeddings else None
+                if query_embedding:
+                    results = await self._find_by_embedding(query_embedding, limit)
                     if results:
                         return results
             except Exception:
@@ -209,63 +541,60 @@ class KnowledgeGraph:
         )
 
     async def get_entity_neighborhood(
-        self, entity_id: str, *, depth: int = 1
+        self,
+        entity_id: str,
+        *,
+        depth: int = 1,
+        relation_types: list[str] | None = None,
+        max_fanout: int | None = None,
     ) -> EntityGraph:
-        """Get an entity and its immediate relations (1 level deep).
+        """Get an entity and the entities and relations within *depth* hops.
 
-        For depth > 1, recursively fetch related entities.
-        MVP supports depth=1 only for simplicity.
+        Returns an empty graph when the entity does not exist.  See
+        :meth:`get_neighborhoods` for the filters.
         """
-        graph = EntityGraph()
+        return await self.get_neighborhoods(
+            [entity_id], depth=depth, relation_types=relation_types, max_fanout=max_fanout
+        )
 
-        async with self._session_factory() as session:
-            # Get the root entity
-            root = await session.get(EntityRow, entity_id)
-            if root is None:
-                return graph
-            graph.entities.append(self._row_to_entity(root))
-
-            # Get outgoing and incoming relations
-            visited = {entity_id}
-            current_ids = {entity_id}
-
-            for _ in range(depth):
-                if not current_ids:
-                    break
-
-                next_ids: set[str] = set()
-                id_list = list(current_ids)
-
-                # Batch-fetch outgoing + incoming relations in two queries
-                outgoing = await session.execute(
-                    select(RelationRow).where(RelationRow.source_id.in_(id_list))
-                )
-                for rel_row in outgoing.scalars().all():
-                    graph.relations.append(self._row_to_relation(rel_row))
-                    if rel_row.target_id not in visited:
-                        next_ids.add(rel_row.target_id)
-                        visited.add(rel_row.target_id)
-
-                incoming = await session.execute(
-                    select(RelationRow).where(RelationRow.target_id.in_(id_list))
-                )
-                for rel_row in incoming.scalars().all():
-                    graph.relations.append(self._row_to_relation(rel_row))
-                    if rel_row.source_id not in visited:
-                        next_ids.add(rel_row.source_id)
-                        visited.add(rel_row.source_id)
-
-                # Batch-fetch newly discovered entities
-                if next_ids:
-                    entity_result = await session.execute(
-                        select(EntityRow).where(EntityRow.id.in_(list(next_ids)))
-                    )
-                    for entity_row in entity_result.scalars().all():
-                        graph.entities.append(self._row_to_entity(entity_row))
+    async def get_neighborhoods(
+        self,
+        entity_ids: list[str],
+        *,
+        depth: int = 1,
+        relation_types: list[str] | None = None,
+        max_fanout: int | None = None,
+    ) -> EntityGraph:
+        """Get the combined neighbourhood of several entities in one traversal.
 
-                current_ids = next_ids
+        Relations are followed in both directions.  *relation_types*
+        restricts which relations are followed and *max_fanout* caps the
+        relations followed per entity and hop, highest confidence first.
+        The query count does not grow with the number of roots or hops.
+        """
+        return await self._traversal.neighborhoods(
+            entity_ids, depth=depth, relation_types=relation_types, max_fanout=max_fanout
+        )
 
-        return graph
+    async def find_paths(
+        self,
+        source_id: str,
+        target_id: str,
+        *,
+        max_depth: int = 3,
+        relation_types: list[str] | None = None,
+        max_fanout: int = DEFAULT_PATH_FANOUT,
+        limit: int = 10,
+    ) -> list[GraphPath]:
+        """Find up to *limit* simple paths of at most *max_depth* relations, shortest first."""
+        return await self._traversal.find_paths(
+            source_id,
+            target_id,
+            max_depth=max_depth,
+            relation_types=relation_types,
+            max_fanout=max_fanout,
+            limit=limit,
+        )
 
     async def list_entities(
         self,
@@ -320,9 +649,22 @@ class KnowledgeGraph:
             await session.execute(
                 delete(RelationRow).where(RelationRow.target_id == entity_id)
             )
+            await session.execute(
+                delete(EntityAliasRow).where(EntityAliasRow.entity_id == entity_id)
+            )
             await session.delete(existing)
             await session.commit()
-            return True
+        self._traversal.invalidate()
+        return True
+
+    async def clear(self) -> None:
+        """Delete every entity, alias and relation in the graph."""
+        async with self._session_factory() as session:
+            await session.execute(delete(RelationRow))
+            await session.execute(delete(EntityAliasRow))
+            await session.execute(delete(EntityRow))
+            await session.commit()
+        self._traversal.invalidate()
 
     async def get_stats(self) -> dict[str, Any]:
         """Return graph statistics: entity count, relation count, type breakdown."""
@@ -0,0 +1,441 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""Knowledge graph traversal -- bulk neighbourhoods and path queries.
+
+Relations are treated as undirected edges when walking the graph.  Every
+query runs in a fixed number of statements regardless of how many roots
+or hops are requested:
+
+* **PostgreSQL** walks the graph in the database with a ``WITH RECURSIVE``
+  query; fan-out caps are applied per node with a ``LATERAL`` subquery.
+* **Other dialects** (SQLite in development) walk an in-memory adjacency
+  snapshot of ``kg_relations``.  The snapshot is rebuilt after graph writes
+  (see :meth:`GraphTraversal.invalidate`) or once it is
+  ``snapshot_ttl`` seconds old.
+
+Both backends then load the reached relations and entities by id.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import String, bindparam, select, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from flydesk.models.knowledge import EntityRow, RelationRow
+
+if TYPE_CHECKING:
+    from flydesk.knowledge.graph import EntityGraph, Relation
+
+_logger = logging.getLogger(__name__)
+
+# Ids per ``IN (...)`` clause when loading reached rows.
+_LOAD_CHUNK = 500
+
+# Relations followed per entity and hop by path queries unless overridden;
+# path enumeration grows as fan-out ** depth, so it is never unbounded.
+DEFAULT_PATH_FANOUT = 25
+
+
+@dataclass
+class GraphPath:
+    """A walk between two entities: ``entity_ids[i]`` -- ``relations[i]`` -- ``entity_ids[i + 1]``."""
+
+    entity_ids: list[str]
+    relations: list[Relation] = field(default_factory=list)
+
+    @property
+    def length(self) -> int:
+        return len(self.relations)
+
+
+@dataclass
+class _Edge:
+    relation_id: str
+    neighbor: str
+    relation_type: str
+    confidence: float
+
+
+class GraphTraversal:
+    """Multi-root, depth-N traversal over ``kg_relations``.
+
+    Parameters
+    ----------
+    session_factory:
+        Session factory bound to the knowledge graph database.
+    snapshot_ttl:
+        Seconds an in-memory adjacency snapshot is reused on non-Postgres
+        databases before it is rebuilt.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        snapshot_ttl: float = 30.0,
+    ) -> None:
+        self._session_factory = session_factory
+        self._snapshot_ttl = snapshot_ttl
+        self._snapshot: dict[str, list[_Edge]] | None = None
+        self._snapshot_at = 0.0
+        self._snapshot_lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        """Drop the adjacency snapshot; the next query rebuilds it."""
+        self._snapshot = None
+
+    # ------------------------------------------------------------------
+    # Public queries
+    # ------------------------------------------------------------------
+
+    async def neighborhoods(
+        self,
+        root_ids: Sequence[str],
+        *,
+        depth: int = 1,
+        relation_types: Iterable[str] | None = None,
+        max_fanout: int | None = None,
+    ) -> EntityGraph:
+        """Return the union of the neighbourhoods of *root_ids*.
+
+        Parameters
+        ----------
+        root_ids:
+            Entities to start from.  Roots missing from the graph are ignored.
+        depth:
+            Hops to walk from each root.
+        relation_types:
+            Only follow relations of these types (all types when ``None``).
+        max_fanout:
+            Follow at most this many relations per entity and hop, highest
+            confidence first (unlimited when ``None``).
+        """
+        from flydesk.knowledge.graph import EntityGraph
+
+        roots = list(dict.fromkeys(root_ids))
+        if not roots:
+            return EntityGraph()
+        types = sorted(set(relation_types)) if relation_types is not None else None
+
+        async with self._session_factory() as session:
+            if _is_postgres(session):
+                reached, relation_ids = await self._walk_sql(
+                    session, roots, max(0, depth), types, max_fanout
+                )
+            else:
+                adjacency = await self._adjacency(session)
+                reached, relation_ids = _walk_snapshot(
+                    adjacency, roots, max(0, depth), types, max_fanout
+                )
+            entities = await _load_entities(session, reached)
+            if not any(root in entities for root in roots):
+                return EntityGraph()
+            relations = await _load_relations(session, relation_ids)
+
+        # Roots first, then by hop distance -- as the single-root walk returned them.
+        order = {entity_id: (hops, i) for i, (entity_id, hops) in enumerate(reached.items())}
+        present = set(entities)
+        return EntityGraph(
+            entities=[entities[e] for e in sorted(present, key=order.__getitem__)],
+            relations=[
+                r for r in relations if r.source_id in present or r.target_id in present
+            ],
+        )
+
+    async def find_paths(
+        self,
+        source_id: str,
+        target_id: str,
+        *,
+        max_depth: int = 3,
+        relation_types: Iterable[str] | None = None,
+        max_fanout: int = DEFAULT_PATH_FANOUT,
+        limit: int = 10,
+    ) -> list[GraphPath]:
+        """Return up to *limit* simple paths between two entities, shortest first.
+
+        At most *max_fanout* relations are followed per entity and hop,
+        highest confidence first.
+        """
+        if source_id == target_id:
+            return [GraphPath(entity_ids=[source_id])]
+        types = sorted(set(relation_types)) if relation_types is not None else None
+
+        async with self._session_factory() as session:
+            if _is_postgres(session):
+                walks = await self._paths_sql(
+                    session, source_id, target_id, max_depth, types, max_fanout, limit
+                )
+            else:
+                adjacency = await self._adjacency(session)
+                walks = _paths_snapshot(
+                    adjacency, source_id, target_id, max_depth, types, max_fanout, limit
+                )
+            relation_ids = {rid for _, rids in walks for rid in rids}
+            relations = {r.id: r for r in await _load_relations(session, relation_ids)}
+
+        return [
+            GraphPath(entity_ids=nodes, relations=[relations[rid] for rid in rids])
+            for nodes, rids in walks
+            if all(rid in relations for rid in rids)
+        ]
+
+    # ------------------------------------------------------------------
+    # PostgreSQL: recursive CTEs
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _edges_sql(types: list[str] | None, max_fanout: int | None) -> str:
+        """Lateral subquery yielding the followed edges of ``w.node``."""
+        type_filter = "AND r.relation_type = ANY(:types)" if types is not None else ""
+        limit = "LIMIT :fanout" if max_fanout is not None else ""
+        return f"""
+            SELECT r.id,
+                   CASE WHEN r.source_id = w.node THEN r.target_id ELSE r.source_id END
+                       AS neighbor
+            FROM kg_relations r
+            WHERE (r.source_id = w.node OR r.target_id = w.node) {type_filter}
+            ORDER BY r.confidence DESC, r.id
+            {limit}
+        """
+
+    @classmethod
+    def _params(cls, stmt: Any, types: list[str] | None, max_fanout: int | None) -> Any:
+        params: dict[str, Any] = {}
+        if types is not None:
+            stmt = stmt.bindparams(bindparam("types", type_=ARRAY(String)))
+            params["types"] = types
+        if max_fanout is not None:
+            params["fanout"] = max_fanout
+        return stmt, params
+
+    async def _walk_sql(
+        self,
+        session: AsyncSession,
+        roots: list[str],
+        depth: int,
+        types: list[str] | None,
+        max_fanout: int | None,
+    ) -> tuple[dict[str, int], set[str]]:
+        stmt = text(f"""
+            WITH RECURSIVE walk(node, hops, relation_id) AS (
+                SELECT CAST(root AS VARCHAR), 0, CAST(NULL AS VARCHAR)
+                FROM unnest(:roots) AS root
+              UNION
+                SELECT e.neighbor, w.hops + 1, e.id
+                FROM walk w
+                CROSS JOIN LATERAL ({self._edges_sql(types, max_fanout)}) e
+                WHERE w.hops < :depth
+            )
+            SELECT node, MIN(hops) AS hops, array_remove(array_agg(DISTINCT relation_id), NULL)
+            FROM walk
+            GROUP BY node
+            ORDER BY MIN(hops)
+        """).bindparams(bindparam("roots", type_=ARRAY(String)))
+        stmt, params = self._params(stmt, types, max_fanout)
+        result = await session.execute(stmt, {**params, "roots": roots, "depth": depth})
+
+        reached = {root: 0 for root in roots}
+        relation_ids: set[str] = set()
+        for node, hops, rel_ids in result.all():
+            reached.setdefault(node, hops)
+            relation_ids.update(rel_ids or [])
+        return reached, relation_ids
+
+    async def _paths_sql(
+        self,
+        session: AsyncSession,
+        source_id: str,
+        target_id: str,
+        max_depth: int,
+        types: list[str] | None,
+        max_fanout: int | None,
+        limit: int,
+    ) -> list[tuple[list[str], list[str]]]:
+        # The recursive term adds one hop per iteration, so walks come out
+        # shortest first.  Without an ORDER BY the outer LIMIT stops the
+        # recursion as soon as enough paths are found, instead of
+        # enumerating every walk up to max_depth before sorting.
+        stmt = text(f"""
+            WITH RECURSIVE walk(node, path, relation_path) AS (
+                SELECT CAST(:source AS VARCHAR),
+                       ARRAY[CAST(:source AS VARCHAR)],
+                       CAST(ARRAY[] AS VARCHAR[])
+              UNION ALL
+                SELECT e.neighbor, w.path || e.neighbor, w.relation_path || e.id
+                FROM walk w
+                CROSS JOIN LATERAL ({self._edges_sql(types, max_fanout)}) e
+                WHERE cardinality(w.relation_path) < :max_depth
+                  AND w.node <> :target
+                  AND NOT (e.neighbor = ANY(w.path))
+            )
+            SELECT path, relation_path
+            FROM walk
+            WHERE node = :target
+            LIMIT :limit
+        """)
+        stmt, params = self._params(stmt, types, max_fanout)
+        result = await session.execute(
+            stmt,
+            {
+                **params,
+                "source": source_id,
+                "target": target_id,
+                "max_depth": max_depth,
+                "limit": limit,
+            },
+        )
+        walks = [(list(path), list(rels)) for path, rels in result.all()]
+        return sorted(walks, key=lambda walk: len(walk[1]))
+
+    # ------------------------------------------------------------------
+    # Other dialects: adjacency snapshot
+    # ------------------------------------------------------------------
+
+    async def _adjacency(self, session: AsyncSession) -> dict[str, list[_Edge]]:
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._snapshot_at < self._snapshot_ttl:
+            return snapshot
+        async with self._snapshot_lock:
+            if self._snapshot is not None and (
+                time.monotonic() - self._snapshot_at < self._snapshot_ttl
+            ):
+                return self._snapshot
+            result = await session.execute(
+                select(
+                    RelationRow.id,
+                    RelationRow.source_id,
+                    RelationRow.target_id,
+                    RelationRow.relation_type,
+                    RelationRow.confidence,
+                )
+            )
+            adjacency: dict[str, list[_Edge]] = {}
+            for rel_id, source, target, rel_type, confidence in result.all():
+                adjacency.setdefault(source, []).append(_Edge(rel_id, target, rel_type, confidence))
+                if target != source:
+                    adjacency.setdefault(target, []).append(
+                        _Edge(rel_id, source, rel_type, confidence)
+                    )
+            for edges in adjacency.values():
+                edges.sort(key=lambda e: (-e.confidence, e.relation_id))
+            self._snapshot = adjacency
+            self._snapshot_at = time.monotonic()
+            _logger.debug("Built KG adjacency snapshot for %d entities", len(adjacency))
+            return adjacency
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _is_postgres(session: AsyncSession) -> bool:
+    return session.get_bind().dialect.name == "postgresql"
+
+
+def _followed(
+    adjacency: dict[str, list[_Edge]],
+    node: str,
+    types: list[str] | None,
+    max_fanout: int | None,
+) -> list[_Edge]:
+    edges = adjacency.get(node, [])
+    if types is not None:
+        edges = [e for e in edges if e.relation_type in types]
+    return edges[:max_fanout] if max_fanout is not None else edges
+
+
+def _walk_snapshot(
+    adjacency: dict[str, list[_Edge]],
+    roots: list[str],
+    depth: int,
+    types: list[str] | None,
+    max_fanout: int | None,
+) -> tuple[dict[str, int], set[str]]:
+    reached = {root: 0 for root in roots}
+    relation_ids: set[str] = set()
+    frontier = list(roots)
+    for hops in range(1, depth + 1):
+        next_frontier: list[str] = []
+        for node in frontier:
+            for edge in _followed(adjacency, node, types, max_fanout):
+                relation_ids.add(edge.relation_id)
+                if edge.neighbor not in reached:
+                    reached[edge.neighbor] = hops
+                    next_frontier.append(edge.neighbor)
+        if not next_frontier:
+            break
+        frontier = next_frontier
+    return reached, relation_ids
+
+
+def _paths_snapshot(
+    adjacency: dict[str, list[_Edge]],
+    source_id: str,
+    target_id: str,
+    max_depth: int,
+    types: list[str] | None,
+    max_fanout: int | None,
+    limit: int,
+) -> list[tuple[list[str], list[str]]]:
+    found: list[tuple[list[str], list[str]]] = []
+    frontier: list[tuple[list[str], list[str]]] = [([source_id], [])]
+    for _ in range(max_depth):
+        next_frontier: list[tuple[list[str], list[str]]] = []
+        for nodes, rels in frontier:
+            for edge in _followed(adjacency, nodes[-1], types, max_fanout):
+                if edge.neighbor in nodes:
+                    continue
+                walk = (nodes + [edge.neighbor], rels + [edge.relation_id])
+                if edge.neighbor == target_id:
+                    found.append(walk)
+                    if len(found) >= limit:
+                        return found
+                else:
+                    next_frontier.append(walk)
+        if not next_frontier:
+            break
+        frontier = next_frontier
+    return found
+
+
+async def _load_entities(session: AsyncSession, ids: Iterable[str]) -> dict[str, Any]:
+    from flydesk.knowledge.graph import KnowledgeGraph
+
+    id_list = list(ids)
+    entities: dict[str, Any] = {}
+    for start in range(0, len(id_list), _LOAD_CHUNK):
+        result = await session.execute(
+            select(EntityRow).where(EntityRow.id.in_(id_list[start : start + _LOAD_CHUNK]))
+        )
+        for row in result.scalars():
+            entities[row.id] = KnowledgeGraph._row_to_entity(row)
+    return entities
+
+
+async def _load_relations(session: AsyncSession, ids: Iterable[str]) -> list[Relation]:
+    from flydesk.knowledge.graph import KnowledgeGraph
+
+    id_list = sorted(ids)
+    relations: list[Relation] = []
+    for start in range(0, len(id_list), _LOAD_CHUNK):
+        result = await session.execute(
+            select(RelationRow).where(RelationRow.id.in_(id_list[start : start + _LOAD_CHUNK]))
+        )
+        relations.extend(KnowledgeGraph._row_to_relation(row) for row in result.scalars())
+    return relations
@@ -25,6 +25,11 @@ _logger = logging.getLogger(__name__)
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from flydesk.knowledge.membership import (
+    delete_document_workspaces,
+    in_workspaces,
+    set_document_workspaces,
+)
 from flydesk.knowledge.models import DocumentChunk, KnowledgeDocument
 from flydesk.models.knowledge_base import DocumentChunkRow, KnowledgeDocumentRow
 
@@ -78,6 +83,7 @@ class KnowledgeIndexer:
         auto_kg_extract: bool = False,
         kg_extractor: Any | None = None,
         cache: KnowledgeCache | None = None,
+        embedding_batch_size: int = 256,
     ) -> None:
         self._session_factory = session_factory
         self._embedding_provider = embedding_provider
@@ -88,32 +94,56 @@ class KnowledgeIndexer:
         self._auto_kg_extract = auto_kg_extract
         self._kg_extractor = kg_extractor
         self._cache = cache
+        self._embedding_batch_size = max(1, embedding_batch_size)
 
     async def index_document(self, document: KnowledgeDocument) -> list[DocumentChunk]:
         """Index a document: store it, chunk it, embed chunks, persist chunks."""
+        indexed = await self.index_documents([document])
+        return indexed[document.id]
+
+    async def index_documents(
+        self, documents: list[KnowledgeDocument]
+    ) -> dict[str, list[DocumentChunk]]:
+        """Index several documents with shared embedding calls and one chunk insert.
+
+        Returns the chunks created for each document, keyed by document id.
+        """
         # 1. Store the document metadata via SQLAlchemy (merge for upsert)
         async with self._session_factory() as session:
-            doc_row = KnowledgeDocumentRow(
-                id=document.id,
-                title=document.title,
-                content=document.content,
-                document_type=str(document.document_type),
-                source=document.source,
-                workspace_ids=_to_json(document.workspace_ids),
-                tags=_to_json(document.tags),
-                metadata_=_to_json(document.metadata),
-            )
-            await session.merge(doc_row)
+            for document in documents:
+                doc_row = KnowledgeDocumentRow(
+                    id=document.id,
+                    title=document.title,
+                    content=document.content,
+                    document_type=str(document.document_type),
+                    source=document.source,
+                    workspace_ids=_to_json(document.workspace_ids),
+                    tags=_to_json(document.tags),
+                    metadata_=_to_json(document.metadata),
+                )
+                await session.merge(doc_row)
+                await set_document_workspaces(session, document.id, document.workspace_ids)
             await session.commit()
 
         # 2. Chunk the content (routes through structural/fixed/auto mode)
-        chunks = self.chunk_document(document.id, document.content)
+        chunks_by_doc = {
+            document.id: self.chunk_document(document.id, document.content)
+            for document in documents
+        }
+        chunks = [chunk for doc_chunks in chunks_by_doc.values() for chunk in doc_chunks]
 
-        # 3. Generate embeddings
+        # 3. Generate embeddings, sharing provider calls across documents
         texts = [c.content for c in chunks]
-        embeddings = await self._embedding_provider.embed(texts)
+        embeddings: list[list[float]] = []
+        for start in range(0, max(len(texts), 1), self._embedding_batch_size):
+            embeddings.extend(
+                await self._embedding_provider.embed(
+                    texts[start : start + self._embedding_batch_size]
+                )
+            )
 
         # 4. Store chunks with embeddings
+        tags_by_doc = {document.id: document.tags for document in documents}
         if self._vector_store is not None:
             from fireflyframework_genai.vectorstores import VectorDocument
 
@@ -123,9 +153,9 @@ class KnowledgeIndexer:
                     text=chunk.content,
                     embedding=embedding,
                     metadata={
-                        "document_id": document.id,
+                        "document_id": chunk.document_id,
                         "chunk_index": chunk.chunk_index,
-                        "tags": document.tags,
+                        "tags": tags_by_doc[chunk.document_id],
                         **chunk.metadata,
                     },
                 )
@@ -135,35 +165,39 @@ class KnowledgeIndexer:
         else:
             dialect = _detect_dialect(self._session_factory)
             async with self._session_factory() as session:
-                for chunk, embedding in zip(chunks, embeddings):
-                    row = DocumentChunkRow(
-                        id=chunk.chunk_id,
-                        document_id=chunk.document_id,
-                        content=chunk.content,
-                        chunk_index=chunk.chunk_index,
-                        embedding=_serialize_embedding(embedding, dialect),
-                        metadata_=_to_json(chunk.metadata),
-                    )
-                    session.add(row)
+                session.add_all(
+                    [
+                        DocumentChunkRow(
+                            id=chunk.chunk_id,
+                            document_id=chunk.document_id,
+                            content=chunk.content,
+                            chunk_index=chunk.chunk_index,
+                            embedding=_serialize_embedding(embedding, dialect),
+                            metadata_=_to_json(chunk.metadata),
+                        )
+                        for chunk, embedding in zip(chunks, embeddings)
+                    ]
+                )
                 await session.commit()
 
-        # Auto-trigger KG extraction (non-fatal)
-        if self._auto_kg_extract and self._kg_extractor:
-            try:
-                await self._kg_extractor.extract_from_document(
-                    document.content, document.title,
-                )
-            except Exception:
-                _logger.debug(
-                    "Auto KG extraction failed for %s", document.id,
-                    exc_info=True,
-                )
+        for document in documents:
+            # Auto-trigger KG extraction (non-fatal)
+            if self._auto_kg_extract and self._kg_extractor:
+                try:
+                    await self._kg_extractor.extract_from_document(
+                        document.content, document.title,
+                    )
+                except Exception:
+                    _logger.debug(
+                        "Auto KG extraction failed for %s", document.id,
+                        exc_info=True,
+                    )
 
-        # Invalidate cached search results since the index has changed
-        if self._cache is not None:
-            await self._cache.invalidate_document(document.id)
+            # Invalidate cached search results since the index has changed
+            if self._cache is not None:
+                await self._cache.invalidate_document(document.id)
 
-        return chunks
+        return chunks_by_doc
 
     def _chunk_text(self, document_id: str, text: str) -> list[DocumentChunk]:
         """Split text into overlapping chunks."""
@@ -327,6 +361,29 @@ class KnowledgeIndexer:
         )
         await producer.enqueue(task)
 
+    async def find_documents_by_source(
+        self, prefix: str
+    ) -> list[tuple[str, str, dict[str, Any]]]:
+        """Return ``(id, source, metadata)`` for documents whose source starts with *prefix*."""
+        async with self._session_factory() as session:
+            result = await session.execute(
+                select(
+                    KnowledgeDocumentRow.id,
+                    KnowledgeDocumentRow.source,
+                    KnowledgeDocumentRow.metadata_,
+                ).where(KnowledgeDocumentRow.source.startswith(prefix, autoescape=True))
+            )
+            rows = result.all()
+        documents: list[tuple[str, str, dict[str, Any]]] = []
+        for doc_id, source, metadata in rows:
+            if isinstance(metadata, str):
+                try:
+                    metadata = json.loads(metadata)
+                except ValueError:
+                    metadata = None
+            documents.append((doc_id, source, metadata if isinstance(metadata, dict) else {}))
+        return documents
+
     async def delete_document(self, document_id: str) -> None:
         """Delete a document and all its chunks."""
         from sqlalchemy import delete
@@ -355,6 +412,7 @@ class KnowledgeIndexer:
             await session.execute(
                 delete(KnowledgeDocumentRow).where(KnowledgeDocumentRow.id == document_id)
             )
+            await delete_document_workspaces(session, [document_id])
             await session.commit()
 
     async def reindex_document(self, document_id: str) -> list[DocumentChunk]:
@@ -441,21 +499,11 @@ class KnowledgeIndexer:
         """
         # List all document IDs (with optional workspace filtering)
         async with self._session_factory() as session:
-            query = select(KnowledgeDocumentRow.id, KnowledgeDocumentRow.workspace_ids)
+            query = select(KnowledgeDocumentRow.id)
+            if workspace_id is not None:
+                query = query.where(in_workspaces([workspace_id]))
             result = await session.execute(query)
-            rows = result.all()
-
-        # workspace_ids is stored as a JSON array string; filter in Python
-        if workspace_id is not None:
-            import json as _json
-            filtered_ids: list[str] = []
-            for doc_id, ws_ids_raw in rows:
-                ws_ids = _json.loads(ws_ids_raw) if ws_ids_raw else []
-                if workspace_id in ws_ids:
-                    filtered_ids.append(doc_id)
-            doc_ids = filtered_ids
-        else:
-            doc_ids = [doc_id for doc_id, _ in rows]
+            doc_ids = list(result.scalars().all())
 
         total = len(doc_ids)
         count = 0
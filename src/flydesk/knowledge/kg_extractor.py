@@ -17,7 +17,6 @@ from __future__ import annotations
 
 import json
 import logging
-import uuid
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
@@ -25,6 +24,7 @@ from jinja2 import Environment, FileSystemLoader
 from pydantic import BaseModel, Field
 
 from flydesk.knowledge.analyzer import _MAX_CONTENT_LENGTH
+from flydesk.knowledge.entity_resolution import canonical_entity_id, normalize_entity_name
 
 if TYPE_CHECKING:
     from flydesk.agent.genai_bridge import DeskAgentFactory
@@ -222,12 +222,13 @@ class KGExtractor:
 
         extraction = self._parse_response(output_text)
 
-        # Convert to dicts with generated IDs, suitable for KnowledgeGraph
+        # Convert to dicts with stable canonical IDs, suitable for KnowledgeGraph
         entity_name_to_id: dict[str, str] = {}
         entity_dicts: list[dict[str, Any]] = []
         for ent in extraction.entities:
-            entity_id = str(uuid.uuid4())
+            entity_id = canonical_entity_id(ent.name, ent.entity_type)
             entity_name_to_id[ent.name] = entity_id
+            entity_name_to_id.setdefault(normalize_entity_name(ent.name), entity_id)
             entity_dicts.append(
                 {
                     "id": entity_id,
@@ -241,8 +242,12 @@ class KGExtractor:
 
         relation_dicts: list[dict[str, Any]] = []
         for rel in extraction.relations:
-            source_id = entity_name_to_id.get(rel.source)
-            target_id = entity_name_to_id.get(rel.target)
+            source_id = entity_name_to_id.get(rel.source) or entity_name_to_id.get(
+                normalize_entity_name(rel.source)
+            )
+            target_id = entity_name_to_id.get(rel.target) or entity_name_to_id.get(
+                normalize_entity_name(rel.target)
+            )
             if source_id is None or target_id is None:
                 logger.debug(
                     "Skipping relation %s -> %s (entity not found in extraction)",
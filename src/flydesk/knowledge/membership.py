@@ -0,0 +1,63 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""Workspace membership of knowledge documents.
+
+``kb_documents.workspace_ids`` keeps the JSON list the API exposes; the
+``kb_document_workspaces`` table mirrors it as one indexed row per
+document and workspace, so workspace filters are index lookups instead of
+substring matches on JSON text.  Code that writes ``workspace_ids`` calls
+:func:`set_document_workspaces` in the same session.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+
+from sqlalchemy import ColumnElement, delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from flydesk.models.knowledge_base import KnowledgeDocumentRow, KnowledgeDocumentWorkspaceRow
+
+# Values per ``IN (...)`` clause.
+_IN_CHUNK = 500
+
+
+async def set_document_workspaces(
+    session: AsyncSession, document_id: str, workspace_ids: Iterable[str] | None
+) -> None:
+    """Replace the workspace memberships of *document_id* (not committed)."""
+    await session.execute(
+        delete(KnowledgeDocumentWorkspaceRow).where(
+            KnowledgeDocumentWorkspaceRow.document_id == document_id
+        )
+    )
+    for workspace_id in dict.fromkeys(ws for ws in workspace_ids or () if ws):
+        session.add(
+            KnowledgeDocumentWorkspaceRow(document_id=document_id, workspace_id=workspace_id)
+        )
+
+
+async def delete_document_workspaces(session: AsyncSession, document_ids: Sequence[str]) -> None:
+    """Remove every workspace membership of *document_ids* (not committed)."""
+    ids = list(document_ids)
+    for start in range(0, len(ids), _IN_CHUNK):
+        await session.execute(
+            delete(KnowledgeDocumentWorkspaceRow).where(
+                KnowledgeDocumentWorkspaceRow.document_id.in_(ids[start : start + _IN_CHUNK])
+            )
+        )
+
+
+def in_workspaces(workspace_ids: Sequence[str]) -> ColumnElement[bool]:
+    """Filter on ``kb_documents`` rows belonging to any of *workspace_ids*."""
+    return KnowledgeDocumentRow.id.in_(
+        select(KnowledgeDocumentWorkspaceRow.document_id).where(
+            KnowledgeDocumentWorkspaceRow.workspace_id.in_(list(workspace_ids))
+        )
+    )
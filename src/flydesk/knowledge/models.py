@@ -31,6 +31,19 @@ class KnowledgeDocument(BaseModel):
     metadata: dict[str, Any] = Field(default_factory=dict)
 
 
+class KnowledgeDocumentSummary(BaseModel):
+    """A knowledge document's metadata, without its content."""
+
+    id: str
+    title: str
+    document_type: DocumentType = DocumentType.OTHER
+    status: DocumentStatus = DocumentStatus.DRAFT
+    source: str | None = None
+    workspace_ids: list[str] = Field(default_factory=list)
+    tags: list[str] = Field(default_factory=list)
+    metadata: dict[str, Any] = Field(default_factory=dict)
+
+
 class DocumentChunk(BaseModel):
     """A chunk of a knowledge document for embedding."""
 
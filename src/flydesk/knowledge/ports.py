@@ -12,7 +12,7 @@ from __future__ import annotations
 
 from typing import Protocol, runtime_checkable
 
-from flydesk.knowledge.models import DocumentType, KnowledgeDocument
+from flydesk.knowledge.models import DocumentType, KnowledgeDocument, KnowledgeDocumentSummary
 
 
 @runtime_checkable
@@ -23,6 +23,14 @@ class KnowledgeDocumentStore(Protocol):
         self, *, workspace_id: str | None = None
     ) -> list[KnowledgeDocument]: ...
 
+    async def list_document_summaries(
+        self,
+        *,
+        workspace_id: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> tuple[list[KnowledgeDocumentSummary], int]: ...
+
     async def get_document(
         self, document_id: str
     ) -> KnowledgeDocument | None: ...
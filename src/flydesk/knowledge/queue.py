@@ -8,10 +8,15 @@
 
 """Background queue for asynchronous knowledge document indexing.
 
-Provides an in-memory queue (``asyncio.Queue``) and an optional Redis-backed
-queue so that document indexing can happen outside the HTTP request cycle.
-Both backends satisfy the ``QueueProducer`` / ``QueueConsumer`` protocols
-from ``fireflyframework_genai.exposure.queues``.
+Provides an in-memory queue (``asyncio.Queue``) and an optional Redis
+Streams queue so that document indexing can happen outside the HTTP request
+cycle.  Both backends satisfy the ``QueueProducer`` / ``QueueConsumer``
+protocols from ``fireflyframework_genai.exposure.queues``.
+
+Consumers can drain up to ``batch_size`` tasks (waiting at most
+``batch_wait_ms`` for a batch to fill) and hand them to a batch handler, so a
+bulk import is embedded and stored in a few large calls instead of one call
+per document.  Several consumer loops can run in parallel.
 
 .. note::
 
@@ -24,9 +29,12 @@ from ``fireflyframework_genai.exposure.queues``.
 
 from __future__ import annotations
 
+import abc
 import asyncio
-import json
 import logging
+import os
+import socket
+import traceback
 from typing import Any, Callable, Coroutine
 
 from pydantic import BaseModel, Field
@@ -38,6 +46,11 @@ from flydesk.jobs.dead_letter import DeadLetterRepository
 logger = logging.getLogger(__name__)
 
 INDEXING_QUEUE_NAME = "knowledge.indexing"
+INDEXING_STREAM_NAME = "knowledge.indexing.stream"
+INDEXING_CONSUMER_GROUP = "flydesk-indexers"
+
+TaskHandler = Callable[["IndexingTask"], Coroutine[Any, Any, None]]
+BatchHandler = Callable[[list["IndexingTask"]], Coroutine[Any, Any, None]]
 
 
 # ---------------------------------------------------------------------------
@@ -59,42 +72,41 @@ class IndexingTask(BaseModel):
 
 
 # ---------------------------------------------------------------------------
-# In-memory backend
+# Shared consumer logic
 # ---------------------------------------------------------------------------
 
 
-class InMemoryIndexingProducer:
-    """Publish ``IndexingTask`` messages to an in-memory ``asyncio.Queue``.
+class _BatchingConsumer(abc.ABC):
+    """Batching, parallelism and dead-lettering shared by the consumers.
 
-    Satisfies the ``QueueProducer`` protocol.
+    Subclasses implement :meth:`_consume_loop`, which collects raw messages
+    as ``(token, body)`` pairs and passes them to :meth:`_process`.  The
+    returned tokens are the messages that are finished with -- indexed or
+    dead-lettered -- and may be acknowledged.
     """
 
-    def __init__(self, queue: asyncio.Queue[QueueMessage]) -> None:
-        self._queue = queue
-
-    async def publish(self, message: QueueMessage) -> None:
-        await self._queue.put(message)
-        logger.debug("Enqueued indexing task (queue size=%d)", self._queue.qsize())
-
-
-class InMemoryIndexingConsumer:
-    """Consume ``IndexingTask`` messages from an in-memory ``asyncio.Queue``.
-
-    Satisfies the ``QueueConsumer`` protocol.
-    """
+    _backend = "indexing"
 
     def __init__(
         self,
-        queue: asyncio.Queue[QueueMessage],
-        handler: Callable[[IndexingTask], Coroutine[Any, Any, None]],
+        handler: TaskHandler | None = None,
         *,
+        batch_handler: BatchHandler | None = None,
+        batch_size: int = 1,
+        batch_wait_ms: int = 0,
+        concurrency: int = 1,
         dead_letter: DeadLetterRepository | None = None,
     ) -> None:
-        self._queue = queue
+        if handler is None and batch_handler is None:
+            raise ValueError("handler or batch_handler is required")
         self._handler = handler
+        self._batch_handler = batch_handler
+        self._batch_size = max(1, batch_size)
+        self._batch_wait = max(0, batch_wait_ms) / 1000
+        self._concurrency = max(1, concurrency)
         self._dead_letter = dead_letter
         self._running = False
-        self._task: asyncio.Task[None] | None = None
+        self._tasks: list[asyncio.Task[None]] = []
 
     @property
     def is_running(self) -> bool:
@@ -103,60 +115,188 @@ class InMemoryIndexingConsumer:
     async def start(self) -> None:
         """Begin consuming messages in the background."""
         self._running = True
-        self._task = asyncio.create_task(self._consume_loop())
-        logger.info("In-memory indexing consumer started")
+        self._tasks = [
+            asyncio.create_task(self._consume_loop(index))
+            for index in range(self._concurrency)
+        ]
+        logger.info(
+            "%s consumer started (consumers=%d, batch_size=%d)",
+            self._backend, self._concurrency, self._batch_size,
+        )
 
     async def stop(self) -> None:
         """Gracefully stop the consumer."""
         self._running = False
-        if self._task is not None:
-            self._task.cancel()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("%s consumer stopped", self._backend)
+
+    @abc.abstractmethod
+    async def _consume_loop(self, index: int) -> None:
+        """Run consumer loop *index* until :meth:`stop` is called."""
+
+    async def _process(self, messages: list[tuple[Any, str]]) -> list[Any]:
+        """Index *messages* as one batch; return the tokens that are settled."""
+        settled: list[Any] = []
+        tasks: list[tuple[Any, IndexingTask, str]] = []
+        for token, body in messages:
             try:
-                await self._task
-            except asyncio.CancelledError:
-                pass
-            self._task = None
-        logger.info("In-memory indexing consumer stopped")
+                tasks.append((token, IndexingTask.model_validate_json(body), body))
+            except Exception:
+                logger.exception("Discarding malformed indexing task")
+                if await self._send_to_dead_letter(None, body, traceback.format_exc()):
+                    settled.append(token)
+        if not tasks:
+            return settled
+
+        if self._batch_handler is not None and len(tasks) > 1:
+            try:
+                await self._batch_handler([task for _, task, _ in tasks])
+            except Exception:
+                # Retry one by one so a single bad document does not
+                # dead-letter the whole batch.
+                logger.warning(
+                    "Indexing batch of %d failed; retrying tasks individually",
+                    len(tasks), exc_info=True,
+                )
+            else:
+                logger.info("Indexed batch of %d documents", len(tasks))
+                return settled + [token for token, _, _ in tasks]
+
+        for token, task, body in tasks:
+            if await self._process_one(task, body):
+                settled.append(token)
+        return settled
+
+    async def _process_one(self, task: IndexingTask, body: str) -> bool:
+        try:
+            if self._batch_handler is not None:
+                await self._batch_handler([task])
+            else:
+                assert self._handler is not None
+                await self._handler(task)
+        except Exception:
+            logger.exception("Failed to process indexing task from queue")
+            return await self._send_to_dead_letter(
+                task.document_id, body, traceback.format_exc()
+            )
+        logger.info("Indexed document %s (%s)", task.document_id, task.title)
+        return True
+
+    async def _send_to_dead_letter(
+        self, document_id: str | None, body: str | None, error: str
+    ) -> bool:
+        """Record a failed task; returns False if it could not be recorded."""
+        if not self._dead_letter:
+            return True
+        try:
+            await self._dead_letter.add(
+                source_type="indexing",
+                source_id=document_id,
+                payload={"body": body} if body else {},
+                error=error,
+            )
+        except Exception:
+            logger.exception("Failed to dead-letter indexing task %s", document_id)
+            return False
+        return True
+
+
+# ---------------------------------------------------------------------------
+# In-memory backend
+# ---------------------------------------------------------------------------
+
+
+class InMemoryIndexingProducer:
+    """Publish ``IndexingTask`` messages to an in-memory ``asyncio.Queue``.
+
+    Satisfies the ``QueueProducer`` protocol.
+    """
+
+    def __init__(self, queue: asyncio.Queue[QueueMessage]) -> None:
+        self._queue = queue
+
+    async def publish(self, message: QueueMessage) -> None:
+        await self._queue.put(message)
+        logger.debug("Enqueued indexing task (queue size=%d)", self._queue.qsize())
+
 
-    async def _consume_loop(self) -> None:
-        """Main consumer loop -- pulls messages and invokes the handler."""
+class InMemoryIndexingConsumer(_BatchingConsumer):
+    """Consume ``IndexingTask`` messages from an in-memory ``asyncio.Queue``.
+
+    Satisfies the ``QueueConsumer`` protocol.
+    """
+
+    _backend = "In-memory indexing"
+
+    def __init__(
+        self,
+        queue: asyncio.Queue[QueueMessage],
+        handler: TaskHandler | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(handler, **kwargs)
+        self._queue = queue
+
+    async def _consume_loop(self, index: int) -> None:
+        """Main consumer loop -- pulls a batch of messages and indexes it."""
+        loop = asyncio.get_running_loop()
         while self._running:
             try:
-                message = await asyncio.wait_for(self._queue.get(), timeout=1.0)
+                first = await asyncio.wait_for(self._queue.get(), timeout=1.0)
             except (asyncio.TimeoutError, TimeoutError):
                 continue
             except asyncio.CancelledError:
                 break
 
-            task = None
-            try:
-                task = IndexingTask.model_validate_json(message.body)
-                await self._handler(task)
-                logger.info(
-                    "Indexed document %s (%s)", task.document_id, task.title
-                )
-            except Exception:
-                logger.exception(
-                    "Failed to process indexing task from queue"
-                )
-                if self._dead_letter:
-                    import traceback
-
-                    await self._dead_letter.add(
-                        source_type="indexing",
-                        source_id=getattr(task, "document_id", None) if task else None,
-                        payload={"body": message.body} if message else {},
-                        error=traceback.format_exc(),
-                    )
+            batch = [first]
+            deadline = loop.time() + self._batch_wait
+            while len(batch) < self._batch_size:
+                try:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        batch.append(self._queue.get_nowait())
+                    else:
+                        batch.append(
+                            await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                        )
+                except (asyncio.QueueEmpty, asyncio.TimeoutError, TimeoutError):
+                    break
+            await self._process([(None, message.body) for message in batch])
 
 
 # ---------------------------------------------------------------------------
-# Redis backend
+# Redis Streams backend
 # ---------------------------------------------------------------------------
 
 
+def _decode(value: Any) -> Any:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def _stream_entries(response: Any) -> list[tuple[str, dict | None]]:
+    """Flatten an ``XREADGROUP`` reply into ``(id, fields)`` pairs."""
+    if not response:
+        return []
+    if isinstance(response, dict):  # RESP3 reply keyed by stream name
+        response = response.items()
+    return [
+        (_decode(entry_id), fields)
+        for _stream, entries in response
+        for entry_id, fields in entries
+    ]
+
+
+def _entry_body(fields: dict | None) -> str | None:
+    if not fields:
+        return None
+    return _decode(fields.get(b"body", fields.get("body")))
+
+
 class RedisIndexingProducer:
-    """Publish ``IndexingTask`` messages to a Redis list.
+    """Publish ``IndexingTask`` messages to a Redis Stream.
 
     Satisfies the ``QueueProducer`` protocol.
     """
@@ -169,12 +309,12 @@ class RedisIndexingProducer:
         import redis.asyncio as aioredis  # type: ignore[import-not-found]
 
         self._client = aioredis.from_url(self._url)
-        logger.info("Redis indexing producer started (queue=%s)", INDEXING_QUEUE_NAME)
+        logger.info("Redis indexing producer started (stream=%s)", INDEXING_STREAM_NAME)
 
     async def publish(self, message: QueueMessage) -> None:
         if self._client is None:
             await self.start()
-        await self._client.lpush(INDEXING_QUEUE_NAME, message.body)
+        await self._client.xadd(INDEXING_STREAM_NAME, {"body": message.body})
         logger.debug("Enqueued indexing task to Redis")
 
     async def stop(self) -> None:
@@ -184,84 +324,162 @@ class RedisIndexingProducer:
         logger.info("Redis indexing producer stopped")
 
 
-class RedisIndexingConsumer:
-    """Consume ``IndexingTask`` messages from a Redis list (BRPOP).
+class RedisIndexingConsumer(_BatchingConsumer):
+    """Consume ``IndexingTask`` messages from a Redis Streams consumer group.
+
+    Messages are acknowledged only once they have been indexed or
+    dead-lettered, so a worker that dies mid-batch leaves them pending.
+    Entries pending for longer than ``reclaim_idle_ms`` are claimed by
+    another consumer; entries already delivered ``max_deliveries`` times are
+    dead-lettered instead of being retried again.
 
     Satisfies the ``QueueConsumer`` protocol.
     """
 
+    _backend = "Redis indexing"
+
     def __init__(
         self,
-        handler: Callable[[IndexingTask], Coroutine[Any, Any, None]],
+        handler: TaskHandler | None = None,
         url: str = "redis://localhost:6379",
         *,
-        dead_letter: DeadLetterRepository | None = None,
+        group: str = INDEXING_CONSUMER_GROUP,
+        consumer_name: str | None = None,
+        reclaim_idle_ms: int = 60_000,
+        max_deliveries: int = 5,
+        **kwargs: Any,
     ) -> None:
+        super().__init__(handler, **kwargs)
         self._url = url
-        self._handler = handler
-        self._dead_letter = dead_letter
-        self._running = False
+        self._group = group
+        self._consumer_name = consumer_name or f"{socket.gethostname()}-{os.getpid()}"
+        self._reclaim_idle_ms = max(1, reclaim_idle_ms)
+        self._max_deliveries = max(1, max_deliveries)
         self._client: Any = None
-        self._task: asyncio.Task[None] | None = None
-
-    @property
-    def is_running(self) -> bool:
-        return self._running
 
     async def start(self) -> None:
         import redis.asyncio as aioredis  # type: ignore[import-not-found]
 
         self._client = aioredis.from_url(self._url)
-        self._running = True
-        self._task = asyncio.create_task(self._consume_loop())
-        logger.info("Redis indexing consumer started (queue=%s)", INDEXING_QUEUE_NAME)
+        try:
+            await self._client.xgroup_create(
+                INDEXING_STREAM_NAME, self._group, id="0", mkstream=True
+            )
+        except Exception as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+        await self._migrate_legacy_list()
+        await super().start()
 
     async def stop(self) -> None:
-        self._running = False
-        if self._task is not None:
-            self._task.cancel()
-            try:
-                await self._task
-            except asyncio.CancelledError:
-                pass
-            self._task = None
+        await super().stop()
         if self._client:
             await self._client.close()
             self._client = None
-        logger.info("Redis indexing consumer stopped")
 
-    async def _consume_loop(self) -> None:
+    async def _migrate_legacy_list(self) -> None:
+        """Move tasks left in the pre-Streams list queue onto the stream."""
+        moved = 0
+        while (raw := await self._client.rpop(INDEXING_QUEUE_NAME)) is not None:
+            await self._client.xadd(INDEXING_STREAM_NAME, {"body": raw})
+            moved += 1
+        if moved:
+            logger.info("Moved %d queued indexing tasks from the legacy list", moved)
+
+    async def _consume_loop(self, index: int) -> None:
+        consumer = f"{self._consumer_name}-{index}"
+        loop = asyncio.get_running_loop()
+        next_reclaim = loop.time()
         while self._running:
-            task = None
-            raw = None
             try:
-                result = await self._client.brpop(INDEXING_QUEUE_NAME, timeout=1)
-                if result is None:
+                messages: list[tuple[str, str | None]] = []
+                if loop.time() >= next_reclaim:
+                    messages = await self._reclaim(consumer)
+                    next_reclaim = loop.time() + self._reclaim_idle_ms / 2000
+                if not messages:
+                    messages = await self._read(consumer)
+                if not messages:
                     continue
-                _, raw = result
-                if isinstance(raw, bytes):
-                    raw = raw.decode("utf-8")
 
-                task = IndexingTask.model_validate_json(raw)
-                await self._handler(task)
-                logger.info(
-                    "Indexed document %s (%s)", task.document_id, task.title
+                deleted = [entry_id for entry_id, body in messages if body is None]
+                settled = deleted + await self._process(
+                    [(entry_id, body) for entry_id, body in messages if body is not None]
                 )
+                if settled:
+                    await self._ack(settled)
             except asyncio.CancelledError:
                 break
             except Exception:
-                logger.exception(
-                    "Failed to process indexing task from Redis queue"
+                logger.exception("Failed to process indexing tasks from Redis stream")
+                await asyncio.sleep(1)
+
+    async def _read(self, consumer: str) -> list[tuple[str, str | None]]:
+        """Read new entries, waiting up to ``batch_wait_ms`` to fill a batch."""
+        loop = asyncio.get_running_loop()
+        entries = _stream_entries(
+            await self._client.xreadgroup(
+                self._group, consumer, {INDEXING_STREAM_NAME: ">"},
+                count=self._batch_size, block=1000,
+            )
+        )
+        deadline = loop.time() + self._batch_wait
+        while entries and len(entries) < self._batch_size:
+            remaining_ms = int((deadline - loop.time()) * 1000)
+            if remaining_ms <= 0:
+                break
+            more = _stream_entries(
+                await self._client.xreadgroup(
+                    self._group, consumer, {INDEXING_STREAM_NAME: ">"},
+                    count=self._batch_size - len(entries), block=remaining_ms,
                 )
-                if self._dead_letter:
-                    import traceback
-
-                    await self._dead_letter.add(
-                        source_type="indexing",
-                        source_id=getattr(task, "document_id", None) if task else None,
-                        payload={"body": raw} if raw else {},
-                        error=traceback.format_exc(),
-                    )
+            )
+            if not more:
+                break
+            entries.extend(more)
+        return [(entry_id, _entry_body(fields)) for entry_id, fields in entries]
+
+    async def _reclaim(self, consumer: str) -> list[tuple[str, str | None]]:
+        """Claim entries abandoned by dead consumers; dead-letter exhausted ones."""
+        pending = await self._client.xpending_range(
+            INDEXING_STREAM_NAME, self._group, min="-", max="+",
+            count=self._batch_size, idle=self._reclaim_idle_ms,
+        )
+        if not pending:
+            return []
+        deliveries = {_decode(p["message_id"]): p["times_delivered"] for p in pending}
+        claimed = await self._client.xclaim(
+            INDEXING_STREAM_NAME, self._group, consumer,
+            min_idle_time=self._reclaim_idle_ms, message_ids=list(deliveries),
+        )
+        messages: list[tuple[str, str | None]] = []
+        exhausted: list[str] = []
+        for raw_id, fields in claimed:
+            if raw_id is None:  # entry deleted since it was delivered
+                continue
+            entry_id = _decode(raw_id)
+            body = _entry_body(fields)
+            if body is not None and deliveries.get(entry_id, 0) >= self._max_deliveries:
+                logger.error(
+                    "Indexing task %s delivered %d times without success; dead-lettering",
+                    entry_id, deliveries[entry_id],
+                )
+                if await self._send_to_dead_letter(
+                    None, body,
+                    f"Not acknowledged after {deliveries[entry_id]} deliveries",
+                ):
+                    exhausted.append(entry_id)
+            else:
+                messages.append((entry_id, body))
+        if exhausted:
+            await self._ack(exhausted)
+        if messages:
+            logger.info("Reclaimed %d pending indexing tasks", len(messages))
+        return messages
+
+    async def _ack(self, entry_ids: list[str]) -> None:
+        await self._client.xack(INDEXING_STREAM_NAME, self._group, *entry_ids)
+        # The stream is a work queue with a single group; drop handled entries.
+        await self._client.xdel(INDEXING_STREAM_NAME, *entry_ids)
 
 
 # ---------------------------------------------------------------------------
@@ -298,9 +516,15 @@ class IndexingQueueProducer:
 
 def create_indexing_queue(
     backend: str,
-    handler: Callable[[IndexingTask], Coroutine[Any, Any, None]],
+    handler: TaskHandler | None = None,
     redis_url: str | None = None,
     *,
+    batch_handler: BatchHandler | None = None,
+    batch_size: int = 1,
+    batch_wait_ms: int = 0,
+    concurrency: int = 1,
+    reclaim_idle_ms: int = 60_000,
+    max_deliveries: int = 5,
     dead_letter: DeadLetterRepository | None = None,
 ) -> tuple[IndexingQueueProducer, InMemoryIndexingConsumer | RedisIndexingConsumer]:
     """Create a matched producer/consumer pair for the given backend.
@@ -309,20 +533,42 @@ def create_indexing_queue(
         backend: ``"memory"`` or ``"redis"``.
         handler: Async callable invoked for each ``IndexingTask``.
         redis_url: Redis connection URL (required when *backend* is ``"redis"``).
+        batch_handler: Async callable invoked with a list of tasks; takes
+            precedence over *handler*.
+        batch_size: Maximum tasks handed to *batch_handler* at once.
+        batch_wait_ms: How long to wait for a batch to fill.
+        concurrency: Number of parallel consumer loops.
+        reclaim_idle_ms: Redis only -- idle time after which a pending task
+            is claimed by another consumer.
+        max_deliveries: Redis only -- deliveries before a task is dead-lettered.
         dead_letter: Optional dead-letter repository for routing failed tasks.
 
     Returns:
         A ``(producer, consumer)`` tuple.
     """
+    options: dict[str, Any] = {
+        "batch_handler": batch_handler,
+        "batch_size": batch_size,
+        "batch_wait_ms": batch_wait_ms,
+        "concurrency": concurrency,
+        "dead_letter": dead_letter,
+    }
+    consumer: InMemoryIndexingConsumer | RedisIndexingConsumer
     if backend == "redis":
         if not redis_url:
             raise ValueError("redis_url is required for the 'redis' queue backend")
         raw_producer = RedisIndexingProducer(url=redis_url)
-        consumer = RedisIndexingConsumer(handler=handler, url=redis_url, dead_letter=dead_letter)
+        consumer = RedisIndexingConsumer(
+            handler,
+            url=redis_url,
+            reclaim_idle_ms=reclaim_idle_ms,
+            max_deliveries=max_deliveries,
+            **options,
+        )
     else:
         queue: asyncio.Queue[QueueMessage] = asyncio.Queue()
         raw_producer = InMemoryIndexingProducer(queue)
-        consumer = InMemoryIndexingConsumer(queue, handler=handler, dead_letter=dead_letter)
+        consumer = InMemoryIndexingConsumer(queue, handler, **options)
 
     producer = IndexingQueueProducer(raw_producer)
     return producer, consumer
@@ -91,6 +91,7 @@ class KnowledgeRetriever:
         *,
         top_k: int = 5,
         tag_filter: list[str] | None = None,
+        query_embedding: list[float] | None = None,
     ) -> list[RetrievalResult]:
         """Find the most relevant document chunks for a query.
 
@@ -105,6 +106,8 @@ class KnowledgeRetriever:
             top_k: Maximum number of results to return.
             tag_filter: When set, only return chunks from documents whose tags
                 overlap with this list.  ``None`` disables filtering.
+            query_embedding: The query's embedding when the caller already
+                computed it; otherwise the query is embedded here.
         """
         # 0. Check cache before running the search
         query_hash: str | None = None
@@ -116,8 +119,9 @@ class KnowledgeRetriever:
                 return [RetrievalResult.model_validate(r) for r in cached]
 
         # 1. Embed the query
-        embeddings = await self._embedding_provider.embed([query])
-        query_embedding = embeddings[0]
+        if query_embedding is None:
+            embeddings = await self._embedding_provider.embed([query])
+            query_embedding = embeddings[0]
 
         # Detect zero-vector embeddings (no real provider configured)
         use_keywords_only = all(v == 0.0 for v in query_embedding)
@@ -0,0 +1,267 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""LLM spend accounting -- per-worker accumulation and a sharded ledger.
+
+Every agent turn records its cost in memory.  A background task flushes
+the accumulated amounts into ``spend_ledger`` rows owned by this worker
+(one per day, user and model), so workers never contend on a shared
+counter row.  Totals are a SQL ``SUM`` across workers.
+
+Days are the server's local date, the same day boundary as the
+``daily_spend_<date>`` settings the ledger replaces;
+:meth:`SpendLedger.import_legacy_settings` carries those totals over.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from dataclasses import dataclass
+from datetime import date
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from flydesk.models.spend import SpendLedgerRow
+from flydesk.models.user_settings import AppSettingRow
+
+logger = logging.getLogger(__name__)
+
+LEGACY_SETTING_PREFIX = "daily_spend_"
+# Ledger shard holding the totals imported from the legacy settings.
+LEGACY_WORKER_ID = "legacy-settings"
+
+
+def spend_day() -> str:
+    """Return today's ISO date, the day spend is booked against."""
+    return date.today().isoformat()
+
+
+@dataclass
+class _Spend:
+    cost_usd: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    call_count: int = 0
+
+    def add(self, other: _Spend) -> None:
+        self.cost_usd += other.cost_usd
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.call_count += other.call_count
+
+
+# (day, user_id, model)
+_ShardKey = tuple[str, str, str]
+
+
+class SpendLedger:
+    """Accumulate LLM spend in memory and flush it to this worker's ledger rows.
+
+    Parameters
+    ----------
+    flush_interval_seconds:
+        How often the task started by :meth:`start` writes accumulated
+        spend.
+    worker_id:
+        Ledger shard owned by this process; generated when omitted.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        flush_interval_seconds: int = 10,
+        worker_id: str | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._interval = flush_interval_seconds
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._pending: dict[_ShardKey, _Spend] = {}
+        self._inflight: dict[_ShardKey, _Spend] = {}
+        self._flush_lock = asyncio.Lock()
+        self._running = False
+        self._task: asyncio.Task | None = None
+
+    # -- Recording --
+
+    def record(
+        self,
+        cost_usd: float,
+        *,
+        user_id: str = "",
+        model: str = "",
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+    ) -> None:
+        """Add one LLM call's cost to the in-memory accumulator."""
+        key = (spend_day(), user_id or "", model or "")
+        self._pending.setdefault(key, _Spend()).add(
+            _Spend(
+                cost_usd=max(float(cost_usd), 0.0),
+                input_tokens=int(input_tokens or 0),
+                output_tokens=int(output_tokens or 0),
+                call_count=1,
+            )
+        )
+
+    # -- Reads --
+
+    async def total(self, day: str | None = None, *, user_id: str | None = None) -> float:
+        """Return the spend recorded for *day*, optionally for one user.
+
+        Sums the ledger rows of every worker in one query, plus this
+        worker's spend that has not been flushed yet.
+        """
+        day = day or spend_day()
+        stmt = select(func.coalesce(func.sum(SpendLedgerRow.cost_usd), 0.0)).where(
+            SpendLedgerRow.day == day
+        )
+        if user_id is not None:
+            stmt = stmt.where(SpendLedgerRow.user_id == user_id)
+        async with self._session_factory() as session:
+            stored = float((await session.execute(stmt)).scalar() or 0.0)
+        local = sum(
+            spend.cost_usd
+            for shard in (self._pending, self._inflight)
+            for key, spend in shard.items()
+            if key[0] == day and (user_id is None or key[1] == user_id)
+        )
+        return round(stored + local, 6)
+
+    # -- Flushing --
+
+    async def flush(self) -> None:
+        """Write accumulated spend to this worker's ledger rows."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            self._inflight, self._pending = self._pending, {}
+            committed = False
+            try:
+                async with self._session_factory() as session:
+                    await self._write(session, self._inflight)
+                    await session.commit()
+                    # The ledger holds the amounts from here on, even if
+                    # closing the session is interrupted.
+                    committed = True
+                    self._inflight = {}
+            except BaseException:
+                if not committed:
+                    # Keep the amounts for the next attempt (or the final
+                    # flush when the task is cancelled mid-write).
+                    for key, spend in self._inflight.items():
+                        self._pending.setdefault(key, _Spend()).add(spend)
+                    self._inflight = {}
+                raise
+
+    async def _write(self, session: AsyncSession, shards: dict[_ShardKey, _Spend]) -> None:
+        days = sorted({day for day, _, _ in shards})
+        result = await session.execute(
+            select(SpendLedgerRow).where(
+                SpendLedgerRow.worker_id == self.worker_id,
+                SpendLedgerRow.day.in_(days),
+            )
+        )
+        rows = {(r.day, r.user_id, r.model): r for r in result.scalars().all()}
+        for key, spend in shards.items():
+            row = rows.get(key)
+            if row is None:
+                day, user_id, model = key
+                session.add(
+                    SpendLedgerRow(
+                        worker_id=self.worker_id,
+                        day=day,
+                        user_id=user_id,
+                        model=model,
+                        cost_usd=round(spend.cost_usd, 6),
+                        input_tokens=spend.input_tokens,
+                        output_tokens=spend.output_tokens,
+                        call_count=spend.call_count,
+                    )
+                )
+            else:
+                row.cost_usd = round(row.cost_usd + spend.cost_usd, 6)
+                row.input_tokens += spend.input_tokens
+                row.output_tokens += spend.output_tokens
+                row.call_count += spend.call_count
+
+    # -- Migration --
+
+    async def import_legacy_settings(self) -> int:
+        """Copy ``daily_spend_<date>`` settings into the ledger.
+
+        Each day's setting becomes (or overwrites) one row of the
+        :data:`LEGACY_WORKER_ID` shard, so running the import again --
+        e.g. after a rolling deploy where older workers still bumped the
+        setting -- never counts an amount twice.  Returns the number of
+        days imported.
+        """
+        async with self._session_factory() as session:
+            settings = (
+                await session.execute(
+                    select(AppSettingRow).where(
+                        AppSettingRow.key.like(f"{LEGACY_SETTING_PREFIX}%")
+                    )
+                )
+            ).scalars().all()
+            amounts: dict[str, float] = {}
+            for setting in settings:
+                day = setting.key[len(LEGACY_SETTING_PREFIX):]
+                try:
+                    date.fromisoformat(day)
+                    amounts[day] = round(float(setting.value or "0"), 6)
+                except ValueError:
+                    logger.warning("Ignoring malformed spend setting %s", setting.key)
+            if not amounts:
+                return 0
+            result = await session.execute(
+                select(SpendLedgerRow).where(SpendLedgerRow.worker_id == LEGACY_WORKER_ID)
+            )
+            rows = {r.day: r for r in result.scalars().all()}
+            for day, cost_usd in amounts.items():
+                row = rows.get(day)
+                if row is None:
+                    session.add(
+                        SpendLedgerRow(worker_id=LEGACY_WORKER_ID, day=day, cost_usd=cost_usd)
+                    )
+                else:
+                    row.cost_usd = cost_usd
+            await session.commit()
+        return len(amounts)
+
+    # -- Background task --
+
+    async def start(self) -> None:
+        self._running = True
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        self._running = False
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.warning("Failed to flush spend ledger on shutdown.", exc_info=True)
+
+    async def _loop(self) -> None:
+        while self._running:
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                break
+            except Exception:
+                logger.warning("Spend ledger flush failed; will retry.", exc_info=True)
+            await asyncio.sleep(self._interval)
@@ -2,24 +2,85 @@
 #
 # Licensed under the Apache License, Version 2.0
 
-"""Async repository for user memories."""
+"""Async repository for user memories.
+
+Memories are embedded when saved (given an embedding provider) and
+searched by a blend of embedding similarity, keyword overlap and recency.
+On PostgreSQL candidates are the user's memories nearest to the query by
+exact cosine distance plus matches from the full-text index on
+``content``; on SQLite the user's newest memories are scored in memory.
+Either way the work per search is bounded per user.
+
+There is deliberately no HNSW index on ``embedding``: an approximate scan
+over every user's memories, filtered to one user afterwards, finds few or
+none of that user's rows when they own a small share of the table.
+Distances are computed exactly over the user's newest memories instead,
+read through the ``(user_id, created_at)`` index.
+"""
 
 from __future__ import annotations
 
+import json
+import logging
+import re
 import uuid
+from datetime import datetime, timezone
+from typing import Any
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, func, literal_column, select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from flydesk.knowledge.entity_resolution import cosine_similarity, parse_embedding
 from flydesk.memory.models import CreateMemory, UpdateMemory, UserMemory
-from flydesk.models.user_memory import UserMemoryRow
+from flydesk.models.user_memory import EMBEDDING_DIMENSIONS, UserMemoryRow
+
+_logger = logging.getLogger(__name__)
+
+# Query words of at least this many characters are matched, at most
+# ``_MAX_KEYWORDS`` of them.
+_MIN_KEYWORD_LENGTH = 3
+_MAX_KEYWORDS = 5
+# Newest memories per user scored when no index is available (SQLite).
+_SCAN_LIMIT = 500
+# Newest memories per user ranked by exact distance on PostgreSQL.
+_EXACT_SCAN_LIMIT = 5000
+# Candidates read by distance and from the full-text index on PostgreSQL.
+_INDEX_CANDIDATES = 50
+# Ranking blend.  Memories need a keyword match or this much similarity.
+_SEMANTIC_WEIGHT = 0.6
+_KEYWORD_WEIGHT = 0.3
+_RECENCY_WEIGHT = 0.1
+_RECENCY_HALF_LIFE_DAYS = 30.0
+_MIN_SIMILARITY = 0.3
+
+
+def _keywords(query: str) -> list[str]:
+    words = [w for w in re.findall(r"\w+", query.lower()) if len(w) >= _MIN_KEYWORD_LENGTH]
+    return list(dict.fromkeys(words))[:_MAX_KEYWORDS]
+
+
+def _aware(value: datetime) -> datetime:
+    """SQLite returns naive datetimes; all stored times are UTC."""
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
 
 
 class MemoryRepository:
     """CRUD operations for user memories, all scoped by user_id."""
 
-    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        embedding_provider: Any | None = None,
+        *,
+        embedding_dimensions: int = EMBEDDING_DIMENSIONS,
+    ) -> None:
         self._session_factory = session_factory
+        self._embedding_provider = embedding_provider
+        self._dimensions = embedding_dimensions
+
+    def set_embedding_provider(self, embedding_provider: Any | None) -> None:
+        """Embed memories with *embedding_provider* from now on."""
+        self._embedding_provider = embedding_provider
 
     def _row_to_model(self, row: UserMemoryRow) -> UserMemory:
         return UserMemory(
@@ -34,6 +95,7 @@ class MemoryRepository:
         )
 
     async def create(self, user_id: str, data: CreateMemory) -> UserMemory:
+        embedding = await self._embed(data.content)
         row = UserMemoryRow(
             id=str(uuid.uuid4()),
             user_id=user_id,
@@ -43,6 +105,7 @@ class MemoryRepository:
             metadata_=data.metadata,
         )
         async with self._session_factory() as session:
+            row.embedding = self._serialize_embedding(session, embedding)
             session.add(row)
             await session.commit()
             await session.refresh(row)
@@ -87,6 +150,9 @@ class MemoryRepository:
     async def update(
         self, user_id: str, memory_id: str, data: UpdateMemory
     ) -> UserMemory | None:
+        # Embed before opening the session so no connection is held while
+        # the provider is called.
+        embedding = await self._embed(data.content) if data.content is not None else None
         async with self._session_factory() as session:
             result = await session.execute(
                 select(UserMemoryRow).where(
@@ -97,8 +163,9 @@ class MemoryRepository:
             row = result.scalar_one_or_none()
             if row is None:
                 return None
-            if data.content is not None:
+            if data.content is not None and data.content != row.content:
                 row.content = data.content
+                row.embedding = self._serialize_embedding(session, embedding)
             if data.category is not None:
                 row.category = data.category
             await session.commit()
@@ -116,34 +183,171 @@ class MemoryRepository:
             await session.commit()
             return result.rowcount > 0
 
-    async def search(self, user_id: str, query: str) -> list[UserMemory]:
-        """Word-level text search in memory content.
+    async def search(
+        self,
+        user_id: str,
+        query: str,
+        *,
+        query_embedding: list[float] | None = None,
+        limit: int = 10,
+        recent: int = 0,
+    ) -> list[UserMemory]:
+        """Return the user's memories most relevant to *query*.
 
-        Extracts words of 3+ characters from the query and OR-matches
-        them against memory content.  At most 5 keywords are used.
-        """
-        from sqlalchemy import or_
+        Memories are ranked by a blend of embedding similarity to the query,
+        the share of query keywords (words of 3+ characters, at most 5) they
+        contain, and recency.  Only memories matching a keyword or similar
+        enough to the query are returned.  Pass *query_embedding* when the
+        query is already embedded; otherwise it is embedded here if an
+        embedding provider is set.
 
-        words = [w for w in query.lower().split() if len(w) >= 3]
-        if not words:
+        The *recent* newest memories are returned first whatever the query,
+        from the same session.
+        """
+        words = _keywords(query)
+        if query_embedding is not None and len(query_embedding) != self._dimensions:
+            query_embedding = None
+        if query_embedding is None and query.strip():
+            query_embedding = await self._embed(query)
+        if not words and query_embedding is None and recent <= 0:
             return []
-        words = words[:5]
 
         async with self._session_factory() as session:
-            def _esc(v: str) -> str:
-                return v.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
-
-            conditions = [
-                UserMemoryRow.content.ilike(f"%{_esc(word)}%") for word in words
-            ]
-            stmt = (
-                select(UserMemoryRow)
-                .where(
-                    UserMemoryRow.user_id == user_id,
-                    or_(*conditions),
+            indexed = session.get_bind().dialect.name == "postgresql"
+            scan = max(recent, 0) if indexed else max(recent, _SCAN_LIMIT)
+            newest: list[UserMemoryRow] = []
+            if scan:
+                result = await session.execute(
+                    select(UserMemoryRow)
+                    .where(UserMemoryRow.user_id == user_id)
+                    .order_by(UserMemoryRow.created_at.desc())
+                    .limit(scan)
                 )
+                newest = list(result.scalars().all())
+            candidates = {row.id: row for row in newest}
+            if indexed:
+                for row in await self._indexed_candidates(
+                    session, user_id, words, query_embedding
+                ):
+                    candidates.setdefault(row.id, row)
+
+        pinned = newest[: max(recent, 0)]
+        pinned_ids = {row.id for row in pinned}
+        now = datetime.now(timezone.utc)
+        scored: list[tuple[float, UserMemoryRow]] = []
+        for row in candidates.values():
+            if row.id in pinned_ids:
+                continue
+            score = self._score(row, words, query_embedding, now)
+            if score is not None:
+                scored.append((score, row))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        ranked = pinned + [row for _score, row in scored]
+        return [self._row_to_model(row) for row in ranked[:limit]]
+
+    # -- Internal --
+
+    @staticmethod
+    async def _indexed_candidates(
+        session: AsyncSession,
+        user_id: str,
+        words: list[str],
+        query_embedding: list[float] | None,
+    ) -> list[UserMemoryRow]:
+        """Nearest memories by exact distance plus full-text matches (PostgreSQL).
+
+        Distances are computed over the user's ``_EXACT_SCAN_LIMIT`` newest
+        memories; the ``LIMIT`` on that subquery keeps the planner from
+        answering the ``ORDER BY`` with an approximate index scan.  Older
+        memories are still found by keyword.
+        """
+        rows: list[UserMemoryRow] = []
+        if query_embedding is not None:
+            newest = (
+                select(UserMemoryRow.id, UserMemoryRow.embedding)
+                .where(UserMemoryRow.user_id == user_id, UserMemoryRow.embedding.is_not(None))
                 .order_by(UserMemoryRow.created_at.desc())
-                .limit(10)
+                .limit(_EXACT_SCAN_LIMIT)
+                .subquery()
             )
-            result = await session.execute(stmt)
-            return [self._row_to_model(r) for r in result.scalars().all()]
+            nearest = (
+                select(newest.c.id)
+                .order_by(newest.c.embedding.cosine_distance(query_embedding))
+                .limit(_INDEX_CANDIDATES)
+            )
+            result = await session.execute(
+                select(UserMemoryRow).where(UserMemoryRow.id.in_(nearest))
+            )
+            rows.extend(result.scalars().all())
+        if words:
+            # Inlined config so the expression matches the GIN index.
+            document = func.to_tsvector(literal_column("'simple'"), UserMemoryRow.content)
+            tsquery = func.to_tsquery(
+                literal_column("'simple'"), " | ".join(f"{word}:*" for word in words)
+            )
+            result = await session.execute(
+                select(UserMemoryRow)
+                .where(UserMemoryRow.user_id == user_id, document.op("@@")(tsquery))
+                .order_by(func.ts_rank(document, tsquery).desc())
+                .limit(_INDEX_CANDIDATES)
+            )
+            rows.extend(result.scalars().all())
+        return rows
+
+    @staticmethod
+    def _score(
+        row: UserMemoryRow,
+        words: list[str],
+        query_embedding: list[float] | None,
+        now: datetime,
+    ) -> float | None:
+        """Blended relevance of *row*, or ``None`` when it does not match."""
+        content = row.content.lower()
+        keyword_score = sum(word in content for word in words) / len(words) if words else 0.0
+        similarity = 0.0
+        if query_embedding is not None:
+            vector = parse_embedding(row.embedding)
+            if vector is not None:
+                similarity = cosine_similarity(query_embedding, vector)
+        if keyword_score == 0.0 and similarity < _MIN_SIMILARITY:
+            return None
+        recency = 1.0
+        if row.created_at is not None:
+            age_days = max((now - _aware(row.created_at)).total_seconds(), 0.0) / 86400
+            recency = 0.5 ** (age_days / _RECENCY_HALF_LIFE_DAYS)
+        return (
+            _SEMANTIC_WEIGHT * similarity
+            + _KEYWORD_WEIGHT * keyword_score
+            + _RECENCY_WEIGHT * recency
+        )
+
+    async def _embed(self, text: str) -> list[float] | None:
+        """Embed *text*; ``None`` without a provider, on failure, for zero vectors
+        or for vectors that do not fit the ``embedding`` column."""
+        if self._embedding_provider is None:
+            return None
+        try:
+            vectors = await self._embedding_provider.embed([text])
+        except Exception:
+            _logger.debug("Failed to embed memory text.", exc_info=True)
+            return None
+        vector = list(vectors[0]) if vectors else []
+        if not vector or all(v == 0.0 for v in vector):
+            return None
+        if len(vector) != self._dimensions:
+            _logger.warning(
+                "Embedding has %d dimensions, expected %d; memory stored without it.",
+                len(vector),
+                self._dimensions,
+            )
+            return None
+        return vector
+
+    @staticmethod
+    def _serialize_embedding(session: AsyncSession, embedding: list[float] | None) -> Any:
+        """pgvector takes the list; SQLite stores JSON text."""
+        if embedding is None:
+            return None
+        if session.get_bind().dialect.name == "sqlite":
+            return json.dumps(embedding)
+        return embedding
@@ -15,23 +15,30 @@ from flydesk.models.catalog import CredentialRow, ExternalSystemRow, ServiceEndp
 from flydesk.models.custom_tool import CustomToolRow
 from flydesk.models.conversation import ConversationRow, MessageRow
 from flydesk.models.dead_letter import DeadLetterEntryRow
-from flydesk.models.document_source import DocumentSourceRow
+from flydesk.models.discovery import DiscoveryFingerprintRow
+from flydesk.models.document_source import DocumentSourceManifestRow, DocumentSourceRow
 from flydesk.models.email_thread import EmailThreadRow  # noqa: F401
 from flydesk.models.export import ExportRow, ExportTemplateRow
 from flydesk.models.folder import ConversationFolderRow
 from flydesk.models.file_upload import FileUploadRow
 from flydesk.models.git_provider import GitProviderRow
 from flydesk.models.job import JobRow
-from flydesk.models.knowledge import EntityRow, RelationRow
+from flydesk.models.knowledge import EntityAliasRow, EntityRow, RelationRow
 from flydesk.models.notification_dismissal import NotificationDismissalRow
-from flydesk.models.knowledge_base import DocumentChunkRow, KnowledgeDocumentRow
+from flydesk.models.knowledge_base import (
+    DocumentChunkRow,
+    KnowledgeDocumentRow,
+    KnowledgeDocumentWorkspaceRow,
+)
 from flydesk.models.local_user import LocalUserRow
 from flydesk.models.process import BusinessProcessRow, ProcessDependencyRow, ProcessStepRow
 from flydesk.models.llm import LLMProviderRow
 from flydesk.models.oidc import OIDCProviderRow
 from flydesk.models.role import RoleRow
 from flydesk.models.routing import ModelRoutingConfigRow
+from flydesk.models.spend import SpendLedgerRow
 from flydesk.models.sso_identity import SSOIdentityRow
+from flydesk.models.usage import UsageRollupRow, UsageRollupStateRow
 from flydesk.models.user_role import UserRoleRow
 from flydesk.models.user_memory import UserMemoryRow
 from flydesk.models.user_settings import AppSettingRow, UserSettingRow
@@ -52,9 +59,12 @@ __all__ = [
     "CredentialRow",
     "CustomToolRow",
     "DeadLetterEntryRow",
+    "DiscoveryFingerprintRow",
     "DocumentChunkRow",
+    "DocumentSourceManifestRow",
     "DocumentSourceRow",
     "EmailThreadRow",
+    "EntityAliasRow",
     "EntityRow",
     "ExportRow",
     "ExportTemplateRow",
@@ -63,6 +73,7 @@ __all__ = [
     "GitProviderRow",
     "JobRow",
     "KnowledgeDocumentRow",
+    "KnowledgeDocumentWorkspaceRow",
     "LLMProviderRow",
     "LocalUserRow",
     "MessageRow",
@@ -74,7 +85,10 @@ __all__ = [
     "RelationRow",
     "RoleRow",
     "ServiceEndpointRow",
+    "SpendLedgerRow",
     "SSOIdentityRow",
+    "UsageRollupRow",
+    "UsageRollupStateRow",
     "UserMemoryRow",
     "UserRoleRow",
     "UserSettingRow",
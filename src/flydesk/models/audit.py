@@ -6,14 +6,19 @@
 #
 #     http://www.apache.org/licenses/LICENSE-2.0
 
-"""ORM model for audit events."""
+"""ORM model for audit events.
+
+On PostgreSQL ``audit_events`` is range-partitioned by month on
+``created_at`` (see :mod:`flydesk.audit.retention`), which is why
+``created_at`` is part of the primary key.
+"""
 
 from __future__ import annotations
 
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, String, Text
+from sqlalchemy import DateTime, Index, String, Text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -28,11 +33,21 @@ def _utcnow() -> datetime:
 
 class AuditEventRow(Base):
     __tablename__ = "audit_events"
+    # Newest-first keyset pagination orders by (created_at, id); each filter
+    # the audit UI offers leads one index so the walk stays an index scan.
+    __table_args__ = (
+        Index("ix_audit_events_created_at_id", "created_at", "id"),
+        Index("ix_audit_events_user_created", "user_id", "created_at", "id"),
+        Index("ix_audit_events_type_created", "event_type", "created_at", "id"),
+        Index("ix_audit_events_risk_created", "risk_level", "created_at", "id"),
+        Index("ix_audit_events_conversation_created", "conversation_id", "created_at", "id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    event_type: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
-    user_id: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
-    conversation_id: Mapped[str | None] = mapped_column(String(255), nullable=True, index=True)
+    event_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    user_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    conversation_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
     system_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
     endpoint_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
     action: Mapped[str] = mapped_column(Text, nullable=False)
@@ -40,4 +55,6 @@ class AuditEventRow(Base):
     risk_level: Mapped[str | None] = mapped_column(String(50), nullable=True)
     ip_address: Mapped[str | None] = mapped_column(String(45), nullable=True)
     user_agent: Mapped[str | None] = mapped_column(String(500), nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utcnow, index=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, default=_utcnow
+    )
@@ -69,6 +69,8 @@ class ServiceEndpointRow(Base):
     rate_limit: Mapped[dict | None] = mapped_column(_JSON, nullable=True)
     timeout_seconds: Mapped[float] = mapped_column(Float, nullable=False, default=30.0)
     retry_policy: Mapped[dict | None] = mapped_column(_JSON, nullable=True)
+    cache_policy: Mapped[dict | None] = mapped_column(_JSON, nullable=True)
+    response_limits: Mapped[dict | None] = mapped_column(_JSON, nullable=True)
     tags: Mapped[list] = mapped_column(_JSON, nullable=False, default=list)
     protocol_type: Mapped[str] = mapped_column(String(20), nullable=False, default="rest")
     graphql_query: Mapped[str | None] = mapped_column(Text, nullable=True)
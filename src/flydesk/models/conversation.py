@@ -59,4 +59,4 @@ class MessageRow(Base):
     metadata_: Mapped[dict] = mapped_column("metadata", _JSON, nullable=False, default=dict)
     turn_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
     token_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utcnow, index=True)
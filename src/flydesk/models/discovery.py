@@ -0,0 +1,51 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""ORM model for incremental discovery state."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from flydesk.models.base import Base
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class DiscoveryFingerprintRow(Base):
+    """ORM row for ``discovery_fingerprints`` -- one per analysed context unit.
+
+    Records the content fingerprint of each system, document or entity
+    cluster at the last successful discovery run so the next run only
+    sends units that changed to the LLM.
+    """
+
+    __tablename__ = "discovery_fingerprints"
+    __table_args__ = (
+        UniqueConstraint(
+            "discovery_type", "scope", "item_key", name="uq_discovery_fingerprint_item"
+        ),
+    )
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    # "process" or "system".
+    discovery_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    # Fingerprint of the run's workspace / document-type filters.
+    scope: Mapped[str] = mapped_column(String(64), nullable=False)
+    # "system:<id>", "document:<id>" or "entities:<type>".
+    item_key: Mapped[str] = mapped_column(String(512), nullable=False)
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=_utcnow, onupdate=_utcnow
+    )
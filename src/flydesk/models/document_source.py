@@ -12,7 +12,7 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, DateTime, String, Text
+from sqlalchemy import BigInteger, Boolean, DateTime, String, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from flydesk.models.base import Base
@@ -37,7 +37,36 @@ class DocumentSourceRow(Base):
     sync_enabled: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     sync_cron: Mapped[str | None] = mapped_column(String(100), nullable=True)
     last_sync_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # JSON map of drive id -> provider change-feed cursor (delta link / page token).
+    sync_cursors: Mapped[str | None] = mapped_column(Text(), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=_utcnow)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, default=_utcnow, onupdate=_utcnow,
     )
+
+
+class DocumentSourceManifestRow(Base):
+    """ORM row for ``document_source_manifest`` -- one per synced object.
+
+    Records the fingerprint of each object seen at its last sync so the next
+    sync only downloads objects that are new or changed.
+    """
+
+    __tablename__ = "document_source_manifest"
+    __table_args__ = (
+        UniqueConstraint("source_id", "container", "key", name="uq_source_manifest_object"),
+    )
+
+    id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    source_id: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    # Bucket/container name, or drive id for drive sources.
+    container: Mapped[str] = mapped_column(String(255), nullable=False)
+    # Object key, or item id for drive sources.
+    key: Mapped[str] = mapped_column(String(1024), nullable=False)
+    name: Mapped[str] = mapped_column(String(1024), nullable=False, default="")
+    document_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    etag: Mapped[str] = mapped_column(String(255), nullable=False, default="")
+    modified_at: Mapped[str] = mapped_column(String(64), nullable=False, default="")
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False, default="")
+    synced_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=_utcnow)
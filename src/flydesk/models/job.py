@@ -43,3 +43,11 @@ class JobRow(Base):
     started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     checkpoint_json: Mapped[str | None] = mapped_column(_JSON, nullable=True)
+    priority: Mapped[str] = mapped_column(String(20), nullable=False, default="interactive")
+    submitter: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # Lease held by the worker executing the job (database queue backend).
+    lease_owner: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True, index=True
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
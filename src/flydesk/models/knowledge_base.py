@@ -48,6 +48,15 @@ class KnowledgeDocumentRow(Base):
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utcnow, onupdate=_utcnow)
 
 
+class KnowledgeDocumentWorkspaceRow(Base):
+    """Workspace membership of a knowledge document (mirrors ``workspace_ids``)."""
+
+    __tablename__ = "kb_document_workspaces"
+
+    document_id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    workspace_id: Mapped[str] = mapped_column(String(255), primary_key=True, index=True)
+
+
 class DocumentChunkRow(Base):
     __tablename__ = "kb_chunks"
 
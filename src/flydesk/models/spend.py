@@ -0,0 +1,50 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""ORM model for the LLM spend ledger."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import BigInteger, DateTime, Float, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from flydesk.models.base import Base
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class SpendLedgerRow(Base):
+    """ORM row for ``spend_ledger`` -- one per worker, day, user and model.
+
+    Each worker only ever writes its own rows, so concurrent workers never
+    contend on a shared counter; totals are the SUM across workers.
+    """
+
+    __tablename__ = "spend_ledger"
+    __table_args__ = (
+        UniqueConstraint("worker_id", "day", "user_id", "model", name="uq_spend_ledger_shard"),
+    )
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    worker_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    # ISO date (server local time), e.g. "2026-03-20".
+    day: Mapped[str] = mapped_column(String(10), nullable=False, index=True)
+    user_id: Mapped[str] = mapped_column(String(255), nullable=False, default="")
+    model: Mapped[str] = mapped_column(String(255), nullable=False, default="")
+    cost_usd: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    input_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    output_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    call_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=_utcnow, onupdate=_utcnow
+    )
@@ -0,0 +1,70 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""ORM models for pre-aggregated usage analytics."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Float, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from flydesk.models.base import Base
+
+
+class UsageRollupRow(Base):
+    """ORM row for ``usage_rollups`` -- one per hour and dimension combination.
+
+    Dimensions that do not apply to a source are stored as ``""`` so the
+    unique constraint covers every combination.
+    """
+
+    __tablename__ = "usage_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "bucket",
+            "source",
+            "event_type",
+            "tool",
+            "user_id",
+            "model",
+            "workspace_id",
+            name="uq_usage_rollup_bucket_dims",
+        ),
+    )
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    # Start of the UTC hour the counts belong to.
+    bucket: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    # "audit", "messages" or "conversations".
+    source: Mapped[str] = mapped_column(String(20), nullable=False)
+    event_type: Mapped[str] = mapped_column(String(50), nullable=False, default="")
+    # Audit action of ``tool_call`` events.
+    tool: Mapped[str] = mapped_column(String(255), nullable=False, default="")
+    user_id: Mapped[str] = mapped_column(String(255), nullable=False, default="")
+    model: Mapped[str] = mapped_column(String(255), nullable=False, default="")
+    workspace_id: Mapped[str] = mapped_column(String(255), nullable=False, default="")
+    event_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    input_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    output_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    cost_usd: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+
+class UsageRollupStateRow(Base):
+    """ORM row for ``usage_rollup_state`` -- the rollup watermark.
+
+    Raw rows created before ``rolled_up_to`` are reflected in
+    ``usage_rollups``; newer rows are read from the source tables.
+    """
+
+    __tablename__ = "usage_rollup_state"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    rolled_up_to: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -12,13 +12,17 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, String, Text
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import DateTime, Index, String, Text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
 from flydesk.models.base import Base
 
 _JSON = JSONB().with_variant(Text, "sqlite")
+# Same dimension as ``kb_chunks.embedding``; JSON text on SQLite.
+EMBEDDING_DIMENSIONS = 1536
+_VECTOR = Vector(EMBEDDING_DIMENSIONS).with_variant(Text, "sqlite")
 
 
 def _utcnow() -> datetime:
@@ -29,9 +33,12 @@ class UserMemoryRow(Base):
     """ORM row for the ``user_memories`` table."""
 
     __tablename__ = "user_memories"
+    # Memory search scores each user's newest memories; on PostgreSQL the
+    # migrations add a GIN full-text index on ``content``.
+    __table_args__ = (Index("ix_user_memories_user_created", "user_id", "created_at"),)
 
     id: Mapped[str] = mapped_column(String(255), primary_key=True)
-    user_id: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    user_id: Mapped[str] = mapped_column(String(255), nullable=False)
     content: Mapped[str] = mapped_column(Text, nullable=False)
     category: Mapped[str] = mapped_column(
         String(100), nullable=False, default="general"
@@ -42,6 +49,7 @@ class UserMemoryRow(Base):
     metadata_: Mapped[dict | None] = mapped_column(
         "metadata", _JSON, nullable=True, default=None
     )
+    embedding = mapped_column(_VECTOR, nullable=True)  # embedding of ``content``
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=_utcnow
     )
@@ -15,11 +15,12 @@ automatically discover business processes.
 
 from __future__ import annotations
 
+import functools
 import json
 import logging
 import re
 import uuid
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
@@ -28,6 +29,17 @@ from pydantic import BaseModel, Field
 
 from flydesk.audit.logger import AuditLogger
 from flydesk.audit.models import AuditEvent, AuditEventType
+from flydesk.catalog.discovery_state import (
+    DiscoveryUnit,
+    changed_units,
+    discovery_scope,
+    entity_cluster_units,
+    load_fingerprints,
+    make_unit,
+    pack_units,
+    run_passes,
+    save_fingerprints,
+)
 from flydesk.jobs.handlers import ProgressCallback
 from flydesk.processes.models import (
     BusinessProcess,
@@ -39,6 +51,7 @@ from flydesk.processes.models import (
 
 if TYPE_CHECKING:
     from flydesk.agent.genai_bridge import DeskAgentFactory
+    from flydesk.catalog.discovery_state import DiscoveryFingerprintStore
     from flydesk.catalog.repository import CatalogRepository
     from flydesk.jobs.models import Job
     from flydesk.jobs.runner import JobRunner
@@ -55,8 +68,12 @@ _PROMPTS_DIR = Path(__file__).parent / "prompts"
 
 # Discovery tuning constants
 _DISCOVERY_ENTITY_LIMIT = 200  # max KG entities loaded for context (matches system discovery)
+_DISCOVERY_RELATION_FANOUT = 50  # max KG relations followed per entity for context
 _DISCOVERY_MAX_TOKENS = 16_384  # max LLM output tokens (sufficient for structured JSON process output)
 _MERGE_DEDUP_LIMIT = 500  # max existing processes loaded for dedup during merge
+_DISCOVERY_CHUNK_CHARS = 120_000  # context characters per LLM pass
+_DISCOVERY_CONCURRENCY = 3  # LLM passes run in parallel
+_FINGERPRINT_TYPE = "process"  # discovery_type of stored fingerprints
 
 
 class DiscoveredStep(BaseModel):
@@ -138,6 +155,10 @@ def _is_system_only(doc: Any, system_ws_id: str) -> bool:
     return ws_ids == [system_ws_id]
 
 
+async def _no_progress(pct: int, message: str) -> None:
+    """Progress callback for LLM passes whose progress is not reported."""
+
+
 # ---------------------------------------------------------------------------
 # Engine
 # ---------------------------------------------------------------------------
@@ -153,6 +174,12 @@ class ProcessDiscoveryEngine:
     4. Parse the structured JSON response into ``BusinessProcess`` models
     5. Merge with existing processes (preserving user-verified/modified ones)
     6. Persist via ``ProcessRepository``
+
+    With a *fingerprint_store*, each run only analyses the systems,
+    documents and entity clusters that changed since the last successful
+    run.  Context larger than *chunk_chars* is split into several LLM
+    passes (at most *max_concurrency* in flight) whose results are
+    deduplicated before the merge.
     """
 
     def __init__(
@@ -164,12 +191,18 @@ class ProcessDiscoveryEngine:
         *,
         audit_logger: AuditLogger | None = None,
         prompts_dir: Path | None = None,
+        fingerprint_store: DiscoveryFingerprintStore | None = None,
+        chunk_chars: int = _DISCOVERY_CHUNK_CHARS,
+        max_concurrency: int = _DISCOVERY_CONCURRENCY,
     ) -> None:
         self._agent_factory = agent_factory
         self._process_repo = process_repo
         self._catalog_repo = catalog_repo
         self._knowledge_graph = knowledge_graph
         self._audit_logger = audit_logger
+        self._fingerprint_store = fingerprint_store
+        self._chunk_chars = chunk_chars
+        self._max_concurrency = max_concurrency
 
         templates_path = prompts_dir or _PROMPTS_DIR
         self._jinja_env = Environment(
@@ -224,6 +257,7 @@ class ProcessDiscoveryEngine:
         *,
         workspace_ids: list[str] | None = None,
         document_types: list[str] | None = None,
+        full: bool = False,
     ) -> Job:
         """Submit a process discovery job to the background job runner.
 
@@ -232,6 +266,7 @@ class ProcessDiscoveryEngine:
             job_runner: The ``JobRunner`` instance to submit the job to.
             workspace_ids: Optional list of workspace IDs to scope discovery to.
             document_types: Optional list of document types to include.
+            full: Analyse all context, not just what changed since the last run.
 
         Returns:
             The created ``Job`` domain object for tracking.
@@ -241,6 +276,8 @@ class ProcessDiscoveryEngine:
             payload["workspace_ids"] = workspace_ids
         if document_types:
             payload["document_types"] = document_types
+        if full:
+            payload["full"] = True
         return await job_runner.submit("process_discovery", payload)
 
     # ------------------------------------------------------------------
@@ -302,18 +339,62 @@ class ProcessDiscoveryEngine:
                 "guidance": guidance,
             }
 
-        # 2. Build prompt
-        system_prompt = self._render_system_prompt(trigger)
-        user_prompt = self._render_context_prompt(context)
-        prompt_size = len(system_prompt) + len(user_prompt)
-        await on_progress(
-            25,
-            f"Sending {prompt_size:,} characters of context to LLM for analysis...",
-        )
+        # 2. Keep only the context that changed since the last successful run
+        units = self._context_units(context)
+        scope = discovery_scope(workspace_ids, document_types)
+        previous = await load_fingerprints(self._fingerprint_store, _FINGERPRINT_TYPE, scope)
+        pending = units if payload.get("full") else changed_units(units, previous)
+        if previous and not pending:
+            await on_progress(100, "No changes since the last discovery — nothing to analyze")
+            return {
+                "status": "skipped",
+                "reason": "unchanged",
+                "context_summary": context_summary,
+                "processes_discovered": 0,
+            }
+        if len(pending) < len(units):
+            await on_progress(
+                22, f"{len(pending)} of {len(units)} context items changed since the last discovery",
+            )
 
-        # 3. Call LLM (with progress feedback and retry)
-        discovery_result, usage_data = await self._call_llm(
-            system_prompt, user_prompt, on_progress,
+        # 3. Build prompts (one per chunk of context)
+        system_prompt = self._render_system_prompt(trigger)
+        chunks = pack_units(pending, self._chunk_chars) or [[]]
+        pending_keys = {u.key for u in pending}
+        reference = [
+            SystemContext(**{**asdict(u.payload), "endpoints": []})
+            for u in units
+            if u.key.startswith("system:") and u.key not in pending_keys
+        ]
+        user_prompts = [
+            self._render_context_prompt(self._context_from_units(chunk, reference))
+            for chunk in chunks
+        ]
+        prompt_size = sum(len(system_prompt) + len(p) for p in user_prompts)
+        if len(user_prompts) > 1:
+            message = (
+                f"Sending {prompt_size:,} characters of context to LLM "
+                f"in {len(user_prompts)} parallel passes..."
+            )
+        else:
+            message = f"Sending {prompt_size:,} characters of context to LLM for analysis..."
+        await on_progress(25, message)
+
+        # 4. Call LLM per chunk (with progress feedback and retry), then reduce
+        # A single pass reports its own progress; parallel passes report
+        # only their completion.
+        pass_progress = on_progress
+        if len(user_prompts) > 1:
+            await on_progress(30, "Waiting for LLM analysis (this may take 1-2 minutes)...")
+            pass_progress = _no_progress
+        discovery_result, usage_data, failed = await run_passes(
+            user_prompts,
+            functools.partial(self._call_llm_pass, system_prompt, on_progress=pass_progress),
+            self._reduce_results,
+            on_progress,
+            max_concurrency=self._max_concurrency,
+            start_pct=30,
+            span_pct=25,
         )
         if discovery_result is None:
             await on_progress(100, "No LLM provider configured — discovery skipped")
@@ -348,6 +429,12 @@ class ProcessDiscoveryEngine:
 
         # 5b. Write discovered processes back to the knowledge graph
         await self._write_to_knowledge_graph(discovered)
+
+        # 5c. Remember what was analysed; failed passes are retried next run
+        failed_keys = {u.key for i in failed for u in chunks[i]}
+        await save_fingerprints(
+            self._fingerprint_store, _FINGERPRINT_TYPE, scope, units, previous, failed_keys
+        )
         merge_parts = []
         if stats["created"]:
             merge_parts.append(f"{stats['created']} new")
@@ -380,6 +467,9 @@ class ProcessDiscoveryEngine:
             "processes_created": stats["created"],
             "processes_updated": stats["updated"],
             "processes_skipped": stats["skipped"],
+            "context_items_analyzed": len(pending),
+            "context_items_total": len(units),
+            "llm_passes": len(user_prompts),
             "input_tokens": usage_data.get("input_tokens", 0),
             "output_tokens": usage_data.get("output_tokens", 0),
             "cost_usd": usage_data.get("cost_usd", 0.0),
@@ -428,12 +518,12 @@ class ProcessDiscoveryEngine:
             else:
                 systems, _ = await self._catalog_repo.list_systems()
 
-            for i, sys in enumerate(systems):
-                await _progress(
-                    7 + (i * 3 // max(len(systems), 1)),
-                    f"Scanning system: {sys.name} ({len(systems) - i - 1} remaining)...",
-                )
-                endpoints = await self._catalog_repo.list_endpoints(sys.id)
+            await _progress(7, f"Loading endpoints of {len(systems)} systems...")
+            endpoints_by_system = await self._catalog_repo.list_endpoints_for_systems(
+                [sys.id for sys in systems]
+            )
+            for sys in systems:
+                endpoints = endpoints_by_system.get(sys.id, [])
                 ep_dicts = [
                     {
                         "id": ep.id,
@@ -474,6 +564,7 @@ class ProcessDiscoveryEngine:
             entity_name_map: dict[str, str] = {e.id: e.name for e in entities}
             ctx.entities = [
                 {
+                    "id": e.id,
                     "name": e.name,
                     "entity_type": e.entity_type,
                     "confidence": e.confidence,
@@ -481,28 +572,29 @@ class ProcessDiscoveryEngine:
                 }
                 for e in entities
             ]
-            # Gather relations for each entity (first-degree)
+            # Gather first-degree relations of all entities in one traversal
+            graph = await self._knowledge_graph.get_neighborhoods(
+                [e.id for e in entities], depth=1, max_fanout=_DISCOVERY_RELATION_FANOUT
+            )
             seen_relations: set[tuple[str, str, str]] = set()
-            for entity in entities:
-                graph = await self._knowledge_graph.get_entity_neighborhood(entity.id, depth=1)
-                for rel in graph.relations:
-                    key = (rel.source_id, rel.target_id, rel.relation_type)
-                    if key not in seen_relations:
-                        seen_relations.add(key)
-                        ctx.relations.append(
-                            {
-                                "source_id": rel.source_id,
-                                "target_id": rel.target_id,
-                                "source_name": entity_name_map.get(
-                                    rel.source_id, rel.source_id
-                                ),
-                                "target_name": entity_name_map.get(
-                                    rel.target_id, rel.target_id
-                                ),
-                                "relation_type": rel.relation_type,
-                                "properties": rel.properties,
-                            }
-                        )
+            for rel in graph.relations:
+                key = (rel.source_id, rel.target_id, rel.relation_type)
+                if key not in seen_relations:
+                    seen_relations.add(key)
+                    ctx.relations.append(
+                        {
+                            "source_id": rel.source_id,
+                            "target_id": rel.target_id,
+                            "source_name": entity_name_map.get(
+                                rel.source_id, rel.source_id
+                            ),
+                            "target_name": entity_name_map.get(
+                                rel.target_id, rel.target_id
+                            ),
+                            "relation_type": rel.relation_type,
+                            "properties": rel.properties,
+                        }
+                    )
             if ctx.entities:
                 await _progress(
                     14,
@@ -518,18 +610,9 @@ class ProcessDiscoveryEngine:
             from flydesk.server import DEFAULT_WORKSPACE_ID as _SYSTEM_WS
 
             if workspace_ids:
-                all_docs = []
-                for ws_id in workspace_ids:
-                    ws_docs = await self._catalog_repo.list_knowledge_documents(workspace_id=ws_id)
-                    all_docs.extend(ws_docs)
-                # Deduplicate by ID
-                seen_doc_ids: set[str] = set()
-                documents = []
-                for doc in all_docs:
-                    doc_id = getattr(doc, "id", None)
-                    if doc_id and doc_id not in seen_doc_ids:
-                        seen_doc_ids.add(doc_id)
-                        documents.append(doc)
+                documents = await self._catalog_repo.list_knowledge_documents(
+                    workspace_ids=workspace_ids
+                )
             else:
                 documents = await self._catalog_repo.list_knowledge_documents()
                 # Prefer user-uploaded documents over system-only platform docs.
@@ -564,6 +647,7 @@ class ProcessDiscoveryEngine:
 
             ctx.documents = [
                 {
+                    "id": getattr(doc, "id", ""),
                     "title": getattr(doc, "title", ""),
                     "document_type": str(getattr(doc, "document_type", "other")),
                     "tags": getattr(doc, "tags", []),
@@ -600,10 +684,63 @@ class ProcessDiscoveryEngine:
             documents=context.documents,
         )
 
+    # ------------------------------------------------------------------
+    # Incremental state
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _context_units(context: DiscoveryContext) -> list[DiscoveryUnit]:
+        """Split *context* into systems, documents and entity-type clusters."""
+        units = [make_unit(f"system:{s.id}", asdict(s), payload=s) for s in context.systems]
+        units.extend(
+            make_unit(f"document:{d.get('id') or d.get('title', '')}", d)
+            for d in context.documents
+        )
+        units.extend(entity_cluster_units(context.entities, context.relations))
+        return units
+
+    @staticmethod
+    def _context_from_units(
+        units: list[DiscoveryUnit],
+        reference_systems: list[SystemContext],
+    ) -> DiscoveryContext:
+        """Rebuild a prompt context from *units*.
+
+        *reference_systems* are unchanged systems without their endpoints,
+        so steps found in changed documents can still name their system.
+        """
+        ctx = DiscoveryContext(systems=list(reference_systems))
+        for unit in units:
+            kind = unit.key.split(":", 1)[0]
+            if kind == "system":
+                ctx.systems.append(unit.payload)
+            elif kind == "document":
+                ctx.documents.append(unit.payload)
+            else:
+                ctx.entities.extend(unit.payload["entities"])
+                ctx.relations.extend(unit.payload["relations"])
+        return ctx
+
     # ------------------------------------------------------------------
     # LLM interaction
     # ------------------------------------------------------------------
 
+    def _reduce_results(self, results: list[DiscoveryResult]) -> DiscoveryResult:
+        """Deduplicate processes found by several passes by normalized name.
+
+        The candidate with the higher confidence (then more steps) wins.
+        """
+        best: dict[str, DiscoveredProcess] = {}
+        for result in results:
+            for proc in result.processes:
+                key = self._normalize_name(proc.name)
+                kept = best.get(key)
+                if kept is None or (proc.confidence, len(proc.steps)) > (
+                    kept.confidence, len(kept.steps)
+                ):
+                    best[key] = proc
+        return DiscoveryResult(processes=list(best.values()))
+
     async def _call_llm(
         self,
         system_prompt: str,
@@ -618,13 +755,28 @@ class ProcessDiscoveryEngine:
         Returns a tuple of (result, usage_data). Result is ``None`` if no LLM
         provider is configured.
         """
+        result, usage_data, _ = await self._call_llm_pass(system_prompt, user_prompt, on_progress)
+        return result, usage_data
+
+    async def _call_llm_pass(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        on_progress: ProgressCallback,
+    ) -> tuple[DiscoveryResult | None, dict[str, Any], bool]:
+        """Run one LLM pass; like ``_call_llm`` plus a success flag.
+
+        The flag is ``False`` when the call raised or the response could not
+        be parsed even after the repair prompt, so the caller knows the pass
+        did not actually analyse its context.
+        """
         agent = await self._agent_factory.create_agent(
             system_prompt,
             model_settings_override={"max_tokens": _DISCOVERY_MAX_TOKENS},
         )
         if agent is None:
             logger.warning("No LLM provider configured; process discovery skipped.")
-            return None, {}
+            return None, {}, False
 
         await on_progress(30, "Waiting for LLM analysis (this may take 1-2 minutes)...")
 
@@ -638,7 +790,7 @@ class ProcessDiscoveryEngine:
         except Exception as exc:
             logger.exception("LLM call failed during process discovery.")
             await on_progress(50, f"LLM call failed: {exc.__class__.__name__}: {exc}")
-            return DiscoveryResult(processes=[]), usage_data
+            return DiscoveryResult(processes=[]), usage_data, False
 
         logger.info(
             "Process discovery LLM response: %d chars (first 500: %s)",
@@ -649,7 +801,7 @@ class ProcessDiscoveryEngine:
 
         parsed, parse_error = self._parse_llm_response(output_text)
         if parsed.processes:
-            return parsed, usage_data
+            return parsed, usage_data, True
 
         # Parsing failed — attempt JSON repair with a follow-up prompt
         if parse_error:
@@ -707,7 +859,7 @@ class ProcessDiscoveryEngine:
                 repaired, repair_error = self._parse_llm_response(repair_text)
                 if repaired.processes:
                     await on_progress(55, f"Repair successful — {len(repaired.processes)} processes parsed")
-                    return repaired, usage_data
+                    return repaired, usage_data, True
                 if repair_error:
                     await on_progress(55, f"Repair also failed: {repair_error[:120]}")
                     logger.warning("Repair parse also failed: %s", repair_error)
@@ -715,7 +867,7 @@ class ProcessDiscoveryEngine:
                 logger.exception("Repair LLM call failed.")
                 await on_progress(55, "Repair attempt failed — LLM error")
 
-        return parsed, usage_data
+        return parsed, usage_data, parse_error is None
 
     @staticmethod
     def _extract_json_from_text(text: str) -> str:
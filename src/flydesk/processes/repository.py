@@ -15,7 +15,7 @@ import logging
 from datetime import datetime, timezone
 from typing import Any
 
-from sqlalchemy import delete, or_, select
+from sqlalchemy import delete, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from flydesk.models.process import (
@@ -135,6 +135,14 @@ class ProcessRepository:
 
             return [self._row_to_process(r) for r in rows]
 
+    async def count(self, *, workspace_id: str | None = None) -> int:
+        """Return the number of processes, optionally filtered by workspace."""
+        async with self._session_factory() as session:
+            stmt = select(func.count()).select_from(BusinessProcessRow)
+            if workspace_id is not None:
+                stmt = stmt.where(BusinessProcessRow.workspace_id == workspace_id)
+            return (await session.execute(stmt)).scalar() or 0
+
     async def update(self, process: BusinessProcess) -> BusinessProcess:
         """Update an existing business process (replaces steps and dependencies)."""
         async with self._session_factory() as session:
@@ -11,6 +11,7 @@
 from __future__ import annotations
 
 import json
+import time
 from datetime import datetime, timezone
 from typing import Any
 
@@ -29,6 +30,11 @@ _UPDATABLE_FIELDS = frozenset({
     "access_scopes",
 })
 
+# Resolved role sets are cached in-process; the TTL bounds how long another
+# worker's role edits can go unseen.
+_RESOLVED_ROLES_TTL_SECONDS = 60.0
+_RESOLVED_ROLES_MAX_ENTRIES = 1024
+
 
 def _to_json(value: Any) -> str | None:
     """Serialize a Python object to a JSON string for SQLite Text columns."""
@@ -45,10 +51,24 @@ def _from_json(value: Any) -> list:
 
 
 class RoleRepository:
-    """CRUD operations for RBAC roles."""
+    """CRUD operations for RBAC roles.
+
+    Permission and access-scope resolution for a set of role names is
+    cached per repository instance.  Every mutation through the repository
+    clears the cache and bumps :attr:`version`, which callers holding
+    derived data (such as cached user sessions) compare to detect role
+    edits.
+    """
 
     def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
         self._session_factory = session_factory
+        self._resolved: dict[frozenset[str], tuple[list[str], AccessScopes, float]] = {}
+        self.version = 0
+
+    def invalidate_cache(self) -> None:
+        """Drop cached role resolutions (called after every role mutation)."""
+        self._resolved.clear()
+        self.version += 1
 
     # -- Queries --
 
@@ -96,6 +116,7 @@ class RoleRepository:
             session.add(row)
             await session.commit()
             await session.refresh(row)
+            self.invalidate_cache()
             return self._row_to_role(row)
 
     async def update_role(self, role_id: str, **kwargs: Any) -> Role | None:
@@ -120,6 +141,7 @@ class RoleRepository:
             row.updated_at = datetime.now(timezone.utc)
             await session.commit()
             await session.refresh(row)
+            self.invalidate_cache()
             return self._row_to_role(row)
 
     async def delete_role(self, role_id: str) -> bool:
@@ -133,6 +155,7 @@ class RoleRepository:
                 raise ValueError(msg)
             await session.delete(row)
             await session.commit()
+            self.invalidate_cache()
             return True
 
     # -- Permission resolution --
@@ -142,19 +165,8 @@ class RoleRepository:
 
         If any role carries the wildcard ``["*"]``, returns ``["*"]``.
         """
-        async with self._session_factory() as session:
-            result = await session.execute(
-                select(RoleRow).where(RoleRow.name.in_(role_names))
-            )
-            rows = result.scalars().all()
-
-        all_perms: set[str] = set()
-        for row in rows:
-            perms = _from_json(row.permissions) if row.permissions else []
-            if "*" in perms:
-                return ["*"]
-            all_perms.update(perms)
-        return sorted(all_perms)
+        permissions, _ = await self._resolve_roles(role_names)
+        return list(permissions)
 
     async def get_access_scopes_for_roles(
         self, role_names: list[str],
@@ -164,17 +176,42 @@ class RoleRepository:
         Returns an :class:`AccessScopes` representing the union (most-permissive)
         of all matching roles' scopes.
         """
+        _, scopes = await self._resolve_roles(role_names)
+        return scopes.model_copy(deep=True)
+
+    async def _resolve_roles(self, role_names: list[str]) -> tuple[list[str], AccessScopes]:
+        """Load permissions and merged scopes of *role_names* in one query (cached)."""
+        key = frozenset(role_names)
+        cached = self._resolved.get(key)
+        if cached is not None and time.monotonic() < cached[2]:
+            return cached[0], cached[1]
+
+        version = self.version
         async with self._session_factory() as session:
             result = await session.execute(
                 select(RoleRow).where(RoleRow.name.in_(role_names))
             )
             rows = result.scalars().all()
 
+        all_perms: set[str] = set()
+        wildcard = False
         scopes_list: list[AccessScopes] = []
         for row in rows:
+            perms = _from_json(row.permissions) if row.permissions else []
+            wildcard = wildcard or "*" in perms
+            all_perms.update(perms)
             scopes_list.append(self._parse_access_scopes(row.access_scopes))
-
-        return merge_access_scopes(scopes_list)
+        permissions = ["*"] if wildcard else sorted(all_perms)
+        scopes = merge_access_scopes(scopes_list)
+
+        # Don't cache a result that raced with a role edit.
+        if version == self.version:
+            if len(self._resolved) >= _RESOLVED_ROLES_MAX_ENTRIES:
+                self._resolved.clear()
+            self._resolved[key] = (
+                permissions, scopes, time.monotonic() + _RESOLVED_ROLES_TTL_SECONDS,
+            )
+        return permissions, scopes
 
     # -- Seeding --
 
@@ -202,6 +239,7 @@ class RoleRepository:
                     existing.description = role.description
                     existing.updated_at = datetime.now(timezone.utc)
             await session.commit()
+        self.invalidate_cache()
 
     # -- Mapping helpers --
 
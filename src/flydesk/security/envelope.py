@@ -0,0 +1,219 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""Envelope encryption on top of a remote KMS provider.
+
+Each secret is encrypted locally with its own random AES-256-GCM data key;
+only the data key is sent to the KMS to be wrapped.  Unwrapped data keys (and
+plaintexts of legacy values encrypted directly by the KMS) are held in a
+short-TTL in-memory cache, so a credential costs one KMS round-trip per TTL
+instead of one per outbound request.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+if TYPE_CHECKING:
+    from flydesk.security.kms import KMSProvider
+
+logger = logging.getLogger(__name__)
+
+ENVELOPE_PREFIX = "env1."
+_AAD = b"flydesk-envelope-v1"
+_NONCE_BYTES = 12
+
+
+def _zero(buffer: bytearray) -> None:
+    """Overwrite *buffer* in place."""
+    for i in range(len(buffer)):
+        buffer[i] = 0
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data.encode("ascii"))
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+class _SecretCache:
+    """Bounded TTL cache of secret bytes that zeroes entries when they leave.
+
+    Values are stored as :class:`bytearray` so they can be overwritten on
+    expiry, eviction or invalidation.  Copies handed to callers (and any
+    ``str`` built from them) are outside its control.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[bytearray, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if time.monotonic() >= expires_at:
+                self._discard(key)
+                return None
+            self._entries.move_to_end(key)
+            return bytes(value)
+
+    def put(self, key: str, value: bytes) -> None:
+        if self._ttl <= 0:
+            return
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (bytearray(value), time.monotonic() + self._ttl)
+            while len(self._entries) > self._max_entries:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._discard(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._entries):
+                self._discard(key)
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            _zero(entry[0])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class EnvelopeKMSProvider:
+    """Wrap a remote :class:`KMSProvider` with envelope encryption and caching.
+
+    Ciphertexts have the form ``env1.<wrapped data key>.<nonce + AES-GCM
+    ciphertext>`` (both parts URL-safe base64).  Values without the prefix
+    were encrypted directly by the KMS before envelope encryption was enabled;
+    they are still decrypted through the KMS and their plaintext is cached.
+
+    Parameters
+    ----------
+    inner:
+        The remote KMS used to wrap and unwrap data keys.
+    cache_ttl_seconds:
+        Lifetime of cached data keys and plaintexts.  ``0`` disables caching
+        (every decrypt then calls the KMS).
+    max_entries:
+        Upper bound on cached secrets.
+    """
+
+    def __init__(
+        self,
+        inner: KMSProvider,
+        *,
+        cache_ttl_seconds: float = 300,
+        max_entries: int = 1024,
+    ) -> None:
+        self._inner = inner
+        self._data_keys = _SecretCache(cache_ttl_seconds, max_entries)
+        self._plaintexts = _SecretCache(cache_ttl_seconds, max_entries)
+
+    @property
+    def inner(self) -> KMSProvider:
+        """The wrapped KMS provider."""
+        return self._inner
+
+    def encrypt(self, plaintext: str) -> str:
+        data_key = bytearray(AESGCM.generate_key(bit_length=256))
+        try:
+            nonce = os.urandom(_NONCE_BYTES)
+            sealed = AESGCM(data_key).encrypt(nonce, plaintext.encode("utf-8"), _AAD)
+            wrapped = self._inner.encrypt(_b64encode(bytes(data_key)))
+        finally:
+            _zero(data_key)
+        return f"{ENVELOPE_PREFIX}{_b64encode(wrapped.encode('utf-8'))}.{_b64encode(nonce + sealed)}"
+
+    def decrypt(self, ciphertext: str) -> str:
+        if not ciphertext.startswith(ENVELOPE_PREFIX):
+            return self._decrypt_legacy(ciphertext)
+
+        try:
+            wrapped_part, sealed_part = ciphertext[len(ENVELOPE_PREFIX):].split(".", 1)
+            sealed = _b64decode(sealed_part)
+        except (ValueError, UnicodeEncodeError) as exc:
+            raise ValueError("Decryption failed -- malformed envelope ciphertext") from exc
+
+        data_key = bytearray(self._unwrap(wrapped_part))
+        try:
+            plaintext = AESGCM(data_key).decrypt(
+                sealed[:_NONCE_BYTES], sealed[_NONCE_BYTES:], _AAD
+            )
+        except InvalidTag as exc:
+            self._data_keys.discard(_digest(wrapped_part))
+            raise ValueError("Decryption failed -- invalid key or corrupted data") from exc
+        finally:
+            _zero(data_key)
+        return plaintext.decode("utf-8")
+
+    def invalidate(self, ciphertext: str) -> None:
+        """Drop cached key material for *ciphertext* (e.g. after rotation)."""
+        if ciphertext.startswith(ENVELOPE_PREFIX):
+            wrapped_part = ciphertext[len(ENVELOPE_PREFIX):].split(".", 1)[0]
+            self._data_keys.discard(_digest(wrapped_part))
+        else:
+            self._plaintexts.discard(_digest(ciphertext))
+
+    def clear(self) -> None:
+        """Zero and drop every cached secret."""
+        self._data_keys.clear()
+        self._plaintexts.clear()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _unwrap(self, wrapped_part: str) -> bytes:
+        cache_key = _digest(wrapped_part)
+        cached = self._data_keys.get(cache_key)
+        if cached is not None:
+            return cached
+        try:
+            wrapped = _b64decode(wrapped_part).decode("utf-8")
+        except (ValueError, UnicodeError) as exc:
+            raise ValueError("Decryption failed -- malformed envelope ciphertext") from exc
+        logger.debug("Data key cache miss; unwrapping via %s", type(self._inner).__name__)
+        data_key = _b64decode(self._inner.decrypt(wrapped))
+        self._data_keys.put(cache_key, data_key)
+        return data_key
+
+    def _decrypt_legacy(self, ciphertext: str) -> str:
+        cache_key = _digest(ciphertext)
+        cached = self._plaintexts.get(cache_key)
+        if cached is not None:
+            return cached.decode("utf-8")
+        plaintext = self._inner.decrypt(ciphertext)
+        self._plaintexts.put(cache_key, plaintext.encode("utf-8"))
+        return plaintext
@@ -17,6 +17,10 @@ Provides a :class:`KMSProvider` protocol and several implementations:
 * :class:`~flydesk.security.azure_kv.AzureKeyVaultProvider` -- Azure Key Vault
 * :class:`~flydesk.security.vault_kms.VaultKMSProvider` -- HashiCorp Vault Transit
 
+Remote providers can be wrapped in
+:class:`~flydesk.security.envelope.EnvelopeKMSProvider` so that secrets are
+encrypted locally under KMS-wrapped data keys that are cached briefly.
+
 Use :func:`create_kms_provider` to instantiate the appropriate provider based
 on application configuration.
 """
@@ -99,6 +103,18 @@ class NoOpKMSProvider:
         return ciphertext
 
 
+def _maybe_envelope(provider: KMSProvider, config: Any) -> KMSProvider:
+    """Wrap a remote *provider* in envelope encryption when enabled in *config*."""
+    if not getattr(config, "kms_envelope_encryption", False):
+        return provider
+    from flydesk.security.envelope import EnvelopeKMSProvider
+
+    return EnvelopeKMSProvider(
+        provider,
+        cache_ttl_seconds=getattr(config, "kms_cache_ttl_seconds", 300),
+    )
+
+
 def create_kms_provider(config: Any) -> KMSProvider:
     """Create the appropriate KMS provider based on configuration.
 
@@ -119,9 +135,12 @@ def create_kms_provider(config: Any) -> KMSProvider:
             raise ImportError(
                 "AWS KMS provider requires boto3. Install with: pip install flydesk[aws-kms]"
             ) from exc
-        return AWSKMSProvider(
-            key_arn=config.aws_kms_key_arn,
-            region=getattr(config, "aws_kms_region", ""),
+        return _maybe_envelope(
+            AWSKMSProvider(
+                key_arn=config.aws_kms_key_arn,
+                region=getattr(config, "aws_kms_region", ""),
+            ),
+            config,
         )
 
     if provider_type == "gcp":
@@ -134,7 +153,7 @@ def create_kms_provider(config: Any) -> KMSProvider:
                 "GCP KMS provider requires google-cloud-kms. "
                 "Install with: pip install flydesk[gcp-kms]"
             ) from exc
-        return GCPKMSProvider(key_name=config.gcp_kms_key_name)
+        return _maybe_envelope(GCPKMSProvider(key_name=config.gcp_kms_key_name), config)
 
     if provider_type == "azure":
         if not getattr(config, "azure_vault_url", "") or not getattr(config, "azure_key_name", ""):
@@ -149,9 +168,12 @@ def create_kms_provider(config: Any) -> KMSProvider:
                 "Azure KMS provider requires azure-keyvault-keys and azure-identity. "
                 "Install with: pip install flydesk[azure-kms]"
             ) from exc
-        return AzureKeyVaultProvider(
-            vault_url=config.azure_vault_url,
-            key_name=config.azure_key_name,
+        return _maybe_envelope(
+            AzureKeyVaultProvider(
+                vault_url=config.azure_vault_url,
+                key_name=config.azure_key_name,
+            ),
+            config,
         )
 
     if provider_type == "vault":
@@ -166,11 +188,14 @@ def create_kms_provider(config: Any) -> KMSProvider:
             raise ImportError(
                 "Vault KMS provider requires hvac. Install with: pip install flydesk[vault]"
             ) from exc
-        return VaultKMSProvider(
-            url=config.vault_url,
-            token=config.vault_token,
-            transit_key=getattr(config, "vault_transit_key", "flydesk"),
-            mount_point=getattr(config, "vault_mount_point", "transit"),
+        return _maybe_envelope(
+            VaultKMSProvider(
+                url=config.vault_url,
+                token=config.vault_token,
+                transit_key=getattr(config, "vault_transit_key", "flydesk"),
+                mount_point=getattr(config, "vault_mount_point", "transit"),
+            ),
+            config,
         )
 
     # Default: Fernet
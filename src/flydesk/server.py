@@ -175,6 +175,12 @@ async def _init_database(
         await conn.run_sync(Base.metadata.create_all)
 
     session_factory = create_session_factory(engine)
+    if "postgresql" in config.database_url:
+        # create_all leaves a new partitioned audit_events without partitions,
+        # which would reject every insert until the retention job starts.
+        from flydesk.audit.retention import AuditRetention
+
+        await AuditRetention(session_factory).ensure_partitions()
     return engine, session_factory
 
 
@@ -223,7 +229,13 @@ async def _init_repositories(
     from flydesk.tools.sandbox import SandboxExecutor
 
     custom_tool_repo = CustomToolRepository(session_factory)
-    sandbox_executor = SandboxExecutor()
+    sandbox_executor = SandboxExecutor(
+        pool_size=config.sandbox_pool_size,
+        max_concurrency=config.sandbox_max_concurrency,
+        max_executions_per_worker=config.sandbox_max_executions_per_worker,
+        memory_limit_mb=config.sandbox_memory_limit_mb,
+    )
+    await sandbox_executor.start()
 
     from flydesk.llm.repository import LLMProviderRepository
 
@@ -297,7 +309,9 @@ def _init_file_system(
     from flydesk.exports.service import ExportService
 
     export_repo = ExportRepository(session_factory)
-    export_service = ExportService(export_repo, file_storage)
+    export_service = ExportService(
+        export_repo, file_storage, spill_dir=config.tool_response_spill_dir or None
+    )
     app.dependency_overrides[get_export_repo] = lambda: export_repo
     app.dependency_overrides[get_export_service] = lambda: export_service
     app.dependency_overrides[get_export_storage] = lambda: file_storage
@@ -474,15 +488,35 @@ async def _init_jobs(
     app.state.dead_letter = dead_letter
 
     job_repo = JobRepository(session_factory)
-    job_runner = JobRunner(job_repo, config=config, dead_letter=dead_letter)
+    notifier = None
+    if config.job_queue_backend == "database":
+        from flydesk.jobs.notify import create_job_notifier
+
+        notifier = create_job_notifier(config, session_factory)
+    job_runner = JobRunner(job_repo, config=config, dead_letter=dead_letter, notifier=notifier)
     job_runner.register_handler("indexing", IndexingJobHandler(indexer))
 
     if doc_source_repo is not None:
         from flydesk.jobs.source_sync import SourceSyncHandler
 
-        sync_handler = SourceSyncHandler(doc_source_repo)
+        sync_handler = SourceSyncHandler(
+            doc_source_repo,
+            indexer=indexer,
+            max_concurrent_downloads=config.source_sync_concurrency,
+        )
         job_runner.register_handler("source_sync", sync_handler)
 
+    from flydesk.jobs.git_import import GitImportJobHandler
+    from flydesk.knowledge.git_provider_repository import GitProviderRepository
+
+    git_import_handler = GitImportJobHandler(
+        GitProviderRepository(session_factory, config.credential_encryption_key),
+        indexer=indexer,
+        max_concurrency=config.git_import_concurrency,
+        archive_threshold=config.git_import_archive_threshold,
+    )
+    job_runner.register_handler("git_import", git_import_handler)
+
     await job_runner.start()
     app.state.job_runner = job_runner
     app.state.job_repo = job_repo
@@ -491,16 +525,27 @@ async def _init_jobs(
 
     from flydesk.knowledge.queue import IndexingTask, create_indexing_queue
 
-    async def _handle_indexing_task(task: IndexingTask) -> None:
-        await job_runner.submit("indexing", task.model_dump())
+    async def _handle_indexing_batch(tasks: list[IndexingTask]) -> None:
+        if len(tasks) == 1:
+            await job_runner.submit("indexing", tasks[0].model_dump())
+        else:
+            await job_runner.submit("indexing", {"tasks": [t.model_dump() for t in tasks]})
 
     indexing_producer, indexing_consumer = create_indexing_queue(
         backend=config.queue_backend,
-        handler=_handle_indexing_task,
         redis_url=config.redis_url,
+        batch_handler=_handle_indexing_batch,
+        batch_size=config.indexing_batch_size,
+        batch_wait_ms=config.indexing_batch_wait_ms,
+        concurrency=config.indexing_consumers,
+        reclaim_idle_ms=config.indexing_reclaim_idle_ms,
+        max_deliveries=config.indexing_max_deliveries,
         dead_letter=dead_letter,
     )
     await indexing_consumer.start()
+    if doc_source_repo is not None:
+        sync_handler.set_indexing_producer(indexing_producer)
+    git_import_handler.set_indexing_producer(indexing_producer)
     app.state.indexing_producer = indexing_producer
     app.state.indexing_consumer = indexing_consumer
     app.dependency_overrides[get_indexing_producer] = lambda: indexing_producer
@@ -550,12 +595,21 @@ async def _init_agent(  # noqa: PLR0913
     from flydesk.prompts.registry import register_desk_prompts
     from flydesk.knowledge.graph import KnowledgeGraph
     from flydesk.knowledge.retriever import KnowledgeRetriever
+    from flydesk.catalog.models import ResponseLimits
     from flydesk.tools.executor import ToolExecutor
     from flydesk.tools.factory import ToolFactory
+    from flydesk.tools.response_cache import ResponseCache
+    from flydesk.tools.token_manager import OAuth2TokenManager, RedisTokenCache
     from flydesk.widgets.parser import WidgetParser
 
-    knowledge_graph = KnowledgeGraph(session_factory, embedding_provider=embedding_provider)
+    knowledge_graph = KnowledgeGraph(
+        session_factory,
+        embedding_provider=embedding_provider,
+        similarity_threshold=config.kg_entity_similarity_threshold,
+    )
     retriever = KnowledgeRetriever(session_factory, embedding_provider, vector_store=vector_store, cache=cache)
+    # Memories are embedded on save; searches reuse the turn's query embedding.
+    memory_repo.set_embedding_provider(embedding_provider)
     context_enricher = ContextEnricher(
         knowledge_graph=knowledge_graph,
         retriever=retriever,
@@ -563,6 +617,7 @@ async def _init_agent(  # noqa: PLR0913
         entity_limit=config.kg_max_entities_in_context,
         retrieval_top_k=config.rag_top_k,
         settings_repo=settings_repo,
+        embedding_provider=embedding_provider,
     )
     prompt_registry = register_desk_prompts()
     prompt_builder = SystemPromptBuilder(prompt_registry)
@@ -576,6 +631,22 @@ async def _init_agent(  # noqa: PLR0913
     knowledge_importer = KnowledgeImporter(indexer=indexer, http_client=http_client)
     app.dependency_overrides[get_knowledge_importer] = lambda: knowledge_importer
 
+    shared_token_cache = None
+    if config.oauth2_shared_token_cache:
+        if config.redis_url:
+            shared_token_cache = RedisTokenCache(config.redis_url, kms)
+        else:
+            logger.warning(
+                "FLYDESK_OAUTH2_SHARED_TOKEN_CACHE is set but FLYDESK_REDIS_URL is not; "
+                "OAuth2 tokens will be cached per process."
+            )
+    token_manager = OAuth2TokenManager(
+        http_client,
+        shared_cache=shared_token_cache,
+        refresh_ahead_seconds=config.oauth2_refresh_ahead_seconds,
+    )
+    app.state.token_manager = token_manager
+
     tool_executor = ToolExecutor(
         http_client=http_client,
         catalog_repo=catalog_repo,
@@ -583,6 +654,15 @@ async def _init_agent(  # noqa: PLR0913
         audit_logger=audit_logger,
         max_parallel=config.max_tools_per_turn,
         kms=kms,
+        response_cache=ResponseCache(max_entries=config.tool_response_cache_max_entries),
+        response_limits=(
+            ResponseLimits(max_bytes=config.tool_response_max_bytes)
+            if config.tool_response_max_bytes > 0
+            else None
+        ),
+        spill_dir=config.tool_response_spill_dir or None,
+        spill_retention_seconds=config.tool_response_spill_retention_hours * 3600,
+        token_manager=token_manager,
     )
     app.state.tool_executor = tool_executor
 
@@ -679,15 +759,20 @@ async def _init_agent(  # noqa: PLR0913
     model_router = ModelRouter(classifier=classifier, config_repo=routing_config_repo)
 
     # Discovery engines (process + system)
+    from flydesk.catalog.discovery_state import DiscoveryFingerprintStore
     from flydesk.jobs.handlers import ProcessDiscoveryHandler
     from flydesk.processes.discovery import ProcessDiscoveryEngine
 
+    discovery_fingerprints = DiscoveryFingerprintStore(session_factory)
     discovery_engine = ProcessDiscoveryEngine(
         agent_factory=agent_factory,
         process_repo=process_repo,
         catalog_repo=catalog_repo,
         knowledge_graph=knowledge_graph,
         audit_logger=audit_logger,
+        fingerprint_store=discovery_fingerprints,
+        chunk_chars=config.discovery_chunk_chars,
+        max_concurrency=config.discovery_concurrency,
     )
     job_runner.register_handler("process_discovery", ProcessDiscoveryHandler(discovery_engine))
     app.state.discovery_engine = discovery_engine
@@ -702,17 +787,30 @@ async def _init_agent(  # noqa: PLR0913
         catalog_repo=catalog_repo,
         knowledge_graph=knowledge_graph,
         audit_logger=audit_logger,
+        fingerprint_store=discovery_fingerprints,
+        chunk_chars=config.discovery_chunk_chars,
+        max_concurrency=config.discovery_concurrency,
     )
     job_runner.register_handler("system_discovery", SystemDiscoveryHandler(system_discovery_engine))
     app.state.system_discovery_engine = system_discovery_engine
 
     # KG extraction
-    from flydesk.jobs.handlers import KGExtractSingleHandler, KGRecomputeHandler
+    from flydesk.jobs.handlers import KGCompactHandler, KGExtractSingleHandler, KGRecomputeHandler
     from flydesk.knowledge.kg_extractor import KGExtractor
 
     kg_extractor = KGExtractor(agent_factory, settings_repo=settings_repo)
-    job_runner.register_handler("kg_recompute", KGRecomputeHandler(catalog_repo, knowledge_graph, kg_extractor))
+    job_runner.register_handler(
+        "kg_recompute",
+        KGRecomputeHandler(
+            catalog_repo,
+            knowledge_graph,
+            kg_extractor,
+            max_concurrency=config.kg_recompute_concurrency,
+            embed_batch_size=config.kg_embedding_batch_size,
+        ),
+    )
     job_runner.register_handler("kg_extract_single", KGExtractSingleHandler(catalog_repo, knowledge_graph, kg_extractor))
+    job_runner.register_handler("kg_compact", KGCompactHandler(knowledge_graph))
     app.state.kg_extractor = kg_extractor
 
     # Wire KG extractor into the indexer for auto-extraction after indexing
@@ -742,6 +840,19 @@ async def _init_agent(  # noqa: PLR0913
     customization_service = AgentCustomizationService(settings_repo)
     app.state.customization_service = customization_service
 
+    # Per-worker spend accumulator flushed into the sharded spend ledger
+    from flydesk.llm.spend import SpendLedger
+
+    spend_ledger = SpendLedger(
+        session_factory, flush_interval_seconds=config.spend_flush_interval_seconds
+    )
+    try:
+        await spend_ledger.import_legacy_settings()
+    except Exception:
+        logger.warning("Failed to import daily spend settings (non-fatal).", exc_info=True)
+    await spend_ledger.start()
+    app.state.spend_ledger = spend_ledger
+
     desk_agent = DeskAgent(
         context_enricher=context_enricher,
         prompt_builder=prompt_builder,
@@ -764,6 +875,7 @@ async def _init_agent(  # noqa: PLR0913
         custom_tool_repo=custom_tool_repo,
         sandbox_executor=sandbox_executor,
         model_router=model_router,
+        spend_ledger=spend_ledger,
     )
     app.state.desk_agent = desk_agent
     app.state.context_enricher = context_enricher
@@ -776,6 +888,8 @@ async def _init_agent(  # noqa: PLR0913
     return {
         "auto_trigger": auto_trigger,
         "memory_store": memory_store,
+        "token_manager": token_manager,
+        "spend_ledger": spend_ledger,
     }
 
 
@@ -875,7 +989,7 @@ async def _seed_platform_docs(
             if docs:
                 existing_docs: dict[str, str] = {}
                 try:
-                    all_docs = await catalog_repo.list_knowledge_documents()
+                    all_docs, _ = await catalog_repo.list_knowledge_document_summaries()
                     for edoc in all_docs:
                         meta = edoc.get("metadata") if isinstance(edoc, dict) else getattr(edoc, "metadata", None)
                         if meta and isinstance(meta, dict) and "content_hash" in meta:
@@ -945,6 +1059,7 @@ async def _seed_platform_docs(
 async def _init_workflows(
     app: FastAPI,
     session_factory: async_sessionmaker,
+    config: DeskConfig,
 ) -> dict[str, Any]:
     """Wire workflow engine, repository, and scheduler."""
     from flydesk.workflows.repository import WorkflowRepository
@@ -953,7 +1068,15 @@ async def _init_workflows(
 
     wf_repo = WorkflowRepository(session_factory)
     wf_engine = WorkflowEngine(wf_repo)
-    wf_scheduler = WorkflowScheduler(wf_repo, wf_engine)
+    wf_scheduler = WorkflowScheduler(
+        wf_repo,
+        wf_engine,
+        interval_seconds=config.workflow_scheduler_max_interval_seconds,
+        page_size=config.workflow_scheduler_page_size,
+        max_concurrency=config.workflow_scheduler_concurrency,
+        lease_seconds=config.workflow_scheduler_lease_seconds,
+    )
+    wf_engine.set_schedule_listener(wf_scheduler.wake)
     await wf_scheduler.start()
 
     app.dependency_overrides[get_workflow_repo] = lambda: wf_repo
@@ -1074,6 +1197,7 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
 
     # 2. Core repositories
     repos = await _init_repositories(app, config, session_factory)
+    ctx.closables.append(repos["sandbox_executor"])
 
     # 3. File system and exports
     files = _init_file_system(app, config, session_factory)
@@ -1131,16 +1255,50 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         cache=knowledge["cache"],
     )
     ctx.closables.append(agent_ctx["auto_trigger"])
+    ctx.closables.append(agent_ctx["token_manager"])
+    ctx.closables.append(agent_ctx["spend_ledger"])
     if hasattr(agent_ctx["memory_store"], "close"):
         ctx.closables.append(agent_ctx["memory_store"])
 
+    # Chat suggestions, rebuilt when documents or the catalog change.
+    from flydesk.agent.suggestions import SuggestionService
+
+    suggestion_service = SuggestionService(
+        session_factory, ttl_seconds=config.suggestions_cache_ttl_seconds
+    )
+    agent_ctx["auto_trigger"].add_change_listener(suggestion_service.invalidate)
+    suggestion_service.warm()
+    app.state.suggestion_service = suggestion_service
+    ctx.closables.append(suggestion_service)
+
     # Wire indexing producer into the builtin executor for add_knowledge tool.
     app.state.builtin_executor.set_indexing_producer(jobs["indexing_producer"])
 
     # 9. Workflows
-    workflows = await _init_workflows(app, session_factory)
+    workflows = await _init_workflows(app, session_factory, config)
     ctx.closables.append(workflows["workflow_scheduler"])
 
+    # 9a. Usage rollups for dashboard analytics
+    from flydesk.audit.rollup import UsageRollups
+
+    usage_rollups = UsageRollups(
+        session_factory, interval_seconds=config.usage_rollup_interval_seconds
+    )
+    await usage_rollups.start()
+    app.state.usage_rollups = usage_rollups
+    ctx.closables.append(usage_rollups)
+
+    # Audit partition upkeep and retention
+    from flydesk.audit.retention import AuditRetention
+
+    audit_retention = AuditRetention(
+        session_factory,
+        retention_days=config.audit_retention_days if config.audit_retention_enabled else 0,
+        interval_seconds=config.audit_retention_interval_seconds,
+    )
+    await audit_retention.start()
+    ctx.closables.append(audit_retention)
+
     # 9b. Process execution engine (bridges processes to workflows)
     from flydesk.processes.executor import ProcessExecutor
 
@@ -1318,6 +1476,7 @@ def create_app() -> FastAPI:
             oidc_client=oidc_client,
             provider_profile=provider_profile,
             local_jwt_secret=config.effective_jwt_secret,
+            session_cache_ttl=config.auth_session_cache_ttl_seconds,
         )
 
     # Routers
@@ -17,13 +17,13 @@ from __future__ import annotations
 import base64
 import json
 import logging
-import time
 from dataclasses import dataclass, field as dc_field
 from typing import TYPE_CHECKING, Any
 
 import httpx
 
 from flydesk.catalog.enums import AuthType
+from flydesk.tools.token_manager import ClientCredentialsGrant, OAuth2TokenManager
 
 if TYPE_CHECKING:
     from flydesk.catalog.ports import CredentialStore
@@ -45,31 +45,6 @@ class ResolvedAuth:
     body_params: dict[str, Any] = dc_field(default_factory=dict)
 
 
-class _TokenCache:
-    """In-memory cache for OAuth2 access tokens.
-
-    Stores tokens keyed by (system_id, credential_id) with expiry tracking.
-    Tokens are refreshed when within 60 seconds of expiration.
-    """
-
-    def __init__(self) -> None:
-        self._cache: dict[str, tuple[str, float]] = {}  # key -> (token, expires_at)
-        self._buffer_seconds = 60
-
-    def get(self, key: str) -> str | None:
-        entry = self._cache.get(key)
-        if entry is None:
-            return None
-        token, expires_at = entry
-        if time.monotonic() >= expires_at - self._buffer_seconds:
-            del self._cache[key]
-            return None
-        return token
-
-    def put(self, key: str, token: str, expires_in: int) -> None:
-        self._cache[key] = (token, time.monotonic() + expires_in)
-
-
 class AuthResolver:
     """Resolves authentication headers for a given :class:`ExternalSystem`.
 
@@ -79,9 +54,9 @@ class AuthResolver:
     - **API_KEY** -- Custom header from ``auth_config.auth_headers`` with the
       credential value.
     - **BASIC** -- ``Authorization: Basic <base64-encoded-credentials>``
-    - **OAUTH2** -- Client credentials grant flow with token caching and
-      automatic refresh.  Uses ``auth_config.token_url`` and
-      ``auth_config.scopes``.
+    - **OAUTH2** -- Client credentials grant flow.  Tokens are cached and
+      refreshed ahead of expiry by an :class:`OAuth2TokenManager`.  Uses
+      ``auth_config.token_url`` and ``auth_config.scopes``.
     - **MUTUAL_TLS** -- Returns custom auth headers from ``auth_config.auth_headers``
       (certificate handling is at the HTTP client level).
     """
@@ -91,11 +66,12 @@ class AuthResolver:
         credential_store: CredentialStore,
         http_client: httpx.AsyncClient | None = None,
         kms: KMSProvider | None = None,
+        token_manager: OAuth2TokenManager | None = None,
     ) -> None:
         self._credential_store = credential_store
         self._http_client = http_client
         self._kms = kms
-        self._token_cache = _TokenCache()
+        self._token_manager = token_manager or OAuth2TokenManager(http_client)
 
     def _decrypt(self, ciphertext: str) -> str:
         """Decrypt a credential value using the configured KMS.
@@ -280,13 +256,6 @@ class AuthResolver:
         access token (backward-compatible fallback).
         """
         auth_config = system.auth_config
-        cache_key = f"{system.id}:{auth_config.credential_id}"
-
-        # Check cache first
-        cached = self._token_cache.get(cache_key)
-        if cached:
-            return {"Authorization": f"Bearer {cached}"}
-
         token_value = self._decrypt(credential.encrypted_value)  # type: ignore[attr-defined]
 
         # Try to parse as client credentials JSON
@@ -302,12 +271,15 @@ class AuthResolver:
 
         # If we have client_id + client_secret + token_url, do real exchange
         if client_id and client_secret and auth_config.token_url:
-            access_token = await self._exchange_token(
-                token_url=auth_config.token_url,
-                client_id=client_id,
-                client_secret=client_secret,
-                scopes=auth_config.scopes,
-                cache_key=cache_key,
+            access_token = await self._token_manager.get_token(
+                ClientCredentialsGrant(
+                    system_id=system.id,
+                    credential_id=auth_config.credential_id,
+                    token_url=auth_config.token_url,
+                    client_id=client_id,
+                    client_secret=client_secret,
+                    scopes=tuple(auth_config.scopes or ()),
+                )
             )
             if access_token:
                 return {"Authorization": f"Bearer {access_token}"}
@@ -321,61 +293,3 @@ class AuthResolver:
 
         # Fallback: use the stored value as a pre-obtained access token
         return {"Authorization": f"Bearer {token_value}"}
-
-    async def _exchange_token(
-        self,
-        token_url: str,
-        client_id: str,
-        client_secret: str,
-        scopes: list[str] | None,
-        cache_key: str,
-    ) -> str | None:
-        """Execute the OAuth2 client credentials grant."""
-        if not self._http_client:
-            logger.warning("No HTTP client configured for OAuth2 token exchange")
-            return None
-
-        payload: dict[str, str] = {
-            "grant_type": "client_credentials",
-            "client_id": client_id,
-            "client_secret": client_secret,
-        }
-        if scopes:
-            payload["scope"] = " ".join(scopes)
-
-        try:
-            response = await self._http_client.post(
-                token_url,
-                data=payload,
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-                timeout=10.0,
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            access_token = data.get("access_token")
-            if not access_token:
-                logger.error("OAuth2 response missing access_token: %s", data)
-                return None
-
-            # Cache with expiry (default 1 hour if not specified)
-            expires_in = int(data.get("expires_in", 3600))
-            self._token_cache.put(cache_key, access_token, expires_in)
-
-            logger.debug(
-                "OAuth2 token obtained for %s (expires in %ds)",
-                cache_key,
-                expires_in,
-            )
-            return access_token
-
-        except httpx.HTTPStatusError as exc:
-            logger.error(
-                "OAuth2 token exchange HTTP %s: %s",
-                exc.response.status_code,
-                exc.response.text[:200],
-            )
-            return None
-        except Exception:
-            logger.error("OAuth2 token exchange failed", exc_info=True)
-            return None
@@ -11,6 +11,7 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 import random
 import re
@@ -24,15 +25,26 @@ from typing import TYPE_CHECKING, Any
 import httpx
 
 from flydesk.audit.models import AuditEvent, AuditEventType
+from flydesk.catalog.enums import RiskLevel
 from flydesk.tools.auth_resolver import AuthResolver, ResolvedAuth
+from flydesk.tools.response_cache import ResponseCache
+from flydesk.tools.response_stream import read_limited_response
+from flydesk.tools.xml_utils import xml_to_dict as _xml_to_dict
 
 if TYPE_CHECKING:
     from flydesk.catalog.ports import CredentialStore
     from flydesk.auth.models import UserSession
     from flydesk.auth.sso_mapping import SSOAttributeMapping
     from flydesk.audit.logger import AuditLogger
-    from flydesk.catalog.models import RateLimit, RetryPolicy
+    from flydesk.catalog.models import (
+        CachePolicy,
+        RateLimit,
+        ResponseLimits,
+        RetryPolicy,
+        ServiceEndpoint,
+    )
     from flydesk.catalog.repository import CatalogRepository
+    from flydesk.tools.token_manager import OAuth2TokenManager
 
 logger = logging.getLogger(__name__)
 
@@ -114,53 +126,34 @@ class _RateLimiter:
 
 def _parse_response(response: httpx.Response) -> Any:
     """Parse response body based on Content-Type header."""
-    content_type = response.headers.get("content-type", "")
+    return _parse_body(response.headers.get("content-type", ""), response.text)
 
+
+def _parse_body(content_type: str, text: str) -> Any:
+    """Parse a decoded response body based on its Content-Type."""
     # JSON
     if "json" in content_type or "javascript" in content_type:
         try:
-            return response.json()
+            return json.loads(text)
         except Exception:
-            return response.text
+            return text
 
     # XML / SOAP
     if "xml" in content_type:
         try:
-            return _xml_to_dict(ET.fromstring(response.text))
+            return _xml_to_dict(ET.fromstring(text))
         except Exception:
-            return response.text
+            return text
 
     # CSV
     if "csv" in content_type:
-        return _parse_csv(response.text)
+        return _parse_csv(text)
 
     # Default: try JSON first, fall back to text
     try:
-        return response.json()
+        return json.loads(text)
     except Exception:
-        return response.text
-
-
-def _xml_to_dict(element: ET.Element) -> dict[str, Any]:
-    """Recursively convert an XML element to a dict."""
-    tag = element.tag.split("}")[-1] if "}" in element.tag else element.tag
-    result: dict[str, Any] = {}
-    if element.attrib:
-        result["@attributes"] = dict(element.attrib)
-    children: dict[str, list[Any]] = defaultdict(list)
-    for child in element:
-        child_tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
-        children[child_tag].append(_xml_to_dict(child))
-    for k, v in children.items():
-        result[k] = v[0] if len(v) == 1 else v
-    if element.text and element.text.strip():
-        if result:
-            result["#text"] = element.text.strip()
-        else:
-            return {tag: element.text.strip()}
-    if not result:
-        return {tag: None}
-    return {tag: result}
+        return text
 
 
 def _parse_csv(text: str) -> list[dict[str, str]]:
@@ -190,8 +183,14 @@ async def _execute_with_retry(
     retry_policy: RetryPolicy | None,
     rate_limiter: _RateLimiter,
     endpoint_id: str,
+    *,
+    stream: bool = False,
 ) -> httpx.Response:
-    """Execute HTTP request with retry/backoff and rate limiting."""
+    """Execute HTTP request with retry/backoff and rate limiting.
+
+    With ``stream=True`` the returned response body has not been read yet;
+    the caller must consume and close it.
+    """
     max_retries = retry_policy.max_retries if retry_policy else 0
     backoff_factor = retry_policy.backoff_factor if retry_policy else 1.0
 
@@ -200,10 +199,16 @@ async def _execute_with_retry(
         await rate_limiter.acquire(endpoint_id)
 
         try:
-            response = await http_client.request(**request_kwargs)
+            if stream:
+                request = http_client.build_request(**request_kwargs)
+                response = await http_client.send(request, stream=True)
+            else:
+                response = await http_client.request(**request_kwargs)
 
             if response.status_code not in _RETRYABLE_STATUS_CODES or attempt == max_retries:
                 return response
+            if stream:
+                await response.aclose()
 
             # Retryable status code — apply backoff
             if response.status_code == 429:
@@ -263,6 +268,16 @@ class ToolExecutor:
     Supports retry with exponential backoff+jitter via endpoint RetryPolicy,
     per-endpoint rate limiting via RateLimit, and multi-format response parsing
     (JSON, XML, CSV).
+
+    READ-risk endpoints with an enabled ``cache_policy`` are served through a
+    shared :class:`ResponseCache`: identical concurrent calls are coalesced
+    into one upstream request, stale entries are revalidated with
+    ``ETag``/``Last-Modified``, and any write to a system invalidates its
+    cached reads.
+
+    When :class:`ResponseLimits` apply (per endpoint, or the executor-wide
+    default) the body is streamed: responses over ``max_bytes`` are replaced
+    by a bounded preview with summary statistics instead of being parsed whole.
     """
 
     def __init__(
@@ -274,6 +289,11 @@ class ToolExecutor:
         max_parallel: int = 5,
         kms: Any | None = None,
         sso_mappings: list[SSOAttributeMapping] | None = None,
+        response_cache: ResponseCache | None = None,
+        response_limits: ResponseLimits | None = None,
+        spill_dir: str | None = None,
+        spill_retention_seconds: float = 24 * 3600,
+        token_manager: OAuth2TokenManager | None = None,
     ) -> None:
         self._http_client = http_client
         self._catalog_repo = catalog_repo
@@ -281,10 +301,14 @@ class ToolExecutor:
         self._audit_logger = audit_logger
         self._semaphore = asyncio.Semaphore(max_parallel)
         self._auth_resolver = AuthResolver(
-            credential_store, http_client=http_client, kms=kms
+            credential_store, http_client=http_client, kms=kms, token_manager=token_manager
         )
         self._rate_limiter = _RateLimiter()
         self._sso_mappings: list[SSOAttributeMapping] = sso_mappings or []
+        self._response_cache = response_cache or ResponseCache()
+        self._response_limits = response_limits
+        self._spill_dir = spill_dir
+        self._spill_retention_seconds = spill_retention_seconds
 
     # ------------------------------------------------------------------
     # Public API
@@ -506,20 +530,20 @@ class ToolExecutor:
         request_kwargs = self._build_request(endpoint, system, call, resolved_auth)
 
         # Execute the HTTP request with retry and rate limiting.
+        cache_status: str | None = None
         try:
-            response = await _execute_with_retry(
-                self._http_client,
-                request_kwargs,
-                endpoint.retry_policy,
-                self._rate_limiter,
-                endpoint.id,
-            )
+            cache_policy = self._cache_policy_for(endpoint)
+            if cache_policy is not None:
+                status_code, data, cache_status = await self._execute_cached(
+                    endpoint, cache_policy, system.id, request_kwargs
+                )
+            else:
+                response, data, _ = await self._send(endpoint, request_kwargs)
+                status_code = response.status_code
             elapsed_ms = round((time.monotonic() - start) * 1000, 1)
 
-            data = _parse_response(response)
-
-            success = 200 <= response.status_code < 400
-            error = None if success else f"HTTP {response.status_code}"
+            success = 200 <= status_code < 400
+            error = None if success else f"HTTP {status_code}"
 
             result = ToolResult(
                 call_id=call.call_id,
@@ -528,7 +552,7 @@ class ToolExecutor:
                 data=data,
                 error=error,
                 duration_ms=elapsed_ms,
-                status_code=response.status_code,
+                status_code=status_code,
             )
         except httpx.TimeoutException:
             elapsed_ms = round((time.monotonic() - start) * 1000, 1)
@@ -553,7 +577,22 @@ class ToolExecutor:
                 status_code=None,
             )
 
+        # Any non-read call may have changed upstream state (even if it
+        # failed part-way), so drop cached reads for the whole system.
+        if endpoint.risk_level != RiskLevel.READ:
+            self._response_cache.invalidate_system(system.id)
+
         # Audit: log the tool result.
+        result_detail: dict[str, Any] = {
+            "call_id": call.call_id,
+            "tool_name": call.tool_name,
+            "success": result.success,
+            "status_code": result.status_code,
+            "duration_ms": result.duration_ms,
+            "error": result.error,
+        }
+        if cache_status is not None:
+            result_detail["cache"] = cache_status
         await self._audit_logger.log(
             AuditEvent(
                 event_type=AuditEventType.TOOL_RESULT,
@@ -562,20 +601,120 @@ class ToolExecutor:
                 system_id=system.id,
                 endpoint_id=endpoint.id,
                 action=f"{endpoint.method} {endpoint.path}",
-                detail={
-                    "call_id": call.call_id,
-                    "tool_name": call.tool_name,
-                    "success": result.success,
-                    "status_code": result.status_code,
-                    "duration_ms": result.duration_ms,
-                    "error": result.error,
-                },
+                detail=result_detail,
                 risk_level=endpoint.risk_level.value,
             )
         )
 
         return result
 
+    async def _send(
+        self,
+        endpoint: ServiceEndpoint,
+        request_kwargs: dict[str, Any],
+    ) -> tuple[httpx.Response, Any, bool]:
+        """Execute the request and parse its body.
+
+        Returns ``(response, data, truncated)``.  When response limits apply
+        the body is streamed and ``truncated`` is ``True`` if it exceeded
+        ``max_bytes`` and *data* is a summary rather than the full payload.
+        """
+        limits = endpoint.response_limits or self._response_limits
+        if limits is None:
+            response = await _execute_with_retry(
+                self._http_client,
+                request_kwargs,
+                endpoint.retry_policy,
+                self._rate_limiter,
+                endpoint.id,
+            )
+            return response, _parse_response(response), False
+
+        response = await _execute_with_retry(
+            self._http_client,
+            request_kwargs,
+            endpoint.retry_policy,
+            self._rate_limiter,
+            endpoint.id,
+            stream=True,
+        )
+        try:
+            body = await read_limited_response(
+                response,
+                limits,
+                spill_dir=self._spill_dir,
+                spill_retention_seconds=self._spill_retention_seconds,
+            )
+        finally:
+            await response.aclose()
+
+        if body.summary is not None:
+            return response, body.summary, True
+        text = (body.content or b"").decode(response.charset_encoding or "utf-8", errors="replace")
+        return response, _parse_body(response.headers.get("content-type", ""), text), False
+
+    # ------------------------------------------------------------------
+    # Response caching
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _cache_policy_for(endpoint: ServiceEndpoint) -> CachePolicy | None:
+        """Return the active cache policy, or ``None`` if *endpoint* is not cached.
+
+        Only READ-risk endpoints that opted in via ``cache_policy`` are cached.
+        """
+        policy = endpoint.cache_policy
+        if policy is None or not policy.enabled or endpoint.risk_level != RiskLevel.READ:
+            return None
+        return policy
+
+    async def _execute_cached(
+        self,
+        endpoint: ServiceEndpoint,
+        policy: CachePolicy,
+        system_id: str,
+        request_kwargs: dict[str, Any],
+    ) -> tuple[int, Any, str]:
+        """Serve a READ call from the response cache, fetching at most once.
+
+        Returns ``(status_code, data, cache_status)`` where ``cache_status``
+        is one of ``hit``, ``revalidated`` or ``miss``.
+        """
+        cache = self._response_cache
+        key = cache.make_key(request_kwargs)
+
+        entry = cache.get(key)
+        if entry is not None and entry.is_fresh:
+            return entry.status_code, entry.data, "hit"
+
+        async def _fetch() -> tuple[int, Any, str]:
+            generation = cache.generation(system_id)
+            stale = cache.get(key)
+            kwargs = request_kwargs
+            if stale is not None and stale.can_revalidate:
+                kwargs = {
+                    **request_kwargs,
+                    "headers": {**request_kwargs.get("headers", {}), **stale.conditional_headers()},
+                }
+
+            response, data, truncated = await self._send(endpoint, kwargs)
+            if response.status_code == 304 and stale is not None:
+                cache.refresh(key, response, policy)
+                return stale.status_code, stale.data, "revalidated"
+
+            if not truncated:
+                cache.store(
+                    key,
+                    system_id=system_id,
+                    response=response,
+                    data=data,
+                    policy=policy,
+                    generation=generation,
+                )
+            return response.status_code, data, "miss"
+
+        return await cache.single_flight(key, _fetch)
+
     # ------------------------------------------------------------------
     # Protocol-specific request builders
     # ------------------------------------------------------------------
@@ -0,0 +1,255 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""In-memory response cache with request coalescing for READ-risk endpoints."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    import httpx
+
+    from flydesk.catalog.models import CachePolicy
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class CachedResponse:
+    """A parsed upstream response plus the validators needed to revalidate it."""
+
+    system_id: str
+    status_code: int
+    data: Any
+    expires_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def is_fresh(self) -> bool:
+        return self.expires_at > time.monotonic()
+
+    @property
+    def can_revalidate(self) -> bool:
+        return self.etag is not None or self.last_modified is not None
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Return ``If-None-Match`` / ``If-Modified-Since`` headers for revalidation."""
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def parse_cache_control(value: str) -> dict[str, str | None]:
+    """Parse a ``Cache-Control`` header into a directive -> argument mapping."""
+    directives: dict[str, str | None] = {}
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, arg = part.partition("=")
+        directives[name.strip().lower()] = arg.strip().strip('"') or None
+    return directives
+
+
+def _effective_ttl(response: httpx.Response, policy: CachePolicy) -> float | None:
+    """Return the TTL to apply to *response*, or ``None`` if it must not be stored.
+
+    The policy TTL is the ceiling; upstream ``max-age``/``s-maxage`` may only
+    shorten it and ``no-cache`` forces revalidation on every use.
+    """
+    ttl = float(policy.ttl_seconds)
+    if not policy.respect_cache_control:
+        return ttl
+
+    directives = parse_cache_control(response.headers.get("cache-control", ""))
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+    for name in ("s-maxage", "max-age"):
+        raw = directives.get(name)
+        if raw is None:
+            continue
+        try:
+            return max(0.0, min(ttl, float(raw)))
+        except ValueError:
+            break
+    return ttl
+
+
+class ResponseCache:
+    """Bounded LRU of parsed tool responses with single-flight fetches.
+
+    Keys are derived from the fully built request (method, resolved URL,
+    params, body and outbound headers), so responses obtained with one
+    principal's credentials are never served to another.  Entries are grouped
+    by system so that a write to a system can drop every cached read for it.
+
+    Parameters
+    ----------
+    max_entries:
+        Upper bound on cached responses.  Stale entries that can still be
+        revalidated are kept until evicted by LRU order.
+    """
+
+    def __init__(self, *, max_entries: int = 1000) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future[Any]] = {}
+        # Bumped on every write to a system so that reads which started
+        # before the write cannot repopulate the cache with stale data.
+        self._generations: dict[str, int] = defaultdict(int)
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def make_key(request_kwargs: dict[str, Any]) -> str:
+        """Derive a stable cache key from httpx request kwargs."""
+        content = request_kwargs.get("content")
+        if isinstance(content, bytes):
+            content = content.decode("utf-8", errors="replace")
+        material = {
+            "method": str(request_kwargs.get("method", "GET")).upper(),
+            "url": request_kwargs.get("url"),
+            "params": request_kwargs.get("params"),
+            "json": request_kwargs.get("json"),
+            "content": content,
+            "headers": {
+                str(k).lower(): str(v)
+                for k, v in (request_kwargs.get("headers") or {}).items()
+            },
+        }
+        encoded = json.dumps(material, sort_keys=True, default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Lookup / store
+    # ------------------------------------------------------------------
+
+    def get(self, key: str) -> CachedResponse | None:
+        """Return the entry for *key*, fresh or stale, or ``None``."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if not entry.is_fresh and not entry.can_revalidate:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def generation(self, system_id: str) -> int:
+        """Return the current write generation for *system_id*."""
+        return self._generations[system_id]
+
+    def store(
+        self,
+        key: str,
+        *,
+        system_id: str,
+        response: httpx.Response,
+        data: Any,
+        policy: CachePolicy,
+        generation: int,
+    ) -> bool:
+        """Cache a successful response.  Returns ``True`` if it was stored."""
+        if not 200 <= response.status_code < 300:
+            return False
+        if generation != self._generations[system_id]:
+            # A write to this system executed while the read was in flight.
+            return False
+        ttl = _effective_ttl(response, policy)
+        if ttl is None:
+            return False
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        if ttl <= 0 and etag is None and last_modified is None:
+            return False
+
+        self._entries[key] = CachedResponse(
+            system_id=system_id,
+            status_code=response.status_code,
+            data=data,
+            expires_at=time.monotonic() + ttl,
+            etag=etag,
+            last_modified=last_modified,
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return True
+
+    def refresh(self, key: str, response: httpx.Response, policy: CachePolicy) -> None:
+        """Extend an entry's lifetime after a ``304 Not Modified`` revalidation."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        ttl = _effective_ttl(response, policy)
+        entry.expires_at = time.monotonic() + (ttl or 0.0)
+        entry.etag = response.headers.get("etag") or entry.etag
+        entry.last_modified = response.headers.get("last-modified") or entry.last_modified
+        self._entries.move_to_end(key)
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    def invalidate_system(self, system_id: str) -> int:
+        """Drop every cached response for *system_id*.  Returns the number removed."""
+        self._generations[system_id] += 1
+        stale = [k for k, e in self._entries.items() if e.system_id == system_id]
+        for key in stale:
+            del self._entries[key]
+        if stale:
+            logger.debug("Invalidated %d cached responses for system %s", len(stale), system_id)
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        self._entries.clear()
+
+    # ------------------------------------------------------------------
+    # Request coalescing
+    # ------------------------------------------------------------------
+
+    async def single_flight(self, key: str, fetch: Callable[[], Awaitable[T]]) -> T:
+        """Run *fetch* once for all concurrent callers sharing *key*.
+
+        The shared fetch is shielded so that one caller being cancelled does
+        not cancel the request for the others.
+        """
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fetch())
+            self._inflight[key] = future
+
+            def _release(done: asyncio.Future[Any]) -> None:
+                if self._inflight.get(key) is done:
+                    del self._inflight[key]
+
+            future.add_done_callback(_release)
+        return await asyncio.shield(future)
+
+    def __len__(self) -> int:
+        return len(self._entries)
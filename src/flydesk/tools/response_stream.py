@@ -0,0 +1,707 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""Streamed, size-capped consumption of upstream tool responses.
+
+Bodies that fit within an endpoint's :class:`ResponseLimits` are returned as
+raw bytes for the regular parser.  Larger bodies are never held in memory:
+they are fed chunk by chunk into an incremental summariser (JSON, CSV, XML or
+plain text) that keeps only a bounded preview plus counts and schema, and are
+optionally spilled to a private local file.  The preview of every format is
+bounded by ``preview_items`` and ``preview_chars``.  Exports read spilled
+bodies back through :func:`open_spill`.
+"""
+
+from __future__ import annotations
+
+import codecs
+import csv
+import json
+import logging
+import os
+import re
+import stat
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, BinaryIO, Protocol
+
+if TYPE_CHECKING:
+    import httpx
+
+    from flydesk.catalog.models import ResponseLimits
+
+from flydesk.tools.xml_utils import local_name, xml_to_dict
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_SPILL_DIR = os.path.join(tempfile.gettempdir(), "flydesk-tool-responses")
+_DEFAULT_SPILL_RETENTION_SECONDS = 24 * 3600
+_SPILL_PREFIX = "flydesk-"
+_SPILL_ID = re.compile(r"^flydesk-[A-Za-z0-9_]+\.(json|xml|csv|txt)$")
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_JSON_VALUE_START = frozenset('"-0123456789tfn[{')
+_UNSET: Any = object()
+
+
+@dataclass
+class StreamedBody:
+    """Result of :func:`read_limited_response`.
+
+    Exactly one of ``content`` (the complete body, within limits) or
+    ``summary`` (a bounded preview of an oversized body) is set.
+    """
+
+    content: bytes | None = None
+    summary: dict[str, Any] | None = None
+
+    @property
+    def truncated(self) -> bool:
+        return self.summary is not None
+
+
+class _Summariser(Protocol):
+    def feed(self, chunk: bytes) -> None: ...
+
+    def finish(self) -> dict[str, Any]: ...
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+async def read_limited_response(
+    response: httpx.Response,
+    limits: ResponseLimits,
+    *,
+    spill_dir: str | None = None,
+    spill_retention_seconds: float = _DEFAULT_SPILL_RETENTION_SECONDS,
+) -> StreamedBody:
+    """Consume a streaming *response* without exceeding ``limits.max_bytes`` in memory.
+
+    Spilled bodies are identified in the summary by ``spill_id`` (the file
+    name only; the local path is never returned).  Spill files older than
+    *spill_retention_seconds* are removed whenever a new one is written.
+
+    The caller owns *response* and is responsible for closing it.
+    """
+    content_type = response.headers.get("content-type", "")
+    encoding = response.charset_encoding or "utf-8"
+
+    buffer = bytearray()
+    summariser: _Summariser | None = None
+    spill: BinaryIO | None = None
+    spill_path: str | None = None
+    total_bytes = 0
+
+    try:
+        async for chunk in response.aiter_bytes():
+            total_bytes += len(chunk)
+            if summariser is None:
+                buffer.extend(chunk)
+                if len(buffer) <= limits.max_bytes:
+                    continue
+                # Over the ceiling: switch to incremental mode and replay
+                # what has been buffered so far, then release it.
+                summariser = _make_summariser(content_type, bytes(buffer[:64]), encoding, limits)
+                if limits.spill_to_disk:
+                    try:
+                        spill, spill_path = _open_spill_file(
+                            spill_dir or _DEFAULT_SPILL_DIR, content_type, spill_retention_seconds
+                        )
+                    except OSError:
+                        logger.warning("Could not open spill file; continuing without it", exc_info=True)
+                chunk = bytes(buffer)
+                buffer = bytearray()
+            summariser.feed(chunk)
+            if spill is not None:
+                spill.write(chunk)
+    finally:
+        if spill is not None:
+            spill.close()
+
+    if summariser is None:
+        return StreamedBody(content=bytes(buffer))
+
+    logger.info(
+        "Upstream response exceeded %d bytes (%d total, %s); returning summary",
+        limits.max_bytes,
+        total_bytes,
+        content_type or "unknown content type",
+    )
+    summary: dict[str, Any] = {
+        "truncated": True,
+        "total_bytes": total_bytes,
+        "max_bytes": limits.max_bytes,
+        "content_type": content_type,
+        **summariser.finish(),
+    }
+    if spill_path is not None:
+        logger.info("Spilled %d byte response to %s", total_bytes, spill_path)
+        summary["spill_id"] = os.path.basename(spill_path)
+    return StreamedBody(summary=summary)
+
+
+def open_spill(spill_id: str, spill_dir: str | None = None) -> tuple[BinaryIO, str]:
+    """Open the spilled body named by a summary's ``spill_id`` for reading.
+
+    Returns ``(file, format)`` where *format* is ``json``, ``xml``, ``csv``
+    or ``txt``.  Raises ``ValueError`` for an id that is not a spill file
+    name and ``FileNotFoundError`` once retention has removed the file.
+    """
+    match = _SPILL_ID.match(spill_id)
+    if match is None:
+        raise ValueError(f"Invalid spill id: {spill_id!r}")
+    path = os.path.join(spill_dir or _DEFAULT_SPILL_DIR, spill_id)
+    # O_NOFOLLOW: a spill file is never a symlink.
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+    return os.fdopen(fd, "rb"), match.group(1)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _detect_format(content_type: str, head: bytes) -> str:
+    """Mirror the content-type dispatch of the regular response parser."""
+    if "json" in content_type or "javascript" in content_type:
+        return "json"
+    if "xml" in content_type:
+        return "xml"
+    if "csv" in content_type:
+        return "csv"
+    # Unknown types: the regular parser tries JSON first.
+    if head.lstrip()[:1] in (b"{", b"["):
+        return "json"
+    return "text"
+
+
+def _make_summariser(
+    content_type: str, head: bytes, encoding: str, limits: ResponseLimits
+) -> _Summariser:
+    fmt = _detect_format(content_type, head)
+    if fmt == "json":
+        return _JsonSummary(encoding, limits)
+    if fmt == "xml":
+        return _XmlSummary(limits)
+    if fmt == "csv":
+        return _CsvSummary(encoding, limits)
+    return _TextSummary(encoding, limits)
+
+
+def _open_spill_file(
+    directory: str, content_type: str, retention_seconds: float
+) -> tuple[BinaryIO, str]:
+    """Create an owner-only spill file in *directory* after purging expired ones."""
+    _ensure_private_dir(directory)
+    _purge_spill_files(directory, retention_seconds)
+    ext = {"json": ".json", "xml": ".xml", "csv": ".csv"}.get(
+        _detect_format(content_type, b""), ".txt"
+    )
+    # mkstemp creates the file with O_EXCL and mode 0600.
+    fd, path = tempfile.mkstemp(prefix=_SPILL_PREFIX, suffix=ext, dir=directory)
+    return os.fdopen(fd, "wb"), path
+
+
+def _ensure_private_dir(directory: str) -> None:
+    """Create *directory* with mode 0700, refusing one that another user controls."""
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode):
+        raise OSError(f"Spill directory {directory!r} is not a directory")
+    if hasattr(os, "getuid") and info.st_uid != os.getuid():
+        raise OSError(f"Spill directory {directory!r} is owned by another user")
+    if stat.S_IMODE(info.st_mode) & 0o077:
+        os.chmod(directory, 0o700)
+
+
+def _purge_spill_files(directory: str, retention_seconds: float) -> None:
+    cutoff = time.time() - retention_seconds
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.name.startswith(_SPILL_PREFIX):
+                continue
+            try:
+                if entry.is_file(follow_symlinks=False) and entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+            except OSError:
+                logger.debug("Could not remove expired spill file %s", entry.path, exc_info=True)
+
+
+def _type_name(value: Any) -> str:
+    if value is None:
+        return "null"
+    return type(value).__name__
+
+
+def _record_schema(records: list[Any]) -> dict[str, str]:
+    """Union of field names (and the first seen type) across dict records."""
+    schema: dict[str, str] = {}
+    for record in records:
+        if isinstance(record, dict):
+            for key, value in record.items():
+                schema.setdefault(key, _type_name(value))
+    return schema
+
+
+# ---------------------------------------------------------------------------
+# JSON
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _JsonFrame:
+    """An open object or array whose members are being streamed."""
+
+    kind: str  # "object" | "array"
+    path: str
+    container: Any
+    count: int = 0
+    expect: str = "first"  # object: first/key/colon/value/comma; array: first/value/comma
+    key: str | None = None
+    full: bool = False
+    records: list[Any] = field(default_factory=list)
+
+
+class _JsonSummary:
+    """Incremental JSON scanner that keeps a bounded, same-shaped preview.
+
+    Objects along the path from the root are streamed member by member so that
+    wrappers like ``{"data": [...], "total": n}`` keep their shape.  Array
+    elements are decoded one at a time with :meth:`json.JSONDecoder.raw_decode`;
+    only the first ``preview_items`` are kept, the rest are just counted.  The
+    kept preview as a whole never exceeds ``preview_chars`` characters.
+    """
+
+    def __init__(self, encoding: str, limits: ResponseLimits) -> None:
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self._json = json.JSONDecoder()
+        self._limits = limits
+        self._buf = ""
+        self._pos = 0
+        self._retry_at = 0
+        self._stack: list[_JsonFrame] = []
+        self._root: Any = _UNSET
+        self._counts: dict[str, int] = {}
+        self._schema: dict[str, dict[str, str]] = {}
+        self._kept = 0
+        self._error: str | None = None
+        self._done = False
+
+    def feed(self, chunk: bytes) -> None:
+        if self._error or self._done:
+            return
+        self._buf += self._decoder.decode(chunk)
+        if len(self._buf) - self._pos >= self._retry_at:
+            self._advance(final=False)
+
+    def finish(self) -> dict[str, Any]:
+        if not self._error and not self._done:
+            self._buf += self._decoder.decode(b"", final=True)
+            self._advance(final=True)
+            if self._stack and not self._error:
+                self._error = "unexpected end of JSON document"
+        result: dict[str, Any] = {
+            "format": "json",
+            "preview": None if self._root is _UNSET else self._root,
+            "counts": self._counts,
+            "schema": self._schema,
+        }
+        if self._error:
+            result["parse_error"] = self._error
+        return result
+
+    # -- scanning --------------------------------------------------------
+
+    def _advance(self, *, final: bool) -> None:
+        buf = self._buf
+        pos = self._pos
+        while not self._error:
+            pos = _WHITESPACE.match(buf, pos).end()  # type: ignore[union-attr]
+            if pos >= len(buf):
+                break
+            frame = self._stack[-1] if self._stack else None
+            ch = buf[pos]
+
+            if frame is None:
+                if self._root is not _UNSET:
+                    self._done = True
+                    break
+                if ch in "[{":
+                    self._open(ch, "$")
+                    pos += 1
+                    continue
+                decoded = self._decode(pos, final)
+                if decoded is None:
+                    break
+                self._root, pos = decoded
+                continue
+
+            if frame.expect in ("first", "comma"):
+                closer = "]" if frame.kind == "array" else "}"
+                if ch == closer:
+                    self._close()
+                    pos += 1
+                    continue
+                if frame.expect == "comma":
+                    if ch != ",":
+                        self._error = f"expected ',' at character {pos}"
+                        break
+                    pos += 1
+                frame.expect = "value" if frame.kind == "array" else "key"
+                continue
+
+            if frame.expect == "key":
+                if ch != '"':
+                    self._error = f"expected object key at character {pos}"
+                    break
+                decoded = self._decode(pos, final)
+                if decoded is None:
+                    break
+                frame.key, pos = decoded
+                frame.expect = "colon"
+                continue
+
+            if frame.expect == "colon":
+                if ch != ":":
+                    self._error = f"expected ':' at character {pos}"
+                    break
+                frame.expect = "value"
+                pos += 1
+                continue
+
+            # frame.expect == "value"
+            if frame.kind == "object" and ch in "[{":
+                frame.count += 1
+                frame.expect = "comma"
+                self._open(ch, f"{frame.path}.{frame.key}")
+                pos += 1
+                continue
+            decoded = self._decode(pos, final)
+            if decoded is None:
+                break
+            value, end = decoded
+            frame.count += 1
+            frame.expect = "comma"
+            if frame.kind == "array":
+                if not frame.full and len(frame.container) < self._limits.preview_items:
+                    if self._keep(end - pos):
+                        frame.container.append(value)
+                        frame.records.append(value)
+                    else:
+                        # Keep the preview a strict prefix of the array.
+                        frame.full = True
+            elif self._keep(end - pos):
+                frame.container[frame.key] = value
+            pos = end
+
+        # Compact the buffer so memory stays bounded by the current element.
+        self._buf = buf[pos:]
+        self._pos = 0
+
+    def _decode(self, pos: int, final: bool) -> tuple[Any, int] | None:
+        """Decode one complete value at *pos*, or return ``None`` to wait for more data."""
+        buf = self._buf
+        if buf[pos] not in _JSON_VALUE_START:
+            self._error = f"unexpected character {buf[pos]!r} at {pos}"
+            return None
+        try:
+            value, end = self._json.raw_decode(buf, pos)
+        except json.JSONDecodeError as exc:
+            if final:
+                self._error = str(exc)
+            else:
+                self._wait(pos)
+            return None
+        # A number ending exactly at the buffer edge may continue in the next chunk.
+        if not final and end == len(buf) and type(value) in (int, float):
+            self._wait(pos)
+            return None
+        self._retry_at = 0
+        return value, end
+
+    def _keep(self, size: int) -> bool:
+        """Reserve *size* characters of the preview budget (``preview_chars`` overall)."""
+        if self._kept + size > self._limits.preview_chars:
+            return False
+        self._kept += size
+        return True
+
+    def _wait(self, pos: int) -> None:
+        pending = len(self._buf) - pos
+        if pending > self._limits.max_bytes:
+            self._error = f"single JSON value exceeds {self._limits.max_bytes} bytes"
+            return
+        # Only retry once the pending element has doubled, keeping the
+        # re-decoding cost of large elements linear overall.
+        self._retry_at = max(pending * 2, 1)
+
+    def _open(self, ch: str, path: str) -> None:
+        container: Any = [] if ch == "[" else {}
+        parent = self._stack[-1] if self._stack else None
+        if parent is None:
+            self._root = container
+        elif self._keep(2):
+            parent.container[parent.key] = container
+        self._stack.append(
+            _JsonFrame(kind="array" if ch == "[" else "object", path=path, container=container)
+        )
+
+    def _close(self) -> None:
+        frame = self._stack.pop()
+        if frame.kind == "array":
+            self._counts[frame.path] = frame.count
+            schema = _record_schema(frame.records)
+            if schema:
+                self._schema[frame.path] = schema
+        elif frame.count > len(frame.container):
+            self._counts[frame.path] = frame.count
+
+
+# ---------------------------------------------------------------------------
+# CSV
+# ---------------------------------------------------------------------------
+
+
+class _CsvSummary:
+    """Incremental CSV reader: header, row count and the first rows as dicts.
+
+    Preview rows are kept while they fit in ``preview_items`` and
+    ``preview_chars`` (measured on the raw record text).
+    """
+
+    def __init__(self, encoding: str, limits: ResponseLimits) -> None:
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self._limits = limits
+        self._pending = ""
+        self._record = ""
+        self._columns: list[str] | None = None
+        self._rows = 0
+        self._preview: list[dict[str, str]] = []
+        self._preview_full = False
+        self._kept = 0
+        self._error: str | None = None
+
+    def feed(self, chunk: bytes) -> None:
+        text = self._pending + self._decoder.decode(chunk)
+        lines = text.split("\n")
+        self._pending = lines.pop()
+        self._consume(lines)
+
+    def finish(self) -> dict[str, Any]:
+        tail = self._pending + self._decoder.decode(b"", final=True)
+        self._pending = ""
+        self._consume([tail])
+        if self._record:
+            self._emit(self._record)
+        result: dict[str, Any] = {
+            "format": "csv",
+            "columns": self._columns or [],
+            "row_count": self._rows,
+            "preview": self._preview,
+        }
+        if self._error:
+            result["parse_error"] = self._error
+        return result
+
+    def _consume(self, lines: list[str]) -> None:
+        for line in lines:
+            record = f"{self._record}\n{line}" if self._record else line
+            # An odd number of quotes means a quoted field spans lines.
+            if record.count('"') % 2:
+                if len(record) > self._limits.max_bytes:
+                    self._error = f"single CSV record exceeds {self._limits.max_bytes} bytes"
+                    self._record = ""
+                else:
+                    self._record = record
+                continue
+            self._record = ""
+            self._emit(record)
+
+    def _emit(self, record: str) -> None:
+        record = record.rstrip("\r")
+        if not record.strip():
+            return
+        values = next(csv.reader([record]))
+        if self._columns is None:
+            self._columns = [v.strip() for v in values]
+            return
+        self._rows += 1
+        if self._preview_full:
+            return
+        if (
+            len(self._preview) >= self._limits.preview_items
+            or self._kept + len(record) > self._limits.preview_chars
+        ):
+            self._preview_full = True
+            return
+        self._kept += len(record)
+        self._preview.append(dict(zip(self._columns, (v.strip() for v in values))))
+
+
+# ---------------------------------------------------------------------------
+# XML
+# ---------------------------------------------------------------------------
+
+
+class _XmlSummary:
+    """Pull-parser summary: record path, per-tag record counts and first records.
+
+    The record level is the shallowest depth at which an element has a
+    completed sibling with the same tag, so wrappers such as a SOAP
+    ``Envelope > Body > Response`` are skipped and the repeated ``Row``
+    elements become the records.  Records are removed from the tree as soon
+    as they are complete, which also releases everything nested inside them;
+    only records kept in the (``preview_chars``-bounded) preview stay
+    attached.  A deeper level detected first (e.g. repeated children inside
+    the first record) is replaced when a shallower one appears.  Documents
+    without repetition fall back to the children of the innermost
+    single-child wrapper.
+    """
+
+    def __init__(self, limits: ResponseLimits) -> None:
+        self._limits = limits
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._stack: list[ET.Element] = []
+        # Completed child tags of each open element, parallel to ``_stack``.
+        self._seen: list[Counter[str]] = []
+        self._root: ET.Element | None = None
+        self._container: ET.Element | None = None
+        self._record_depth: int | None = None
+        self._record_path: str | None = None
+        self._counts: Counter[str] = Counter()
+        self._rows = 0
+        self._preview: list[dict[str, Any]] = []
+        self._preview_full = False
+        self._kept = 0
+        self._error: str | None = None
+
+    def feed(self, chunk: bytes) -> None:
+        if self._error:
+            return
+        try:
+            self._parser.feed(chunk)
+        except ET.ParseError as exc:
+            self._error = str(exc)
+            return
+        self._drain()
+
+    def finish(self) -> dict[str, Any]:
+        if not self._error:
+            try:
+                self._parser.close()
+            except ET.ParseError as exc:
+                self._error = str(exc)
+            self._drain()
+        if self._record_depth is None and self._root is not None:
+            self._fallback_records(self._root)
+        result: dict[str, Any] = {
+            "format": "xml",
+            "root": local_name(self._root.tag) if self._root is not None else None,
+            "record_path": self._record_path,
+            "row_count": self._rows,
+            "element_counts": dict(self._counts),
+            "preview": self._preview,
+        }
+        if self._error:
+            result["parse_error"] = self._error
+        return result
+
+    def _drain(self) -> None:
+        for event, element in self._parser.read_events():
+            if event == "start":
+                if self._root is None:
+                    self._root = element  # type: ignore[assignment]
+                self._stack.append(element)  # type: ignore[arg-type]
+                self._seen.append(Counter())
+                continue
+            self._stack.pop()
+            self._seen.pop()
+            if not self._stack:
+                continue
+            depth = len(self._stack)
+            parent = self._stack[-1]
+            tag = element.tag  # type: ignore[union-attr]
+            repeated = self._seen[-1][tag] > 0
+            self._seen[-1][tag] += 1
+            if parent is self._container:
+                self._take(parent, element)  # type: ignore[arg-type]
+            elif repeated and (self._record_depth is None or depth < self._record_depth):
+                self._adopt_level(depth, parent, element)  # type: ignore[arg-type]
+
+    def _adopt_level(self, depth: int, parent: ET.Element, last: ET.Element) -> None:
+        """Make *parent*'s children the records and consume those up to *last*.
+
+        The pull parser may already have attached later siblings whose end
+        events are still queued; they are taken when those events arrive.
+        """
+        self._container = parent
+        self._record_depth = depth
+        self._record_path = "/".join(local_name(e.tag) for e in self._stack) + "/*"
+        self._counts.clear()
+        self._rows = 0
+        self._preview = []
+        self._preview_full = False
+        self._kept = 0
+        for child in list(parent):
+            self._take(parent, child)
+            if child is last:
+                break
+
+    def _fallback_records(self, container: ET.Element) -> None:
+        path = [local_name(container.tag)]
+        while len(container) == 1 and len(container[0]):
+            container = container[0]
+            path.append(local_name(container.tag))
+        self._record_path = "/".join(path) + "/*"
+        for child in list(container):
+            self._take(container, child)
+
+    def _take(self, parent: ET.Element, element: ET.Element) -> None:
+        self._rows += 1
+        self._counts[local_name(element.tag)] += 1
+        if not self._preview_full:
+            record = xml_to_dict(element)
+            size = len(json.dumps(record, default=str))
+            if (
+                len(self._preview) >= self._limits.preview_items
+                or self._kept + size > self._limits.preview_chars
+            ):
+                self._preview_full = True
+            else:
+                self._kept += size
+                self._preview.append(record)
+                return
+        parent.remove(element)
+
+
+# ---------------------------------------------------------------------------
+# Plain text
+# ---------------------------------------------------------------------------
+
+
+class _TextSummary:
+    """Keeps the first ``preview_chars`` characters of the body."""
+
+    def __init__(self, encoding: str, limits: ResponseLimits) -> None:
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self._limit = limits.preview_chars
+        self._preview = ""
+
+    def feed(self, chunk: bytes) -> None:
+        if len(self._preview) >= self._limit:
+            return
+        self._preview += self._decoder.decode(chunk)[: self._limit - len(self._preview)]
+
+    def finish(self) -> dict[str, Any]:
+        return {"format": "text", "preview": self._preview}
@@ -6,19 +6,205 @@
 #
 #     http://www.apache.org/licenses/LICENSE-2.0
 
-"""Subprocess sandbox for executing custom Python tool code safely."""
+"""Subprocess sandbox for executing custom Python tool code safely.
+
+On POSIX systems a small pool of pre-started *zygote* interpreters is kept
+warm.  A zygote never runs tool code itself: for each call it compiles the
+code (caching code objects by hash), forks a child, and the child runs the
+code with stdin/stdout redirected to in-memory buffers, then exits.  Every
+call therefore starts from the same clean, already-initialised interpreter
+state -- nothing a tool does (monkeypatching the stdlib, leaving threads or
+globals behind, reading inherited descriptors) can reach the zygote or any
+later call -- while skipping interpreter start-up and stdlib imports.
+
+Zygotes are replaced after a fixed number of calls.  Where ``fork`` is not
+available, or with ``pool_size=0``, each call starts a fresh interpreter.
+"""
 
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
 import logging
+import os
+import struct
 import sys
+import time
 from dataclasses import dataclass
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+_FRAME_HEADER = struct.Struct(">I")
+
+# Extra time given to a zygote to report a timeout it enforces itself
+# before the parent gives up on it and kills it.
+_ZYGOTE_GRACE_SECONDS = 2.0
+
+# Source of the zygote interpreter.  It deliberately imports nothing from
+# flydesk: only the standard library is needed.
+_ZYGOTE_SOURCE = r'''
+import io
+import json
+import os
+import select
+import signal
+import struct
+import sys
+import time
+import traceback
+
+_HEADER = struct.Struct(">I")
+_CACHE_SIZE = 128
+# Bound before any tool code runs, so a tool that patches the json module
+# cannot change how its own result is reported.
+_dumps = json.dumps
+
+
+def _limit_memory(limit_bytes):
+    if limit_bytes <= 0:
+        return
+    try:
+        import resource
+
+        resource.setrlimit(resource.RLIMIT_AS, (limit_bytes, limit_bytes))
+    except (ImportError, ValueError, OSError):
+        pass
+
+
+def _read_exact(fd, size):
+    data = b""
+    while len(data) < size:
+        chunk = os.read(fd, size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+
+def _write_all(fd, data):
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _child(code, params, result_fd, memory_limit):
+    _limit_memory(memory_limit)
+    stdin = io.TextIOWrapper(io.BytesIO(json.dumps(params).encode()), encoding="utf-8")
+    stdout = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+    stderr = io.StringIO()
+    sys.stdin, sys.stdout, sys.stderr = stdin, stdout, stderr
+    exit_code = 0
+    try:
+        exec(code, {"__name__": "__main__", "__builtins__": __builtins__})
+    except SystemExit as exc:
+        if exc.code is None:
+            exit_code = 0
+        elif isinstance(exc.code, int):
+            exit_code = exc.code
+        else:
+            print(exc.code, file=stderr)
+            exit_code = 1
+    except BaseException:
+        traceback.print_exc(file=stderr)
+        exit_code = 1
+    try:
+        stdout.flush()
+    except Exception:
+        pass
+    result = {
+        "exit_code": exit_code,
+        "stdout": stdout.buffer.getvalue().decode("utf-8", "replace"),
+        "stderr": stderr.getvalue(),
+    }
+    _write_all(result_fd, _dumps(result).encode())
+
+
+def _run(request, cache, proto_fds):
+    try:
+        code = cache.get(request["hash"])
+        if code is None:
+            code = compile(request["code"], "<string>", "exec")
+            cache[request["hash"]] = code
+            while len(cache) > _CACHE_SIZE:
+                cache.pop(next(iter(cache)))
+    except BaseException:
+        return {"exit_code": 1, "stdout": "", "stderr": traceback.format_exc()}
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        status = 0
+        try:
+            os.close(read_fd)
+            for fd in proto_fds:
+                os.close(fd)
+            _child(code, request["params"], write_fd, request["memory_limit"])
+        except BaseException:
+            status = 70
+        finally:
+            os._exit(status)
+
+    os.close(write_fd)
+    deadline = time.monotonic() + request["timeout"]
+    chunks = []
+    timed_out = False
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            timed_out = True
+            break
+        ready, _, _ = select.select([read_fd], [], [], remaining)
+        if not ready:
+            continue
+        chunk = os.read(read_fd, 65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    os.close(read_fd)
+    if timed_out:
+        os.kill(pid, signal.SIGKILL)
+    _, status = os.waitpid(pid, 0)
+    if timed_out:
+        return {"timeout": True}
+    returncode = os.waitstatus_to_exitcode(status)
+    try:
+        result = json.loads(b"".join(chunks))
+        if not isinstance(result, dict) or set(result) != {"exit_code", "stdout", "stderr"}:
+            raise ValueError("unexpected result shape")
+    except ValueError:
+        return {"crashed": True, "returncode": returncode}
+    return result
+
+
+def _main():
+    memory_limit = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+    # Keep private descriptors for the protocol and point fds 0/1 at
+    # /dev/null; children close the private ones before running tool code.
+    proto_in = os.dup(0)
+    proto_out = os.dup(1)
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    os.close(devnull)
+    cache = {}
+    while True:
+        header = _read_exact(proto_in, _HEADER.size)
+        if header is None:
+            return
+        body = _read_exact(proto_in, _HEADER.unpack(header)[0])
+        if body is None:
+            return
+        request = json.loads(body)
+        request["memory_limit"] = memory_limit
+        response = json.dumps(_run(request, cache, (proto_in, proto_out))).encode()
+        _write_all(proto_out, _HEADER.pack(len(response)) + response)
+
+
+_main()
+'''
+
 
 @dataclass(frozen=True)
 class SandboxResult:
@@ -29,13 +215,134 @@ class SandboxResult:
     error: str | None = None
 
 
+def _to_result(returncode: int, stdout_text: str, stderr_text: str) -> SandboxResult:
+    """Interpret a finished script run the same way for pooled and one-shot execution."""
+    if returncode != 0:
+        err_text = stderr_text.strip()
+        return SandboxResult(success=False, error=err_text or f"Exit code {returncode}")
+
+    stdout_text = stdout_text.strip()
+    if not stdout_text:
+        return SandboxResult(success=False, error="No output produced")
+
+    try:
+        data = json.loads(stdout_text)
+    except json.JSONDecodeError:
+        return SandboxResult(
+            success=False,
+            error=f"Output is not valid JSON: {stdout_text[:200]}",
+        )
+
+    return SandboxResult(success=True, data=data)
+
+
+class _Zygote:
+    """A warm interpreter that forks one child per call."""
+
+    def __init__(self, proc: asyncio.subprocess.Process) -> None:
+        self._proc = proc
+        self.executions = 0
+
+    @classmethod
+    async def spawn(cls, memory_limit_bytes: int) -> _Zygote:
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable, "-c", _ZYGOTE_SOURCE, str(memory_limit_bytes),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        return cls(proc)
+
+    @property
+    def alive(self) -> bool:
+        return self._proc.returncode is None
+
+    async def run(
+        self, code: str, code_hash: str, params: dict[str, Any], timeout: float
+    ) -> dict[str, Any]:
+        """Send one request and wait for its response frame."""
+        assert self._proc.stdin is not None and self._proc.stdout is not None
+        body = json.dumps(
+            {"hash": code_hash, "code": code, "params": params, "timeout": timeout}
+        ).encode()
+        self.executions += 1
+        self._proc.stdin.write(_FRAME_HEADER.pack(len(body)) + body)
+        await self._proc.stdin.drain()
+        header = await self._proc.stdout.readexactly(_FRAME_HEADER.size)
+        (size,) = _FRAME_HEADER.unpack(header)
+        return json.loads(await self._proc.stdout.readexactly(size))
+
+    async def close(self) -> None:
+        if self._proc.returncode is None:
+            self._proc.kill()
+        await self._proc.wait()
+
+
 class SandboxExecutor:
     """Execute Python tool code in an isolated subprocess.
 
     The code receives input parameters via stdin as JSON and must print
     a single JSON object to stdout.
+
+    Parameters
+    ----------
+    pool_size:
+        Number of warm zygote interpreters kept ready.  ``0`` starts a fresh
+        interpreter per call.
+    max_concurrency:
+        Maximum number of tools executing at once.  Calls beyond the warm
+        pool use temporary zygotes; time spent waiting for a slot counts
+        against the call's timeout.
+    max_executions_per_worker:
+        Calls a zygote serves before it is replaced.
+    memory_limit_mb:
+        Address-space limit applied to each tool process (POSIX only).
+        ``0`` disables the limit.
     """
 
+    def __init__(
+        self,
+        *,
+        pool_size: int = 2,
+        max_concurrency: int = 16,
+        max_executions_per_worker: int = 500,
+        memory_limit_mb: int = 1024,
+    ) -> None:
+        self._pool_size = pool_size if hasattr(os, "fork") else 0
+        self._max_executions = max_executions_per_worker
+        self._memory_limit_bytes = memory_limit_mb * 1024 * 1024
+        self._idle: list[_Zygote] = []
+        self._slots = asyncio.Semaphore(max(max_concurrency, 1))
+        self._warming: set[asyncio.Task[None]] = set()
+        self._closed = False
+
+    async def start(self) -> None:
+        """Pre-start the zygote pool so the first calls do not pay startup cost."""
+        self._closed = False
+        missing = self._pool_size - len(self._idle)
+        if missing <= 0:
+            return
+        zygotes = await asyncio.gather(
+            *(_Zygote.spawn(self._memory_limit_bytes) for _ in range(missing)),
+            return_exceptions=True,
+        )
+        for zygote in zygotes:
+            if isinstance(zygote, BaseException):
+                logger.warning("Failed to start sandbox worker: %s", zygote)
+            else:
+                self._idle.append(zygote)
+        logger.info("Sandbox pool started (%d workers)", len(self._idle))
+
+    async def stop(self) -> None:
+        """Terminate all zygotes."""
+        self._closed = True
+        for task in list(self._warming):
+            task.cancel()
+        if self._warming:
+            await asyncio.gather(*self._warming, return_exceptions=True)
+        idle, self._idle = self._idle, []
+        await asyncio.gather(*(z.close() for z in idle), return_exceptions=True)
+
     async def execute(
         self,
         code: str,
@@ -43,7 +350,106 @@ class SandboxExecutor:
         *,
         timeout: int = 30,
     ) -> SandboxResult:
-        """Run *code* in a subprocess, passing *params* via stdin as JSON."""
+        """Run *code* in a sandboxed interpreter, passing *params* via stdin as JSON."""
+        if self._pool_size <= 0:
+            return await self._execute_subprocess(code, params, timeout=timeout)
+        deadline = time.monotonic() + timeout
+        try:
+            try:
+                await asyncio.wait_for(self._slots.acquire(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return SandboxResult(success=False, error=f"Timeout after {timeout}s")
+            try:
+                return await self._execute_pooled(
+                    code, params, timeout=timeout, deadline=deadline
+                )
+            finally:
+                self._slots.release()
+        except Exception as exc:
+            logger.error("Sandbox execution error: %s", exc, exc_info=True)
+            return SandboxResult(success=False, error=str(exc))
+
+    # ------------------------------------------------------------------
+    # Pooled execution
+    # ------------------------------------------------------------------
+
+    async def _execute_pooled(
+        self, code: str, params: dict[str, Any], *, timeout: int, deadline: float
+    ) -> SandboxResult:
+        # Serialise up front so bad parameters never reach a zygote.
+        json.dumps(params)
+        code_hash = hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+        zygote = self._checkout()
+        if zygote is None:
+            zygote = await _Zygote.spawn(self._memory_limit_bytes)
+
+        reusable = False
+        try:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                reusable = True
+                return SandboxResult(success=False, error=f"Timeout after {timeout}s")
+            try:
+                response = await asyncio.wait_for(
+                    zygote.run(code, code_hash, params, remaining),
+                    timeout=remaining + _ZYGOTE_GRACE_SECONDS,
+                )
+            except asyncio.TimeoutError:
+                return SandboxResult(success=False, error=f"Timeout after {timeout}s")
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return SandboxResult(success=False, error="Sandbox worker exited unexpectedly")
+
+            reusable = zygote.executions < self._max_executions
+            if response.get("timeout"):
+                return SandboxResult(success=False, error=f"Timeout after {timeout}s")
+            if response.get("crashed"):
+                return SandboxResult(
+                    success=False,
+                    error=f"Sandbox process exited unexpectedly (code {response['returncode']})",
+                )
+            return _to_result(response["exit_code"], response["stdout"], response["stderr"])
+        finally:
+            if reusable and not self._closed and len(self._idle) < self._pool_size:
+                self._idle.append(zygote)
+            else:
+                await zygote.close()
+                self._replenish()
+
+    def _checkout(self) -> _Zygote | None:
+        while self._idle:
+            zygote = self._idle.pop()
+            if zygote.alive:
+                return zygote
+        return None
+
+    def _replenish(self) -> None:
+        """Start a replacement zygote in the background to keep the pool warm."""
+        if self._closed or len(self._idle) + len(self._warming) >= self._pool_size:
+            return
+
+        async def _warm() -> None:
+            try:
+                zygote = await _Zygote.spawn(self._memory_limit_bytes)
+            except Exception:
+                logger.warning("Failed to start replacement sandbox worker", exc_info=True)
+                return
+            if self._closed:
+                await zygote.close()
+            else:
+                self._idle.append(zygote)
+
+        task = asyncio.create_task(_warm())
+        self._warming.add(task)
+        task.add_done_callback(self._warming.discard)
+
+    # ------------------------------------------------------------------
+    # One interpreter per call
+    # ------------------------------------------------------------------
+
+    async def _execute_subprocess(
+        self, code: str, params: dict[str, Any], *, timeout: int
+    ) -> SandboxResult:
         try:
             proc = await asyncio.create_subprocess_exec(
                 sys.executable, "-c", code,
@@ -63,23 +469,7 @@ class SandboxExecutor:
                 await proc.wait()
                 return SandboxResult(success=False, error=f"Timeout after {timeout}s")
 
-            if proc.returncode != 0:
-                err_text = stderr.decode().strip()
-                return SandboxResult(success=False, error=err_text or f"Exit code {proc.returncode}")
-
-            stdout_text = stdout.decode().strip()
-            if not stdout_text:
-                return SandboxResult(success=False, error="No output produced")
-
-            try:
-                data = json.loads(stdout_text)
-            except json.JSONDecodeError:
-                return SandboxResult(
-                    success=False,
-                    error=f"Output is not valid JSON: {stdout_text[:200]}",
-                )
-
-            return SandboxResult(success=True, data=data)
+            return _to_result(proc.returncode or 0, stdout.decode(), stderr.decode())
 
         except Exception as exc:
             logger.error("Sandbox execution error: %s", exc, exc_info=True)
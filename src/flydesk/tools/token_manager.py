@@ -0,0 +1,512 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""OAuth2 client-credentials token manager.
+
+Tokens are kept in a per-process cache and, optionally, in a Redis cache
+shared by every worker (values encrypted with the configured KMS).  Tokens
+that are in use are refreshed in the background before they expire, and
+concurrent refreshes for the same grant are coalesced into one request to
+the token endpoint -- per process via a shared future, across workers via a
+short-lived Redis lock.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import uuid
+from dataclasses import asdict, dataclass, field as dc_field
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+if TYPE_CHECKING:
+    from flydesk.security.kms import KMSProvider
+
+logger = logging.getLogger(__name__)
+
+_EXCHANGE_TIMEOUT = 10.0
+_DEFAULT_EXPIRES_IN = 3600
+_RETRY_DELAY_SECONDS = 30.0
+_PEER_POLL_INTERVAL = 0.1
+
+# Compare-and-delete so a worker never releases a lock another worker holds.
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+@dataclass(frozen=True)
+class ClientCredentialsGrant:
+    """Everything needed to request a token with the client-credentials flow."""
+
+    system_id: str
+    credential_id: str
+    token_url: str
+    client_id: str
+    client_secret: str
+    scopes: tuple[str, ...] = ()
+
+    @property
+    def cache_key(self) -> str:
+        """Cache key for tokens issued for this grant.
+
+        Includes a fingerprint of the client credentials so that rotating a
+        secret or changing scopes never serves a token minted for the old
+        configuration.
+        """
+        material = json.dumps(
+            [self.token_url, self.client_id, self.client_secret, sorted(self.scopes)]
+        )
+        fingerprint = hashlib.sha256(material.encode("utf-8")).hexdigest()[:16]
+        return f"{self.system_id}:{self.credential_id}:{fingerprint}"
+
+
+@dataclass
+class TokenRefreshStats:
+    """Per-system counters for token endpoint calls."""
+
+    refreshes: int = 0
+    failures: int = 0
+    last_latency_ms: float | None = None
+    total_latency_ms: float = 0.0
+    last_error: str | None = None
+    last_refreshed_at: datetime | None = None
+
+    @property
+    def avg_latency_ms(self) -> float | None:
+        calls = self.refreshes + self.failures
+        return self.total_latency_ms / calls if calls else None
+
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data.pop("total_latency_ms")
+        data["avg_latency_ms"] = self.avg_latency_ms
+        if self.last_refreshed_at is not None:
+            data["last_refreshed_at"] = self.last_refreshed_at.isoformat()
+        return data
+
+
+class _TokenCache:
+    """In-memory cache for OAuth2 access tokens.
+
+    Stores tokens keyed by grant with expiry tracking.  Tokens are treated as
+    expired once they are within ``buffer_seconds`` of expiration.
+    """
+
+    def __init__(self, buffer_seconds: int = 60) -> None:
+        self._cache: dict[str, tuple[str, float]] = {}  # key -> (token, expires_at)
+        self._buffer_seconds = buffer_seconds
+
+    def get(self, key: str) -> str | None:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        token, expires_at = entry
+        if time.monotonic() >= expires_at - self._buffer_seconds:
+            del self._cache[key]
+            return None
+        return token
+
+    def put(self, key: str, token: str, expires_in: float) -> None:
+        self._cache[key] = (token, time.monotonic() + expires_in)
+
+    def usable_for(self, key: str) -> float:
+        """Seconds until the token for *key* stops being served (0 if absent)."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return 0.0
+        return max(0.0, entry[1] - self._buffer_seconds - time.monotonic())
+
+
+# ---------------------------------------------------------------------------
+# Shared (cross-worker) cache
+# ---------------------------------------------------------------------------
+
+
+class RedisTokenCache:
+    """Redis-backed token cache shared by all workers.
+
+    Tokens are stored KMS-encrypted under a hashed key with a Redis TTL equal
+    to the token lifetime, so neither the token nor the system/credential
+    identifiers appear in Redis in clear text.  Redis errors are logged and
+    treated as cache misses; callers fall back to their local cache.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        kms: KMSProvider,
+        *,
+        prefix: str = "flydesk:oauth2:",
+    ) -> None:
+        self._url = url
+        self._kms = kms
+        self._prefix = prefix
+        self._client: Any = None
+
+    def _connect(self) -> Any:
+        if self._client is None:
+            import redis.asyncio as aioredis  # type: ignore[import-not-found]
+
+            self._client = aioredis.from_url(self._url)
+        return self._client
+
+    def _key(self, kind: str, key: str) -> str:
+        return f"{self._prefix}{kind}:{hashlib.sha256(key.encode('utf-8')).hexdigest()}"
+
+    async def get(self, key: str) -> tuple[str, float] | None:
+        """Return ``(token, expires_at)`` with *expires_at* as a UNIX timestamp."""
+        try:
+            raw = await self._connect().get(self._key("token", key))
+            if raw is None:
+                return None
+            if isinstance(raw, bytes):
+                raw = raw.decode("utf-8")
+            data = json.loads(self._kms.decrypt(raw))
+            return data["access_token"], float(data["expires_at"])
+        except Exception:
+            logger.warning("Shared token cache read failed", exc_info=True)
+            return None
+
+    async def put(self, key: str, token: str, expires_at: float) -> None:
+        ttl = int(expires_at - time.time())
+        if ttl <= 0:
+            return
+        payload = json.dumps({"access_token": token, "expires_at": expires_at})
+        try:
+            await self._connect().set(
+                self._key("token", key), self._kms.encrypt(payload), ex=ttl
+            )
+        except Exception:
+            logger.warning("Shared token cache write failed", exc_info=True)
+
+    async def acquire_lock(self, key: str, ttl_seconds: float) -> str | None:
+        """Try to take the refresh lock for *key*.  Returns a lock token or ``None``."""
+        lock_token = uuid.uuid4().hex
+        try:
+            acquired = await self._connect().set(
+                self._key("lock", key), lock_token, nx=True, px=int(ttl_seconds * 1000)
+            )
+        except Exception:
+            logger.warning("Shared token lock unavailable; refreshing locally", exc_info=True)
+            return lock_token
+        return lock_token if acquired else None
+
+    async def release_lock(self, key: str, lock_token: str) -> None:
+        try:
+            await self._connect().eval(
+                _RELEASE_LOCK_SCRIPT, 1, self._key("lock", key), lock_token
+            )
+        except Exception:
+            logger.debug("Failed to release shared token lock", exc_info=True)
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+# ---------------------------------------------------------------------------
+# Token manager
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _ManagedToken:
+    """Bookkeeping for a grant whose token is refreshed in the background."""
+
+    grant: ClientCredentialsGrant
+    issued_at: float
+    last_used: float
+    timer: asyncio.TimerHandle | None = dc_field(default=None, repr=False)
+
+
+class OAuth2TokenManager:
+    """Issue, cache and proactively refresh OAuth2 client-credentials tokens.
+
+    Parameters
+    ----------
+    http_client:
+        Client used to call token endpoints.  Without one, :meth:`get_token`
+        always returns ``None``.
+    shared_cache:
+        Optional :class:`RedisTokenCache` so that workers share tokens and
+        only one of them calls the token endpoint per refresh.
+    refresh_ahead_seconds:
+        How long before expiry a token that is still in use is refreshed in
+        the background.  Short-lived tokens are refreshed at half their
+        lifetime at the earliest.
+    expiry_buffer_seconds:
+        Tokens are never handed out within this many seconds of expiry.
+    """
+
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient | None = None,
+        *,
+        shared_cache: RedisTokenCache | None = None,
+        refresh_ahead_seconds: float = 300.0,
+        expiry_buffer_seconds: int = 60,
+    ) -> None:
+        self._http_client = http_client
+        self._shared = shared_cache
+        self._refresh_ahead = refresh_ahead_seconds
+        self._buffer = expiry_buffer_seconds
+        self._local = _TokenCache(buffer_seconds=expiry_buffer_seconds)
+        self._inflight: dict[str, asyncio.Future[str | None]] = {}
+        self._managed: dict[str, _ManagedToken] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._stats: dict[str, TokenRefreshStats] = {}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def get_token(self, grant: ClientCredentialsGrant) -> str | None:
+        """Return a valid access token for *grant*, or ``None`` if none can be obtained."""
+        key = grant.cache_key
+        managed = self._managed.get(key)
+        if managed is not None:
+            managed.last_used = time.monotonic()
+        token = self._local.get(key)
+        if token:
+            return token
+        return await self._single_flight(grant)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Return token refresh statistics keyed by system ID."""
+        return {system_id: s.to_dict() for system_id, s in self._stats.items()}
+
+    async def stop(self) -> None:
+        """Cancel scheduled and running refreshes and close the shared cache."""
+        for managed in self._managed.values():
+            if managed.timer is not None:
+                managed.timer.cancel()
+        self._managed.clear()
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._shared is not None:
+            await self._shared.close()
+
+    # ------------------------------------------------------------------
+    # Refresh coordination
+    # ------------------------------------------------------------------
+
+    async def _single_flight(self, grant: ClientCredentialsGrant) -> str | None:
+        """Obtain a token, sharing one in-flight refresh among concurrent callers."""
+        key = grant.cache_key
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._obtain(grant))
+            self._inflight[key] = future
+
+            def _release(done: asyncio.Future[str | None]) -> None:
+                if self._inflight.get(key) is done:
+                    del self._inflight[key]
+
+            future.add_done_callback(_release)
+        return await asyncio.shield(future)
+
+    async def _obtain(self, grant: ClientCredentialsGrant) -> str | None:
+        key = grant.cache_key
+        # A token from a peer is only useful if it outlives the one we hold.
+        min_expires_at = time.time() + self._local.usable_for(key) + self._buffer
+
+        if self._shared is None:
+            return await self._exchange_and_store(grant)
+
+        adopted = await self._adopt_shared(grant, min_expires_at)
+        if adopted:
+            return adopted
+
+        lock_token = await self._shared.acquire_lock(key, _EXCHANGE_TIMEOUT)
+        if lock_token is None:
+            # Another worker is refreshing; wait for it to publish the token.
+            deadline = time.monotonic() + _EXCHANGE_TIMEOUT
+            while time.monotonic() < deadline:
+                await asyncio.sleep(_PEER_POLL_INTERVAL)
+                adopted = await self._adopt_shared(grant, min_expires_at)
+                if adopted:
+                    return adopted
+            logger.warning(
+                "Timed out waiting for peer token refresh for system %s", grant.system_id
+            )
+            return await self._exchange_and_store(grant)
+
+        try:
+            return await self._exchange_and_store(grant)
+        finally:
+            await self._shared.release_lock(key, lock_token)
+
+    async def _adopt_shared(
+        self, grant: ClientCredentialsGrant, min_expires_at: float
+    ) -> str | None:
+        assert self._shared is not None
+        entry = await self._shared.get(grant.cache_key)
+        if entry is None:
+            return None
+        token, expires_at = entry
+        if expires_at <= min_expires_at:
+            return None
+        self._store_local(grant, token, expires_at - time.time())
+        return token
+
+    async def _exchange_and_store(self, grant: ClientCredentialsGrant) -> str | None:
+        requested_at = time.time()
+        result = await self._exchange_token(grant)
+        if result is None:
+            return None
+        token, expires_in = result
+        # Measure lifetime from when the request was sent to stay conservative.
+        expires_at = requested_at + expires_in
+        self._store_local(grant, token, expires_at - time.time())
+        if self._shared is not None:
+            await self._shared.put(grant.cache_key, token, expires_at)
+        return token
+
+    def _store_local(
+        self, grant: ClientCredentialsGrant, token: str, expires_in: float
+    ) -> None:
+        key = grant.cache_key
+        self._local.put(key, token, expires_in)
+        now = time.monotonic()
+        managed = self._managed.get(key)
+        if managed is None:
+            managed = _ManagedToken(grant=grant, issued_at=now, last_used=now)
+            self._managed[key] = managed
+        else:
+            managed.grant = grant
+            managed.issued_at = now
+        self._schedule_refresh(managed, self._refresh_delay(expires_in))
+
+    # ------------------------------------------------------------------
+    # Background refresh
+    # ------------------------------------------------------------------
+
+    def _refresh_delay(self, expires_in: float) -> float:
+        """Seconds from now at which a token with *expires_in* should be renewed."""
+        delay = max(expires_in / 2, expires_in - self._refresh_ahead)
+        # Always renew before the token stops being served.
+        return max(0.0, min(delay, expires_in - self._buffer))
+
+    def _schedule_refresh(self, managed: _ManagedToken, delay: float) -> None:
+        if managed.timer is not None:
+            managed.timer.cancel()
+        loop = asyncio.get_running_loop()
+        managed.timer = loop.call_later(delay, self._refresh_due, managed.grant.cache_key)
+
+    def _refresh_due(self, key: str) -> None:
+        managed = self._managed.get(key)
+        if managed is None:
+            return
+        managed.timer = None
+        if managed.last_used <= managed.issued_at:
+            # Nobody used the token since it was issued; let it lapse rather
+            # than keep idle grants alive indefinitely.
+            del self._managed[key]
+            logger.debug("Dropping idle OAuth2 token for system %s", managed.grant.system_id)
+            return
+        task = asyncio.create_task(self._background_refresh(managed.grant))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _background_refresh(self, grant: ClientCredentialsGrant) -> None:
+        key = grant.cache_key
+        token = await self._single_flight(grant)
+        if token is not None:
+            return
+        # Keep serving the current token and retry while it is still usable.
+        remaining = self._local.usable_for(key)
+        managed = self._managed.get(key)
+        if managed is not None and remaining > 0:
+            self._schedule_refresh(managed, min(_RETRY_DELAY_SECONDS, remaining / 2))
+
+    # ------------------------------------------------------------------
+    # Token endpoint
+    # ------------------------------------------------------------------
+
+    async def _exchange_token(
+        self, grant: ClientCredentialsGrant
+    ) -> tuple[str, int] | None:
+        """Execute the OAuth2 client credentials grant."""
+        if not self._http_client:
+            logger.warning("No HTTP client configured for OAuth2 token exchange")
+            return None
+
+        payload: dict[str, str] = {
+            "grant_type": "client_credentials",
+            "client_id": grant.client_id,
+            "client_secret": grant.client_secret,
+        }
+        if grant.scopes:
+            payload["scope"] = " ".join(grant.scopes)
+
+        started = time.perf_counter()
+        try:
+            response = await self._http_client.post(
+                grant.token_url,
+                data=payload,
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+                timeout=_EXCHANGE_TIMEOUT,
+            )
+            response.raise_for_status()
+            data = response.json()
+
+            access_token = data.get("access_token")
+            if not access_token:
+                logger.error("OAuth2 response missing access_token: %s", data)
+                self._record(grant, started, error="response missing access_token")
+                return None
+
+            # Default to 1 hour if the provider does not say.
+            expires_in = int(data.get("expires_in", _DEFAULT_EXPIRES_IN))
+            self._record(grant, started)
+            logger.debug(
+                "OAuth2 token obtained for system %s (expires in %ds)",
+                grant.system_id,
+                expires_in,
+            )
+            return access_token, expires_in
+
+        except httpx.HTTPStatusError as exc:
+            logger.error(
+                "OAuth2 token exchange HTTP %s: %s",
+                exc.response.status_code,
+                exc.response.text[:200],
+            )
+            self._record(grant, started, error=f"HTTP {exc.response.status_code}")
+            return None
+        except Exception as exc:
+            logger.error("OAuth2 token exchange failed", exc_info=True)
+            self._record(grant, started, error=type(exc).__name__)
+            return None
+
+    def _record(
+        self, grant: ClientCredentialsGrant, started: float, *, error: str | None = None
+    ) -> None:
+        latency_ms = (time.perf_counter() - started) * 1000
+        stats = self._stats.setdefault(grant.system_id, TokenRefreshStats())
+        stats.last_latency_ms = latency_ms
+        stats.total_latency_ms += latency_ms
+        if error is None:
+            stats.refreshes += 1
+            stats.last_refreshed_at = datetime.now(timezone.utc)
+        else:
+            stats.failures += 1
+            stats.last_error = error
@@ -0,0 +1,41 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""XML helpers shared by the response parser and the streaming summariser."""
+
+from __future__ import annotations
+
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from typing import Any
+
+
+def local_name(tag: str) -> str:
+    """Strip the ``{namespace}`` prefix from an element tag."""
+    return tag.split("}")[-1] if "}" in tag else tag
+
+
+def xml_to_dict(element: ET.Element) -> dict[str, Any]:
+    """Recursively convert an XML element to a dict."""
+    tag = local_name(element.tag)
+    result: dict[str, Any] = {}
+    if element.attrib:
+        result["@attributes"] = dict(element.attrib)
+    children: dict[str, list[Any]] = defaultdict(list)
+    for child in element:
+        children[local_name(child.tag)].append(xml_to_dict(child))
+    for k, v in children.items():
+        result[k] = v[0] if len(v) == 1 else v
+    if element.text and element.text.strip():
+        if result:
+            result["#text"] = element.text.strip()
+        else:
+            return {tag: element.text.strip()}
+    if not result:
+        return {tag: None}
+    return {tag: result}
@@ -19,6 +19,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from collections.abc import Callable
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
@@ -62,6 +63,13 @@ class AutoTriggerService:
         # Handle for the debounce timer scheduled via ``loop.call_later``.
         self._debounce_timer: asyncio.TimerHandle | None = None
 
+        # Callbacks notified of every data change, regardless of settings.
+        self._change_listeners: list[Callable[[], None]] = []
+
+    def add_change_listener(self, callback: Callable[[], None]) -> None:
+        """Register *callback* to be called whenever documents or the catalog change."""
+        self._change_listeners.append(callback)
+
     # ------------------------------------------------------------------
     # Public event hooks
     # ------------------------------------------------------------------
@@ -72,6 +80,7 @@ class AutoTriggerService:
         Submits a per-document KG extraction job (immediate, not debounced)
         when ``auto_kg_extract`` is enabled.
         """
+        self._notify_change()
         if not self._auto_kg_extract:
             return
         try:
@@ -90,6 +99,7 @@ class AutoTriggerService:
         Schedules both ``kg_recompute`` and ``process_discovery`` jobs if
         auto-analysis is enabled.
         """
+        self._notify_change()
         if not self._config.auto_analyze:
             return
         logger.debug("Catalog updated: %s -- scheduling triggers", system_id)
@@ -97,6 +107,13 @@ class AutoTriggerService:
         self._schedule_trigger("process_discovery")
         self._schedule_trigger("system_discovery")
 
+    def _notify_change(self) -> None:
+        for callback in self._change_listeners:
+            try:
+                callback()
+            except Exception:
+                logger.warning("Change listener failed.", exc_info=True)
+
     # ------------------------------------------------------------------
     # Debounce logic
     # ------------------------------------------------------------------
@@ -32,6 +32,44 @@ logger = logging.getLogger(__name__)
 # A step handler takes (step, workflow) and returns a result dict.
 StepHandler = Callable[[WorkflowStep, Workflow], Awaitable[dict]]
 
+# Step types that pause the workflow until a trigger arrives.
+_WAIT_STEP_TYPES = frozenset(
+    {StepType.WAIT_WEBHOOK, StepType.WAIT_HUMAN, StepType.WAIT_POLL}
+)
+
+# Transitions one resume may make before handing the workflow back to the
+# scheduler, so condition loops over non-waiting steps cannot run forever.
+_MAX_TRANSITIONS_PER_PASS = 100
+
+
+class _Execution:
+    """Workflow and step state for one engine pass, loaded once.
+
+    Steps are changed in memory and remembered; :meth:`checkpoint` writes the
+    workflow and every changed step in a single transaction.
+    """
+
+    def __init__(self, workflow: Workflow) -> None:
+        self.workflow = workflow
+        self.steps = workflow.steps
+        self._changed: dict[str, WorkflowStep] = {}
+
+    def update_step(self, step: WorkflowStep, status: StepStatus, **fields: Any) -> None:
+        step.status = status
+        for name, value in fields.items():
+            setattr(step, name, value)
+        self._changed[step.id] = step
+
+    async def checkpoint(self, repo: WorkflowRepository) -> bool:
+        """Persist pending changes; ``False`` if the workflow was cancelled meanwhile."""
+        changed = list(self._changed.values())
+        self._changed.clear()
+        saved = await repo.save_transition(self.workflow, changed)
+        if not saved:
+            logger.info("Workflow %s is no longer active; stopping", self.workflow.id)
+        return saved
+
+
 
 class WorkflowEngine:
     """Orchestrates durable workflow lifecycle: start, resume, cancel, and status queries."""
@@ -43,6 +81,18 @@ class WorkflowEngine:
     ) -> None:
         self._repo = repo
         self._step_handlers: dict[str, StepHandler] = step_handlers or {}
+        self._schedule_listener: Callable[[datetime], None] | None = None
+
+    def set_schedule_listener(self, listener: Callable[[datetime], None] | None) -> None:
+        """Register a callback told whenever a workflow is scheduled for a later check."""
+        self._schedule_listener = listener
+
+    async def _schedule(self, run: _Execution, at: datetime) -> None:
+        """Put the workflow in WAITING until *at* and checkpoint it."""
+        run.workflow.status = WorkflowStatus.WAITING
+        run.workflow.next_check_at = at
+        if await run.checkpoint(self._repo) and self._schedule_listener is not None:
+            self._schedule_listener(at)
 
     async def start(
         self,
@@ -67,25 +117,24 @@ class WorkflowEngine:
             state=params,
             created_at=now,
         )
-        await self._repo.create(wf)
-
-        if steps:
-            for i, step_def in enumerate(steps):
-                step = WorkflowStep(
-                    id=str(uuid.uuid4()),
-                    workflow_id=workflow_id,
-                    step_index=i,
-                    step_type=StepType(step_def["step_type"]),
-                    description=step_def.get("description", ""),
-                    input=step_def.get("input"),
-                )
-                await self._repo.create_step(step)
+        step_models = [
+            WorkflowStep(
+                id=str(uuid.uuid4()),
+                workflow_id=workflow_id,
+                step_index=i,
+                step_type=StepType(step_def["step_type"]),
+                description=step_def.get("description", ""),
+                input=step_def.get("input"),
+            )
+            for i, step_def in enumerate(steps or [])
+        ]
+        await self._repo.create(wf, step_models)
 
         logger.info(
             "Workflow %s (%s) created with %d steps",
             workflow_id,
             workflow_type,
-            len(steps or []),
+            len(step_models),
         )
         return wf
 
@@ -129,7 +178,7 @@ class WorkflowEngine:
 
     async def resume(self, workflow_id: str, trigger: Trigger) -> None:
         """Resume a waiting or pending workflow with the given trigger."""
-        wf = await self._repo.get(workflow_id)
+        wf = await self._repo.get_with_steps(workflow_id)
         if wf is None:
             logger.warning("Workflow %s not found for resume", workflow_id)
             return
@@ -140,70 +189,20 @@ class WorkflowEngine:
             )
             return
 
-        await self._repo.update_status(workflow_id, WorkflowStatus.RUNNING)
-
-        state = dict(wf.state)
-        state[f"trigger_{wf.current_step}"] = trigger.payload
-        wf.state = state  # keep in-memory copy in sync for step execution
-        await self._repo.save_checkpoint(workflow_id, state=state)
-
-        # Execute the current step with timeout enforcement
-        steps = await self._repo.get_steps(workflow_id)
-        if wf.current_step < len(steps):
-            step = steps[wf.current_step]
-
-            # Handle CONDITION steps by evaluating the branch immediately
-            if step.step_type == StepType.CONDITION:
-                condition = step.input or {}
-                target_step = self._check_condition(state, condition)
-                await self._repo.update_step_status(
-                    step.id,
-                    StepStatus.COMPLETED,
-                    output={"target_step": target_step},
-                    completed_at=datetime.now(UTC),
-                )
-                await self._repo.save_checkpoint(
-                    workflow_id, current_step=target_step
-                )
-                logger.info(
-                    "Condition step %d branched to step %d",
-                    wf.current_step,
-                    target_step,
-                )
-                return
-
-            await self._run_step_with_timeout(step, wf)
+        wf.status = WorkflowStatus.RUNNING
+        wf.state = {**wf.state, f"trigger_{wf.current_step}": trigger.payload}
+        await self._advance_workflow(_Execution(wf), wf.current_step)
 
     async def _execute_step(self, step: WorkflowStep, workflow: Workflow) -> dict:
         """Execute a single workflow step using registered handlers.
 
-        Dispatches to the handler registered for ``step.step_type``.
-        Steps of type ``wait_webhook`` / ``wait_human`` / ``wait_poll``
-        transition to WAITING without executing — they resume on trigger.
+        Dispatches to the handler registered for ``step.step_type``.  Steps
+        of type ``wait_webhook`` / ``wait_human`` / ``wait_poll`` only reach
+        here once their trigger has arrived, and complete with its payload.
         """
-        await self._repo.update_step_status(
-            step.id,
-            StepStatus.RUNNING,
-            started_at=datetime.now(UTC),
-        )
-
-        # Wait-type steps: when being *resumed* (trigger arrived), the step
-        # is done.  When first encountered during auto-advance, they pause.
-        if step.step_type in (
-            StepType.WAIT_WEBHOOK,
-            StepType.WAIT_HUMAN,
-            StepType.WAIT_POLL,
-        ):
-            # Check if a trigger payload exists for this step (set by resume())
-            trigger_key = f"trigger_{step.step_index}"
-            if trigger_key in (workflow.state or {}):
-                # Trigger already received — the wait is satisfied
-                return {"status": "completed", "trigger": workflow.state[trigger_key]}
-            # No trigger yet — pause
-            await self._repo.update_step_status(step.id, StepStatus.WAITING)
-            await self._repo.update_status(workflow.id, WorkflowStatus.WAITING)
-            logger.info("Step %s (%s) waiting for trigger", step.id, step.step_type)
-            return {"status": "waiting"}
+        if step.step_type in _WAIT_STEP_TYPES:
+            trigger = (workflow.state or {}).get(f"trigger_{step.step_index}")
+            return {"status": "completed", "trigger": trigger}
 
         handler = self._step_handlers.get(step.step_type.value)
         if handler is None:
@@ -216,118 +215,112 @@ class WorkflowEngine:
 
         return await handler(step, workflow)
 
-    async def _run_step_with_timeout(
-        self, step: WorkflowStep, workflow: Workflow
-    ) -> None:
-        """Wrap step execution in asyncio.wait_for with retry on timeout."""
-        timeout = step.timeout_seconds if hasattr(step, "timeout_seconds") else 300
-        max_retries = step.max_retries if hasattr(step, "max_retries") else 0
-        retry_count = step.retry_count if hasattr(step, "retry_count") else 0
+    async def _run_step_with_timeout(self, step: WorkflowStep, run: _Execution) -> bool:
+        """Run *step* under its timeout, retrying with backoff on timeout.
+
+        Returns ``True`` when the step completed and the workflow should move
+        on; otherwise the workflow has been checkpointed as waiting or failed.
+        """
+        workflow = run.workflow
+        run.update_step(step, StepStatus.RUNNING, started_at=datetime.now(UTC))
+        # Persist the transition into this step before running a handler, so
+        # a crash mid-step resumes here rather than at the previous step.
+        if step.step_type not in _WAIT_STEP_TYPES and not await run.checkpoint(self._repo):
+            return False
 
         try:
             result = await asyncio.wait_for(
                 self._execute_step(step, workflow),
-                timeout=timeout,
-            )
-
-            # If the step transitioned to WAITING, don't mark completed
-            if result.get("status") == "waiting":
-                return
-
-            await self._repo.update_step_status(
-                step.id,
-                StepStatus.COMPLETED,
-                output=result,
-                completed_at=datetime.now(UTC),
+                timeout=step.timeout_seconds,
             )
-
-            # Advance to next step
-            await self._advance_workflow(workflow)
-
         except TimeoutError:
-            retry_count += 1
-            if retry_count < max_retries:
+            retry_count = step.retry_count + 1
+            if retry_count < step.max_retries:
                 backoff = min(30 * (2 ** retry_count), 3600)
                 # Reschedule the workflow for retry
-                await self._repo.save_checkpoint(
-                    workflow.id,
-                    next_check_at=datetime.now(UTC) + timedelta(seconds=backoff),
-                )
-                await self._repo.update_step_status(
-                    step.id,
-                    StepStatus.PENDING,
-                )
-                await self._repo.update_status(
-                    workflow.id, WorkflowStatus.WAITING
-                )
+                run.update_step(step, StepStatus.PENDING, retry_count=retry_count)
+                await self._schedule(run, datetime.now(UTC) + timedelta(seconds=backoff))
                 logger.warning(
                     "Step %s timed out, retry %d/%d (backoff %ds)",
-                    step.id, retry_count, max_retries, backoff,
+                    step.id, retry_count, step.max_retries, backoff,
                 )
             else:
                 error_msg = (
-                    f"Timed out after {timeout}s "
-                    f"(exhausted {max_retries} retries)"
+                    f"Timed out after {step.timeout_seconds}s "
+                    f"(exhausted {step.max_retries} retries)"
                 )
-                await self._repo.update_step_status(
-                    step.id,
-                    StepStatus.FAILED,
-                    error=error_msg,
-                    completed_at=datetime.now(UTC),
-                )
-                await self._repo.update_status(
-                    workflow.id,
-                    WorkflowStatus.FAILED,
-                    error=error_msg,
-                    completed_at=datetime.now(UTC),
+                now = datetime.now(UTC)
+                run.update_step(
+                    step, StepStatus.FAILED, retry_count=retry_count,
+                    error=error_msg, completed_at=now,
                 )
+                workflow.status = WorkflowStatus.FAILED
+                workflow.error = error_msg
+                workflow.completed_at = now
+                await run.checkpoint(self._repo)
                 logger.error("Step %s failed after all retries", step.id)
+            return False
 
-    async def _advance_workflow(self, workflow: Workflow) -> None:
-        """Move to the next step or complete the workflow."""
-        steps = await self._repo.get_steps(workflow.id)
-        next_step = workflow.current_step + 1
-
-        if next_step >= len(steps):
-            # All steps done
-            await self._repo.update_status(
-                workflow.id,
-                WorkflowStatus.COMPLETED,
-                completed_at=datetime.now(UTC),
-            )
-            logger.info("Workflow %s completed all %d steps", workflow.id, len(steps))
-            return
+        run.update_step(
+            step, StepStatus.COMPLETED, output=result, completed_at=datetime.now(UTC)
+        )
+        return True
 
-        await self._repo.save_checkpoint(workflow.id, current_step=next_step)
-
-        # Auto-execute next step if it's not a wait type
-        next_step_obj = steps[next_step]
-        if next_step_obj.step_type == StepType.CONDITION:
-            state = (await self._repo.get(workflow.id)).state or {}
-            target = self._check_condition(state, next_step_obj.input or {})
-            await self._repo.update_step_status(
-                next_step_obj.id,
-                StepStatus.COMPLETED,
-                output={"target_step": target},
-                completed_at=datetime.now(UTC),
-            )
-            await self._repo.save_checkpoint(workflow.id, current_step=target)
-            # Recurse to advance past the condition
-            workflow.current_step = target
-            await self._advance_workflow(workflow)
-        elif next_step_obj.step_type not in (
-            StepType.WAIT_WEBHOOK, StepType.WAIT_HUMAN, StepType.WAIT_POLL,
-        ):
-            # Continue executing automatically
-            workflow.current_step = next_step
-            await self._run_step_with_timeout(next_step_obj, workflow)
-        else:
-            # Wait-type step — set workflow to WAITING
-            await self._repo.update_status(workflow.id, WorkflowStatus.WAITING)
-            logger.info(
-                "Workflow %s waiting at step %d (%s)",
-                workflow.id, next_step, next_step_obj.step_type,
-            )
+    async def _advance_workflow(self, run: _Execution, index: int) -> None:
+        """Run steps from *index* until the workflow waits, fails, or completes.
+
+        Condition steps and triggered wait steps are settled in memory; each
+        transition is persisted together with the step that follows it, as
+        one checkpoint before that step's handler runs.
+        """
+        workflow = run.workflow
+        for transitions in range(_MAX_TRANSITIONS_PER_PASS + 1):
+            if index >= len(run.steps):
+                workflow.status = WorkflowStatus.COMPLETED
+                workflow.completed_at = datetime.now(UTC)
+                if await run.checkpoint(self._repo):
+                    logger.info(
+                        "Workflow %s completed all %d steps", workflow.id, len(run.steps)
+                    )
+                return
+
+            step = run.steps[index]
+            workflow.current_step = index
+            is_wait = step.step_type in _WAIT_STEP_TYPES
+
+            if is_wait and f"trigger_{index}" not in workflow.state:
+                run.update_step(step, StepStatus.WAITING)
+                workflow.status = WorkflowStatus.WAITING
+                if await run.checkpoint(self._repo):
+                    logger.info(
+                        "Workflow %s waiting at step %d (%s)",
+                        workflow.id, index, step.step_type,
+                    )
+                return
+
+            if transitions == _MAX_TRANSITIONS_PER_PASS and not is_wait:
+                # Hand back to the scheduler; it resumes at this step.
+                await self._schedule(run, datetime.now(UTC))
+                logger.info(
+                    "Workflow %s yielded after %d transitions", workflow.id, transitions
+                )
+                return
+
+            if step.step_type == StepType.CONDITION:
+                target = self._check_condition(workflow.state, step.input or {})
+                run.update_step(
+                    step,
+                    StepStatus.COMPLETED,
+                    output={"target_step": target},
+                    completed_at=datetime.now(UTC),
+                )
+                logger.info("Condition step %d branched to step %d", index, target)
+                index = target
+                continue
+
+            if not await self._run_step_with_timeout(step, run):
+                return
+            index += 1
 
     async def cancel(self, workflow_id: str) -> None:
         """Cancel a workflow, setting its status and completed_at timestamp."""
@@ -339,17 +332,16 @@ class WorkflowEngine:
 
     async def get_status(self, workflow_id: str) -> dict[str, Any] | None:
         """Return a status summary dict for a workflow, or None if not found."""
-        wf = await self._repo.get(workflow_id)
+        wf = await self._repo.get_with_steps(workflow_id)
         if wf is None:
             return None
 
-        steps = await self._repo.get_steps(workflow_id)
         return {
             "id": wf.id,
             "workflow_type": wf.workflow_type,
             "status": wf.status.value,
             "current_step": wf.current_step,
-            "total_steps": len(steps),
+            "total_steps": len(wf.steps),
             "created_at": wf.created_at.isoformat(),
             "started_at": wf.started_at.isoformat() if wf.started_at else None,
             "completed_at": wf.completed_at.isoformat() if wf.completed_at else None,
@@ -12,10 +12,10 @@ from __future__ import annotations
 
 import json
 import logging
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import and_, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from flydesk.models.workflow import WorkflowRow, WorkflowStepRow, WorkflowWebhookRow
@@ -59,8 +59,8 @@ class WorkflowRepository:
 
     # -- Workflow CRUD -------------------------------------------------------
 
-    async def create(self, wf: Workflow) -> None:
-        """Persist a new workflow record."""
+    async def create(self, wf: Workflow, steps: list[WorkflowStep] | None = None) -> None:
+        """Persist a new workflow record together with its *steps*, in one transaction."""
         async with self._session_factory() as session:
             row = WorkflowRow(
                 id=wf.id,
@@ -79,8 +79,25 @@ class WorkflowRepository:
                 next_check_at=wf.next_check_at,
             )
             session.add(row)
+            if steps:
+                session.add_all([self._step_to_row(step) for step in steps])
             await session.commit()
 
+    async def get_with_steps(self, workflow_id: str) -> Workflow | None:
+        """Retrieve a workflow with ``steps`` populated, in one session."""
+        async with self._session_factory() as session:
+            row = await session.get(WorkflowRow, workflow_id)
+            if row is None:
+                return None
+            wf = self._row_to_workflow(row)
+            result = await session.execute(
+                select(WorkflowStepRow)
+                .where(WorkflowStepRow.workflow_id == workflow_id)
+                .order_by(WorkflowStepRow.step_index.asc())
+            )
+            wf.steps = [self._row_to_step(r) for r in result.scalars().all()]
+            return wf
+
     async def get(self, workflow_id: str) -> Workflow | None:
         """Retrieve a workflow by ID, or ``None`` if not found."""
         async with self._session_factory() as session:
@@ -126,6 +143,107 @@ class WorkflowRepository:
             result = await session.execute(stmt)
             return [self._row_to_workflow(r) for r in result.scalars().all()]
 
+    # -- Scheduling leases ----------------------------------------------------
+
+    @staticmethod
+    def _due_condition(now: datetime) -> Any:
+        return and_(
+            WorkflowRow.status == WorkflowStatus.WAITING.value,
+            WorkflowRow.next_check_at <= now,
+            or_(WorkflowRow.lease_expires_at.is_(None), WorkflowRow.lease_expires_at < now),
+        )
+
+    async def claim_due_for_poll(
+        self,
+        worker_id: str,
+        *,
+        limit: int,
+        lease_seconds: float,
+    ) -> list[Workflow]:
+        """Lease up to *limit* due WAITING workflows to *worker_id*.
+
+        Workflows are claimed earliest ``next_check_at`` first.  On PostgreSQL
+        the candidate rows are locked with ``FOR UPDATE SKIP LOCKED`` so
+        concurrent schedulers take disjoint pages; on SQLite the conditional
+        UPDATE ensures a workflow leased by another scheduler is not returned.
+        """
+        now = datetime.now(timezone.utc)
+        expires = now + timedelta(seconds=lease_seconds)
+        due = self._due_condition(now)
+        async with self._session_factory() as session:
+            result = await session.execute(
+                select(WorkflowRow.id)
+                .where(due)
+                .order_by(WorkflowRow.next_check_at.asc())
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            ids = list(result.scalars().all())
+            if not ids:
+                await session.rollback()
+                return []
+            await session.execute(
+                update(WorkflowRow)
+                .where(WorkflowRow.id.in_(ids), due)
+                .values(lease_owner=worker_id, lease_expires_at=expires)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+            result = await session.execute(
+                select(WorkflowRow)
+                .where(
+                    WorkflowRow.id.in_(ids),
+                    WorkflowRow.lease_owner == worker_id,
+                    WorkflowRow.lease_expires_at == expires,
+                )
+                .order_by(WorkflowRow.next_check_at.asc())
+                .execution_options(populate_existing=True)
+            )
+            return [self._row_to_workflow(r) for r in result.scalars().all()]
+
+    async def release_lease(self, workflow_id: str, worker_id: str) -> None:
+        """Clear *worker_id*'s scheduling lease on a workflow."""
+        async with self._session_factory() as session:
+            await session.execute(
+                update(WorkflowRow)
+                .where(WorkflowRow.id == workflow_id, WorkflowRow.lease_owner == worker_id)
+                .values(lease_owner=None, lease_expires_at=None)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+
+    async def next_due_at(self) -> datetime | None:
+        """Earliest time at which a WAITING workflow becomes claimable."""
+        now = datetime.now(timezone.utc)
+        waiting = WorkflowRow.status == WorkflowStatus.WAITING.value
+        async with self._session_factory() as session:
+            next_check = (
+                await session.execute(
+                    select(func.min(WorkflowRow.next_check_at)).where(
+                        waiting,
+                        or_(
+                            WorkflowRow.lease_expires_at.is_(None),
+                            WorkflowRow.lease_expires_at < now,
+                        ),
+                    )
+                )
+            ).scalar_one_or_none()
+            lease_expiry = (
+                await session.execute(
+                    select(func.min(WorkflowRow.lease_expires_at)).where(
+                        waiting,
+                        WorkflowRow.next_check_at.is_not(None),
+                        WorkflowRow.lease_expires_at >= now,
+                    )
+                )
+            ).scalar_one_or_none()
+        candidates = [
+            t if t.tzinfo is not None else t.replace(tzinfo=timezone.utc)
+            for t in (next_check, lease_expiry)
+            if t is not None
+        ]
+        return min(candidates, default=None)
+
     async def update_status(
         self,
         workflow_id: str,
@@ -175,28 +293,62 @@ class WorkflowRepository:
                 row.next_check_at = next_check_at
             await session.commit()
 
+    async def save_transition(
+        self, wf: Workflow, steps: list[WorkflowStep] | None = None
+    ) -> bool:
+        """Write the in-memory state of *wf* and changed *steps* in one transaction.
+
+        Returns ``False`` without writing anything if the workflow is missing
+        or was cancelled since it was loaded, so the caller can stop.
+        """
+        async with self._session_factory() as session:
+            row = await session.get(WorkflowRow, wf.id)
+            if row is None:
+                logger.warning("save_transition: workflow %s not found", wf.id)
+                return False
+            if row.status == WorkflowStatus.CANCELLED.value:
+                return False
+            row.status = wf.status.value
+            row.current_step = wf.current_step
+            row.state_json = _to_json(wf.state)
+            row.result_json = _to_json(wf.result)
+            row.error = wf.error
+            row.started_at = wf.started_at
+            row.completed_at = wf.completed_at
+            row.next_check_at = wf.next_check_at
+            if steps:
+                result = await session.execute(
+                    select(WorkflowStepRow).where(
+                        WorkflowStepRow.id.in_([step.id for step in steps])
+                    )
+                )
+                rows = {r.id: r for r in result.scalars().all()}
+                for step in steps:
+                    step_row = rows.get(step.id)
+                    if step_row is None:
+                        logger.warning("save_transition: step %s not found", step.id)
+                        continue
+                    step_row.status = step.status.value
+                    step_row.output_json = _to_json(step.output)
+                    step_row.error = step.error
+                    step_row.started_at = step.started_at
+                    step_row.completed_at = step.completed_at
+                    step_row.retry_count = step.retry_count
+            await session.commit()
+            return True
+
     # -- Steps ----------------------------------------------------------------
 
     async def create_step(self, step: WorkflowStep) -> None:
         """Persist a new workflow step."""
+        await self.create_steps([step])
+
+    async def create_steps(self, steps: list[WorkflowStep]) -> None:
+        """Persist several workflow steps in one transaction."""
+        if not steps:
+            return
         async with self._session_factory() as session:
-            row = WorkflowStepRow(
-                id=step.id,
-                workflow_id=step.workflow_id,
-                step_index=step.step_index,
-                step_type=step.step_type.value,
-                description=step.description,
-                status=step.status.value,
-                input_json=_to_json(step.input),
-                output_json=_to_json(step.output),
-                error=step.error,
-                started_at=step.started_at,
-                completed_at=step.completed_at,
-                timeout_seconds=step.timeout_seconds,
-                max_retries=step.max_retries,
-                retry_count=step.retry_count,
-            )
-            session.add(row)
+            session.add_all([self._step_to_row(step) for step in steps])
             await session.commit()
 
     async def get_steps(self, workflow_id: str) -> list[WorkflowStep]:
@@ -298,6 +450,25 @@ class WorkflowRepository:
             next_check_at=row.next_check_at,
         )
 
+    @staticmethod
+    def _step_to_row(step: WorkflowStep) -> WorkflowStepRow:
+        return WorkflowStepRow(
+            id=step.id,
+            workflow_id=step.workflow_id,
+            step_index=step.step_index,
+            step_type=step.step_type.value,
+            description=step.description,
+            status=step.status.value,
+            input_json=_to_json(step.input),
+            output_json=_to_json(step.output),
+            error=step.error,
+            started_at=step.started_at,
+            completed_at=step.completed_at,
+            timeout_seconds=step.timeout_seconds,
+            max_retries=step.max_retries,
+            retry_count=step.retry_count,
+        )
+
     @staticmethod
     def _row_to_step(row: WorkflowStepRow) -> WorkflowStep:
         return WorkflowStep(
@@ -6,50 +6,100 @@
 #
 #     http://www.apache.org/licenses/LICENSE-2.0
 
-"""Periodic scheduler for polling-based workflow steps."""
+"""Timer-driven scheduler for polling-based workflow steps."""
 
 from __future__ import annotations
 
 import asyncio
 import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
 
 from flydesk.workflows.engine import WorkflowEngine
-from flydesk.workflows.models import Trigger, TriggerType
+from flydesk.workflows.models import Trigger, TriggerType, Workflow
 from flydesk.workflows.repository import WorkflowRepository
 
 logger = logging.getLogger(__name__)
 
+# Minimum pause before re-checking a workflow that is still due right after
+# a tick, so one that keeps returning to WAITING cannot spin the loop.
+_MIN_RECHECK_SECONDS = 1.0
+
 
 class WorkflowScheduler:
+    """Resumes WAITING workflows when their ``next_check_at`` comes due.
+
+    Instead of waking on a fixed interval, the scheduler sleeps until the
+    earliest ``next_check_at`` in the database and is woken early by
+    :meth:`wake` when the engine schedules an earlier check.  Sleeps are
+    capped at *interval_seconds* so checks scheduled by other replicas are
+    still noticed.
+
+    Due workflows are claimed in pages of *page_size* under a lease, so
+    several replicas can share a backlog without resuming the same workflow
+    twice, and resumed concurrently, at most *max_concurrency* at a time.
+
+    Parameters
+    ----------
+    interval_seconds:
+        Longest the scheduler sleeps without checking the database.
+    page_size:
+        Workflows claimed per database round trip.
+    max_concurrency:
+        Workflows resumed at the same time.
+    lease_seconds:
+        How long a claimed workflow is reserved for this scheduler.
+    """
+
     def __init__(
         self,
         repo: WorkflowRepository,
         engine: WorkflowEngine,
         *,
         interval_seconds: int = 30,
+        page_size: int = 100,
+        max_concurrency: int = 10,
+        lease_seconds: int = 300,
     ) -> None:
         self._repo = repo
         self._engine = engine
         self._interval = interval_seconds
+        self._page_size = max(1, page_size)
+        self._max_concurrency = max(1, max_concurrency)
+        self._lease_seconds = lease_seconds
+        self._worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._slots = asyncio.Semaphore(self._max_concurrency)
+        self._inflight: set[asyncio.Task[None]] = set()
+        self._wakeup = asyncio.Event()
+        self._next_wakeup: datetime | None = None
         self._running = False
         self._task: asyncio.Task | None = None
 
     async def start(self) -> None:
         self._running = True
         self._task = asyncio.create_task(self._loop())
-        logger.info("WorkflowScheduler started (interval=%ds)", self._interval)
+        logger.info(
+            "WorkflowScheduler started (max_interval=%ds, concurrency=%d)",
+            self._interval, self._max_concurrency,
+        )
 
     async def stop(self) -> None:
         self._running = False
-        if self._task is not None:
-            self._task.cancel()
-            try:
-                await self._task
-            except asyncio.CancelledError:
-                pass
-            self._task = None
+        tasks = [t for t in (self._task, *self._inflight) if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._inflight.clear()
         logger.info("WorkflowScheduler stopped")
 
+    def wake(self, at: datetime | None = None) -> None:
+        """Re-check the schedule now if *at* is earlier than the planned wakeup."""
+        if at is None or self._next_wakeup is None or at < self._next_wakeup:
+            self._wakeup.set()
+
     async def _loop(self) -> None:
         while self._running:
             try:
@@ -58,12 +108,59 @@ class WorkflowScheduler:
                 break
             except Exception:
                 logger.exception("WorkflowScheduler tick failed")
-            await asyncio.sleep(self._interval)
+                await asyncio.sleep(min(self._interval, 5))
+                continue
+            if self._running:
+                await self._sleep_until_due()
+
+    async def _sleep_until_due(self) -> None:
+        """Sleep until the next workflow is due, at most ``interval_seconds``."""
+        self._wakeup.clear()
+        now = datetime.now(timezone.utc)
+        delay = float(self._interval)
+        next_due = await self._repo.next_due_at()
+        if next_due is not None:
+            until_due = (next_due - now).total_seconds()
+            delay = min(delay, until_due if until_due > 0 else _MIN_RECHECK_SECONDS)
+        self._next_wakeup = now + timedelta(seconds=delay)
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+        except (asyncio.TimeoutError, TimeoutError):
+            pass
+        finally:
+            self._next_wakeup = None
 
-    async def _tick(self) -> None:
-        due = await self._repo.list_due_for_poll()
-        for wf in due:
-            trigger = Trigger(
-                trigger_type=TriggerType.POLL, step_index=wf.current_step
+    async def _tick(self) -> int:
+        """Claim due workflows page by page and start resuming them.
+
+        Returns the number of workflows dispatched.  A page is claimed only
+        once the previous one has been handed to free resume slots.
+        """
+        dispatched = 0
+        while True:
+            due = await self._repo.claim_due_for_poll(
+                self._worker_id, limit=self._page_size, lease_seconds=self._lease_seconds
             )
+            for wf in due:
+                await self._slots.acquire()
+                task = asyncio.create_task(self._resume(wf))
+                self._inflight.add(task)
+                task.add_done_callback(self._inflight.discard)
+            dispatched += len(due)
+            if len(due) < self._page_size:
+                return dispatched
+
+    async def _resume(self, wf: Workflow) -> None:
+        try:
+            trigger = Trigger(trigger_type=TriggerType.POLL, step_index=wf.current_step)
             await self._engine.resume(wf.id, trigger)
+        except Exception:
+            # Keep the lease: the workflow is retried once it expires.
+            logger.exception("Failed to resume workflow %s", wf.id)
+            return
+        finally:
+            self._slots.release()
+        try:
+            await self._repo.release_lease(wf.id, self._worker_id)
+        except Exception:
+            logger.warning("Could not release lease on workflow %s", wf.id, exc_info=True)
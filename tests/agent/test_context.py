@@ -237,3 +237,28 @@ class TestContextEnricher:
         assert result.relevant_entities == []
         assert result.knowledge_snippets == []
         assert result.conversation_history == []
+
+    async def test_enrich_embeds_message_once_for_all_lookups(self, knowledge_graph, retriever):
+        provider = MagicMock()
+        provider.embed = AsyncMock(return_value=[[0.1, 0.2]])
+        memory_repo = MagicMock()
+        memory_repo.search = AsyncMock(return_value=[])
+        enricher = ContextEnricher(
+            knowledge_graph=knowledge_graph,
+            retriever=retriever,
+            memory_repo=memory_repo,
+            embedding_provider=provider,
+        )
+
+        await enricher.enrich("refund policy", user_id="user-1")
+
+        provider.embed.assert_awaited_once_with(["refund policy"])
+        knowledge_graph.find_relevant_entities.assert_awaited_once_with(
+            "refund policy", limit=5, query_embedding=[0.1, 0.2]
+        )
+        retriever.retrieve.assert_awaited_once_with(
+            "refund policy", top_k=5, tag_filter=None, query_embedding=[0.1, 0.2]
+        )
+        memory_repo.search.assert_awaited_once_with(
+            "user-1", "refund policy", query_embedding=[0.1, 0.2], limit=10, recent=5
+        )
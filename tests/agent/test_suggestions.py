@@ -0,0 +1,158 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0
+
+"""Tests for precomputed chat suggestions."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from flydesk.agent.suggestions import SuggestionService
+from flydesk.knowledge.membership import set_document_workspaces
+from flydesk.models.base import Base
+from flydesk.models.catalog import ExternalSystemRow
+from flydesk.models.knowledge_base import KnowledgeDocumentRow
+from flydesk.models.process import BusinessProcessRow
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+async def service(session_factory):
+    svc = SuggestionService(session_factory, ttl_seconds=3600)
+    yield svc
+    await svc.stop()
+
+
+async def _add_system(session_factory, system_id: str, workspace_id: str | None = None):
+    async with session_factory() as session:
+        session.add(
+            ExternalSystemRow(
+                id=system_id,
+                name=system_id.upper(),
+                description="",
+                base_url="https://example.com",
+                workspace_id=workspace_id,
+                metadata_="{}",
+            )
+        )
+        await session.commit()
+
+
+async def _add_document(session_factory, doc_id: str, workspace_ids: list[str] | None = None):
+    async with session_factory() as session:
+        session.add(
+            KnowledgeDocumentRow(
+                id=doc_id,
+                title=doc_id,
+                content="x",
+                workspace_ids=json.dumps(workspace_ids or []),
+                tags="[]",
+                metadata_="{}",
+            )
+        )
+        await set_document_workspaces(session, doc_id, workspace_ids)
+        await session.commit()
+
+
+async def _settle(service: SuggestionService) -> None:
+    while service._refreshing:
+        await asyncio.sleep(0)
+
+
+def _titles(items) -> list[str]:
+    return [item.title for item in items]
+
+
+class TestSuggestionService:
+    async def test_renders_from_counts(self, service, session_factory):
+        for i in range(5):
+            await _add_system(session_factory, f"s{i}")
+        await _add_document(session_factory, "d1")
+        async with session_factory() as session:
+            session.add(BusinessProcessRow(id="p1", name="Onboarding"))
+            await session.commit()
+
+        items = await service.get(is_admin=False)
+
+        assert _titles(items) == [
+            "Explore Systems", "Knowledge Base", "Business Processes", "Capabilities",
+        ]
+        assert items[0].description.startswith("5 registered:")
+        assert items[0].description.endswith("and 2 more")
+        assert items[1].description == "Search across 1 knowledge document"
+        assert items[2].description.endswith("e.g. Onboarding")
+
+    async def test_admin_variant_adds_health_and_audit(self, service, session_factory):
+        await _add_system(session_factory, "s1")
+        await _add_document(session_factory, "d1")
+        async with session_factory() as session:
+            session.add(BusinessProcessRow(id="p1", name="Onboarding"))
+            await session.commit()
+
+        items = await service.get(is_admin=True)
+
+        assert _titles(items) == [
+            "Explore Systems", "Knowledge Base", "Business Processes",
+            "System Health", "Audit Events", "Capabilities",
+        ]
+
+    async def test_cached_snapshot_serves_without_queries(self, service, session_factory):
+        await service.get(is_admin=False)
+
+        with patch.object(service, "_load_stats", side_effect=AssertionError("queried")):
+            await service.get(is_admin=False)
+            await service.get(is_admin=True)
+
+    async def test_invalidate_rebuilds_snapshot(self, service, session_factory):
+        assert _titles(await service.get(is_admin=False)) == ["Capabilities"]
+
+        await _add_document(session_factory, "d1")
+        assert _titles(await service.get(is_admin=False)) == ["Capabilities"]
+
+        service.invalidate()
+        await _settle(service)
+
+        assert _titles(await service.get(is_admin=False)) == ["Knowledge Base", "Capabilities"]
+
+    async def test_stale_snapshot_served_while_refreshing(self, session_factory):
+        service = SuggestionService(session_factory, ttl_seconds=0)
+        await service.get(is_admin=False)
+        await _add_system(session_factory, "s1")
+
+        # The stale snapshot is returned; the refresh happens behind it.
+        assert _titles(await service.get(is_admin=False)) == ["Capabilities"]
+        await _settle(service)
+        assert _titles(await service.get(is_admin=False))[0] == "Explore Systems"
+        await service.stop()
+
+    async def test_workspaces_are_separate(self, service, session_factory):
+        await _add_system(session_factory, "s1", workspace_id="ws-a")
+        await _add_document(session_factory, "d1", workspace_ids=["ws-b"])
+
+        assert _titles(await service.get(is_admin=False, workspace_id="ws-a")) == [
+            "Explore Systems", "Capabilities",
+        ]
+        assert _titles(await service.get(is_admin=False, workspace_id="ws-b")) == [
+            "Knowledge Base", "Capabilities",
+        ]
+
+    async def test_query_failure_returns_fallback(self, service):
+        with patch.object(service, "_load_stats", side_effect=RuntimeError("db down")):
+            items = await service.get(is_admin=True)
+
+        assert "System Health" in _titles(items)
+        assert service._snapshots == {}
@@ -10,13 +10,17 @@
 
 from __future__ import annotations
 
+import csv
+import io
+import json
 import os
 from datetime import datetime, timezone
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from httpx import ASGITransport, AsyncClient
 
+from flydesk.audit.logger import encode_cursor
 from flydesk.audit.models import AuditEvent, AuditEventType
 from flydesk.auth.models import UserSession
 
@@ -162,6 +166,7 @@ class TestQueryEvents:
             conversation_id=None,
             offset=0,
             limit=50,
+            cursor=None,
         )
 
     async def test_query_events_with_event_type_filter(
@@ -179,6 +184,7 @@ class TestQueryEvents:
             conversation_id=None,
             offset=0,
             limit=50,
+            cursor=None,
         )
 
     async def test_query_events_with_limit(self, admin_client, mock_audit_logger):
@@ -194,6 +200,7 @@ class TestQueryEvents:
             conversation_id=None,
             offset=0,
             limit=10,
+            cursor=None,
         )
 
     async def test_query_events_with_all_filters(
@@ -213,9 +220,79 @@ class TestQueryEvents:
             conversation_id=None,
             offset=0,
             limit=25,
+            cursor=None,
         )
 
 
+class TestCursorPagination:
+    async def test_full_page_returns_next_cursor(self, admin_client, mock_audit_logger):
+        event = _sample_event()
+        event.id = "evt-2"
+        event.timestamp = datetime(2026, 3, 1, tzinfo=timezone.utc)
+        mock_audit_logger.query.return_value = [event]
+
+        response = await admin_client.get("/api/audit/events?limit=1")
+
+        assert response.status_code == 200
+        assert response.headers["X-Next-Cursor"] == encode_cursor(event.timestamp, "evt-2")
+
+    async def test_partial_page_has_no_cursor(self, admin_client, mock_audit_logger):
+        mock_audit_logger.query.return_value = []
+        response = await admin_client.get("/api/audit/events?limit=5")
+        assert "X-Next-Cursor" not in response.headers
+
+    async def test_malformed_cursor_is_400(self, admin_client, mock_audit_logger):
+        mock_audit_logger.query.side_effect = ValueError("Invalid audit cursor: 'x'")
+        response = await admin_client.get("/api/audit/events?cursor=x")
+        assert response.status_code == 400
+
+
+class TestExportEvents:
+    @staticmethod
+    def _stream(events):
+        async def _iter(**kwargs):
+            for event in events:
+                yield event
+
+        return _iter
+
+    async def test_export_ndjson(self, admin_client, mock_audit_logger):
+        mock_audit_logger.iter_events = MagicMock(side_effect=self._stream([_sample_event()] * 2))
+
+        response = await admin_client.get("/api/audit/export?user_id=user-1")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["action"] for line in lines] == ["list_users", "list_users"]
+        assert mock_audit_logger.iter_events.call_args.kwargs["user_id"] == "user-1"
+
+    async def test_export_csv(self, admin_client, mock_audit_logger):
+        mock_audit_logger.iter_events = MagicMock(side_effect=self._stream([_sample_event()]))
+
+        response = await admin_client.get("/api/audit/export?format=csv")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 1
+        assert rows[0]["action"] == "list_users"
+        assert json.loads(rows[0]["detail"]) == {"args": {"page": 1}}
+
+    async def test_export_csv_neutralises_formulas(self, admin_client, mock_audit_logger):
+        event = _sample_event().model_copy(
+            update={"action": "=HYPERLINK(\"http://x\")", "user_agent": "@SUM(A1)"}
+        )
+        mock_audit_logger.iter_events = MagicMock(side_effect=self._stream([event]))
+
+        response = await admin_client.get("/api/audit/export?format=csv")
+
+        [row] = list(csv.DictReader(io.StringIO(response.text)))
+        assert row["action"] == "'=HYPERLINK(\"http://x\")"
+        assert row["user_agent"] == "'@SUM(A1)"
+        assert row["event_type"] == "tool_call"
+
+
 # ---------------------------------------------------------------------------
 # Admin-only access
 # ---------------------------------------------------------------------------
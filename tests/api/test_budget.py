@@ -13,6 +13,7 @@ def mock_request():
     request.app.state.config.budget_alert_warning = 0.8
     request.app.state.config.budget_alert_critical = 0.95
     request.app.state.settings_repo = AsyncMock()
+    request.app.state.spend_ledger = None
     return request
 
 
@@ -53,7 +54,20 @@ async def test_budget_status_unlimited():
     request.app.state.config = MagicMock()
     request.app.state.config.daily_budget_limit = 0.0
     request.app.state.settings_repo = AsyncMock()
+    request.app.state.spend_ledger = None
     request.app.state.settings_repo.get_app_setting.return_value = "0"
     result = await budget_status(request)
     assert result["status"] == "unlimited"
     assert result["percentage"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_budget_status_reads_spend_ledger(mock_request):
+    from flydesk.api.budget import budget_status
+
+    mock_request.app.state.spend_ledger = AsyncMock()
+    mock_request.app.state.spend_ledger.total.return_value = 90.0
+    result = await budget_status(mock_request)
+    assert result["spent_today"] == 90.0
+    assert result["status"] == "warning"
+    mock_request.app.state.settings_repo.get_app_setting.assert_not_called()
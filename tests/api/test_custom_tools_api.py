@@ -90,6 +90,7 @@ async def admin_client():
         async with AsyncClient(transport=transport, base_url="http://test") as ac:
             yield ac
 
+        await sandbox_executor.stop()
         await engine.dispose()
 
 
@@ -189,6 +190,7 @@ async def non_admin_client():
         async with AsyncClient(transport=transport, base_url="http://test") as ac:
             yield ac
 
+        await sandbox_executor.stop()
         await engine.dispose()
 
 
@@ -542,6 +542,38 @@ class TestImportRepos:
         assert data["items"][2]["path"] == "api.json"
         assert data["items"][2]["status"] == "queued"
 
+    async def test_import_without_paths_resolves_whole_branch(
+        self, client, mock_repo, mock_git_provider
+    ):
+        mock_repo.get_provider.return_value = _sample_provider_row()
+        mock_git_provider.list_tree = AsyncMock(
+            return_value=[
+                GitTreeEntry(path="README.md", sha="s1"),
+                GitTreeEntry(path="docs", sha="s2", type="tree"),
+                GitTreeEntry(path="docs/guide.md", sha="s3"),
+            ]
+        )
+        mock_git_provider.get_file_content = AsyncMock(
+            return_value=GitFileContent(path="f.md", sha="sha1", content="content", size=7)
+        )
+
+        with patch("flydesk.api.git_import.GitProviderFactory") as mock_factory:
+            mock_factory.create.return_value = mock_git_provider
+            response = await client.post(
+                "/api/git/prov-1/import",
+                json={
+                    "items": [
+                        {"owner": "octocat", "repo": "hello", "branch": "main", "paths": []}
+                    ]
+                },
+                params={"token": "ghp_test"},
+            )
+
+        assert response.status_code == 202
+        items = response.json()["items"]
+        assert [item["path"] for item in items] == ["README.md", "docs/guide.md"]
+        assert {item["status"] for item in items} == {"queued"}
+
     async def test_import_provider_not_found(self, client, mock_repo):
         mock_repo.get_provider.return_value = None
         response = await client.post(
@@ -11,6 +11,7 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import os
 from datetime import datetime, timedelta, timezone
 from unittest.mock import patch
@@ -66,6 +67,7 @@ async def client():
 
         app.dependency_overrides[get_job_repo] = lambda: job_repo
         app.dependency_overrides[get_job_runner] = lambda: job_runner
+        app.state.job_runner = job_runner
 
         transport = ASGITransport(app=app)
         async with AsyncClient(transport=transport, base_url="http://test") as ac:
@@ -283,6 +285,20 @@ class TestCancelExtendedToPaused:
         assert job.status == JobStatus.CANCELLED
 
 
+class TestJobsMetricsAPI:
+    async def test_metrics_report_queue_and_types(self, client):
+        """GET /api/jobs/metrics returns queue depth and per-type stats."""
+        ac, repo, runner = client
+        await runner.submit("test", {})
+
+        response = await ac.get("/api/jobs/metrics")
+        assert response.status_code == 200
+        body = response.json()
+        assert body["queued"] == 1
+        assert body["lanes"] == {"interactive": 1, "bulk": 0}
+        assert body["job_types"]["test"]["queued"] == 1
+
+
 class TestJobsStreamAPI:
     async def test_stream_not_found(self, client):
         """GET /api/jobs/{id}/stream returns 404 for unknown jobs."""
@@ -305,3 +321,39 @@ class TestJobsStreamAPI:
         text = response.text
         assert "event: job_progress" in text
         assert "event: done" in text
+
+    async def test_stream_never_moves_progress_backwards(self, client):
+        """Lagging database progress is not replayed after a newer live event."""
+        ac, repo, runner = client
+        await repo.create(_make_job("j-live", status=JobStatus.RUNNING, progress_pct=20))
+        hub = runner.progress_hub
+
+        async def _drive() -> None:
+            while hub.subscriber_count() == 0:
+                await asyncio.sleep(0.01)
+            hub.publish(
+                {
+                    "job_id": "j-live",
+                    "job_type": "indexing",
+                    "status": "running",
+                    "progress_pct": 60,
+                    "progress_message": "live",
+                }
+            )
+            # Let a few database polls see the stale 20% first.
+            await asyncio.sleep(0.2)
+            await repo.update_progress("j-live", 100, "Done")
+            await repo.update_status("j-live", JobStatus.COMPLETED, result={"ok": True})
+
+        with patch("flydesk.api.jobs._HUB_POLL_SECONDS", 0.05):
+            driver = asyncio.create_task(_drive())
+            response = await asyncio.wait_for(ac.get("/api/jobs/j-live/stream"), timeout=10)
+            await asyncio.wait_for(driver, timeout=1)
+
+        progress = [
+            json.loads(block.split("data: ", 1)[1])["progress_pct"]
+            for block in response.text.split("\n\n")
+            if block.startswith("event: job_progress")
+        ]
+        assert progress == [20, 60, 100]
+        assert "event: done" in response.text
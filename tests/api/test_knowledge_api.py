@@ -21,7 +21,14 @@ from httpx import ASGITransport, AsyncClient
 
 from flydesk.auth.models import UserSession
 from flydesk.knowledge.graph import Entity, EntityGraph, Relation
-from flydesk.knowledge.models import DocumentChunk, DocumentStatus, DocumentType, KnowledgeDocument
+from flydesk.knowledge.graph_query import GraphPath
+from flydesk.knowledge.models import (
+    DocumentChunk,
+    DocumentStatus,
+    DocumentType,
+    KnowledgeDocument,
+    KnowledgeDocumentSummary,
+)
 from flydesk.knowledge.queue import IndexingQueueProducer
 
 
@@ -56,6 +63,11 @@ def _sample_document(doc_id: str = "doc-1") -> KnowledgeDocument:
     )
 
 
+def _sample_summary(doc_id: str = "doc-1") -> KnowledgeDocumentSummary:
+    doc = _sample_document(doc_id)
+    return KnowledgeDocumentSummary(**doc.model_dump(exclude={"content"}))
+
+
 def _sample_chunk(chunk_id: str = "chunk-1", doc_id: str = "doc-1") -> DocumentChunk:
     return DocumentChunk(
         chunk_id=chunk_id,
@@ -91,6 +103,7 @@ def mock_doc_store():
     """Return an AsyncMock that mimics KnowledgeDocumentStore."""
     store = AsyncMock()
     store.list_documents = AsyncMock(return_value=[])
+    store.list_document_summaries = AsyncMock(return_value=([], 0))
     store.get_document = AsyncMock(return_value=None)
     store.update_document = AsyncMock(return_value=None)
     return store
@@ -223,13 +236,13 @@ async def non_admin_client(mock_indexer, mock_doc_store, mock_importer, mock_gra
 
 class TestListDocuments:
     async def test_list_documents_empty(self, admin_client, mock_doc_store):
-        mock_doc_store.list_documents.return_value = []
+        mock_doc_store.list_document_summaries.return_value = ([], 0)
         response = await admin_client.get("/api/knowledge/documents")
         assert response.status_code == 200
         assert response.json() == []
 
     async def test_list_documents_returns_items(self, admin_client, mock_doc_store):
-        mock_doc_store.list_documents.return_value = [_sample_document()]
+        mock_doc_store.list_document_summaries.return_value = ([_sample_summary()], 1)
         response = await admin_client.get("/api/knowledge/documents")
         assert response.status_code == 200
         data = response.json()
@@ -239,11 +252,23 @@ class TestListDocuments:
 
     async def test_list_documents_excludes_content(self, admin_client, mock_doc_store):
         """List endpoint should return metadata only, not full content."""
-        mock_doc_store.list_documents.return_value = [_sample_document()]
+        mock_doc_store.list_document_summaries.return_value = ([_sample_summary()], 1)
         response = await admin_client.get("/api/knowledge/documents")
         data = response.json()
         assert "content" not in data[0]
 
+    async def test_list_documents_paginated(self, admin_client, mock_doc_store):
+        mock_doc_store.list_document_summaries.return_value = ([_sample_summary("doc-3")], 7)
+        response = await admin_client.get(
+            "/api/knowledge/documents", params={"limit": 1, "offset": 2, "workspace_id": "ws-1"}
+        )
+        assert response.status_code == 200
+        assert response.headers["X-Total-Count"] == "7"
+        assert [d["id"] for d in response.json()] == ["doc-3"]
+        mock_doc_store.list_document_summaries.assert_awaited_once_with(
+            workspace_id="ws-1", limit=1, offset=2
+        )
+
 
 # ---------------------------------------------------------------------------
 # Get Document by ID
@@ -671,7 +696,45 @@ class TestEntityNeighborhood:
         )
         assert response.status_code == 200
         mock_graph.get_entity_neighborhood.assert_awaited_once_with(
-            "ent-1", depth=2
+            "ent-1", depth=2, relation_types=None, max_fanout=None
+        )
+
+    async def test_get_neighborhood_with_filters(self, admin_client, mock_graph):
+        mock_graph.get_entity_neighborhood.return_value = EntityGraph(
+            entities=[_sample_entity()], relations=[]
+        )
+        response = await admin_client.get(
+            "/api/knowledge/graph/entities/ent-1/neighborhood",
+            params={"relation_type": ["owns", "uses"], "max_fanout": 5},
+        )
+        assert response.status_code == 200
+        mock_graph.get_entity_neighborhood.assert_awaited_once_with(
+            "ent-1", depth=1, relation_types=["owns", "uses"], max_fanout=5
+        )
+
+
+# ---------------------------------------------------------------------------
+# Graph: Paths
+# ---------------------------------------------------------------------------
+
+
+class TestFindGraphPaths:
+    async def test_returns_paths(self, admin_client, mock_graph):
+        relation = Relation(
+            id="rel-1", source_id="ent-1", target_id="ent-2", relation_type="depends_on"
+        )
+        mock_graph.find_paths = AsyncMock(
+            return_value=[GraphPath(entity_ids=["ent-1", "ent-2"], relations=[relation])]
+        )
+        response = await admin_client.get(
+            "/api/knowledge/graph/paths", params={"source": "ent-1", "target": "ent-2"}
+        )
+        assert response.status_code == 200
+        [path] = response.json()
+        assert path["entity_ids"] == ["ent-1", "ent-2"]
+        assert path["relations"][0]["label"] == "depends on"
+        mock_graph.find_paths.assert_awaited_once_with(
+            "ent-1", "ent-2", max_depth=3, relation_types=None, max_fanout=None, limit=10
         )
 
 
@@ -11,8 +11,9 @@ from datetime import datetime, timezone
 import pytest
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
-from flydesk.audit.logger import AuditLogger
+from flydesk.audit.logger import AuditLogger, decode_cursor, encode_cursor
 from flydesk.audit.models import AuditEvent, AuditEventType
+from flydesk.models.audit import AuditEventRow
 from flydesk.models.base import Base
 
 
@@ -235,3 +236,66 @@ class TestAuditLogger:
         assert result.risk_level == "write"
         assert result.ip_address == "192.168.1.1"
         assert result.user_agent == "TestAgent/1.0"
+
+
+async def _seed_rows(session_factory, count: int, *, same_time: bool = False) -> None:
+    """Insert *count* events, optionally all sharing one timestamp."""
+    base = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    async with session_factory() as session:
+        for i in range(count):
+            session.add(
+                AuditEventRow(
+                    id=f"evt-{i:02d}",
+                    event_type="tool_call" if i % 2 else "auth_login",
+                    user_id="user-1",
+                    action=f"action-{i}",
+                    detail="{}",
+                    created_at=base if same_time else base.replace(minute=i),
+                )
+            )
+        await session.commit()
+
+
+class TestKeysetPagination:
+    async def _walk(self, logger, **filters) -> list[str]:
+        seen: list[str] = []
+        cursor = None
+        while True:
+            page = await logger.query(limit=3, cursor=cursor, **filters)
+            seen.extend(e.id for e in page)
+            if len(page) < 3:
+                return seen
+            cursor = encode_cursor(page[-1].timestamp, page[-1].id)
+
+    async def test_pages_cover_every_event_once_newest_first(self, logger, session_factory):
+        await _seed_rows(session_factory, 10)
+
+        assert await self._walk(logger) == [f"evt-{i:02d}" for i in reversed(range(10))]
+
+    async def test_ties_on_timestamp_are_broken_by_id(self, logger, session_factory):
+        await _seed_rows(session_factory, 7, same_time=True)
+
+        assert await self._walk(logger) == [f"evt-{i:02d}" for i in reversed(range(7))]
+
+    async def test_cursor_combines_with_filters(self, logger, session_factory):
+        await _seed_rows(session_factory, 10)
+
+        assert await self._walk(logger, event_type="tool_call") == [
+            "evt-09", "evt-07", "evt-05", "evt-03", "evt-01",
+        ]
+
+    def test_cursor_round_trip(self):
+        at = datetime(2026, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+        assert decode_cursor(encode_cursor(at, "evt-1")) == (at, "evt-1")
+
+    async def test_malformed_cursor_rejected(self, logger):
+        with pytest.raises(ValueError, match="Invalid audit cursor"):
+            await logger.query(cursor="not-a-cursor")
+
+    async def test_iter_events_streams_all_in_batches(self, logger, session_factory):
+        await _seed_rows(session_factory, 7)
+
+        ids = [e.id async for e in logger.iter_events(batch_size=2)]
+
+        assert ids == [f"evt-{i:02d}" for i in reversed(range(7))]
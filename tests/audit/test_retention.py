@@ -0,0 +1,125 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0
+
+"""Tests for audit partitioning helpers and retention."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from flydesk.audit.retention import (
+    AuditRetention,
+    add_months,
+    expired_partitions,
+    month_start,
+    partition_ddl,
+    partition_month,
+    partition_name,
+)
+from flydesk.models.audit import AuditEventRow
+from flydesk.models.base import Base
+
+NOW = datetime(2026, 3, 20, 12, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _seed(session_factory, ages_in_days: list[int]) -> None:
+    async with session_factory() as session:
+        for i, age in enumerate(ages_in_days):
+            session.add(
+                AuditEventRow(
+                    id=f"e{i:03d}",
+                    event_type="tool_call",
+                    user_id="u1",
+                    action="x",
+                    detail="{}",
+                    created_at=NOW - timedelta(days=age),
+                )
+            )
+        await session.commit()
+
+
+async def _remaining(session_factory) -> int:
+    async with session_factory() as session:
+        return (await session.execute(select(func.count()).select_from(AuditEventRow))).scalar()
+
+
+class TestPartitionNaming:
+    def test_month_arithmetic_wraps_years(self):
+        start = month_start(datetime(2026, 11, 30, 23, 59, tzinfo=timezone.utc))
+
+        assert start == datetime(2026, 11, 1, tzinfo=timezone.utc)
+        assert add_months(start, 2) == datetime(2027, 1, 1, tzinfo=timezone.utc)
+        assert add_months(start, -11) == datetime(2025, 12, 1, tzinfo=timezone.utc)
+
+    def test_name_round_trip(self):
+        month = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+        assert partition_name(month) == "audit_events_p202603"
+        assert partition_month("audit_events_p202603") == month
+        assert partition_month("audit_events_default") is None
+
+    def test_ddl_covers_one_month(self):
+        ddl = partition_ddl(NOW)
+
+        assert "audit_events_p202603 PARTITION OF audit_events" in ddl
+        assert "FROM ('2026-03-01T00:00:00+00:00') TO ('2026-04-01T00:00:00+00:00')" in ddl
+
+    def test_only_fully_expired_partitions_are_dropped(self):
+        names = ["audit_events_p202602", "audit_events_p202512", "audit_events_p202601",
+                 "audit_events_default"]
+
+        cutoff = datetime(2026, 2, 10, tzinfo=timezone.utc)
+
+        assert expired_partitions(names, cutoff) == ["audit_events_p202512", "audit_events_p202601"]
+
+
+class TestBatchedRetention:
+    async def test_deletes_only_expired_events(self, session_factory):
+        await _seed(session_factory, [1, 10, 40, 400, 500])
+        retention = AuditRetention(session_factory, retention_days=30)
+
+        await retention.run(now=NOW)
+
+        assert await _remaining(session_factory) == 2
+
+    async def test_deletes_across_batches(self, session_factory):
+        await _seed(session_factory, [100] * 7 + [1])
+        retention = AuditRetention(session_factory, retention_days=30, batch_size=3)
+
+        assert await retention.delete_expired(NOW - timedelta(days=30)) == 7
+        assert await _remaining(session_factory) == 1
+
+    async def test_zero_retention_keeps_everything(self, session_factory):
+        await _seed(session_factory, [1, 4000])
+        retention = AuditRetention(session_factory, retention_days=0)
+
+        await retention.run(now=NOW)
+
+        assert await _remaining(session_factory) == 2
+
+    async def test_retention_is_off_by_default(self, session_factory):
+        await _seed(session_factory, [1, 4000])
+        retention = AuditRetention(session_factory)
+
+        await retention.run(now=NOW)
+
+        assert await _remaining(session_factory) == 2
+
+    async def test_sqlite_is_not_partitioned(self, session_factory):
+        retention = AuditRetention(session_factory)
+
+        assert await retention.ensure_partitions(NOW) is False
@@ -0,0 +1,170 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0
+
+"""Tests for hourly usage rollups."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from flydesk.audit.rollup import (
+    SOURCE_AUDIT,
+    SOURCE_CONVERSATIONS,
+    SOURCE_MESSAGES,
+    TOKEN_EVENT_TYPES,
+    UsageRollups,
+)
+from flydesk.models.audit import AuditEventRow
+from flydesk.models.base import Base
+from flydesk.models.conversation import ConversationRow, MessageRow
+from flydesk.models.usage import UsageRollupRow
+
+NOW = datetime(2026, 3, 20, 12, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+def rollups(session_factory) -> UsageRollups:
+    return UsageRollups(session_factory)
+
+
+async def _audit(session_factory, at: datetime, event_type: str, action: str = "x", **detail):
+    async with session_factory() as session:
+        session.add(
+            AuditEventRow(
+                event_type=event_type,
+                user_id="u1",
+                action=action,
+                detail=json.dumps(detail),
+                created_at=at,
+            )
+        )
+        await session.commit()
+
+
+async def _message(session_factory, conversation_id: str, at: datetime, user_id: str = "u1"):
+    async with session_factory() as session:
+        if await session.get(ConversationRow, conversation_id) is None:
+            session.add(ConversationRow(id=conversation_id, user_id=user_id, metadata_="{}"))
+        session.add(
+            MessageRow(
+                id=f"{conversation_id}-{at.isoformat()}",
+                conversation_id=conversation_id,
+                role="user",
+                content="hi",
+                metadata_="{}",
+                created_at=at,
+            )
+        )
+        await session.commit()
+
+
+async def _seed(session_factory) -> None:
+    hours_ago = lambda h: NOW - timedelta(hours=h)  # noqa: E731
+    await _audit(session_factory, hours_ago(30), "agent_response", input_tokens=10, output_tokens=5, model="m1")
+    await _audit(session_factory, hours_ago(3), "agent_response", input_tokens=20, output_tokens=7, model="m2")
+    await _audit(session_factory, hours_ago(3), "tool_call", action="search")
+    await _audit(session_factory, NOW - timedelta(minutes=10), "tool_call", action="search")
+    await _audit(session_factory, NOW - timedelta(minutes=5), "tool_call", action="run")
+    await _message(session_factory, "c1", hours_ago(30))
+    await _message(session_factory, "c1", hours_ago(2))
+    await _message(session_factory, "c2", hours_ago(2))
+    await _message(session_factory, "c2", NOW - timedelta(minutes=1))
+
+
+async def _figures(rollups: UsageRollups) -> dict:
+    tokens = await rollups.summarize(
+        SOURCE_AUDIT, ["model"], event_types=TOKEN_EVENT_TYPES, now=NOW
+    )
+    tools = await rollups.summarize(
+        SOURCE_AUDIT, ["tool"], event_types=["tool_call"], now=NOW
+    )
+    messages = await rollups.summarize(SOURCE_MESSAGES, ["day"], now=NOW)
+    conversations = await rollups.summarize(SOURCE_CONVERSATIONS, now=NOW)
+    return {
+        "tokens": {k: (v.input_tokens, v.output_tokens) for k, v in tokens.items()},
+        "tools": {k: v.event_count for k, v in tools.items()},
+        "messages": {k: v.event_count for k, v in messages.items()},
+        "conversations": conversations[()].event_count,
+    }
+
+
+EXPECTED = {
+    "tokens": {("m1",): (10, 5), ("m2",): (20, 7)},
+    "tools": {("search",): 2, ("run",): 1},
+    "messages": {("2026-03-19",): 1, ("2026-03-20",): 3},
+    "conversations": 2,
+}
+
+
+class TestUsageRollups:
+    async def test_summary_without_rollups_reads_raw_rows(self, rollups, session_factory):
+        await _seed(session_factory)
+
+        assert await _figures(rollups) == EXPECTED
+
+    async def test_rolled_up_summary_matches_raw(self, rollups, session_factory):
+        await _seed(session_factory)
+
+        hours = await rollups.roll_up(now=NOW)
+
+        assert hours == 30
+        assert await rollups.watermark() == datetime(2026, 3, 20, 12, tzinfo=timezone.utc)
+        assert await _figures(rollups) == EXPECTED
+
+    async def test_rolled_up_hours_are_not_rescanned(self, rollups, session_factory):
+        await _seed(session_factory)
+        await rollups.roll_up(now=NOW)
+
+        # Raw rows behind the watermark no longer matter to the summary.
+        async with session_factory() as session:
+            await session.execute(
+                delete(AuditEventRow).where(AuditEventRow.created_at < NOW - timedelta(hours=1))
+            )
+            await session.commit()
+
+        assert (await _figures(rollups))["tokens"] == EXPECTED["tokens"]
+
+    async def test_roll_up_is_incremental(self, rollups, session_factory):
+        await _seed(session_factory)
+        await rollups.roll_up(now=NOW)
+        async with session_factory() as session:
+            before = (await session.execute(select(func.count()).select_from(UsageRollupRow))).scalar()
+
+        assert await rollups.roll_up(now=NOW) == 0
+        assert await rollups.roll_up(now=NOW + timedelta(hours=1)) == 1
+        async with session_factory() as session:
+            after = (await session.execute(select(func.count()).select_from(UsageRollupRow))).scalar()
+        # Only the 12:00 hour was added: two tool calls and one message.
+        assert after == before + 3
+
+    async def test_since_splits_partial_hour(self, rollups, session_factory):
+        await _seed(session_factory)
+        await rollups.roll_up(now=NOW)
+
+        summary = await rollups.summarize(
+            SOURCE_AUDIT,
+            since=NOW - timedelta(hours=3, minutes=10),
+            event_types=TOKEN_EVENT_TYPES,
+            now=NOW,
+        )
+
+        assert summary[()].input_tokens == 20
+
+    async def test_unknown_dimension_rejected(self, rollups):
+        with pytest.raises(ValueError, match="Unknown usage dimensions"):
+            await rollups.summarize(SOURCE_AUDIT, ["colour"])
@@ -14,9 +14,12 @@ from typing import Any
 import pytest
 from fastapi import FastAPI, Request
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
+from flydesk.auth.local_user_repository import LocalUserRepository
 from flydesk.auth.middleware import AuthMiddleware
 from flydesk.auth.models import UserSession
+from flydesk.models.base import Base
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -208,3 +211,84 @@ class TestAuthMiddleware:
         data = response.json()
         assert data["roles"] == ["realm-admin"]
         assert data["permissions"] == ["res:read"]
+
+
+class TestSessionCache:
+    @staticmethod
+    def _counting_app(claims: dict[str, Any], **kwargs: Any) -> tuple[FastAPI, list[str]]:
+        calls: list[str] = []
+
+        def decoder(token: str) -> dict[str, Any]:
+            calls.append(token)
+            return claims
+
+        app = FastAPI()
+        app.add_middleware(AuthMiddleware, token_decoder=decoder, **kwargs)
+
+        @app.get("/api/protected")
+        async def protected(request: Request):
+            return {"session_id": request.state.user_session.session_id}
+
+        return app, calls
+
+    async def _get_twice(self, app: FastAPI) -> list[str]:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            headers = {"Authorization": f"Bearer {GOOD_TOKEN}"}
+            responses = [await ac.get("/api/protected", headers=headers) for _ in range(2)]
+        assert all(r.status_code == 200 for r in responses)
+        return [r.json()["session_id"] for r in responses]
+
+    async def test_repeated_token_is_decoded_once(self):
+        app, calls = self._counting_app(VALID_CLAIMS)
+
+        session_ids = await self._get_twice(app)
+
+        assert len(calls) == 1
+        # Each request still gets its own session id.
+        assert session_ids[0] != session_ids[1]
+
+    async def test_expired_token_is_not_cached(self):
+        app, calls = self._counting_app({**VALID_CLAIMS, "exp": int(time.time()) - 10})
+
+        await self._get_twice(app)
+
+        assert len(calls) == 2
+
+    async def test_zero_ttl_disables_cache(self):
+        app, calls = self._counting_app(VALID_CLAIMS, session_cache_ttl=0)
+
+        await self._get_twice(app)
+
+        assert len(calls) == 2
+
+    async def test_deactivating_local_user_revokes_merged_role(self):
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        local_user_repo = LocalUserRepository(async_sessionmaker(engine, expire_on_commit=False))
+        user = await local_user_repo.create_user(
+            username="ops",
+            email=VALID_CLAIMS["email"],
+            display_name="Ops",
+            password_hash="x",
+            role="operator",
+        )
+        app, calls = self._counting_app(VALID_CLAIMS)
+        app.state.local_user_repo = local_user_repo
+
+        @app.get("/api/roles")
+        async def roles(request: Request):
+            return request.state.user_session.roles
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            headers = {"Authorization": f"Bearer {GOOD_TOKEN}"}
+            before = (await ac.get("/api/roles", headers=headers)).json()
+            await local_user_repo.deactivate_user(user.id)
+            after = (await ac.get("/api/roles", headers=headers)).json()
+        await engine.dispose()
+
+        assert "operator" in before
+        assert "operator" not in after
+        assert len(calls) == 2
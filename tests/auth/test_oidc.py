@@ -6,6 +6,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import base64
 import hashlib
 import time
@@ -306,3 +307,40 @@ class TestPKCE:
         pair2 = generate_pkce_pair()
         assert pair1[0] != pair2[0]
         assert pair1[1] != pair2[1]
+
+
+class TestJWKSCache:
+    async def test_keys_near_expiry_refresh_in_background(self):
+        """Near-expiry keys are served immediately while a refresh runs."""
+        client = OIDCClient(issuer_url=ISSUER, client_id=CLIENT_ID)
+        client._discovery_cache = (time.monotonic(), OIDCDiscoveryDocument(**DISCOVERY_DATA))
+        stale = {"keys": []}
+        client._jwks_cache = (time.monotonic() - 3500, stale)
+
+        mock_http = AsyncMock()
+        mock_http.__aenter__ = AsyncMock(return_value=mock_http)
+        mock_http.__aexit__ = AsyncMock(return_value=False)
+        mock_http.get = AsyncMock(return_value=_httpx_response(TEST_JWKS))
+
+        with patch("flydesk.auth.oidc.httpx.AsyncClient", return_value=mock_http):
+            assert await client.fetch_jwks() is stale
+            assert await client.fetch_jwks() is stale
+            await client._jwks_refresh
+
+        assert mock_http.get.call_count == 1
+        assert client._jwks_cache[1] == TEST_JWKS
+
+    async def test_concurrent_cold_fetches_share_one_request(self):
+        client = OIDCClient(issuer_url=ISSUER, client_id=CLIENT_ID)
+        client._discovery_cache = (time.monotonic(), OIDCDiscoveryDocument(**DISCOVERY_DATA))
+
+        mock_http = AsyncMock()
+        mock_http.__aenter__ = AsyncMock(return_value=mock_http)
+        mock_http.__aexit__ = AsyncMock(return_value=False)
+        mock_http.get = AsyncMock(return_value=_httpx_response(TEST_JWKS))
+
+        with patch("flydesk.auth.oidc.httpx.AsyncClient", return_value=mock_http):
+            results = await asyncio.gather(*(client.fetch_jwks() for _ in range(5)))
+
+        assert all(r == TEST_JWKS for r in results)
+        assert mock_http.get.call_count == 1
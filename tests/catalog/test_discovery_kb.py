@@ -87,7 +87,7 @@ def mock_catalog_repo():
 def mock_knowledge_graph():
     kg = AsyncMock()
     kg.list_entities.return_value = []
-    kg.get_entity_neighborhood.return_value = MagicMock(entities=[], relations=[])
+    kg.get_neighborhoods.return_value = MagicMock(entities=[], relations=[])
     return kg
 
 
@@ -0,0 +1,200 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""Tests for incremental discovery state -- fingerprints, chunking, store."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from flydesk.catalog.discovery_state import (
+    DiscoveryFingerprintStore,
+    changed_units,
+    combine_usage,
+    discovery_scope,
+    entity_cluster_units,
+    fingerprint,
+    load_fingerprints,
+    make_unit,
+    pack_units,
+    run_bounded,
+    run_passes,
+    save_fingerprints,
+)
+from flydesk.models.base import Base
+
+
+@pytest.fixture
+async def store():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield DiscoveryFingerprintStore(async_sessionmaker(engine, expire_on_commit=False))
+    await engine.dispose()
+
+
+class TestUnits:
+    def test_fingerprint_ignores_key_order(self):
+        assert fingerprint({"a": 1, "b": [1, 2]}) == fingerprint({"b": [1, 2], "a": 1})
+        assert fingerprint({"a": 1}) != fingerprint({"a": 2})
+
+    def test_scope_ignores_filter_order(self):
+        assert discovery_scope(["w2", "w1"], ["api"]) == discovery_scope(["w1", "w2"], ["api"])
+        assert discovery_scope() != discovery_scope(["w1"])
+
+    def test_changed_units(self):
+        a, b = make_unit("document:a", {"x": 1}), make_unit("document:b", {"x": 2})
+        previous = {"document:a": a.fingerprint, "document:b": "stale"}
+
+        assert [u.key for u in changed_units([a, b], previous)] == ["document:b"]
+        assert [u.key for u in changed_units([a, b], previous, always=["document:a"])] == [
+            "document:a",
+            "document:b",
+        ]
+
+    def test_entity_clusters_group_by_type_with_relations(self):
+        entities = [
+            {"id": "e1", "name": "Billing", "entity_type": "Service"},
+            {"id": "e2", "name": "Ledger", "entity_type": "service"},
+            {"id": "e3", "name": "Finance", "entity_type": "team"},
+        ]
+        relations = [
+            {"source_id": "e3", "target_id": "e1", "relation_type": "owns"},
+            {"source_id": "x", "target_id": "e2", "relation_type": "calls"},
+            {"source_id": "x", "target_id": "y", "relation_type": "calls"},
+        ]
+
+        units = {u.key: u.payload for u in entity_cluster_units(entities, relations)}
+
+        assert list(units) == ["entities:service", "entities:team"]
+        assert [e["id"] for e in units["entities:service"]["entities"]] == ["e1", "e2"]
+        assert [r["source_id"] for r in units["entities:service"]["relations"]] == ["x"]
+        assert [r["source_id"] for r in units["entities:team"]["relations"]] == ["e3"]
+
+    def test_pack_units_respects_budget_and_order(self):
+        units = [make_unit(f"document:{i}", "x" * size) for i, size in enumerate([40, 40, 100, 10])]
+
+        chunks = pack_units(units, 90)
+
+        assert [[u.key for u in chunk] for chunk in chunks] == [
+            ["document:0", "document:1"],
+            ["document:2"],
+            ["document:3"],
+        ]
+        assert pack_units([], 90) == []
+
+    def test_combine_usage(self):
+        combined = combine_usage(
+            [
+                {"input_tokens": 10, "output_tokens": 5, "total_tokens": 15, "cost_usd": 0.1, "model": "m"},
+                {},
+                {"input_tokens": 1, "output_tokens": 1, "total_tokens": 2, "cost_usd": 0.2, "model": "m"},
+            ]
+        )
+
+        assert combined == {
+            "input_tokens": 11,
+            "output_tokens": 6,
+            "total_tokens": 17,
+            "cost_usd": 0.3,
+            "model": "m",
+        }
+
+    async def test_run_bounded_limits_concurrency_and_keeps_order(self):
+        in_flight = peak = 0
+
+        async def _call(i: int) -> int:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01 * (5 - i))
+            in_flight -= 1
+            return i
+
+        results = await run_bounded([lambda i=i: _call(i) for i in range(5)], 2)
+
+        assert results == [0, 1, 2, 3, 4]
+        assert peak == 2
+
+    async def test_run_passes_reduces_and_reports_failed_passes(self):
+        progress: list[int] = []
+
+        async def _on_progress(pct: int, message: str) -> None:
+            progress.append(pct)
+
+        async def _call(prompt: str) -> tuple[list[str] | None, dict, bool]:
+            if prompt == "bad":
+                return None, {}, False
+            return [prompt], {"total_tokens": 1}, True
+
+        result, usage, failed = await run_passes(
+            ["a", "bad", "b"], _call, lambda rs: sorted(x for r in rs for x in r),
+            _on_progress, max_concurrency=2, start_pct=30, span_pct=30,
+        )
+
+        assert result == ["a", "b"]
+        assert usage["total_tokens"] == 2
+        assert failed == [1]
+        assert progress[-1] == 60
+
+    async def test_run_passes_single_prompt_skips_reduce(self):
+        async def _call(prompt: str):
+            return prompt, {}, False
+
+        async def _on_progress(pct: int, message: str) -> None:
+            raise AssertionError("single passes report their own progress")
+
+        assert await run_passes(
+            ["only"], _call, lambda rs: "reduced", _on_progress,
+            max_concurrency=2, start_pct=0, span_pct=10,
+        ) == ("only", {}, [0])
+
+
+class TestFingerprintStore:
+    async def test_round_trip_and_update(self, store):
+        await store.save("process", "s", {"system:a": "1", "system:b": "2"})
+        await store.save("process", "s", {"system:a": "3"})
+
+        assert await store.load("process", "s") == {"system:a": "3", "system:b": "2"}
+
+    async def test_removed_keys_are_deleted(self, store):
+        await store.save("process", "s", {"system:a": "1", "system:b": "2"})
+
+        await store.save("process", "s", {"system:a": "1"}, removed=["system:b"])
+
+        assert await store.load("process", "s") == {"system:a": "1"}
+
+    async def test_types_and_scopes_are_isolated(self, store):
+        await store.save("process", "s1", {"document:a": "1"})
+        await store.save("system", "s1", {"document:a": "2"})
+
+        assert await store.load("process", "s2") == {}
+        assert await store.load("system", "s1") == {"document:a": "2"}
+
+        await store.clear("process")
+
+        assert await store.load("process", "s1") == {}
+        assert await store.load("system", "s1") == {"document:a": "2"}
+
+    async def test_save_skips_failed_units_and_forgets_removed(self, store):
+        await store.save("process", "s", {"system:a": "1", "system:gone": "2"})
+        units = [make_unit("system:a", {"v": 2}), make_unit("system:b", {"v": 3})]
+        previous = await load_fingerprints(store, "process", "s")
+
+        await save_fingerprints(store, "process", "s", units, previous, {"system:b"})
+
+        assert await load_fingerprints(store, "process", "s") == {
+            "system:a": units[0].fingerprint
+        }
+
+    async def test_helpers_without_store(self):
+        assert await load_fingerprints(None, "process", "s") == {}
+        await save_fingerprints(None, "process", "s", [], {}, set())
@@ -103,6 +103,15 @@ class TestCatalogRepository:
         endpoints = await repo.list_endpoints(system_id="crm-test")
         assert len(endpoints) == 1
 
+    async def test_list_endpoints_for_systems(self, repo, sample_system, sample_endpoint):
+        await repo.create_system(sample_system)
+        await repo.create_endpoint(sample_endpoint)
+
+        endpoints = await repo.list_endpoints_for_systems(["crm-test", "unknown"])
+
+        assert [ep.id for ep in endpoints["crm-test"]] == ["get-customer"]
+        assert endpoints["unknown"] == []
+
     async def test_list_all_active_endpoints(self, repo, sample_system, sample_endpoint):
         await repo.create_system(sample_system)
         await repo.create_endpoint(sample_endpoint)
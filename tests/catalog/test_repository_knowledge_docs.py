@@ -0,0 +1,133 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0
+
+"""Tests for CatalogRepository knowledge document listings and projections."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from flydesk.catalog.repository import CatalogRepository
+from flydesk.knowledge.indexer import KnowledgeIndexer
+from flydesk.knowledge.models import KnowledgeDocument, KnowledgeDocumentSummary
+from flydesk.models.base import Base
+from flydesk.models.knowledge_base import KnowledgeDocumentWorkspaceRow
+
+
+class _FakeEmbeddingProvider:
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        return [[0.0, 1.0] for _ in texts]
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    yield factory
+    await engine.dispose()
+
+
+@pytest.fixture
+def repo(session_factory):
+    return CatalogRepository(session_factory)
+
+
+@pytest.fixture
+async def indexer(session_factory):
+    indexer = KnowledgeIndexer(
+        session_factory=session_factory, embedding_provider=_FakeEmbeddingProvider()
+    )
+    await indexer.index_documents(
+        [
+            KnowledgeDocument(id="d1", title="Alpha", content="alpha text", workspace_ids=["ws-a"]),
+            KnowledgeDocument(id="d2", title="Beta", content="beta text", workspace_ids=["ws-a", "ws-b"]),
+            KnowledgeDocument(id="d3", title="Gamma", content="gamma text", workspace_ids=["ws-b"]),
+            KnowledgeDocument(id="d4", title="Delta", content="delta text"),
+        ]
+    )
+    return indexer
+
+
+class TestKnowledgeDocumentListings:
+    async def test_summaries_exclude_content(self, repo, indexer):
+        items, total = await repo.list_knowledge_document_summaries()
+
+        assert total == 4
+        assert all(isinstance(item, KnowledgeDocumentSummary) for item in items)
+        assert [item.title for item in items] == ["Alpha", "Beta", "Delta", "Gamma"]
+        assert items[1].workspace_ids == ["ws-a", "ws-b"]
+
+    async def test_summaries_paginate_with_total(self, repo, indexer):
+        items, total = await repo.list_knowledge_document_summaries(limit=2, offset=1)
+
+        assert total == 4
+        assert [item.id for item in items] == ["d2", "d4"]
+
+    async def test_summaries_filter_by_workspace(self, repo, indexer):
+        items, total = await repo.list_knowledge_document_summaries(workspace_id="ws-b")
+
+        assert total == 2
+        assert {item.id for item in items} == {"d2", "d3"}
+
+    async def test_count_by_workspace(self, repo, indexer):
+        assert await repo.count_knowledge_documents() == 4
+        assert await repo.count_knowledge_documents(workspace_id="ws-a") == 2
+        assert await repo.count_knowledge_documents(workspace_id="ws-missing") == 0
+
+    async def test_list_across_workspaces_returns_each_document_once(self, repo, indexer):
+        docs = await repo.list_knowledge_documents(workspace_ids=["ws-a", "ws-b"])
+
+        assert sorted(d.id for d in docs) == ["d1", "d2", "d3"]
+        assert all(d.content for d in docs)
+
+    async def test_workspace_id_is_not_a_substring_match(self, repo, indexer):
+        assert await repo.list_knowledge_documents(workspace_id="ws") == []
+
+    async def test_iter_streams_in_id_order_across_batches(self, repo, indexer):
+        docs = [doc async for doc in repo.iter_knowledge_documents(batch_size=3)]
+
+        assert [d.id for d in docs] == ["d1", "d2", "d3", "d4"]
+        assert docs[0].content == "alpha text"
+
+    async def test_iter_filters_by_workspace(self, repo, indexer):
+        docs = [doc async for doc in repo.iter_knowledge_documents(workspace_ids=["ws-b"])]
+
+        assert [d.id for d in docs] == ["d2", "d3"]
+
+    async def test_iter_starts_after_id(self, repo, indexer):
+        docs = [doc async for doc in repo.iter_knowledge_documents(after_id="d2", batch_size=1)]
+
+        assert [d.id for d in docs] == ["d3", "d4"]
+
+
+class TestWorkspaceMembership:
+    async def test_update_replaces_membership(self, repo, indexer):
+        await repo.update_knowledge_document("d1", workspace_ids=["ws-b"])
+
+        assert await repo.count_knowledge_documents(workspace_id="ws-a") == 1
+        assert await repo.count_knowledge_documents(workspace_id="ws-b") == 3
+        assert (await repo.get_knowledge_document("d1")).workspace_ids == ["ws-b"]
+
+    async def test_reindex_keeps_membership(self, repo, indexer):
+        await indexer.reindex_document("d2")
+
+        assert await indexer.reindex_all(workspace_id="ws-b") == 2
+
+    async def test_delete_removes_membership(self, repo, indexer, session_factory):
+        await indexer.delete_document("d2")
+
+        async with session_factory() as session:
+            rows = (
+                await session.execute(
+                    select(KnowledgeDocumentWorkspaceRow.document_id).where(
+                        KnowledgeDocumentWorkspaceRow.document_id == "d2"
+                    )
+                )
+            ).all()
+        assert rows == []
+        assert await repo.count_knowledge_documents(workspace_id="ws-a") == 1
@@ -104,7 +104,7 @@ def mock_catalog_repo():
 def mock_knowledge_graph():
     kg = AsyncMock()
     kg.list_entities.return_value = []
-    kg.get_entity_neighborhood.return_value = MagicMock(entities=[], relations=[])
+    kg.get_neighborhoods.return_value = MagicMock(entities=[], relations=[])
     return kg
 
 
@@ -317,6 +317,70 @@ class TestToExternalSystems:
         assert systems[0].metadata["source"] == "auto_discovered"
 
 
+# ---------------------------------------------------------------------------
+# Tests: _reduce_results
+# ---------------------------------------------------------------------------
+
+
+class TestReduceResults:
+    """Tests for SystemDiscoveryEngine._reduce_results() across LLM passes."""
+
+    def test_duplicates_merge_into_highest_confidence(self):
+        low = DiscoveredSystem.model_validate(
+            {**_sample_system_dict("Stripe", 0.6), "evidence": ["doc A"],
+             "endpoints": [{"name": "Charge", "method": "post", "path": "/charges"}]}
+        )
+        high = DiscoveredSystem.model_validate(
+            {**_sample_system_dict("stripe", 0.9), "evidence": ["doc B"], "base_url": "",
+             "endpoints": [{"name": "Charge", "method": "POST", "path": "/charges"},
+                           {"name": "Refund", "method": "POST", "path": "/refunds"}]}
+        )
+        other = DiscoveredSystem.model_validate(_sample_system_dict("Jira", 0.7))
+
+        result = SystemDiscoveryEngine._reduce_results(
+            [SystemDiscoveryResult(systems=[low, other]), SystemDiscoveryResult(systems=[high])]
+        )
+
+        assert [s.name for s in result.systems] == ["stripe", "Jira"]
+        merged = result.systems[0]
+        assert merged.confidence == 0.9
+        assert merged.base_url == "https://stripe.example.com"
+        assert merged.evidence == ["doc B", "doc A"]
+        assert [ep.name for ep in merged.endpoints] == ["Charge", "Refund"]
+        # Inputs are not mutated.
+        assert low.evidence == ["doc A"]
+
+    async def test_large_context_runs_parallel_passes(
+        self, mock_agent_factory, mock_catalog_repo, mock_knowledge_graph
+    ):
+        entities = []
+        for i, entity_type in enumerate(["service", "team"]):
+            entity = MagicMock()
+            entity.id = f"e{i}"
+            entity.name = f"Entity {i}"
+            entity.entity_type = entity_type
+            entity.confidence = 1.0
+            entity.properties = {}
+            entities.append(entity)
+        mock_knowledge_graph.list_entities.return_value = entities
+        mock_catalog_repo.list_systems.return_value = ([_make_system(name="Ledger")], 1)
+        agent = _make_mock_agent(_make_llm_response([_sample_system_dict()]))
+        mock_agent_factory.create_agent.return_value = agent
+        engine = SystemDiscoveryEngine(
+            agent_factory=mock_agent_factory,
+            catalog_repo=mock_catalog_repo,
+            knowledge_graph=mock_knowledge_graph,
+            chunk_chars=1,
+        )
+
+        result = await engine._analyze("job-1", {"trigger": "test"}, AsyncMock())
+
+        assert result["llm_passes"] == 2
+        assert result["systems_discovered"] == 1
+        # Every pass sees the existing catalog for deduplication.
+        assert all("Ledger" in call.args[0] for call in agent.run.call_args_list)
+
+
 # ---------------------------------------------------------------------------
 # Tests: _merge_systems
 # ---------------------------------------------------------------------------
@@ -216,3 +216,45 @@ class TestExportOrchestration:
         assert record.status == ExportStatus.FAILED
         assert record.error == "Export generation failed"
         assert record.completed_at is not None
+
+
+class TestSpilledExport:
+    async def test_spilled_body_is_exported_in_full(self, repo, tmp_path):
+        from flydesk.files.storage import LocalFileStorage
+
+        spill_dir = tmp_path / "spill"
+        spill_dir.mkdir()
+        body = json.dumps([{"id": i} for i in range(1000)]).encode()
+        (spill_dir / "flydesk-abc123.json").write_bytes(body)
+        storage = LocalFileStorage(str(tmp_path / "exports"))
+        service = ExportService(repo, storage, spill_dir=str(spill_dir))
+
+        record = await service.create_export(
+            user_id="user-1",
+            fmt=ExportFormat.CSV,
+            source_data={
+                "truncated": True,
+                "spill_id": "flydesk-abc123.json",
+                "counts": {"$": 1000},
+            },
+            title="Large report",
+        )
+
+        assert record.status == ExportStatus.COMPLETED
+        assert record.file_path.endswith(".json")
+        assert record.file_size == len(body)
+        assert record.row_count == 1000
+        assert await storage.retrieve(record.file_path) == body
+
+    async def test_expired_spill_fails_export(self, repo, storage, tmp_path):
+        service = ExportService(repo, storage, spill_dir=str(tmp_path))
+
+        record = await service.create_export(
+            user_id="user-1",
+            fmt=ExportFormat.JSON,
+            source_data={"spill_id": "flydesk-gone.json"},
+            title="Gone",
+        )
+
+        assert record.status == ExportStatus.FAILED
+        storage.store.assert_not_awaited()
@@ -0,0 +1,366 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""Tests for GitImportJobHandler -- concurrent, archive-based git import."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import tarfile
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from flydesk.api.git_import import RepoImportItem
+from flydesk.jobs.git_import import GitImportJobHandler
+from flydesk.jobs.handlers import JobHandler
+from flydesk.jobs.models import JobStatus
+from flydesk.jobs.repository import JobRepository
+from flydesk.jobs.runner import JobRunner
+from flydesk.knowledge.git_provider import GitFileContent, GitTreeEntry
+from flydesk.knowledge.indexer import KnowledgeIndexer
+from flydesk.knowledge.models import KnowledgeDocument
+from flydesk.models.base import Base
+
+
+# ---------------------------------------------------------------------------
+# Fakes
+# ---------------------------------------------------------------------------
+
+
+class _FakeEmbedder:
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        return [[0.1, 0.2, 0.3] for _ in texts]
+
+
+class _FakeProducer:
+    def __init__(self) -> None:
+        self.tasks = []
+
+    async def enqueue(self, task) -> None:
+        self.tasks.append(task)
+
+
+class _FakeProvider:
+    """In-memory repository served through the GitProvider methods."""
+
+    provider_type = "fake"
+
+    def __init__(self, files: dict[str, str], *, delay: float = 0.0) -> None:
+        self.files = files
+        self.shas = {path: f"sha-{path}-1" for path in files}
+        self.fetched: list[str] = []
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.failures: dict[str, list[Exception]] = {}
+
+    async def list_tree(self, owner, repo, branch):
+        return [GitTreeEntry(path=p, sha=self.shas[p]) for p in self.files]
+
+    async def get_file_content(self, owner, repo, path, ref=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            pending = self.failures.get(path)
+            if pending:
+                raise pending.pop(0)
+            self.fetched.append(path)
+            return GitFileContent(path=path, sha=self.shas[path], content=self.files[path])
+        finally:
+            self.in_flight -= 1
+
+    async def aclose(self) -> None:
+        pass
+
+
+class _ArchiveProvider(_FakeProvider):
+    def __init__(self, files: dict[str, str], *, broken: bool = False) -> None:
+        super().__init__(files)
+        self.archives = 0
+        self.broken = broken
+
+    async def download_archive(self, owner, repo, ref, dest) -> None:
+        self.archives += 1
+        if self.broken:
+            raise httpx.ConnectError("archive unavailable")
+        buf = io.BytesIO()
+        with tarfile.open(fileobj=buf, mode="w:gz") as archive:
+            for path, text in self.files.items():
+                data = text.encode()
+                info = tarfile.TarInfo(f"{repo}-abc123/{path}")
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+        dest.write(buf.getvalue())
+
+
+def _rate_limited() -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://api.github.com/x")
+    response = httpx.Response(429, headers={"Retry-After": "0"}, request=request)
+    return httpx.HTTPStatusError("rate limited", request=request, response=response)
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+async def indexer():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield KnowledgeIndexer(
+        session_factory=async_sessionmaker(engine, expire_on_commit=False),
+        embedding_provider=_FakeEmbedder(),
+    )
+    await engine.dispose()
+
+
+@pytest.fixture
+def producer() -> _FakeProducer:
+    return _FakeProducer()
+
+
+def _handler(indexer, producer, **kwargs) -> GitImportJobHandler:
+    return GitImportJobHandler(AsyncMock(), indexer=indexer, producer=producer, **kwargs)
+
+
+def _item(paths: list[str] | None = None) -> RepoImportItem:
+    return RepoImportItem(owner="acme", repo="docs", branch="main", paths=paths or [])
+
+
+async def _index_tasks(indexer, producer) -> None:
+    """Index what the handler enqueued, as the queue consumer would."""
+    for task in producer.tasks:
+        await indexer.index_document(
+            KnowledgeDocument(
+                id=task.document_id,
+                title=task.title,
+                content=task.content,
+                source=task.source,
+                metadata=task.metadata,
+            )
+        )
+    producer.tasks.clear()
+
+
+async def _noop_progress(pct: int, message: str) -> None:
+    pass
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+
+class TestGitImportHandler:
+    def test_conforms_to_job_handler_protocol(self, indexer, producer):
+        assert isinstance(_handler(indexer, producer), JobHandler)
+
+    async def test_first_import_enqueues_every_file(self, indexer, producer):
+        provider = _FakeProvider({"README.md": "# Hi", "docs/a.md": "A"})
+        handler = _handler(indexer, producer)
+
+        result = await handler.import_items(provider, "prov-1", [_item()], _noop_progress)
+
+        assert result["files"] == 2
+        assert result["added"] == 2
+        sources = {t.source for t in producer.tasks}
+        assert sources == {"git://acme/docs/README.md@main", "git://acme/docs/docs/a.md@main"}
+        task = next(t for t in producer.tasks if t.metadata["path"] == "docs/a.md")
+        assert task.metadata["sha"] == "sha-docs/a.md-1"
+        assert task.metadata["content_hash"]
+
+    async def test_unchanged_blob_shas_are_not_fetched(self, indexer, producer):
+        provider = _FakeProvider({"a.md": "A", "b.md": "B"})
+        handler = _handler(indexer, producer)
+        await handler.import_items(provider, "prov-1", [_item()], _noop_progress)
+        await _index_tasks(indexer, producer)
+        provider.fetched.clear()
+
+        result = await handler.import_items(provider, "prov-1", [_item()], _noop_progress)
+
+        assert result["unchanged"] == 2
+        assert provider.fetched == []
+        assert producer.tasks == []
+
+    async def test_changed_file_replaces_its_document(self, indexer, producer):
+        provider = _FakeProvider({"a.md": "A", "b.md": "B"})
+        handler = _handler(indexer, producer)
+        await handler.import_items(provider, "prov-1", [_item()], _noop_progress)
+        first_ids = {t.metadata["path"]: t.document_id for t in producer.tasks}
+        await _index_tasks(indexer, producer)
+
+        provider.files["a.md"] = "A, revised"
+        provider.shas["a.md"] = "sha-a.md-2"
+        result = await handler.import_items(provider, "prov-1", [_item()], _noop_progress)
+
+        assert (result["updated"], result["unchanged"]) == (1, 1)
+        assert provider.fetched[-1] == "a.md"
+        [task] = producer.tasks
+        assert task.document_id == first_ids["a.md"]
+        assert await indexer.find_documents_by_source("git://acme/docs/a.md") == []
+
+    async def test_same_content_under_new_sha_is_not_reindexed(self, indexer, producer):
+        provider = _FakeProvider({"a.md": "A"})
+        handler = _handler(indexer, producer)
+        await handler.import_items(provider, "prov-1", [_item()], _noop_progress)
+        await _index_tasks(indexer, producer)
+
+        provider.shas["a.md"] = "commit-2"
+        result = await handler.import_items(provider, "prov-1", [_item()], _noop_progress)
+
+        assert result["unchanged"] == 1
+        assert producer.tasks == []
+
+    async def test_large_change_sets_use_the_branch_archive(self, indexer, producer):
+        files = {f"docs/{i}.md": f"doc {i}" for i in range(5)}
+        provider = _ArchiveProvider(files)
+        handler = _handler(indexer, producer, archive_threshold=3)
+
+        result = await handler.import_items(provider, "prov-1", [_item()], _noop_progress)
+
+        assert provider.archives == 1
+        assert provider.fetched == []
+        assert result["archives"] == 1
+        assert result["added"] == 5
+        assert {t.content for t in producer.tasks} == set(files.values())
+
+    async def test_small_change_sets_fetch_files(self, indexer, producer):
+        provider = _ArchiveProvider({"a.md": "A", "b.md": "B"})
+        handler = _handler(indexer, producer, archive_threshold=3)
+
+        await handler.import_items(provider, "prov-1", [_item()], _noop_progress)
+
+        assert provider.archives == 0
+        assert sorted(provider.fetched) == ["a.md", "b.md"]
+
+    async def test_failed_archive_falls_back_to_file_fetches(self, indexer, producer):
+        provider = _ArchiveProvider({"a.md": "A", "b.md": "B"}, broken=True)
+        handler = _handler(indexer, producer, archive_threshold=1)
+
+        result = await handler.import_items(provider, "prov-1", [_item()], _noop_progress)
+
+        assert result["added"] == 2
+        assert sorted(provider.fetched) == ["a.md", "b.md"]
+
+    async def test_fetches_are_bounded(self, indexer, producer):
+        provider = _FakeProvider({f"{i}.md": str(i) for i in range(12)}, delay=0.01)
+        handler = _handler(indexer, producer, max_concurrency=3)
+
+        result = await handler.import_items(provider, "prov-1", [_item()], _noop_progress)
+
+        assert result["added"] == 12
+        assert provider.max_in_flight == 3
+
+    async def test_rate_limited_fetch_is_retried(self, indexer, producer):
+        provider = _FakeProvider({"a.md": "A"})
+        provider.failures["a.md"] = [_rate_limited()]
+        handler = _handler(indexer, producer)
+
+        result = await handler.import_items(provider, "prov-1", [_item()], _noop_progress)
+
+        assert result["added"] == 1
+        assert result["failed"] == 0
+
+    async def test_other_errors_fail_only_that_file(self, indexer, producer):
+        provider = _FakeProvider({"a.md": "A", "b.md": "B"})
+        provider.failures["b.md"] = [RuntimeError("gone")]
+        handler = _handler(indexer, producer)
+
+        result = await handler.import_items(provider, "prov-1", [_item()], _noop_progress)
+
+        assert (result["added"], result["failed"]) == (1, 1)
+        assert result["failures"] == [{"repo": "acme/docs", "path": "b.md", "error": "gone"}]
+
+    async def test_selected_paths_only(self, indexer, producer):
+        provider = _FakeProvider({"a.md": "A", "b.md": "B"})
+        handler = _handler(indexer, producer)
+
+        result = await handler.import_items(provider, "prov-1", [_item(["b.md"])], _noop_progress)
+
+        assert result["files"] == 1
+        assert [t.metadata["path"] for t in producer.tasks] == ["b.md"]
+
+    async def test_execute_decrypts_token_and_reports_progress(self, indexer, producer):
+        provider_repo = MagicMock()
+        provider_repo.get_provider = AsyncMock(
+            return_value=SimpleNamespace(
+                is_active=True, auth_method="pat", provider_type="github", base_url=None
+            )
+        )
+        provider_repo.decrypt_token.return_value = "ghp_plain"
+        handler = GitImportJobHandler(provider_repo, indexer=indexer, producer=producer)
+        provider = _FakeProvider({"a.md": "A"})
+        progress: list[int] = []
+
+        async def _on_progress(pct: int, message: str) -> None:
+            progress.append(pct)
+
+        with patch("flydesk.jobs.git_import.GitProviderFactory") as factory:
+            factory.create.return_value = provider
+            result = await handler.execute(
+                "job-1",
+                {"provider_id": "prov-1", "token": "encrypted", "items": [_item().model_dump()]},
+                _on_progress,
+            )
+
+        factory.create.assert_called_once_with("github", token="ghp_plain", base_url=None)
+        assert result["added"] == 1
+        assert progress[-1] == 100
+        assert progress == sorted(progress)
+
+    async def test_runs_as_job_through_runner(self, indexer, producer):
+        provider_repo = MagicMock()
+        provider_repo.get_provider = AsyncMock(
+            return_value=SimpleNamespace(
+                is_active=True, auth_method="pat", provider_type="github", base_url=None
+            )
+        )
+        provider_repo.decrypt_token.return_value = "ghp_plain"
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        repo = JobRepository(async_sessionmaker(engine, expire_on_commit=False))
+        runner = JobRunner(repo)
+        runner.register_handler(
+            "git_import", GitImportJobHandler(provider_repo, indexer=indexer, producer=producer)
+        )
+
+        with patch("flydesk.jobs.git_import.GitProviderFactory") as factory:
+            factory.create.return_value = _FakeProvider({"a.md": "A", "b.md": "B"})
+            await runner.start()
+            job = await runner.submit(
+                "git_import",
+                {"provider_id": "prov-1", "token": "encrypted", "items": [_item().model_dump()]},
+            )
+            for _ in range(100):
+                current = await repo.get(job.id)
+                if current.status in (JobStatus.COMPLETED, JobStatus.FAILED):
+                    break
+                await asyncio.sleep(0.05)
+            await runner.stop()
+        await engine.dispose()
+
+        assert current.status == JobStatus.COMPLETED, current.error
+        assert current.result["added"] == 2
+
+    async def test_execute_unknown_provider(self, indexer, producer):
+        provider_repo = MagicMock()
+        provider_repo.get_provider = AsyncMock(return_value=None)
+        handler = GitImportJobHandler(provider_repo, indexer=indexer, producer=producer)
+
+        result = await handler.execute("job-1", {"provider_id": "nope", "token": "x"}, _noop_progress)
+
+        assert "not found" in result["error"]
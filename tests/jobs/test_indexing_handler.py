@@ -0,0 +1,76 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0
+
+"""Tests for IndexingJobHandler."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from flydesk.jobs.handlers import IndexingJobHandler
+from flydesk.knowledge.queue import IndexingTask
+
+
+async def _noop_progress(pct: int, message: str) -> None:
+    pass
+
+
+def _task(doc_id: str) -> dict:
+    return IndexingTask(
+        document_id=doc_id, title=doc_id.upper(), content="C", document_type="other"
+    ).model_dump()
+
+
+class TestIndexingJobHandler:
+    async def test_single_task(self):
+        indexer = AsyncMock()
+        handler = IndexingJobHandler(indexer)
+
+        result = await handler.execute("job-1", _task("d0"), _noop_progress)
+
+        indexer.index_document.assert_awaited_once()
+        assert result == {"document_id": "d0", "title": "D0"}
+
+    async def test_batch_indexed_together(self):
+        indexer = AsyncMock()
+        handler = IndexingJobHandler(indexer)
+
+        result = await handler.execute(
+            "job-1", {"tasks": [_task("d0"), _task("d1")]}, _noop_progress
+        )
+
+        indexer.index_documents.assert_awaited_once()
+        documents = indexer.index_documents.await_args.args[0]
+        assert [d.id for d in documents] == ["d0", "d1"]
+        assert result == {"document_ids": ["d0", "d1"], "documents": 2}
+
+    async def test_failed_batch_falls_back_to_individual_documents(self):
+        indexer = AsyncMock()
+        indexer.index_documents.side_effect = RuntimeError("batch failed")
+        indexer.index_document.side_effect = [None, ValueError("bad document"), None]
+        handler = IndexingJobHandler(indexer)
+
+        result = await handler.execute(
+            "job-1", {"tasks": [_task("d0"), _task("d1"), _task("d2")]}, _noop_progress
+        )
+
+        assert indexer.index_document.await_count == 3
+        assert result == {
+            "document_ids": ["d0", "d2"],
+            "documents": 2,
+            "failed": {"d1": "bad document"},
+        }
+
+    async def test_batch_fails_when_no_document_indexes(self):
+        indexer = AsyncMock()
+        indexer.index_documents.side_effect = RuntimeError("batch failed")
+        indexer.index_document.side_effect = ValueError("bad document")
+        handler = IndexingJobHandler(indexer)
+
+        with pytest.raises(ValueError, match="bad document"):
+            await handler.execute(
+                "job-1", {"tasks": [_task("d0"), _task("d1")]}, _noop_progress
+            )
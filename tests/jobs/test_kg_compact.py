@@ -0,0 +1,33 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0
+
+"""Tests for KGCompactHandler -- one-off duplicate entity compaction."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock
+
+from flydesk.jobs.handlers import JobHandler, KGCompactHandler
+
+
+class TestKGCompactHandler:
+    def test_conforms_to_job_handler_protocol(self):
+        assert isinstance(KGCompactHandler(AsyncMock()), JobHandler)
+
+    async def test_returns_compaction_stats(self):
+        kg = AsyncMock()
+        stats = {
+            "entities_merged": 3,
+            "relations_rewired": 2,
+            "relations_removed": 1,
+            "aliases_added": 4,
+        }
+        kg.compact_entities.return_value = stats
+        on_progress = AsyncMock()
+
+        result = await KGCompactHandler(kg).execute("job-1", {}, on_progress)
+
+        assert result == stats
+        kg.compact_entities.assert_awaited_once_with(on_progress)
+        on_progress.assert_any_call(100, "Merged 3 duplicate entities")
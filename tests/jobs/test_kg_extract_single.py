@@ -29,8 +29,7 @@ def mock_catalog_repo():
 @pytest.fixture
 def mock_knowledge_graph():
     graph = AsyncMock()
-    graph.upsert_entity = AsyncMock()
-    graph.add_relation = AsyncMock()
+    graph.upsert_entities.side_effect = lambda entities, **kw: {e.id: e.id for e in entities}
     return graph
 
 
@@ -87,8 +86,32 @@ class TestKGExtractSingleHandler:
         assert result["document_id"] == "doc-1"
         assert result["entities"] == 1
         assert result["relations"] == 1
-        mock_knowledge_graph.upsert_entity.assert_awaited_once()
-        mock_knowledge_graph.add_relation.assert_awaited_once()
+        mock_knowledge_graph.upsert_entities.assert_awaited_once()
+        assert mock_knowledge_graph.upsert_entities.call_args.kwargs["resolve"] is True
+        [relation] = mock_knowledge_graph.add_relations.call_args.args[0]
+        assert (relation.source_id, relation.target_id) == ("ent-1", "ent-2")
+
+    async def test_relations_follow_resolved_entities(
+        self, handler, mock_catalog_repo, mock_knowledge_graph, mock_extractor, on_progress
+    ):
+        """Relation endpoints are rewritten to the canonical entity ids."""
+        mock_catalog_repo.get_knowledge_document.return_value = _FakeDoc(
+            id="doc-1", title="Test Doc", content="content"
+        )
+        mock_extractor.extract_from_document.return_value = (
+            [
+                {"id": "ent-1", "entity_type": "service", "name": "Auth"},
+                {"id": "ent-2", "entity_type": "service", "name": "Billing"},
+            ],
+            [{"source_id": "ent-1", "target_id": "ent-2", "relation_type": "calls"}],
+        )
+        mock_knowledge_graph.upsert_entities.side_effect = None
+        mock_knowledge_graph.upsert_entities.return_value = {"ent-1": "auth", "ent-2": "billing"}
+
+        await handler.execute("job-1", {"document_id": "doc-1"}, on_progress)
+
+        [relation] = mock_knowledge_graph.add_relations.call_args.args[0]
+        assert (relation.source_id, relation.target_id) == ("auth", "billing")
 
     async def test_skips_when_document_not_found(
         self, handler, mock_catalog_repo, on_progress
@@ -10,6 +10,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -24,6 +25,18 @@ def _unwrap(result):
     return result
 
 
+def _stub_documents(repo, docs) -> None:
+    """Serve *docs* through the repository's count and streaming reads."""
+
+    async def _stream(*, after_id=None, **kwargs):
+        for doc in docs:
+            if after_id is None or doc.id > after_id:
+                yield doc
+
+    repo.count_knowledge_documents = AsyncMock(return_value=len(docs))
+    repo.iter_knowledge_documents = MagicMock(side_effect=_stream)
+
+
 # ---------------------------------------------------------------------------
 # Fixtures
 # ---------------------------------------------------------------------------
@@ -32,13 +45,14 @@ def _unwrap(result):
 @pytest.fixture
 def mock_catalog_repo():
     repo = AsyncMock()
-    repo.list_knowledge_documents.return_value = []
+    _stub_documents(repo, [])
     return repo
 
 
 @pytest.fixture
 def mock_knowledge_graph():
     kg = AsyncMock()
+    kg.upsert_entities.side_effect = lambda entities, **kw: {e.id: e.id for e in entities}
     return kg
 
 
@@ -101,7 +115,7 @@ class TestExecute:
     ):
         """Processes a single document and upserts entities/relations."""
         doc = _make_doc("d-1", "Onboarding Guide", "How to onboard new employees.")
-        mock_catalog_repo.list_knowledge_documents.return_value = [doc]
+        _stub_documents(mock_catalog_repo, [doc])
 
         mock_extractor.extract_from_document.return_value = (
             [
@@ -139,10 +153,11 @@ class TestExecute:
         assert result["relations_added"] == 1
         assert result["documents_processed"] == 1
 
-        # Verify entities were upserted
-        assert mock_knowledge_graph.upsert_entity.call_count == 2
-        # Verify relation was added
-        assert mock_knowledge_graph.add_relation.call_count == 1
+        # Entities and relations are written in one bulk call each
+        mock_knowledge_graph.upsert_entities.assert_awaited_once()
+        assert len(mock_knowledge_graph.upsert_entities.call_args.args[0]) == 2
+        mock_knowledge_graph.add_relations.assert_awaited_once()
+        assert len(mock_knowledge_graph.add_relations.call_args.args[0]) == 1
 
         # Verify progress reported
         on_progress.assert_any_call(0, "Loading knowledge documents")
@@ -159,7 +174,7 @@ class TestExecute:
             _make_doc("d-2", "Doc B", "Content B"),
             _make_doc("d-3", "Doc C", "Content C"),
         ]
-        mock_catalog_repo.list_knowledge_documents.return_value = docs
+        _stub_documents(mock_catalog_repo, docs)
 
         # Each doc yields 1 entity and 0 relations
         mock_extractor.extract_from_document.return_value = (
@@ -179,7 +194,7 @@ class TestExecute:
     ):
         """Documents with empty content are skipped."""
         doc = _make_doc("d-1", "Empty Doc", "")
-        mock_catalog_repo.list_knowledge_documents.return_value = [doc]
+        _stub_documents(mock_catalog_repo, [doc])
 
         result = _unwrap(await handler.execute("job-4", {}, on_progress))
 
@@ -195,7 +210,7 @@ class TestExecute:
             _make_doc("d-1", "Good Doc", "Good content"),
             _make_doc("d-2", "Bad Doc", "Bad content"),
         ]
-        mock_catalog_repo.list_knowledge_documents.return_value = docs
+        _stub_documents(mock_catalog_repo, docs)
 
         # First call succeeds, second fails
         mock_extractor.extract_from_document.side_effect = [
@@ -222,7 +237,7 @@ class TestExecute:
             _make_doc("d-3", "Doc C", "Content C"),
             _make_doc("d-4", "Doc D", "Content D"),
         ]
-        mock_catalog_repo.list_knowledge_documents.return_value = docs
+        _stub_documents(mock_catalog_repo, docs)
         mock_extractor.extract_from_document.return_value = ([], [])
 
         await handler.execute("job-6", {}, on_progress)
@@ -239,9 +254,9 @@ class TestExecute:
     async def test_entity_properties_passed_correctly(
         self, handler, mock_catalog_repo, mock_extractor, mock_knowledge_graph, on_progress
     ):
-        """Entity fields are correctly passed to KnowledgeGraph.upsert_entity()."""
+        """Entity fields are correctly passed to KnowledgeGraph.upsert_entities()."""
         doc = _make_doc("d-1", "Test", "Test content")
-        mock_catalog_repo.list_knowledge_documents.return_value = [doc]
+        _stub_documents(mock_catalog_repo, [doc])
 
         mock_extractor.extract_from_document.return_value = (
             [
@@ -259,8 +274,8 @@ class TestExecute:
 
         await handler.execute("job-7", {}, on_progress)
 
-        # Verify the entity passed to upsert_entity
-        entity_arg = mock_knowledge_graph.upsert_entity.call_args.args[0]
+        # Verify the entity passed to upsert_entities
+        [entity_arg] = mock_knowledge_graph.upsert_entities.call_args.args[0]
         assert entity_arg.id == "ent-abc"
         assert entity_arg.entity_type == "system"
         assert entity_arg.name == "CRM"
@@ -271,9 +286,9 @@ class TestExecute:
     async def test_relation_properties_passed_correctly(
         self, handler, mock_catalog_repo, mock_extractor, mock_knowledge_graph, on_progress
     ):
-        """Relation fields are correctly passed to KnowledgeGraph.add_relation()."""
+        """Relation fields are correctly passed to KnowledgeGraph.add_relations()."""
         doc = _make_doc("d-1", "Test", "Test content")
-        mock_catalog_repo.list_knowledge_documents.return_value = [doc]
+        _stub_documents(mock_catalog_repo, [doc])
 
         mock_extractor.extract_from_document.return_value = (
             [
@@ -293,9 +308,81 @@ class TestExecute:
 
         await handler.execute("job-8", {}, on_progress)
 
-        relation_arg = mock_knowledge_graph.add_relation.call_args.args[0]
+        [relation_arg] = mock_knowledge_graph.add_relations.call_args.args[0]
         assert relation_arg.source_id == "e1"
         assert relation_arg.target_id == "e2"
         assert relation_arg.relation_type == "integrates_with"
         assert relation_arg.properties == {"protocol": "REST"}
         assert relation_arg.confidence == 0.88
+
+
+# ---------------------------------------------------------------------------
+# Tests: Pipeline
+# ---------------------------------------------------------------------------
+
+
+class TestPipeline:
+    """Concurrent extraction with ordered, batched graph writes."""
+
+    async def test_extractions_run_concurrently_up_to_the_limit(
+        self, mock_catalog_repo, mock_knowledge_graph, mock_extractor, on_progress
+    ):
+        _stub_documents(mock_catalog_repo, [
+            _make_doc(f"d-{i}", f"Doc {i}", f"Content {i}") for i in range(8)
+        ])
+        in_flight = 0
+        peak = 0
+
+        async def _extract(content, title):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return ([], [])
+
+        mock_extractor.extract_from_document.side_effect = _extract
+        handler = KGRecomputeHandler(
+            mock_catalog_repo, mock_knowledge_graph, mock_extractor, max_concurrency=3
+        )
+
+        result = _unwrap(await handler.execute("job-9", {}, on_progress))
+
+        assert result["documents_processed"] == 8
+        assert peak == 3
+        progress = [c.args[0] for c in on_progress.call_args_list if c.args[0] > 0]
+        assert progress == sorted(progress)
+
+    async def test_entities_are_written_in_batches(
+        self, mock_catalog_repo, mock_knowledge_graph, mock_extractor, on_progress
+    ):
+        _stub_documents(mock_catalog_repo, [
+            _make_doc(f"d-{i}", f"Doc {i}", f"Content {i}") for i in range(5)
+        ])
+
+        async def _extract(content, title):
+            return (
+                [{"id": title, "entity_type": "doc", "name": title}],
+                [{"source_id": title, "target_id": "hub", "relation_type": "links"}],
+            )
+
+        mock_extractor.extract_from_document.side_effect = _extract
+        handler = KGRecomputeHandler(
+            mock_catalog_repo, mock_knowledge_graph, mock_extractor,
+            flush_size=2, embed_batch_size=16,
+        )
+
+        result = _unwrap(await handler.execute("job-10", {}, on_progress))
+
+        assert result["entities_added"] == 5
+        batches = [
+            [e.id for e in call.args[0]]
+            for call in mock_knowledge_graph.upsert_entities.call_args_list
+        ]
+        assert batches == [["Doc 0", "Doc 1"], ["Doc 2", "Doc 3"], ["Doc 4"]]
+        assert all(
+            call.kwargs["embed_batch_size"] == 16
+            for call in mock_knowledge_graph.upsert_entities.call_args_list
+        )
+        assert mock_knowledge_graph.add_relations.await_count == 3
+        mock_knowledge_graph.upsert_entity.assert_not_called()
@@ -16,23 +16,35 @@ def _make_doc(doc_id, title, content):
     return doc
 
 
+def _stub_documents(repo, docs) -> None:
+    """Serve *docs* through the repository's count and streaming reads."""
+
+    async def _stream(*, after_id=None, **kwargs):
+        for doc in docs:
+            if after_id is None or doc.id > after_id:
+                yield doc
+
+    repo.count_knowledge_documents = AsyncMock(return_value=len(docs))
+    repo.iter_knowledge_documents = MagicMock(side_effect=_stream)
+
+
 @pytest.fixture
 def handler():
     catalog = AsyncMock()
     kg = AsyncMock()
     extractor = AsyncMock()
     extractor.extract_from_document.return_value = ([], [])
-    return KGRecomputeHandler(catalog, kg, extractor), catalog, extractor
+    return KGRecomputeHandler(catalog, kg, extractor, max_concurrency=1), catalog, extractor
 
 
 class TestKGRecomputeCheckpoint:
     async def test_pauses_at_boundary(self, handler):
         h, catalog, extractor = handler
-        catalog.list_knowledge_documents.return_value = [
+        _stub_documents(catalog, [
             _make_doc("d1", "Doc 1", "content1"),
             _make_doc("d2", "Doc 2", "content2"),
             _make_doc("d3", "Doc 3", "content3"),
-        ]
+        ])
 
         call_count = 0
         def pause_after_one():
@@ -45,17 +57,43 @@ class TestKGRecomputeCheckpoint:
 
         assert isinstance(result, ExecutionResult)
         assert result.is_paused
-        assert result.checkpoint["current_index"] == 2
+        assert result.checkpoint["last_id"] == "d2"
+        assert result.checkpoint["documents_processed"] == 2
         assert extractor.extract_from_document.call_count == 2
 
-    async def test_resumes_from_checkpoint(self, handler):
+    async def test_resumes_after_last_processed_id(self, handler):
+        h, catalog, extractor = handler
+        # d0 was added while the job was paused; it sorts before the
+        # checkpoint and must not shift the resume position.
+        docs = [
+            _make_doc("d0", "Doc 0", "c0"),
+            _make_doc("d1", "Doc 1", "c1"),
+            _make_doc("d2", "Doc 2", "c2"),
+            _make_doc("d3", "Doc 3", "c3"),
+        ]
+        _stub_documents(catalog, docs)
+
+        result = await h.execute(
+            "j-1", {}, AsyncMock(),
+            checkpoint={
+                "last_id": "d2", "documents_processed": 2,
+                "entities_added": 0, "relations_added": 0,
+            },
+        )
+
+        catalog.iter_knowledge_documents.assert_called_once_with(after_id="d2")
+        extractor.extract_from_document.assert_called_once()
+        assert extractor.extract_from_document.call_args[0][1] == "Doc 3"
+        assert result.result["documents_processed"] == 3
+
+    async def test_resumes_from_positional_checkpoint(self, handler):
         h, catalog, extractor = handler
         docs = [
             _make_doc("d1", "Doc 1", "c1"),
             _make_doc("d2", "Doc 2", "c2"),
             _make_doc("d3", "Doc 3", "c3"),
         ]
-        catalog.list_knowledge_documents.return_value = docs
+        _stub_documents(catalog, docs)
 
         progress = AsyncMock()
         result = await h.execute(
@@ -68,3 +106,35 @@ class TestKGRecomputeCheckpoint:
         extractor.extract_from_document.assert_called_once()
         call_args = extractor.extract_from_document.call_args
         assert call_args[0][1] == "Doc 3"
+
+    async def test_concurrent_pause_flushes_consumed_documents_only(self):
+        catalog = AsyncMock()
+        kg = AsyncMock()
+        extractor = AsyncMock()
+        _stub_documents(catalog, [
+            _make_doc(f"d{i}", f"Doc {i}", f"content{i}") for i in range(6)
+        ])
+
+        async def _extract(content, title):
+            return ([{"id": title, "entity_type": "doc", "name": title}], [])
+
+        extractor.extract_from_document.side_effect = _extract
+        h = KGRecomputeHandler(catalog, kg, extractor, max_concurrency=3)
+
+        calls = 0
+
+        def pause_after_two():
+            nonlocal calls
+            calls += 1
+            return calls >= 2
+
+        result = await h.execute("j-1", {}, AsyncMock(), should_pause=pause_after_two)
+
+        assert result.checkpoint == {
+            "last_id": "d1", "documents_processed": 2,
+            "entities_added": 2, "relations_added": 0,
+        }
+        # Results extracted ahead of the checkpoint are discarded, not written.
+        written = [e.id for call in kg.upsert_entities.call_args_list for e in call.args[0]]
+        assert written == ["Doc 0", "Doc 1"]
+        assert extractor.extract_from_document.call_count <= 2 + 3
@@ -0,0 +1,86 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0
+
+"""Tests for ProgressThrottle and ProgressHub."""
+
+from __future__ import annotations
+
+import asyncio
+
+from flydesk.jobs.progress import ProgressHub, ProgressThrottle
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.writes: list[tuple[int, str]] = []
+
+    async def __call__(self, pct: int, message: str) -> None:
+        self.writes.append((pct, message))
+
+
+class TestProgressThrottle:
+    async def test_coalesces_between_milestones(self):
+        persist = Recorder()
+        throttle = ProgressThrottle(persist, interval=60, milestone_pct=25)
+        for pct in range(1, 101):
+            await throttle.update(pct, f"step {pct}")
+
+        # First report, then each 25% milestone (100% included).
+        assert [pct for pct, _ in persist.writes] == [1, 25, 50, 75, 100]
+
+    async def test_interval_elapsed_persists(self):
+        persist = Recorder()
+        throttle = ProgressThrottle(persist, interval=0.05, milestone_pct=0)
+        await throttle.update(1, "a")
+        await throttle.update(2, "b")
+        await asyncio.sleep(0.06)
+        await throttle.update(3, "c")
+        assert persist.writes == [(1, "a"), (3, "c")]
+
+    async def test_flush_writes_latest_once(self):
+        persist = Recorder()
+        throttle = ProgressThrottle(persist, interval=60, milestone_pct=0)
+        await throttle.update(1, "a")
+        await throttle.update(7, "latest")
+        await throttle.flush()
+        await throttle.flush()
+        assert persist.writes == [(1, "a"), (7, "latest")]
+
+
+class TestProgressHub:
+    async def test_fan_out_to_job_and_global_subscribers(self):
+        hub = ProgressHub()
+        job_sub = hub.subscribe("j-1")
+        other_sub = hub.subscribe("j-2")
+        all_sub = hub.subscribe()
+
+        hub.publish({"job_id": "j-1", "progress_pct": 5})
+
+        assert (await job_sub.get(timeout=0.1))["progress_pct"] == 5
+        assert (await all_sub.get(timeout=0.1))["job_id"] == "j-1"
+        assert await other_sub.get(timeout=0.01) is None
+
+    async def test_slow_subscriber_keeps_latest(self):
+        hub = ProgressHub(buffer_size=2)
+        sub = hub.subscribe("j-1")
+        for pct in range(10):
+            hub.publish({"job_id": "j-1", "progress_pct": pct})
+
+        received = [(await sub.get(timeout=0.1))["progress_pct"] for _ in range(2)]
+        assert received == [8, 9]
+        assert sub.dropped == 8
+
+    async def test_get_wakes_on_publish(self):
+        hub = ProgressHub()
+        sub = hub.subscribe("j-1")
+        waiter = asyncio.create_task(sub.get(timeout=1))
+        await asyncio.sleep(0)
+        hub.publish({"job_id": "j-1", "progress_pct": 1})
+        assert (await waiter)["progress_pct"] == 1
+
+    def test_close_unsubscribes(self):
+        hub = ProgressHub()
+        with hub.subscribe("j-1"):
+            assert hub.subscriber_count() == 1
+        assert hub.subscriber_count() == 0
@@ -0,0 +1,100 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""Tests for JobQueue -- lanes, fairness, and concurrency caps."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from flydesk.jobs.models import JobPriority
+from flydesk.jobs.queue import JobQueue, QueuedJob
+
+
+def _job(
+    job_id: str,
+    job_type: str = "indexing",
+    priority: JobPriority = JobPriority.INTERACTIVE,
+    submitter: str = "alice",
+) -> QueuedJob:
+    return QueuedJob(job_id=job_id, job_type=job_type, priority=priority, submitter=submitter)
+
+
+async def _drain(queue: JobQueue, n: int) -> list[str]:
+    order = []
+    for _ in range(n):
+        entry = await asyncio.wait_for(queue.get(), timeout=1)
+        order.append(entry.job_id)
+        await queue.task_done(entry)
+    return order
+
+
+class TestLanes:
+    async def test_interactive_before_bulk(self):
+        queue = JobQueue(max_concurrency=1)
+        await queue.put(_job("bulk-1", "kg_recompute", JobPriority.BULK))
+        await queue.put(_job("int-1"))
+        assert await _drain(queue, 2) == ["int-1", "bulk-1"]
+
+    async def test_bulk_not_starved(self):
+        queue = JobQueue(max_concurrency=1, bulk_share=2)
+        await queue.put(_job("bulk-1", "kg_recompute", JobPriority.BULK))
+        for i in range(4):
+            await queue.put(_job(f"int-{i}"))
+        assert await _drain(queue, 5) == ["int-0", "int-1", "bulk-1", "int-2", "int-3"]
+
+
+class TestFairness:
+    async def test_submitters_served_round_robin(self):
+        queue = JobQueue(max_concurrency=1)
+        for i in range(3):
+            await queue.put(_job(f"a-{i}", submitter="alice"))
+        await queue.put(_job("b-0", submitter="bob"))
+        assert await _drain(queue, 4) == ["a-0", "b-0", "a-1", "a-2"]
+
+
+class TestConcurrency:
+    async def test_global_limit(self):
+        queue = JobQueue(max_concurrency=2)
+        for i in range(3):
+            await queue.put(_job(f"j-{i}"))
+        first = await queue.get()
+        await queue.get()
+        with pytest.raises(TimeoutError):
+            await asyncio.wait_for(queue.get(), timeout=0.05)
+        await queue.task_done(first)
+        assert (await asyncio.wait_for(queue.get(), timeout=1)).job_id == "j-2"
+
+    async def test_type_cap_skips_to_other_types(self):
+        queue = JobQueue(max_concurrency=4, type_limits={"kg_recompute": 1})
+        await queue.put(_job("kg-1", "kg_recompute"))
+        await queue.put(_job("kg-2", "kg_recompute"))
+        await queue.put(_job("idx-1", "indexing"))
+        assert (await queue.get()).job_id == "kg-1"
+        assert (await queue.get()).job_id == "idx-1"
+        with pytest.raises(TimeoutError):
+            await asyncio.wait_for(queue.get(), timeout=0.05)
+
+
+class TestStats:
+    async def test_depth_running_and_wait(self):
+        queue = JobQueue(max_concurrency=1, type_limits={"kg_recompute": 1})
+        await queue.put(_job("kg-1", "kg_recompute", JobPriority.BULK))
+        await queue.put(_job("idx-1"))
+        await queue.get()
+
+        stats = queue.stats()
+        assert stats["running"] == 1
+        assert stats["queued"] == 1
+        assert stats["lanes"] == {"interactive": 0, "bulk": 1}
+        assert stats["job_types"]["indexing"]["running"] == 1
+        assert stats["job_types"]["indexing"]["dispatched"] == 1
+        assert stats["job_types"]["kg_recompute"]["queued"] == 1
+        assert stats["job_types"]["kg_recompute"]["limit"] == 1
@@ -10,12 +10,13 @@
 
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timedelta, timezone
 
 import pytest
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
-from flydesk.jobs.models import Job, JobStatus
+from flydesk.jobs.models import Job, JobPriority, JobStatus
 from flydesk.jobs.repository import JobRepository
 from flydesk.models.base import Base
 
@@ -216,3 +217,72 @@ class TestJobRepository:
         remaining = await repo.list()
         ids = {j.id for j in remaining}
         assert ids == {"j-old-running", "j-new-done"}
+
+
+class TestJobLeases:
+    async def test_claim_marks_running_with_lease(self, repo):
+        await repo.create(_make_job("j-1"))
+        job = await repo.claim_next("worker-a", job_types=["indexing"], lease_seconds=30)
+        assert job is not None
+        assert job.id == "j-1"
+        assert job.status == JobStatus.RUNNING
+        assert job.attempts == 1
+        assert await repo.claim_next("worker-b", job_types=["indexing"], lease_seconds=30) is None
+
+    async def test_claim_respects_job_types_and_priority(self, repo):
+        now = datetime.now(timezone.utc)
+        await repo.create(_make_job("bulk", priority=JobPriority.BULK, created_at=now))
+        await repo.create(_make_job("other", job_type="kg_recompute", created_at=now))
+        await repo.create(_make_job("interactive", created_at=now + timedelta(seconds=1)))
+        first = await repo.claim_next("w", job_types=["indexing"], lease_seconds=30)
+        second = await repo.claim_next("w", job_types=["indexing"], lease_seconds=30)
+        assert [first.id, second.id] == ["interactive", "bulk"]
+
+    async def test_concurrent_claims_never_share_a_job(self, tmp_path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/jobs.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        repo = JobRepository(async_sessionmaker(engine, expire_on_commit=False))
+        for i in range(10):
+            await repo.create(_make_job(f"j-{i}"))
+
+        async def drain(worker: str) -> list[str]:
+            claimed = []
+            while (job := await repo.claim_next(worker, job_types=["indexing"], lease_seconds=30)):
+                claimed.append(job.id)
+            return claimed
+
+        results = await asyncio.gather(*(drain(f"w-{n}") for n in range(4)))
+        claimed = [job_id for ids in results for job_id in ids]
+        assert sorted(claimed) == sorted(f"j-{i}" for i in range(10))
+        await engine.dispose()
+
+    async def test_expired_lease_is_reclaimed(self, repo):
+        await repo.create(_make_job("j-1"))
+        await repo.claim_next("crashed", job_types=["indexing"], lease_seconds=-1)
+        job = await repo.claim_next("healthy", job_types=["indexing"], lease_seconds=30)
+        assert job is not None
+        assert job.attempts == 2
+        assert await repo.renew_lease("j-1", "crashed", 30) is False
+        assert await repo.renew_lease("j-1", "healthy", 30) is True
+
+    async def test_terminal_status_clears_lease(self, repo):
+        await repo.create(_make_job("j-1"))
+        await repo.claim_next("w", job_types=["indexing"], lease_seconds=30)
+        await repo.update_status("j-1", JobStatus.CANCELLED)
+        assert await repo.renew_lease("j-1", "w", 30) is False
+
+    async def test_release_lease_returns_job_to_pending(self, repo):
+        await repo.create(_make_job("j-1"))
+        await repo.claim_next("w", job_types=["indexing"], lease_seconds=30)
+        assert await repo.release_lease("j-1", "w") is True
+        assert (await repo.get("j-1")).status == JobStatus.PENDING
+
+    async def test_pending_counts(self, repo):
+        await repo.create(_make_job("a"))
+        await repo.create(_make_job("b", job_type="kg_recompute", priority=JobPriority.BULK))
+        await repo.create(_make_job("c", status=JobStatus.COMPLETED))
+        assert await repo.pending_counts() == {
+            "indexing": {"interactive": 1},
+            "kg_recompute": {"bulk": 1},
+        }
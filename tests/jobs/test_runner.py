@@ -17,7 +17,7 @@ import pytest
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from flydesk.jobs.handlers import JobHandler, ProgressCallback
-from flydesk.jobs.models import Job, JobStatus
+from flydesk.jobs.models import Job, JobPriority, JobStatus
 from flydesk.jobs.repository import JobRepository
 from flydesk.jobs.runner import JobRunner
 from flydesk.models.base import Base
@@ -80,8 +80,8 @@ class SlowHandler:
 
 
 @pytest.fixture
-async def session_factory():
-    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+async def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/jobs.db")
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     factory = async_sessionmaker(engine, expire_on_commit=False)
@@ -264,3 +264,247 @@ class TestJobRunner:
         """SuccessHandler and FailingHandler satisfy the JobHandler protocol."""
         assert isinstance(SuccessHandler(), JobHandler)
         assert isinstance(FailingHandler(), JobHandler)
+
+
+class BlockingHandler:
+    """A handler that runs until released, to observe concurrent dispatch."""
+
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+
+    async def execute(
+        self,
+        job_id: str,
+        payload: dict,
+        on_progress: ProgressCallback,
+        checkpoint: dict | None = None,
+        should_pause=lambda: False,
+    ) -> dict:
+        await self.release.wait()
+        return {}
+
+
+async def _wait_for_status(repo, job_id: str, status: JobStatus) -> Job | None:
+    for _ in range(100):
+        current = await repo.get(job_id)
+        if current is not None and current.status == status:
+            return current
+        await asyncio.sleep(0.02)
+    return await repo.get(job_id)
+
+
+class TestWorkerPool:
+    async def test_long_bulk_job_does_not_block_interactive(self, repo):
+        from flydesk.config import DeskConfig
+
+        runner = JobRunner(repo, config=DeskConfig(job_max_concurrency=2))
+        blocking = BlockingHandler()
+        runner.register_handler("kg_recompute", blocking)
+        runner.register_handler("indexing", SuccessHandler())
+        await runner.start()
+
+        long_job = await runner.submit("kg_recompute", {})
+        await _wait_for_status(repo, long_job.id, JobStatus.RUNNING)
+        short_job = await runner.submit("indexing", {"value": "quick"}, submitter="alice")
+
+        final = await _wait_for_status(repo, short_job.id, JobStatus.COMPLETED)
+        assert final is not None and final.status == JobStatus.COMPLETED
+        assert (await repo.get(long_job.id)).status == JobStatus.RUNNING
+
+        blocking.release.set()
+        await _wait_for_status(repo, long_job.id, JobStatus.COMPLETED)
+        await runner.stop()
+
+    async def test_job_type_cap_respected(self, repo):
+        runner = JobRunner(repo)
+        blocking = BlockingHandler()
+        runner.register_handler("kg_recompute", blocking)
+        await runner.start()
+
+        first = await runner.submit("kg_recompute", {})
+        second = await runner.submit("kg_recompute", {})
+        await _wait_for_status(repo, first.id, JobStatus.RUNNING)
+        await asyncio.sleep(0.1)
+        assert (await repo.get(second.id)).status == JobStatus.PENDING
+
+        stats = await runner.stats()
+        assert stats["job_types"]["kg_recompute"]["running"] == 1
+        assert stats["job_types"]["kg_recompute"]["queued"] == 1
+        assert stats["lanes"]["bulk"] == 1
+
+        blocking.release.set()
+        await _wait_for_status(repo, second.id, JobStatus.COMPLETED)
+        await runner.stop()
+
+    def test_default_priorities(self, runner):
+        assert runner.priority_for("kg_recompute") == JobPriority.BULK
+        assert runner.priority_for("indexing") == JobPriority.INTERACTIVE
+
+
+class CountingHandler:
+    """Counts executions so double-processing across workers is visible."""
+
+    def __init__(self) -> None:
+        self.executed: list[str] = []
+
+    async def execute(
+        self,
+        job_id: str,
+        payload: dict,
+        on_progress: ProgressCallback,
+        checkpoint: dict | None = None,
+        should_pause=lambda: False,
+    ) -> dict:
+        self.executed.append(job_id)
+        await asyncio.sleep(0.01)
+        return {}
+
+
+def _db_config(**overrides):
+    from flydesk.config import DeskConfig
+
+    return DeskConfig(
+        job_queue_backend="database",
+        job_lease_seconds=1,
+        job_poll_interval_seconds=0.05,
+        **overrides,
+    )
+
+
+class TestDatabaseQueue:
+    async def test_replicas_share_work_without_duplicates(self, repo):
+        handler = CountingHandler()
+        replicas = [JobRunner(repo, config=_db_config()) for _ in range(2)]
+        for replica in replicas:
+            replica.register_handler("test", handler)
+            await replica.start()
+
+        jobs = [await replicas[0].submit("test", {}) for _ in range(6)]
+        for job in jobs:
+            await _wait_for_status(repo, job.id, JobStatus.COMPLETED)
+        for replica in replicas:
+            await replica.stop()
+
+        assert sorted(handler.executed) == sorted(j.id for j in jobs)
+
+    async def test_job_submitted_elsewhere_is_picked_up(self, repo):
+        submitter = JobRunner(repo, config=_db_config())
+        submitter.register_handler("test", SuccessHandler())
+        worker = JobRunner(repo, config=_db_config())
+        worker.register_handler("test", SuccessHandler())
+        await worker.start()
+
+        job = await submitter.submit("test", {"value": "remote"})
+        final = await _wait_for_status(repo, job.id, JobStatus.COMPLETED)
+        await worker.stop()
+        assert final.result == {"key": "remote"}
+
+    async def test_expired_lease_reclaimed_from_crashed_worker(self, repo):
+        job = Job(
+            id="orphan",
+            job_type="test",
+            status=JobStatus.PENDING,
+            created_at=datetime.now(timezone.utc),
+        )
+        await repo.create(job)
+        await repo.claim_next("crashed-worker", job_types=["test"], lease_seconds=0.1)
+
+        worker = JobRunner(repo, config=_db_config())
+        worker.register_handler("test", SuccessHandler())
+        await worker.start()
+        final = await _wait_for_status(repo, "orphan", JobStatus.COMPLETED)
+        await worker.stop()
+        assert final.status == JobStatus.COMPLETED
+        assert final.attempts == 2
+
+    async def test_cancel_stops_running_job(self, repo):
+        runner = JobRunner(repo, config=_db_config())
+        runner.register_handler("test", SlowHandler())
+        await runner.start()
+        job = await runner.submit("test", {})
+        await _wait_for_status(repo, job.id, JobStatus.RUNNING)
+
+        await repo.update_status(job.id, JobStatus.CANCELLED)
+        for _ in range(50):
+            if not runner._workers:
+                break
+            await asyncio.sleep(0.05)
+        assert not runner._workers
+        await runner.stop()
+
+    async def test_stop_releases_running_jobs(self, repo):
+        runner = JobRunner(repo, config=_db_config())
+        runner.register_handler("test", SlowHandler())
+        await runner.start()
+        job = await runner.submit("test", {})
+        await _wait_for_status(repo, job.id, JobStatus.RUNNING)
+        await runner.stop()
+        assert (await repo.get(job.id)).status == JobStatus.PENDING
+
+
+class ChattyHandler:
+    """Reports progress for every one of 100 work items."""
+
+    async def execute(
+        self,
+        job_id: str,
+        payload: dict,
+        on_progress: ProgressCallback,
+        checkpoint: dict | None = None,
+        should_pause=lambda: False,
+    ) -> dict:
+        for i in range(1, 101):
+            await on_progress(i, f"Item {i}/100")
+        return {}
+
+
+class TestProgressCoalescing:
+    async def test_progress_writes_are_coalesced(self, repo, monkeypatch):
+        from flydesk.config import DeskConfig
+
+        writes: list[int] = []
+        original = repo.update_progress
+
+        async def counting_update(job_id, pct, message=""):
+            writes.append(pct)
+            await original(job_id, pct, message)
+
+        monkeypatch.setattr(repo, "update_progress", counting_update)
+        runner = JobRunner(
+            repo,
+            config=DeskConfig(job_progress_interval_seconds=60, job_progress_milestone_pct=25),
+        )
+        runner.register_handler("test", ChattyHandler())
+        subscription = runner.progress_hub.subscribe()
+        await runner.start()
+
+        job = await runner.submit("test", {})
+        final = await _wait_for_status(repo, job.id, JobStatus.COMPLETED)
+        await runner.stop()
+
+        assert writes == [1, 25, 50, 75, 100]
+        assert (final.progress_pct, final.progress_message) == (100, "Item 100/100")
+
+        events = []
+        while (event := await subscription.get(timeout=0)) is not None:
+            events.append(event)
+        assert events[-1]["status"] == "completed"
+        assert events[-2]["progress_pct"] == 100
+
+    async def test_failure_flushes_latest_progress(self, repo):
+        from flydesk.config import DeskConfig
+
+        class FailingMidway:
+            async def execute(self, job_id, payload, on_progress, checkpoint=None, should_pause=lambda: False):
+                await on_progress(1, "start")
+                await on_progress(3, "third item")
+                raise RuntimeError("boom")
+
+        runner = JobRunner(repo, config=DeskConfig(job_progress_interval_seconds=60))
+        runner.register_handler("test", FailingMidway())
+        await runner.start()
+        job = await runner.submit("test", {})
+        final = await _wait_for_status(repo, job.id, JobStatus.FAILED)
+        await runner.stop()
+
+        assert (final.progress_pct, final.progress_message) == (3, "third item")
@@ -82,6 +82,8 @@ def _mock_repo(
     repo.get_row = AsyncMock(return_value=row)
     repo.update_last_sync = AsyncMock()
     repo.list_sync_enabled = AsyncMock(return_value=sync_enabled_rows or [])
+    repo.get_manifest = AsyncMock(return_value={})
+    repo.save_sync_state = AsyncMock()
     return repo
 
 
@@ -277,6 +279,7 @@ class TestRunSyncForAll:
         repo.get_decrypted_config = AsyncMock(side_effect=[{"bucket": "b"}, {"tenant_id": "t"}])
         repo.get_row = AsyncMock(side_effect=[row1, row2])
         repo.update_last_sync = AsyncMock()
+        repo.get_manifest = AsyncMock(return_value={})
 
         results = await run_sync_for_all(repo)
 
@@ -291,3 +294,198 @@ class TestRunSyncForAll:
         repo = _mock_repo(sync_enabled_rows=[])
         results = await run_sync_for_all(repo)
         assert results == []
+
+
+# ---------------------------------------------------------------------------
+# Incremental sync
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+async def source_repo():
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from flydesk.knowledge.document_source_repository import DocumentSourceRepository
+    from flydesk.models.base import Base
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield DocumentSourceRepository(async_sessionmaker(engine, expire_on_commit=False))
+    await engine.dispose()
+
+
+async def _create_source(repo, source_type: str = "s3") -> str:
+    source = await repo.create(
+        source_type=source_type,
+        category="blob" if source_type == "s3" else "drive",
+        display_name="Docs",
+        auth_method="credentials",
+        config={"bucket": "docs"},
+        sync_enabled=True,
+    )
+    return source.id
+
+
+def _producer():
+    producer = AsyncMock()
+    producer.enqueue = AsyncMock()
+    return producer
+
+
+def _enqueued(producer) -> dict[str, object]:
+    return {c.args[0].metadata["key"]: c.args[0] for c in producer.enqueue.call_args_list}
+
+
+@patch("flydesk.jobs.source_sync._ensure_adapters_loaded")
+@patch("flydesk.jobs.source_sync.DocumentSourceFactory")
+class TestIncrementalSync:
+    async def test_only_new_and_changed_objects_are_imported(
+        self, mock_factory, mock_ensure, source_repo
+    ):
+        source_id = await _create_source(source_repo)
+        contents = {"a.md": b"# A", "b.txt": b"bee"}
+        objects = {
+            "docs": [
+                StorageObject(key="a.md", size=3, last_modified="2026-01-01", etag="e1"),
+                StorageObject(key="b.txt", size=3, last_modified="2026-01-01", etag="e2"),
+            ]
+        }
+        adapter = _blob_adapter([StorageContainer(name="docs")], objects)
+        adapter.get_object_content = AsyncMock(side_effect=lambda c, k: contents[k])
+        mock_factory.create.return_value = adapter
+        indexer = AsyncMock()
+        producer = _producer()
+        handler = SourceSyncHandler(source_repo, indexer=indexer, producer=producer)
+
+        first = await handler.sync_source(source_id)
+        assert first["added"] == 2
+        first_ids = {k: t.document_id for k, t in _enqueued(producer).items()}
+        assert set(first_ids) == {"a.md", "b.txt"}
+
+        # Nothing changed: no downloads, nothing enqueued.
+        adapter.get_object_content.reset_mock()
+        producer.enqueue.reset_mock()
+        second = await handler.sync_source(source_id)
+        assert second["changed"] == 0
+        adapter.get_object_content.assert_not_awaited()
+        producer.enqueue.assert_not_awaited()
+
+        # b.txt is touched (new ETag, same bytes); a.md really changes.
+        objects["docs"][0].etag = "e1-v2"
+        objects["docs"][1].etag = "e2-v2"
+        contents["a.md"] = b"# A, revised"
+        third = await handler.sync_source(source_id)
+        assert third["updated"] == 1
+        assert third["unchanged"] == 1
+        reindexed = _enqueued(producer)
+        assert set(reindexed) == {"a.md"}
+        assert reindexed["a.md"].document_id == first_ids["a.md"]
+        indexer.delete_document.assert_awaited_once_with(first_ids["a.md"])
+
+    async def test_removed_objects_are_deleted(self, mock_factory, mock_ensure, source_repo):
+        source_id = await _create_source(source_repo)
+        objects = {
+            "docs": [
+                StorageObject(key="a.md", size=1, last_modified="2026-01-01", etag="e1"),
+                StorageObject(key="b.md", size=1, last_modified="2026-01-01", etag="e2"),
+            ]
+        }
+        adapter = _blob_adapter([StorageContainer(name="docs")], objects)
+        mock_factory.create.return_value = adapter
+        indexer = AsyncMock()
+        producer = _producer()
+        handler = SourceSyncHandler(source_repo, indexer=indexer, producer=producer)
+        await handler.sync_source(source_id)
+        doc_b = _enqueued(producer)["b.md"].document_id
+
+        objects["docs"].pop()
+        result = await handler.sync_source(source_id)
+
+        assert result["removed"] == 1
+        assert result["files_found"] == 1
+        indexer.delete_document.assert_awaited_once_with(doc_b)
+        manifest = await source_repo.get_manifest(source_id)
+        assert set(manifest) == {("docs", "a.md")}
+
+    async def test_failed_download_is_retried_next_sync(
+        self, mock_factory, mock_ensure, source_repo
+    ):
+        source_id = await _create_source(source_repo)
+        objects = {"docs": [StorageObject(key="a.md", size=1, last_modified="t", etag="e1")]}
+        adapter = _blob_adapter([StorageContainer(name="docs")], objects)
+        adapter.get_object_content = AsyncMock(side_effect=[ConnectionError("reset"), b"a"])
+        mock_factory.create.return_value = adapter
+        handler = SourceSyncHandler(source_repo, producer=_producer())
+
+        assert (await handler.sync_source(source_id))["failed"] == 1
+        assert (await handler.sync_source(source_id))["added"] == 1
+
+    async def test_drive_change_feed_uses_stored_cursor(
+        self, mock_factory, mock_ensure, source_repo
+    ):
+        from flydesk.knowledge.document_source import DriveChanges
+
+        source_id = await _create_source(source_repo, "onedrive")
+        adapter = _drive_adapter([DriveInfo(id="d1", name="Drive")], {})
+        feed = {
+            None: DriveChanges(
+                items=[
+                    DriveItem(id="i1", name="a.md", path="", is_folder=False, etag="c1"),
+                    DriveItem(id="i2", name="b.md", path="", is_folder=False, etag="c1"),
+                ],
+                removed_ids=[],
+                cursor="delta-1",
+            ),
+            "delta-1": DriveChanges(items=[], removed_ids=["i2"], cursor="delta-2"),
+        }
+        adapter.list_changes = AsyncMock(side_effect=lambda d, cursor=None: feed[cursor])
+        mock_factory.create.return_value = adapter
+        indexer = AsyncMock()
+        handler = SourceSyncHandler(source_repo, indexer=indexer, producer=_producer())
+
+        first = await handler.sync_source(source_id)
+        second = await handler.sync_source(source_id)
+
+        assert first["added"] == 2
+        assert [c.args for c in adapter.list_changes.call_args_list] == [
+            ("d1", None),
+            ("d1", "delta-1"),
+        ]
+        adapter.list_items.assert_not_awaited()
+        assert second["removed"] == 1
+        assert second["files_found"] == 1
+        row = await source_repo.get_row(source_id)
+        assert '"delta-2"' in row.sync_cursors
+
+    async def test_downloads_are_bounded(self, mock_factory, mock_ensure, source_repo):
+        import asyncio
+
+        source_id = await _create_source(source_repo)
+        objects = {
+            "docs": [
+                StorageObject(key=f"f{i}.txt", size=1, last_modified="t", etag=str(i))
+                for i in range(10)
+            ]
+        }
+        adapter = _blob_adapter([StorageContainer(name="docs")], objects)
+        active = peak = 0
+
+        async def download(container, key):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return key.encode()
+
+        adapter.get_object_content = AsyncMock(side_effect=download)
+        mock_factory.create.return_value = adapter
+        handler = SourceSyncHandler(
+            source_repo, producer=_producer(), max_concurrent_downloads=3
+        )
+
+        result = await handler.sync_source(source_id)
+
+        assert result["added"] == 10
+        assert peak == 3
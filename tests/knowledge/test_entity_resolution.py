@@ -0,0 +1,211 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0
+
+"""Tests for knowledge graph entity resolution and compaction."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from flydesk.knowledge.entity_resolution import (
+    blocking_tokens,
+    canonical_entity_id,
+    cosine_similarity,
+    normalize_entity_name,
+    parse_embedding,
+    remap_relations,
+)
+from flydesk.knowledge.graph import Entity, KnowledgeGraph, Relation
+from flydesk.models.base import Base
+from flydesk.models.knowledge import EntityAliasRow
+
+# Names that embed close to each other; anything else gets its own axis.
+_SIMILAR = {"payments service": [1.0, 0.0, 0.0], "payment service": [0.99, 0.05, 0.0]}
+
+
+class _NameEmbedder:
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        vectors = []
+        for text in texts:
+            name = normalize_entity_name(text.split(" (")[0])
+            vectors.append(_SIMILAR.get(name, [0.0, 0.0, 1.0 + len(name)]))
+        return vectors
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+def kg(session_factory) -> KnowledgeGraph:
+    return KnowledgeGraph(session_factory, embedding_provider=_NameEmbedder())
+
+
+def _entity(entity_id: str, name: str, entity_type: str = "service", **kwargs) -> Entity:
+    return Entity(id=entity_id, entity_type=entity_type, name=name, **kwargs)
+
+
+class TestNormalisation:
+    def test_names_normalise_to_one_key(self):
+        assert normalize_entity_name("The Payments-Service ") == "payments service"
+        assert normalize_entity_name("PAYMENTS   service") == "payments service"
+        assert normalize_entity_name("R&D") == "r and d"
+
+    def test_canonical_id_is_stable_and_type_scoped(self):
+        assert canonical_entity_id("Payments Service", "Service") == canonical_entity_id(
+            "payments-service", "service"
+        )
+        assert canonical_entity_id("Payments", "service") != canonical_entity_id("Payments", "team")
+
+    def test_blocking_tokens_skip_short_words(self):
+        assert blocking_tokens("The API of Billing") == ["billing", "api"]
+
+    def test_vectors(self):
+        assert parse_embedding("[1, 2]") == [1.0, 2.0]
+        assert parse_embedding(None) is None
+        assert cosine_similarity([1.0, 0.0], [1.0, 0.0]) == pytest.approx(1.0)
+        assert cosine_similarity([1.0, 0.0], [0.0, 0.0]) == 0.0
+
+    def test_remap_relations_drops_merge_self_loops(self):
+        relations = [
+            Relation(source_id="a", target_id="b", relation_type="calls"),
+            Relation(source_id="a", target_id="c", relation_type="calls"),
+            Relation(source_id="c", target_id="c", relation_type="self"),
+        ]
+
+        result = remap_relations(relations, {"b": "a"})
+
+        assert [(r.source_id, r.target_id) for r in result] == [("a", "c"), ("c", "c")]
+
+
+class TestResolveOnUpsert:
+    async def test_same_name_in_batch_is_one_entity(self, kg):
+        mapping = await kg.upsert_entities(
+            [_entity("x1", "Payments Service"), _entity("x2", "payments-service")],
+            resolve=True,
+        )
+
+        assert mapping == {"x1": "x1", "x2": "x1"}
+        stored = await kg.get_entity("x1")
+        assert stored.mention_count == 2
+        assert await kg.get_entity("x2") is None
+
+    async def test_alias_resolves_later_mentions(self, kg):
+        await kg.upsert_entities([_entity("x1", "Payments Service")], resolve=True)
+
+        mapping = await kg.upsert_entities([_entity("y1", "the payments service")], resolve=True)
+
+        assert mapping == {"y1": "x1"}
+        assert (await kg.get_entity("x1")).mention_count == 2
+
+    async def test_similar_embedding_merges_into_canonical(self, kg):
+        await kg.upsert_entities(
+            [_entity("x1", "Payments Service", properties={"owner": "fin"}, confidence=0.5)],
+            resolve=True,
+        )
+
+        mapping = await kg.upsert_entities(
+            [_entity("y1", "Payment Service", properties={"owner": "ops", "tier": 1})],
+            resolve=True,
+        )
+
+        assert mapping == {"y1": "x1"}
+        merged = await kg.get_entity("x1")
+        assert merged.name == "Payments Service"
+        assert merged.properties == {"owner": "fin", "tier": 1}
+        assert merged.confidence == 1.0
+        assert merged.mention_count == 2
+
+    async def test_different_types_are_not_merged(self, kg):
+        await kg.upsert_entities([_entity("x1", "Payments Service")], resolve=True)
+
+        mapping = await kg.upsert_entities(
+            [_entity("t1", "Payments Service", entity_type="team")], resolve=True
+        )
+
+        assert mapping == {"t1": "t1"}
+
+    async def test_without_resolve_ids_are_kept(self, kg):
+        await kg.upsert_entities([_entity("x1", "Payments Service")])
+
+        mapping = await kg.upsert_entities([_entity("y1", "Payments Service")])
+
+        assert mapping == {"y1": "y1"}
+        assert await kg.get_entity("y1") is not None
+
+    async def test_delete_entity_removes_its_aliases(self, kg, session_factory):
+        await kg.upsert_entities([_entity("x1", "Payments Service")], resolve=True)
+
+        await kg.delete_entity("x1")
+
+        async with session_factory() as session:
+            rows = (await session.execute(select(EntityAliasRow))).scalars().all()
+        assert rows == []
+
+
+class TestCompaction:
+    async def test_merges_duplicates_and_rewires_relations(self, kg, session_factory):
+        await kg.upsert_entities(
+            [
+                _entity("a", "Payments Service", mention_count=3),
+                _entity("b", "payments-service"),
+                _entity("c", "Payment Service"),
+                _entity("d", "Ledger"),
+            ]
+        )
+        await kg.add_relations(
+            [
+                Relation(source_id="a", target_id="d", relation_type="writes"),
+                Relation(source_id="b", target_id="d", relation_type="writes"),
+                Relation(source_id="c", target_id="d", relation_type="reads"),
+                Relation(source_id="a", target_id="b", relation_type="same_as"),
+            ]
+        )
+
+        stats = await kg.compact_entities()
+
+        assert stats["entities_merged"] == 2
+        assert stats["relations_removed"] == 2
+        assert [e.id for e in await kg.list_entities()] == ["a", "d"]
+        survivor = await kg.get_entity("a")
+        assert survivor.mention_count == 5
+        relations = {(r.source_id, r.target_id, r.relation_type) for r in await kg.list_relations()}
+        assert relations == {("a", "d", "writes"), ("a", "d", "reads")}
+
+        async with session_factory() as session:
+            aliases = {
+                row.alias: row.entity_id
+                for row in (await session.execute(select(EntityAliasRow))).scalars()
+            }
+        assert aliases == {"payments service": "a", "payment service": "a", "ledger": "d"}
+
+    async def test_compaction_is_idempotent(self, kg):
+        await kg.upsert_entities([_entity("a", "Billing"), _entity("b", "billing")])
+        await kg.compact_entities()
+
+        stats = await kg.compact_entities()
+
+        assert stats["entities_merged"] == 0
+        assert len(await kg.list_entities()) == 1
+
+    async def test_reports_progress_per_type(self, kg):
+        await kg.upsert_entities(
+            [_entity("a", "Billing"), _entity("t", "Billing", entity_type="Team")]
+        )
+        progress: list[int] = []
+
+        async def _on_progress(pct: int, message: str) -> None:
+            progress.append(pct)
+
+        stats = await kg.compact_entities(_on_progress)
+
+        assert stats["entities_merged"] == 0
+        assert progress == [50, 100]
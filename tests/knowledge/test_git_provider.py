@@ -11,6 +11,9 @@
 from __future__ import annotations
 
 import base64
+import io
+import tarfile
+import time
 from unittest.mock import AsyncMock
 
 import httpx
@@ -18,12 +21,16 @@ import pytest
 
 from flydesk.knowledge.git_provider import (
     GitAccount,
+    GitArchiveProvider,
     GitBranch,
     GitFileContent,
     GitProvider,
     GitProviderFactory,
     GitRepo,
     GitTreeEntry,
+    RateLimitGate,
+    is_rate_limited,
+    read_archive,
 )
 from flydesk.knowledge.github import (
     GITHUB_API_BASE,
@@ -352,3 +359,80 @@ class TestUnifiedDataclasses:
         fc = GitFileContent(path="f.md", sha="abc", content="hello")
         assert fc.encoding == "utf-8"
         assert fc.size == 0
+
+
+# ---------------------------------------------------------------------------
+# Archives and rate limits
+# ---------------------------------------------------------------------------
+
+
+def _tarball(files: dict[str, bytes], top: str = "acme-docs-abc123") -> io.BytesIO:
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as archive:
+        for path, data in files.items():
+            info = tarfile.TarInfo(f"{top}/{path}")
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    buf.seek(0)
+    return buf
+
+
+class TestReadArchive:
+    def test_yields_requested_members_without_top_level_dir(self):
+        buf = _tarball({"README.md": b"# Hi", "docs/a.md": b"A", "docs/b.md": b"B"})
+        members = dict(read_archive(buf, ["docs/a.md", "README.md"]))
+        assert members == {"README.md": b"# Hi", "docs/a.md": b"A"}
+
+    def test_missing_paths_are_not_yielded(self):
+        buf = _tarball({"a.md": b"A"})
+        assert list(read_archive(buf, ["a.md", "gone.md"])) == [("a.md", b"A")]
+
+    def test_adapters_support_archives(self):
+        assert isinstance(GitHubAdapter(token="t"), GitArchiveProvider)
+
+
+class TestRateLimitGate:
+    def test_exhausted_limit_pauses_until_reset(self):
+        gate = RateLimitGate(max_wait=120)
+        reset = int(time.time()) + 30
+        delay = gate.observe(
+            200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(reset)}
+        )
+        assert 25 <= delay <= 31
+
+    def test_remaining_requests_do_not_pause(self):
+        gate = RateLimitGate()
+        delay = gate.observe(
+            200, {"RateLimit-Remaining": "10", "RateLimit-Reset": str(int(time.time()) + 30)}
+        )
+        assert delay == 0
+
+    def test_retry_after_is_capped(self):
+        gate = RateLimitGate(max_wait=5)
+        assert gate.observe(429, {"Retry-After": "3600"}) == 5
+
+    @pytest.mark.anyio
+    async def test_requests_wait_while_paused(self, monkeypatch):
+        gate = RateLimitGate()
+        gate.observe(429, {"Retry-After": "2"})
+        slept: list[float] = []
+
+        async def _sleep(delay):
+            slept.append(delay)
+
+        monkeypatch.setattr("flydesk.knowledge.git_provider.asyncio.sleep", _sleep)
+        await gate.before_request(httpx.Request("GET", "https://api.github.com/x"))
+        assert slept and 1 < slept[0] <= 2
+
+    def test_is_rate_limited(self):
+        request = httpx.Request("GET", "https://api.github.com/x")
+
+        def _error(status, headers):
+            response = httpx.Response(status, headers=headers, request=request)
+            return httpx.HTTPStatusError("err", request=request, response=response)
+
+        assert is_rate_limited(_error(429, {}))
+        assert is_rate_limited(_error(403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0"}))
+        assert not is_rate_limited(_error(403, {}))
+        assert not is_rate_limited(_error(404, {}))
+        assert not is_rate_limited(ValueError("boom"))
@@ -155,3 +155,49 @@ class TestKnowledgeGraph:
         graph = await kg.get_entity_neighborhood("nonexistent")
         assert graph.entities == []
         assert graph.relations == []
+
+
+class TestBulkWrites:
+    async def test_upsert_entities_counts_repeats_as_mentions(self, kg, sample_entity):
+        await kg.upsert_entity(sample_entity)
+        renamed = Entity(id="acme-corp", entity_type="company", name="Acme Inc")
+        other = Entity(id="globex", entity_type="company", name="Globex")
+
+        await kg.upsert_entities([renamed, other, other])
+
+        acme = await kg.get_entity("acme-corp")
+        assert (acme.name, acme.mention_count) == ("Acme Inc", 2)
+        globex = await kg.get_entity("globex")
+        assert globex.mention_count == 2
+
+    async def test_upsert_entities_embeds_in_batches(self, session_factory):
+        class _Embedder:
+            def __init__(self):
+                self.calls: list[int] = []
+
+            async def embed(self, texts):
+                self.calls.append(len(texts))
+                return [[0.1, 0.2] for _ in texts]
+
+        embedder = _Embedder()
+        kg = KnowledgeGraph(session_factory, embedding_provider=embedder)
+        entities = [Entity(id=f"e-{i}", entity_type="concept", name=f"E{i}") for i in range(5)]
+
+        await kg.upsert_entities(entities + entities[:1], embed_batch_size=2)
+
+        assert embedder.calls == [2, 2, 1]
+
+    async def test_add_relations_updates_existing_triples(self, kg):
+        await kg.add_relation(
+            Relation(source_id="a", target_id="b", relation_type="uses", confidence=0.5)
+        )
+
+        await kg.add_relations([
+            Relation(source_id="a", target_id="b", relation_type="uses", confidence=0.9),
+            Relation(source_id="a", target_id="c", relation_type="uses"),
+            Relation(source_id="a", target_id="c", relation_type="uses", confidence=0.7),
+        ])
+
+        relations = await kg.list_relations()
+        by_target = {r.target_id: r.confidence for r in relations}
+        assert by_target == {"b": 0.9, "c": 0.7}
@@ -0,0 +1,128 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0
+
+"""Tests for multi-root knowledge graph traversal and path queries."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from flydesk.knowledge.graph import Entity, KnowledgeGraph, Relation
+from flydesk.models.base import Base
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def kg(engine) -> KnowledgeGraph:
+    """A chain a - b - c - d plus a hub h linked to a, b and c."""
+    graph = KnowledgeGraph(async_sessionmaker(engine, expire_on_commit=False))
+    await graph.upsert_entities(
+        [Entity(id=i, entity_type="service", name=i.upper()) for i in "abcdh"]
+    )
+    await graph.add_relations(
+        [
+            Relation(source_id="a", target_id="b", relation_type="calls", confidence=0.9),
+            Relation(source_id="b", target_id="c", relation_type="calls", confidence=0.9),
+            Relation(source_id="c", target_id="d", relation_type="owns", confidence=0.9),
+            Relation(source_id="h", target_id="a", relation_type="monitors", confidence=0.2),
+            Relation(source_id="h", target_id="b", relation_type="monitors", confidence=0.3),
+            Relation(source_id="h", target_id="c", relation_type="monitors", confidence=0.4),
+        ]
+    )
+    return graph
+
+
+def _ids(graph) -> list[str]:
+    return [e.id for e in graph.entities]
+
+
+def _edges(graph) -> set[tuple[str, str]]:
+    return {(r.source_id, r.target_id) for r in graph.relations}
+
+
+class TestNeighborhoods:
+    async def test_single_root_first_degree(self, kg):
+        graph = await kg.get_entity_neighborhood("a")
+
+        assert _ids(graph)[0] == "a"
+        assert set(_ids(graph)) == {"a", "b", "h"}
+        assert _edges(graph) == {("a", "b"), ("h", "a")}
+
+    async def test_depth_two_reaches_second_degree(self, kg):
+        graph = await kg.get_entity_neighborhood("a", depth=2, relation_types=["calls"])
+
+        assert _ids(graph) == ["a", "b", "c"]
+        assert _edges(graph) == {("a", "b"), ("b", "c")}
+
+    async def test_many_roots_in_one_traversal(self, kg, engine):
+        statements: list[str] = []
+        listener = lambda *args: statements.append(args[2])  # noqa: E731
+        event.listen(engine.sync_engine, "before_cursor_execute", listener)
+        try:
+            graph = await kg.get_neighborhoods(["a", "d"])
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", listener)
+
+        assert set(_ids(graph)) == {"a", "b", "h", "c", "d"}
+        assert ("c", "d") in _edges(graph)
+        # Adjacency snapshot + entities + relations, independent of root count.
+        assert len(statements) == 3
+
+    async def test_fanout_keeps_highest_confidence_relations(self, kg):
+        graph = await kg.get_entity_neighborhood("h", max_fanout=1)
+
+        assert _edges(graph) == {("h", "c")}
+
+    async def test_missing_root_returns_empty_graph(self, kg):
+        graph = await kg.get_entity_neighborhood("nope")
+
+        assert graph.entities == []
+        assert graph.relations == []
+
+    async def test_snapshot_sees_new_relations(self, kg):
+        await kg.get_entity_neighborhood("d")
+        await kg.add_relation(Relation(source_id="d", target_id="h", relation_type="calls"))
+
+        graph = await kg.get_entity_neighborhood("d")
+
+        assert set(_ids(graph)) == {"d", "c", "h"}
+
+
+class TestPaths:
+    async def test_shortest_paths_first(self, kg):
+        paths = await kg.find_paths("a", "c")
+
+        assert [p.entity_ids for p in paths][:2] == [["a", "b", "c"], ["a", "h", "c"]]
+        assert paths[0].length == 2
+        assert [r.relation_type for r in paths[0].relations] == ["calls", "calls"]
+
+    async def test_relation_type_filter_and_depth(self, kg):
+        assert await kg.find_paths("a", "d", max_depth=2) == []
+
+        paths = await kg.find_paths("a", "d", relation_types=["calls", "owns"])
+
+        assert [p.entity_ids for p in paths] == [["a", "b", "c", "d"]]
+
+    async def test_limit(self, kg):
+        paths = await kg.find_paths("a", "c", limit=1)
+
+        assert len(paths) == 1
+
+    async def test_clear_drops_snapshot(self, kg):
+        assert await kg.find_paths("a", "c")
+
+        await kg.clear()
+
+        assert await kg.find_paths("a", "c") == []
+        assert (await kg.get_entity_neighborhood("a")).entities == []
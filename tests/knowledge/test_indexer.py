@@ -157,3 +157,43 @@ class TestKnowledgeIndexer:
                 select(DocumentChunkRow).where(DocumentChunkRow.document_id == "doc-001")
             )
             assert result.scalars().all() == []
+
+
+class TestIndexDocuments:
+    @staticmethod
+    def _documents(n: int) -> list[KnowledgeDocument]:
+        return [
+            KnowledgeDocument(
+                id=f"doc-{i}",
+                title=f"Doc {i}",
+                content=f"Document {i} has enough text to be split into more than one chunk.",
+            )
+            for i in range(n)
+        ]
+
+    async def test_batch_shares_embedding_call(
+        self, indexer, session_factory, embedding_provider
+    ):
+        """A batch of documents is embedded in one provider call."""
+        indexed = await indexer.index_documents(self._documents(3))
+
+        assert embedding_provider.call_count == 1
+        assert set(indexed) == {"doc-0", "doc-1", "doc-2"}
+        async with session_factory() as session:
+            result = await session.execute(select(DocumentChunkRow))
+            rows = result.scalars().all()
+        assert len(rows) == sum(len(chunks) for chunks in indexed.values())
+        assert {row.document_id for row in rows} == set(indexed)
+
+    async def test_embedding_batch_size_splits_calls(self, session_factory, embedding_provider):
+        indexer = KnowledgeIndexer(
+            session_factory=session_factory,
+            embedding_provider=embedding_provider,
+            chunk_size=50,
+            chunk_overlap=10,
+            embedding_batch_size=2,
+        )
+        indexed = await indexer.index_documents(self._documents(2))
+
+        total_chunks = sum(len(chunks) for chunks in indexed.values())
+        assert embedding_provider.call_count == -(-total_chunks // 2)
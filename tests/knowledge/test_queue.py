@@ -7,15 +7,20 @@
 from __future__ import annotations
 
 import asyncio
+import itertools
+from unittest.mock import AsyncMock
 
 import pytest
 
 from flydesk.knowledge.queue import (
     INDEXING_QUEUE_NAME,
+    INDEXING_STREAM_NAME,
     InMemoryIndexingConsumer,
     InMemoryIndexingProducer,
     IndexingQueueProducer,
     IndexingTask,
+    RedisIndexingConsumer,
+    RedisIndexingProducer,
     create_indexing_queue,
 )
 from fireflyframework_genai.exposure.queues import QueueMessage
@@ -310,3 +315,282 @@ class TestCreateIndexingQueue:
         assert processed[0].document_id == sample_task.document_id
         assert processed[0].title == sample_task.title
         assert processed[0].content == sample_task.content
+
+
+# ---------------------------------------------------------------------------
+# Batching
+# ---------------------------------------------------------------------------
+
+
+def _task(doc_id: str) -> IndexingTask:
+    return IndexingTask(document_id=doc_id, title="T", content="C", document_type="other")
+
+
+async def _fill(queue: asyncio.Queue[QueueMessage], *doc_ids: str) -> None:
+    for doc_id in doc_ids:
+        await queue.put(QueueMessage(body=_task(doc_id).model_dump_json()))
+
+
+class TestBatchingConsumer:
+    async def test_drains_up_to_batch_size(self, memory_queue):
+        batches: list[list[str]] = []
+
+        async def batch_handler(tasks: list[IndexingTask]) -> None:
+            batches.append([t.document_id for t in tasks])
+
+        await _fill(memory_queue, *(f"d{i}" for i in range(5)))
+        consumer = InMemoryIndexingConsumer(
+            memory_queue, batch_handler=batch_handler, batch_size=2
+        )
+        await consumer.start()
+        await asyncio.sleep(0.1)
+        await consumer.stop()
+
+        assert batches == [["d0", "d1"], ["d2", "d3"], ["d4"]]
+
+    async def test_waits_for_batch_to_fill(self, memory_queue):
+        batches: list[list[str]] = []
+
+        async def batch_handler(tasks: list[IndexingTask]) -> None:
+            batches.append([t.document_id for t in tasks])
+
+        consumer = InMemoryIndexingConsumer(
+            memory_queue, batch_handler=batch_handler, batch_size=10, batch_wait_ms=200
+        )
+        await consumer.start()
+        await _fill(memory_queue, "d0")
+        await asyncio.sleep(0.05)
+        await _fill(memory_queue, "d1")
+        await asyncio.sleep(0.3)
+        await consumer.stop()
+
+        assert batches == [["d0", "d1"]]
+
+    async def test_parallel_consumers(self, memory_queue):
+        active = 0
+        peak = 0
+
+        async def batch_handler(tasks: list[IndexingTask]) -> None:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.05)
+            active -= 1
+
+        await _fill(memory_queue, "d0", "d1", "d2")
+        consumer = InMemoryIndexingConsumer(
+            memory_queue, batch_handler=batch_handler, concurrency=3
+        )
+        await consumer.start()
+        await asyncio.sleep(0.1)
+        await consumer.stop()
+
+        assert peak == 3
+
+    async def test_failed_batch_retried_per_task(self, memory_queue):
+        indexed: list[str] = []
+        dead_letter = AsyncMock()
+
+        async def batch_handler(tasks: list[IndexingTask]) -> None:
+            if any(t.document_id == "bad" for t in tasks):
+                raise RuntimeError("embedding failed")
+            indexed.extend(t.document_id for t in tasks)
+
+        await _fill(memory_queue, "d0", "bad", "d1")
+        consumer = InMemoryIndexingConsumer(
+            memory_queue, batch_handler=batch_handler, batch_size=3,
+            dead_letter=dead_letter,
+        )
+        await consumer.start()
+        await asyncio.sleep(0.1)
+        await consumer.stop()
+
+        assert indexed == ["d0", "d1"]
+        dead_letter.add.assert_awaited_once()
+        assert dead_letter.add.await_args.kwargs["source_id"] == "bad"
+
+    def test_requires_a_handler(self, memory_queue):
+        with pytest.raises(ValueError):
+            InMemoryIndexingConsumer(memory_queue)
+
+
+# ---------------------------------------------------------------------------
+# Redis Streams backend
+# ---------------------------------------------------------------------------
+
+
+class FakeStreamRedis:
+    """Just enough of ``redis.asyncio.Redis`` for one stream and one group."""
+
+    def __init__(self) -> None:
+        self.entries: dict[str, dict] = {}
+        self.pending: dict[str, dict] = {}
+        self.lists: dict[str, list] = {}
+        self.delivered_upto = 0
+        self._ids = itertools.count(1)
+
+    async def xadd(self, name, fields):
+        entry_id = f"{next(self._ids)}-0"
+        self.entries[entry_id] = {k.encode(): v if isinstance(v, bytes) else v.encode() for k, v in fields.items()}
+        return entry_id.encode()
+
+    async def xgroup_create(self, name, group, id="0", mkstream=False):
+        return True
+
+    async def xreadgroup(self, group, consumer, streams, count=None, block=None):
+        new = [eid for eid in self.entries if int(eid.split("-")[0]) > self.delivered_upto][:count]
+        if not new:
+            await asyncio.sleep(min(block or 0, 20) / 1000)
+            return []
+        for eid in new:
+            self.delivered_upto = int(eid.split("-")[0])
+            self.pending[eid] = {"consumer": consumer, "times_delivered": 1, "idle": 0}
+        return [[INDEXING_STREAM_NAME.encode(), [(eid.encode(), self.entries[eid]) for eid in new]]]
+
+    async def xpending_range(self, name, group, min, max, count, idle=None):
+        return [
+            {"message_id": eid.encode(), "consumer": p["consumer"], "times_delivered": p["times_delivered"]}
+            for eid, p in self.pending.items()
+            if p["idle"] >= (idle or 0)
+        ][:count]
+
+    async def xclaim(self, name, group, consumer, min_idle_time, message_ids):
+        claimed = []
+        for eid in message_ids:
+            self.pending[eid].update(consumer=consumer, idle=0)
+            self.pending[eid]["times_delivered"] += 1
+            claimed.append((eid.encode(), self.entries.get(eid)))
+        return claimed
+
+    async def xack(self, name, group, *ids):
+        for eid in ids:
+            self.pending.pop(eid, None)
+
+    async def xdel(self, name, *ids):
+        for eid in ids:
+            self.entries.pop(eid, None)
+
+    async def rpop(self, name):
+        items = self.lists.get(name) or []
+        return items.pop() if items else None
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_redis(monkeypatch) -> FakeStreamRedis:
+    import redis.asyncio as aioredis
+
+    client = FakeStreamRedis()
+    monkeypatch.setattr(aioredis, "from_url", lambda url: client)
+    return client
+
+
+class TestRedisStreamsConsumer:
+    async def test_acks_after_indexing(self, fake_redis):
+        indexed: list[str] = []
+
+        async def batch_handler(tasks: list[IndexingTask]) -> None:
+            indexed.extend(t.document_id for t in tasks)
+
+        producer = IndexingQueueProducer(RedisIndexingProducer("redis://test"))
+        for doc_id in ("d0", "d1"):
+            await producer.enqueue(_task(doc_id))
+        consumer = RedisIndexingConsumer(
+            url="redis://test", batch_handler=batch_handler, batch_size=10
+        )
+        await consumer.start()
+        await asyncio.sleep(0.1)
+        await consumer.stop()
+
+        assert indexed == ["d0", "d1"]
+        assert fake_redis.pending == {}
+        assert fake_redis.entries == {}
+
+    async def test_unacked_task_left_pending_on_crash(self, fake_redis):
+        started = asyncio.Event()
+
+        async def batch_handler(tasks: list[IndexingTask]) -> None:
+            started.set()
+            await asyncio.sleep(10)
+
+        await RedisIndexingProducer("redis://test").publish(
+            QueueMessage(body=_task("d0").model_dump_json())
+        )
+        consumer = RedisIndexingConsumer(url="redis://test", batch_handler=batch_handler)
+        await consumer.start()
+        await asyncio.wait_for(started.wait(), timeout=1)
+        await consumer.stop()
+
+        assert list(fake_redis.pending) == list(fake_redis.entries)
+
+    async def test_reclaims_idle_pending_entries(self, fake_redis):
+        indexed: list[str] = []
+
+        async def batch_handler(tasks: list[IndexingTask]) -> None:
+            indexed.extend(t.document_id for t in tasks)
+
+        entry_id = (await fake_redis.xadd(INDEXING_STREAM_NAME, {"body": _task("d0").model_dump_json()})).decode()
+        fake_redis.delivered_upto = 1
+        fake_redis.pending[entry_id] = {"consumer": "dead", "times_delivered": 1, "idle": 120_000}
+
+        consumer = RedisIndexingConsumer(url="redis://test", batch_handler=batch_handler)
+        await consumer.start()
+        await asyncio.sleep(0.1)
+        await consumer.stop()
+
+        assert indexed == ["d0"]
+        assert fake_redis.pending == {}
+
+    async def test_exhausted_entries_dead_lettered(self, fake_redis):
+        batch_handler = AsyncMock()
+        dead_letter = AsyncMock()
+        entry_id = (await fake_redis.xadd(INDEXING_STREAM_NAME, {"body": _task("d0").model_dump_json()})).decode()
+        fake_redis.delivered_upto = 1
+        fake_redis.pending[entry_id] = {"consumer": "dead", "times_delivered": 5, "idle": 120_000}
+
+        consumer = RedisIndexingConsumer(
+            url="redis://test", batch_handler=batch_handler,
+            max_deliveries=5, dead_letter=dead_letter,
+        )
+        await consumer.start()
+        await asyncio.sleep(0.1)
+        await consumer.stop()
+
+        batch_handler.assert_not_awaited()
+        dead_letter.add.assert_awaited_once()
+        assert fake_redis.pending == {}
+
+    async def test_failed_task_dead_lettered_and_acked(self, fake_redis):
+        dead_letter = AsyncMock()
+
+        async def batch_handler(tasks: list[IndexingTask]) -> None:
+            raise RuntimeError("boom")
+
+        await RedisIndexingProducer("redis://test").publish(
+            QueueMessage(body=_task("d0").model_dump_json())
+        )
+        consumer = RedisIndexingConsumer(
+            url="redis://test", batch_handler=batch_handler, dead_letter=dead_letter
+        )
+        await consumer.start()
+        await asyncio.sleep(0.1)
+        await consumer.stop()
+
+        dead_letter.add.assert_awaited_once()
+        assert fake_redis.pending == {}
+
+    async def test_migrates_legacy_list(self, fake_redis):
+        indexed: list[str] = []
+
+        async def batch_handler(tasks: list[IndexingTask]) -> None:
+            indexed.extend(t.document_id for t in tasks)
+
+        fake_redis.lists[INDEXING_QUEUE_NAME] = [_task("old").model_dump_json().encode()]
+        consumer = RedisIndexingConsumer(url="redis://test", batch_handler=batch_handler)
+        await consumer.start()
+        await asyncio.sleep(0.1)
+        await consumer.stop()
+
+        assert indexed == ["old"]
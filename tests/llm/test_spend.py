@@ -0,0 +1,144 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0
+
+"""Tests for the sharded LLM spend ledger."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from flydesk.llm.spend import LEGACY_WORKER_ID, SpendLedger, spend_day
+from flydesk.models.base import Base
+from flydesk.models.spend import SpendLedgerRow
+from flydesk.models.user_settings import AppSettingRow
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _rows(session_factory) -> list[SpendLedgerRow]:
+    async with session_factory() as session:
+        result = await session.execute(
+            select(SpendLedgerRow).order_by(SpendLedgerRow.worker_id, SpendLedgerRow.user_id)
+        )
+        return list(result.scalars().all())
+
+
+class TestSpendLedger:
+    async def test_record_accumulates_until_flush(self, session_factory):
+        ledger = SpendLedger(session_factory, worker_id="w1")
+        ledger.record(0.25, user_id="u1", model="m", input_tokens=10, output_tokens=5)
+        ledger.record(0.5, user_id="u1", model="m", input_tokens=20, output_tokens=5)
+
+        assert await _rows(session_factory) == []
+        assert await ledger.total() == 0.75
+
+        await ledger.flush()
+
+        [row] = await _rows(session_factory)
+        assert (row.worker_id, row.day, row.user_id, row.model) == ("w1", spend_day(), "u1", "m")
+        assert row.cost_usd == 0.75
+        assert (row.input_tokens, row.output_tokens, row.call_count) == (30, 10, 2)
+
+    async def test_flush_adds_to_existing_shard(self, session_factory):
+        ledger = SpendLedger(session_factory, worker_id="w1")
+        ledger.record(1.0, user_id="u1")
+        await ledger.flush()
+        ledger.record(2.0, user_id="u1")
+        await ledger.flush()
+
+        [row] = await _rows(session_factory)
+        assert row.cost_usd == 3.0
+        assert row.call_count == 2
+
+    async def test_total_sums_all_workers(self, session_factory):
+        first = SpendLedger(session_factory, worker_id="w1")
+        second = SpendLedger(session_factory, worker_id="w2")
+        first.record(1.0, user_id="u1")
+        second.record(2.5, user_id="u2")
+        await first.flush()
+        await second.flush()
+        second.record(0.5, user_id="u2")
+
+        assert len(await _rows(session_factory)) == 2
+        assert await first.total() == 3.5
+        assert await second.total() == 4.0
+        assert await second.total(user_id="u2") == 3.0
+
+    async def test_failed_flush_keeps_amounts(self, session_factory):
+        ledger = SpendLedger(session_factory, worker_id="w1")
+        ledger.record(1.0)
+
+        with patch.object(ledger, "_write", side_effect=RuntimeError("db down")):
+            with pytest.raises(RuntimeError):
+                await ledger.flush()
+
+        assert await ledger.total() == 1.0
+        await ledger.flush()
+        [row] = await _rows(session_factory)
+        assert row.cost_usd == 1.0
+
+    async def test_flush_interrupted_after_commit_does_not_double_count(self, session_factory):
+        ledger = SpendLedger(session_factory, worker_id="w1")
+        ledger.record(1.0)
+
+        with patch.object(AsyncSession, "close", AsyncMock(side_effect=RuntimeError("boom"))):
+            with pytest.raises(RuntimeError):
+                await ledger.flush()
+
+        assert await ledger.total() == 1.0
+        await ledger.flush()
+        [row] = await _rows(session_factory)
+        assert row.cost_usd == 1.0
+
+    async def test_stop_flushes_pending_spend(self, session_factory):
+        ledger = SpendLedger(session_factory, worker_id="w1", flush_interval_seconds=3600)
+        await ledger.start()
+        ledger.record(0.1)
+
+        await ledger.stop()
+
+        [row] = await _rows(session_factory)
+        assert row.cost_usd == 0.1
+
+
+class TestLegacyImport:
+    async def _set(self, session_factory, key: str, value: str) -> None:
+        async with session_factory() as session:
+            await session.merge(AppSettingRow(key=key, value=value))
+            await session.commit()
+
+    async def test_imports_daily_spend_settings(self, session_factory):
+        await self._set(session_factory, f"daily_spend_{spend_day()}", "2.5")
+        await self._set(session_factory, "daily_spend_2026-01-02", "1.25")
+        await self._set(session_factory, "daily_spend_bogus", "9")
+        ledger = SpendLedger(session_factory, worker_id="w1")
+
+        assert await ledger.import_legacy_settings() == 2
+
+        ledger.record(0.5)
+        assert await ledger.total() == 3.0
+        assert await ledger.total("2026-01-02") == 1.25
+        assert {row.worker_id for row in await _rows(session_factory)} == {LEGACY_WORKER_ID}
+
+    async def test_reimport_overwrites_instead_of_adding(self, session_factory):
+        key = f"daily_spend_{spend_day()}"
+        await self._set(session_factory, key, "2.0")
+        ledger = SpendLedger(session_factory, worker_id="w1")
+        await ledger.import_legacy_settings()
+        await self._set(session_factory, key, "3.0")
+
+        await ledger.import_legacy_settings()
+
+        assert await ledger.total() == 3.0
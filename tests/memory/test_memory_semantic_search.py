@@ -0,0 +1,183 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0
+
+"""Tests for embedding-backed memory search."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from flydesk.memory.models import CreateMemory, UpdateMemory
+from flydesk.memory.repository import MemoryRepository
+from flydesk.models import Base
+from flydesk.models.user_memory import UserMemoryRow
+
+# Toy embedding space: one axis per topic.
+_TOPICS = {
+    "theme": [1.0, 0.0, 0.0],
+    "dark": [1.0, 0.0, 0.0],
+    "colour": [0.9, 0.1, 0.0],
+    "finance": [0.0, 1.0, 0.0],
+    "python": [0.0, 0.0, 1.0],
+}
+
+
+class _TopicEmbeddingProvider:
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        self.calls.append(texts)
+        vectors = []
+        for text in texts:
+            vector = [0.0, 0.0, 0.0]
+            for word, axis in _TOPICS.items():
+                if word in text.lower():
+                    vector = [a + b for a, b in zip(vector, axis)]
+            vectors.append(vector)
+        return vectors
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    yield factory
+    await engine.dispose()
+
+
+@pytest.fixture
+def provider() -> _TopicEmbeddingProvider:
+    return _TopicEmbeddingProvider()
+
+
+@pytest.fixture
+def repo(session_factory, provider) -> MemoryRepository:
+    return MemoryRepository(session_factory, embedding_provider=provider, embedding_dimensions=3)
+
+
+async def _embedding_of(session_factory, memory_id: str):
+    async with session_factory() as session:
+        raw = (
+            await session.execute(
+                select(UserMemoryRow.embedding).where(UserMemoryRow.id == memory_id)
+            )
+        ).scalar_one()
+    return json.loads(raw) if raw is not None else None
+
+
+class TestMemoryEmbeddings:
+    async def test_create_stores_embedding(self, repo, session_factory):
+        mem = await repo.create("user-1", CreateMemory(content="Prefers the dark UI"))
+
+        assert await _embedding_of(session_factory, mem.id) == [1.0, 0.0, 0.0]
+
+    async def test_update_reembeds_changed_content(self, repo, session_factory, provider):
+        mem = await repo.create("user-1", CreateMemory(content="Prefers the dark UI"))
+        await repo.update("user-1", mem.id, UpdateMemory(content="Works in finance"))
+
+        assert await _embedding_of(session_factory, mem.id) == [0.0, 1.0, 0.0]
+
+        provider.calls.clear()
+        await repo.update("user-1", mem.id, UpdateMemory(category="fact"))
+        assert provider.calls == []
+
+    async def test_embedding_failure_still_saves(self, session_factory):
+        class _Failing:
+            async def embed(self, texts):
+                raise RuntimeError("provider down")
+
+        repo = MemoryRepository(session_factory, embedding_provider=_Failing())
+        mem = await repo.create("user-1", CreateMemory(content="Prefers the dark UI"))
+
+        assert await _embedding_of(session_factory, mem.id) is None
+
+    async def test_wrong_dimension_is_not_stored(self, session_factory, provider):
+        repo = MemoryRepository(session_factory, embedding_provider=provider)
+        mem = await repo.create("user-1", CreateMemory(content="Prefers the dark UI"))
+
+        assert await _embedding_of(session_factory, mem.id) is None
+        assert [m.id for m in await repo.search("user-1", "dark")] == [mem.id]
+
+    async def test_update_embeds_before_opening_a_session(self, session_factory):
+        open_sessions = 0
+
+        def _factory():
+            nonlocal open_sessions
+            session = session_factory()
+            original_close = session.close
+
+            async def _close():
+                nonlocal open_sessions
+                open_sessions -= 1
+                await original_close()
+
+            open_sessions += 1
+            session.close = _close
+            return session
+
+        class _Checking(_TopicEmbeddingProvider):
+            async def embed(self, texts):
+                assert open_sessions == 0
+                return await super().embed(texts)
+
+        repo = MemoryRepository(_factory, embedding_provider=_Checking(), embedding_dimensions=3)
+        mem = await repo.create("user-1", CreateMemory(content="Prefers the dark UI"))
+
+        await repo.update("user-1", mem.id, UpdateMemory(content="Works in finance"))
+
+        assert await _embedding_of(session_factory, mem.id) == [0.0, 1.0, 0.0]
+
+
+class TestSemanticSearch:
+    async def test_finds_paraphrase_without_shared_keywords(self, repo):
+        await repo.create("user-1", CreateMemory(content="Prefers the dark UI"))
+        await repo.create("user-1", CreateMemory(content="Works in finance"))
+
+        results = await repo.search("user-1", "which colour scheme?")
+
+        assert [m.content for m in results] == ["Prefers the dark UI"]
+
+    async def test_reuses_given_query_embedding(self, repo, provider):
+        await repo.create("user-1", CreateMemory(content="Works in finance"))
+        provider.calls.clear()
+
+        results = await repo.search("user-1", "budget", query_embedding=[0.0, 1.0, 0.0])
+
+        assert provider.calls == []
+        assert [m.content for m in results] == ["Works in finance"]
+
+    async def test_ranks_by_similarity_then_recency(self, repo, session_factory):
+        old = await repo.create("user-1", CreateMemory(content="Likes a dark theme"))
+        await repo.create("user-1", CreateMemory(content="Likes a dark theme too"))
+        await repo.create("user-1", CreateMemory(content="Python and finance notes"))
+        async with session_factory() as session:
+            row = await session.get(UserMemoryRow, old.id)
+            row.created_at = datetime.now(timezone.utc) - timedelta(days=90)
+            await session.commit()
+
+        results = await repo.search("user-1", "dark theme")
+
+        assert [m.content for m in results] == ["Likes a dark theme too", "Likes a dark theme"]
+
+    async def test_scoped_to_user(self, repo):
+        await repo.create("user-2", CreateMemory(content="Prefers the dark UI"))
+
+        assert await repo.search("user-1", "dark theme") == []
+
+    async def test_recent_memories_come_first(self, repo):
+        await repo.create("user-1", CreateMemory(content="Prefers the dark UI"))
+        await repo.create("user-1", CreateMemory(content="Python and finance notes"))
+        await repo.create("user-1", CreateMemory(content="Has a cat"))
+
+        results = await repo.search("user-1", "dark theme", recent=1, limit=2)
+
+        assert [m.content for m in results] == ["Has a cat", "Prefers the dark UI"]
@@ -20,6 +20,7 @@ import pytest
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from flydesk.audit.models import AuditEventType
+from flydesk.catalog.discovery_state import DiscoveryFingerprintStore
 from flydesk.jobs.handlers import JobHandler, ProcessDiscoveryHandler
 from flydesk.models.base import Base
 from flydesk.processes.discovery import (
@@ -65,7 +66,7 @@ def process_repo(session_factory):
 def mock_catalog_repo():
     repo = AsyncMock()
     repo.list_systems.return_value = ([], 0)
-    repo.list_endpoints.return_value = []
+    repo.list_endpoints_for_systems.return_value = {}
     repo.list_knowledge_documents.return_value = []
     return repo
 
@@ -74,7 +75,7 @@ def mock_catalog_repo():
 def mock_knowledge_graph():
     kg = AsyncMock()
     kg.list_entities.return_value = []
-    kg.get_entity_neighborhood.return_value = MagicMock(entities=[], relations=[])
+    kg.get_neighborhoods.return_value = MagicMock(entities=[], relations=[])
     return kg
 
 
@@ -397,7 +398,7 @@ class TestContextGathering:
         endpoint.risk_level = "low"
 
         mock_catalog_repo.list_systems.return_value = ([system], 1)
-        mock_catalog_repo.list_endpoints.return_value = [endpoint]
+        mock_catalog_repo.list_endpoints_for_systems.return_value = {system.id: [endpoint]}
 
         ctx = await engine._gather_context()
         assert len(ctx.systems) == 1
@@ -425,9 +426,11 @@ class TestContextGathering:
         relation.relation_type = "HAS_ORDER"
         relation.properties = {}
         neighborhood.relations = [relation]
-        mock_knowledge_graph.get_entity_neighborhood.return_value = neighborhood
+        mock_knowledge_graph.get_neighborhoods.return_value = neighborhood
 
         ctx = await engine._gather_context()
+        mock_knowledge_graph.get_neighborhoods.assert_awaited_once()
+        assert mock_knowledge_graph.get_neighborhoods.call_args.args[0] == ["ent-1"]
         assert len(ctx.entities) == 1
         assert ctx.entities[0]["name"] == "Customer"
         assert len(ctx.relations) == 1
@@ -822,7 +825,7 @@ def _add_minimal_context(mock_catalog_repo):
     system.status = "active"
     system.tags = []
     mock_catalog_repo.list_systems.return_value = ([system], 1)
-    mock_catalog_repo.list_endpoints.return_value = []
+    mock_catalog_repo.list_endpoints_for_systems.return_value = {}
 
 
 class TestAnalyzePipeline:
@@ -935,6 +938,124 @@ class TestAnalyzePipeline:
             assert progress_calls[i] >= progress_calls[i - 1]
 
 
+# ---------------------------------------------------------------------------
+# Tests: Incremental + chunked discovery
+# ---------------------------------------------------------------------------
+
+
+def _set_systems(mock_catalog_repo, descriptions: dict[str, str]) -> None:
+    systems = []
+    for sys_id, description in descriptions.items():
+        system = MagicMock()
+        system.id = sys_id
+        system.name = f"System {sys_id}"
+        system.description = description
+        system.base_url = f"https://{sys_id}.example.com"
+        system.status = "active"
+        system.tags = []
+        systems.append(system)
+    mock_catalog_repo.list_systems.return_value = (systems, len(systems))
+    mock_catalog_repo.list_endpoints_for_systems.return_value = {}
+
+
+@pytest.fixture
+def incremental_engine(mock_agent_factory, process_repo, mock_catalog_repo, mock_knowledge_graph, session_factory):
+    return ProcessDiscoveryEngine(
+        agent_factory=mock_agent_factory,
+        process_repo=process_repo,
+        catalog_repo=mock_catalog_repo,
+        knowledge_graph=mock_knowledge_graph,
+        fingerprint_store=DiscoveryFingerprintStore(session_factory),
+    )
+
+
+class TestIncrementalDiscovery:
+    """Only context that changed since the last successful run is analysed."""
+
+    async def test_unchanged_context_is_skipped(
+        self, incremental_engine, mock_agent_factory, mock_catalog_repo, on_progress
+    ):
+        _set_systems(mock_catalog_repo, {"a": "Orders", "b": "Billing"})
+        agent = _make_mock_agent(_make_llm_response([_sample_process_dict()]))
+        mock_agent_factory.create_agent.return_value = agent
+
+        first = await incremental_engine._analyze("job-1", {}, on_progress)
+        second = await incremental_engine._analyze("job-2", {}, on_progress)
+
+        assert first["context_items_analyzed"] == 2
+        assert second["status"] == "skipped"
+        assert second["reason"] == "unchanged"
+        assert agent.run.await_count == 1
+
+    async def test_only_changed_units_are_sent(
+        self, incremental_engine, mock_agent_factory, mock_catalog_repo, on_progress
+    ):
+        _set_systems(mock_catalog_repo, {"a": "Orders", "b": "Billing"})
+        agent = _make_mock_agent(_make_llm_response([]))
+        mock_agent_factory.create_agent.return_value = agent
+        await incremental_engine._analyze("job-1", {}, on_progress)
+
+        _set_systems(mock_catalog_repo, {"a": "Orders", "b": "Billing and invoicing"})
+        result = await incremental_engine._analyze("job-2", {}, on_progress)
+
+        assert (result["context_items_analyzed"], result["context_items_total"]) == (1, 2)
+        prompt = agent.run.call_args.args[0]
+        assert "Billing and invoicing" in prompt
+        # The unchanged system is still listed so steps can reference it.
+        assert "System a" in prompt
+
+    async def test_full_run_analyses_everything(
+        self, incremental_engine, mock_agent_factory, mock_catalog_repo, on_progress
+    ):
+        _set_systems(mock_catalog_repo, {"a": "Orders"})
+        mock_agent_factory.create_agent.return_value = _make_mock_agent(_make_llm_response([]))
+        await incremental_engine._analyze("job-1", {}, on_progress)
+
+        result = await incremental_engine._analyze("job-2", {"full": True}, on_progress)
+
+        assert result["status"] == "completed"
+        assert result["context_items_analyzed"] == 1
+
+    async def test_failed_pass_is_retried_next_run(
+        self, incremental_engine, mock_agent_factory, mock_catalog_repo, on_progress
+    ):
+        _set_systems(mock_catalog_repo, {"a": "Orders"})
+        mock_agent_factory.create_agent.return_value = _make_mock_agent("not json")
+        await incremental_engine._analyze("job-1", {}, on_progress)
+
+        mock_agent_factory.create_agent.return_value = _make_mock_agent(_make_llm_response([]))
+        result = await incremental_engine._analyze("job-2", {}, on_progress)
+
+        assert result["status"] == "completed"
+        assert result["context_items_analyzed"] == 1
+
+    async def test_large_context_is_split_and_reduced(
+        self, mock_agent_factory, process_repo, mock_catalog_repo, mock_knowledge_graph, on_progress
+    ):
+        engine = ProcessDiscoveryEngine(
+            agent_factory=mock_agent_factory,
+            process_repo=process_repo,
+            catalog_repo=mock_catalog_repo,
+            knowledge_graph=mock_knowledge_graph,
+            chunk_chars=1,
+        )
+        _set_systems(mock_catalog_repo, {"a": "Orders", "b": "Billing"})
+        agent = _make_mock_agent("")
+        low = _make_mock_agent(_make_llm_response([_sample_process_dict(confidence=0.4)]))
+        high = _make_mock_agent(_make_llm_response([_sample_process_dict(confidence=0.9)]))
+        agent.run.side_effect = [low.run.return_value, high.run.return_value]
+        mock_agent_factory.create_agent.return_value = agent
+
+        result = await engine._analyze("job-1", {}, on_progress)
+
+        assert result["llm_passes"] == 2
+        assert result["processes_discovered"] == 1
+        [stored] = await process_repo.list()
+        assert stored.confidence == 0.9
+        progress = [call.args[0] for call in on_progress.call_args_list]
+        assert progress == sorted(progress)
+
+
 # ---------------------------------------------------------------------------
 # Tests: ProcessDiscoveryHandler
 # ---------------------------------------------------------------------------
@@ -1141,8 +1262,8 @@ class TestEdgeCases:
         shared_relation.properties = {}
 
         neighborhood = MagicMock()
-        neighborhood.relations = [shared_relation]
-        mock_knowledge_graph.get_entity_neighborhood.return_value = neighborhood
+        neighborhood.relations = [shared_relation, shared_relation]
+        mock_knowledge_graph.get_neighborhoods.return_value = neighborhood
 
         ctx = await engine._gather_context()
         # The relation should appear only once even though both entities share it
@@ -148,3 +148,19 @@ class TestRoleRepository:
         await repo.seed_builtin_roles()
         perms = await repo.get_permissions_for_roles(["admin", "viewer"])
         assert perms == ["*"]
+
+    async def test_role_edit_invalidates_resolved_permissions(self, repo):
+        """Cached role resolution is dropped when a role changes."""
+        await repo.create_role(
+            Role(id="role-auditor", name="auditor", display_name="Auditor", permissions=["audit:read"])
+        )
+        assert await repo.get_permissions_for_roles(["auditor"]) == ["audit:read"]
+        version = repo.version
+
+        await repo.update_role("role-auditor", permissions=["audit:read", "exports:create"])
+
+        assert repo.version > version
+        assert sorted(await repo.get_permissions_for_roles(["auditor"])) == [
+            "audit:read",
+            "exports:create",
+        ]
@@ -0,0 +1,154 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0
+
+"""Tests for envelope encryption and the decrypted-secret cache."""
+
+from __future__ import annotations
+
+import base64
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from flydesk.security.envelope import ENVELOPE_PREFIX, EnvelopeKMSProvider, _SecretCache
+from flydesk.security.kms import KMSProvider, create_kms_provider
+
+
+class _CountingKMS:
+    """Reversible stand-in for a remote KMS that counts round-trips."""
+
+    def __init__(self) -> None:
+        self.encrypt_calls = 0
+        self.decrypt_calls = 0
+
+    def encrypt(self, plaintext: str) -> str:
+        self.encrypt_calls += 1
+        return "kms:" + base64.b64encode(plaintext.encode()).decode()
+
+    def decrypt(self, ciphertext: str) -> str:
+        self.decrypt_calls += 1
+        if not ciphertext.startswith("kms:"):
+            raise ValueError("not a KMS ciphertext")
+        return base64.b64decode(ciphertext[4:]).decode()
+
+
+@pytest.fixture
+def remote() -> _CountingKMS:
+    return _CountingKMS()
+
+
+@pytest.fixture
+def envelope(remote: _CountingKMS) -> EnvelopeKMSProvider:
+    return EnvelopeKMSProvider(remote, cache_ttl_seconds=60)
+
+
+class TestEnvelopeEncryption:
+    def test_satisfies_protocol(self, envelope):
+        assert isinstance(envelope, KMSProvider)
+
+    def test_roundtrip(self, envelope):
+        ciphertext = envelope.encrypt('{"client_secret": "s3cret"}')
+        assert ciphertext.startswith(ENVELOPE_PREFIX)
+        assert "s3cret" not in ciphertext
+        assert envelope.decrypt(ciphertext) == '{"client_secret": "s3cret"}'
+
+    def test_each_secret_gets_its_own_data_key(self, envelope, remote):
+        a = envelope.encrypt("same")
+        b = envelope.encrypt("same")
+        assert a.split(".")[1] != b.split(".")[1]
+        assert remote.encrypt_calls == 2
+
+    def test_tampered_ciphertext_rejected(self, envelope):
+        ciphertext = envelope.encrypt("secret")
+        prefix, wrapped, sealed = ciphertext.split(".")
+        raw = bytearray(base64.urlsafe_b64decode(sealed))
+        raw[-1] ^= 0x01
+        tampered = f"{prefix}.{wrapped}.{base64.urlsafe_b64encode(bytes(raw)).decode()}"
+        with pytest.raises(ValueError, match="Decryption failed"):
+            envelope.decrypt(tampered)
+
+    def test_malformed_ciphertext_rejected(self, envelope):
+        with pytest.raises(ValueError):
+            envelope.decrypt(ENVELOPE_PREFIX + "no-separator")
+
+
+class TestCaching:
+    def test_data_key_unwrapped_once_per_ttl(self, envelope, remote):
+        ciphertext = envelope.encrypt("secret")
+        for _ in range(5):
+            assert envelope.decrypt(ciphertext) == "secret"
+        assert remote.decrypt_calls == 1
+
+    def test_legacy_values_decrypted_via_kms_and_cached(self, envelope, remote):
+        legacy = remote.encrypt("old-secret")
+        assert envelope.decrypt(legacy) == "old-secret"
+        assert envelope.decrypt(legacy) == "old-secret"
+        assert remote.decrypt_calls == 1
+
+    def test_invalidate_forces_unwrap(self, envelope, remote):
+        ciphertext = envelope.encrypt("secret")
+        envelope.decrypt(ciphertext)
+        envelope.invalidate(ciphertext)
+        envelope.decrypt(ciphertext)
+        assert remote.decrypt_calls == 2
+
+    def test_zero_ttl_disables_cache(self, remote):
+        envelope = EnvelopeKMSProvider(remote, cache_ttl_seconds=0)
+        ciphertext = envelope.encrypt("secret")
+        envelope.decrypt(ciphertext)
+        envelope.decrypt(ciphertext)
+        assert remote.decrypt_calls == 2
+
+
+class TestSecretCache:
+    def test_expired_entries_are_zeroed(self):
+        cache = _SecretCache(ttl_seconds=60, max_entries=10)
+        cache.put("k", b"key-material")
+        stored = cache._entries["k"][0]
+        with patch("flydesk.security.envelope.time.monotonic", return_value=time.monotonic() + 120):
+            assert cache.get("k") is None
+        assert stored == bytearray(len(b"key-material"))
+
+    def test_eviction_zeroes_oldest(self):
+        cache = _SecretCache(ttl_seconds=60, max_entries=1)
+        cache.put("a", b"aaaa")
+        first = cache._entries["a"][0]
+        cache.put("b", b"bbbb")
+        assert len(cache) == 1
+        assert first == bytearray(4)
+
+    def test_clear_zeroes_everything(self):
+        cache = _SecretCache(ttl_seconds=60, max_entries=10)
+        cache.put("a", b"aaaa")
+        stored = cache._entries["a"][0]
+        cache.clear()
+        assert stored == bytearray(4)
+        assert len(cache) == 0
+
+
+class TestFactory:
+    def test_envelope_wraps_remote_provider_when_enabled(self):
+        with patch.dict("sys.modules", {"hvac": MagicMock()}):
+            config = SimpleNamespace(
+                kms_provider="vault",
+                vault_url="http://vault:8200",
+                vault_token="s.mytoken",
+                kms_envelope_encryption=True,
+                kms_cache_ttl_seconds=30,
+            )
+            kms = create_kms_provider(config)
+            from flydesk.security.vault_kms import VaultKMSProvider
+
+            assert isinstance(kms, EnvelopeKMSProvider)
+            assert isinstance(kms.inner, VaultKMSProvider)
+
+    def test_fernet_never_wrapped(self):
+        config = SimpleNamespace(
+            kms_provider="fernet",
+            credential_encryption_key="",
+            kms_envelope_encryption=True,
+        )
+        assert not isinstance(create_kms_provider(config), EnvelopeKMSProvider)
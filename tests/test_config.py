@@ -31,6 +31,7 @@ class TestDeskConfig:
             assert cfg.oidc_issuer_url == "https://idp.example.com"
             assert cfg.agent_name == "Ember"
             assert cfg.audit_retention_days == 365
+            assert cfg.audit_retention_enabled is False
             assert cfg.rate_limit_per_user == 60
             assert cfg.accent_color == "#2563EB"
             assert cfg.app_title == "Firefly Desk"
@@ -19,7 +19,8 @@ import pytest
 
 from flydesk.catalog.enums import AuthType
 from flydesk.catalog.models import AuthConfig, Credential, ExternalSystem
-from flydesk.tools.auth_resolver import AuthResolver, ResolvedAuth, _TokenCache
+from flydesk.tools.auth_resolver import AuthResolver, ResolvedAuth
+from flydesk.tools.token_manager import _TokenCache
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,334 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""Tests for the READ-endpoint response cache and its ToolExecutor integration."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from flydesk.catalog.enums import AuthType, HttpMethod, RiskLevel
+from flydesk.catalog.models import (
+    AuthConfig,
+    CachePolicy,
+    Credential,
+    ExternalSystem,
+    ServiceEndpoint,
+)
+from flydesk.tools.executor import ToolCall, ToolExecutor
+from flydesk.tools.response_cache import ResponseCache, parse_cache_control
+
+_URL = "https://api.example.com/accounts/123"
+
+
+def _response(
+    status_code: int = 200,
+    json: dict | None = None,
+    headers: dict[str, str] | None = None,
+) -> httpx.Response:
+    return httpx.Response(
+        status_code=status_code,
+        json=json if json is not None else {"id": "123"},
+        headers=headers,
+        request=httpx.Request("GET", _URL),
+    )
+
+
+def _endpoint(
+    endpoint_id: str = "ep-read",
+    method: HttpMethod = HttpMethod.GET,
+    risk_level: RiskLevel = RiskLevel.READ,
+    cache_policy: CachePolicy | None = None,
+) -> ServiceEndpoint:
+    return ServiceEndpoint(
+        id=endpoint_id,
+        system_id="sys-1",
+        name=endpoint_id,
+        description="Test endpoint",
+        method=method,
+        path="/accounts/{id}",
+        when_to_use="testing",
+        risk_level=risk_level,
+        required_permissions=[],
+        cache_policy=cache_policy,
+    )
+
+
+def _call(call_id: str = "c1", endpoint_id: str = "ep-read", method: str = "GET") -> ToolCall:
+    return ToolCall(
+        call_id=call_id,
+        tool_name="get_account",
+        endpoint_id=endpoint_id,
+        arguments={"path": {"id": "123"}, "_method": method, "_system_id": "sys-1"},
+    )
+
+
+@pytest.fixture
+def endpoints() -> dict[str, ServiceEndpoint]:
+    return {
+        "ep-read": _endpoint(cache_policy=CachePolicy(ttl_seconds=60)),
+        "ep-write": _endpoint(
+            "ep-write",
+            method=HttpMethod.POST,
+            risk_level=RiskLevel.LOW_WRITE,
+            cache_policy=CachePolicy(),
+        ),
+        "ep-uncached": _endpoint("ep-uncached"),
+    }
+
+
+@pytest.fixture
+def http_client() -> MagicMock:
+    mock = MagicMock(spec=httpx.AsyncClient)
+    mock.request = AsyncMock(return_value=_response())
+    return mock
+
+
+@pytest.fixture
+def executor(http_client: MagicMock, endpoints: dict[str, ServiceEndpoint]) -> ToolExecutor:
+    catalog_repo = MagicMock()
+    catalog_repo.get_endpoint = AsyncMock(side_effect=lambda eid: endpoints.get(eid))
+    catalog_repo.get_system = AsyncMock(
+        return_value=ExternalSystem(
+            id="sys-1",
+            name="Accounts",
+            description="Test system",
+            base_url="https://api.example.com",
+            auth_config=AuthConfig(auth_type=AuthType.BEARER, credential_id="cred-1"),
+        )
+    )
+    credential_store = MagicMock()
+    credential_store.get_credential = AsyncMock(
+        return_value=Credential(
+            id="cred-1",
+            system_id="sys-1",
+            name="Token",
+            encrypted_value="token-value",
+            credential_type="bearer",
+        )
+    )
+    audit_logger = MagicMock()
+    audit_logger.log = AsyncMock(return_value="evt-id")
+    return ToolExecutor(
+        http_client=http_client,
+        catalog_repo=catalog_repo,
+        credential_store=credential_store,
+        audit_logger=audit_logger,
+    )
+
+
+# ---------------------------------------------------------------------------
+# ResponseCache unit tests
+# ---------------------------------------------------------------------------
+
+
+class TestParseCacheControl:
+    def test_directives_and_arguments(self):
+        assert parse_cache_control('private, max-age=30, no-cache="set-cookie"') == {
+            "private": None,
+            "max-age": "30",
+            "no-cache": "set-cookie",
+        }
+
+    def test_empty_header(self):
+        assert parse_cache_control("") == {}
+
+
+class TestResponseCacheKeys:
+    def test_key_varies_with_auth_headers(self):
+        base = {"method": "GET", "url": _URL, "headers": {"Authorization": "Bearer a"}}
+        other = {**base, "headers": {"Authorization": "Bearer b"}}
+        assert ResponseCache.make_key(base) != ResponseCache.make_key(other)
+
+    def test_key_varies_with_params(self):
+        base = {"method": "GET", "url": _URL, "params": {"page": 1}}
+        other = {**base, "params": {"page": 2}}
+        assert ResponseCache.make_key(base) != ResponseCache.make_key(other)
+
+    def test_key_is_stable_for_header_case_and_order(self):
+        a = {"method": "get", "url": _URL, "headers": {"X-A": "1", "Authorization": "t"}}
+        b = {"method": "GET", "url": _URL, "headers": {"authorization": "t", "x-a": "1"}}
+        assert ResponseCache.make_key(a) == ResponseCache.make_key(b)
+
+
+class TestResponseCacheStore:
+    def test_no_store_is_not_cached(self):
+        cache = ResponseCache()
+        stored = cache.store(
+            "k",
+            system_id="sys-1",
+            response=_response(headers={"cache-control": "no-store"}),
+            data={},
+            policy=CachePolicy(),
+            generation=cache.generation("sys-1"),
+        )
+        assert stored is False
+        assert cache.get("k") is None
+
+    def test_upstream_max_age_shortens_ttl(self):
+        cache = ResponseCache()
+        cache.store(
+            "k",
+            system_id="sys-1",
+            response=_response(headers={"cache-control": "max-age=0", "etag": '"v1"'}),
+            data={},
+            policy=CachePolicy(ttl_seconds=60),
+            generation=cache.generation("sys-1"),
+        )
+        entry = cache.get("k")
+        assert entry is not None
+        assert entry.is_fresh is False
+        assert entry.conditional_headers() == {"If-None-Match": '"v1"'}
+
+    def test_error_responses_are_not_cached(self):
+        cache = ResponseCache()
+        stored = cache.store(
+            "k",
+            system_id="sys-1",
+            response=_response(status_code=500),
+            data={},
+            policy=CachePolicy(),
+            generation=cache.generation("sys-1"),
+        )
+        assert stored is False
+
+    def test_write_during_fetch_prevents_store(self):
+        cache = ResponseCache()
+        generation = cache.generation("sys-1")
+        cache.invalidate_system("sys-1")
+        stored = cache.store(
+            "k",
+            system_id="sys-1",
+            response=_response(),
+            data={},
+            policy=CachePolicy(),
+            generation=generation,
+        )
+        assert stored is False
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.store(
+                key,
+                system_id="sys-1",
+                response=_response(),
+                data=key,
+                policy=CachePolicy(),
+                generation=cache.generation("sys-1"),
+            )
+        assert len(cache) == 2
+        assert cache.get("a") is None
+        assert cache.get("c") is not None
+
+
+class TestSingleFlight:
+    async def test_concurrent_callers_share_one_fetch(self):
+        cache = ResponseCache()
+        calls = 0
+
+        async def fetch() -> int:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return 42
+
+        results = await asyncio.gather(*(cache.single_flight("k", fetch) for _ in range(5)))
+        assert results == [42] * 5
+        assert calls == 1
+
+    async def test_exception_propagates_to_all_callers(self):
+        cache = ResponseCache()
+
+        async def fetch() -> int:
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        results = await asyncio.gather(
+            *(cache.single_flight("k", fetch) for _ in range(3)), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+
+# ---------------------------------------------------------------------------
+# ToolExecutor integration
+# ---------------------------------------------------------------------------
+
+
+class TestExecutorCaching:
+    async def test_repeat_read_served_from_cache(self, executor: ToolExecutor, http_client):
+        first = await executor._execute_single(_call("c1"), "user-1", "conv-1")
+        second = await executor._execute_single(_call("c2"), "user-2", "conv-2")
+
+        assert first.data == second.data == {"id": "123"}
+        assert second.success is True
+        assert http_client.request.await_count == 1
+
+    async def test_uncached_endpoint_always_goes_upstream(
+        self, executor: ToolExecutor, http_client
+    ):
+        await executor._execute_single(_call("c1", "ep-uncached"), "user-1", "conv-1")
+        await executor._execute_single(_call("c2", "ep-uncached"), "user-1", "conv-1")
+        assert http_client.request.await_count == 2
+
+    async def test_write_endpoint_never_cached(self, executor: ToolExecutor, http_client):
+        await executor._execute_single(_call("c1", "ep-write", "POST"), "user-1", "conv-1")
+        await executor._execute_single(_call("c2", "ep-write", "POST"), "user-1", "conv-1")
+        assert http_client.request.await_count == 2
+
+    async def test_write_invalidates_system_reads(self, executor: ToolExecutor, http_client):
+        await executor._execute_single(_call("c1"), "user-1", "conv-1")
+        await executor._execute_single(_call("c2", "ep-write", "POST"), "user-1", "conv-1")
+        await executor._execute_single(_call("c3"), "user-1", "conv-1")
+        assert http_client.request.await_count == 3
+
+    async def test_concurrent_identical_reads_coalesced(
+        self, executor: ToolExecutor, http_client
+    ):
+        async def slow_request(**kwargs):
+            await asyncio.sleep(0.02)
+            return _response()
+
+        http_client.request = AsyncMock(side_effect=slow_request)
+        results = await executor.execute_parallel(
+            [_call(f"c{i}") for i in range(4)], "user-1", "conv-1"
+        )
+        assert all(r.success for r in results)
+        assert http_client.request.await_count == 1
+
+    async def test_stale_entry_revalidated_with_etag(
+        self, executor: ToolExecutor, http_client
+    ):
+        http_client.request = AsyncMock(
+            side_effect=[
+                _response(headers={"cache-control": "no-cache", "etag": '"v1"'}),
+                httpx.Response(status_code=304, request=httpx.Request("GET", _URL)),
+            ]
+        )
+        await executor._execute_single(_call("c1"), "user-1", "conv-1")
+        result = await executor._execute_single(_call("c2"), "user-1", "conv-1")
+
+        assert result.success is True
+        assert result.status_code == 200
+        assert result.data == {"id": "123"}
+        revalidation = http_client.request.await_args_list[1].kwargs
+        assert revalidation["headers"]["If-None-Match"] == '"v1"'
+
+    async def test_cache_status_recorded_in_audit(self, executor: ToolExecutor):
+        await executor._execute_single(_call("c1"), "user-1", "conv-1")
+        await executor._execute_single(_call("c2"), "user-1", "conv-1")
+        result_events = [
+            c.args[0]
+            for c in executor._audit_logger.log.await_args_list
+            if c.args[0].event_type == "tool_result"
+        ]
+        assert [e.detail["cache"] for e in result_events] == ["miss", "hit"]
@@ -0,0 +1,335 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""Tests for streamed, size-capped tool response parsing."""
+
+from __future__ import annotations
+
+import json
+import os
+import stat
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from flydesk.catalog.enums import HttpMethod, RiskLevel
+from flydesk.catalog.models import ExternalSystem, ResponseLimits, RetryPolicy, ServiceEndpoint
+from flydesk.tools.executor import ToolCall, ToolExecutor
+from flydesk.tools.response_stream import open_spill, read_limited_response
+
+
+class _ChunkedStream(httpx.AsyncByteStream):
+    """Yields the body in fixed-size chunks to exercise incremental parsing."""
+
+    def __init__(self, body: bytes, chunk_size: int = 7) -> None:
+        self._body = body
+        self._chunk_size = chunk_size
+
+    async def __aiter__(self):
+        for i in range(0, len(self._body), self._chunk_size):
+            yield self._body[i : i + self._chunk_size]
+
+
+def _streamed(body: bytes, content_type: str) -> httpx.Response:
+    return httpx.Response(
+        status_code=200,
+        headers={"content-type": content_type},
+        stream=_ChunkedStream(body),
+        request=httpx.Request("GET", "https://api.example.com/report"),
+    )
+
+
+async def _read(body: bytes, content_type: str, **limits) -> dict | bytes:
+    result = await read_limited_response(
+        _streamed(body, content_type), ResponseLimits(**limits)
+    )
+    return result.summary if result.truncated else result.content
+
+
+class TestWithinLimit:
+    async def test_small_body_returned_whole(self):
+        body = b'{"ok": true}'
+        assert await _read(body, "application/json", max_bytes=1024) == body
+
+
+class TestJsonSummary:
+    async def test_top_level_array(self):
+        rows = [{"id": i, "name": f"row-{i}"} for i in range(100)]
+        summary = await _read(
+            json.dumps(rows).encode(), "application/json", max_bytes=200, preview_items=3
+        )
+        assert summary["truncated"] is True
+        assert summary["format"] == "json"
+        assert summary["preview"] == rows[:3]
+        assert summary["counts"] == {"$": 100}
+        assert summary["schema"] == {"$": {"id": "int", "name": "str"}}
+
+    async def test_wrapped_array_keeps_shape(self):
+        doc = {
+            "meta": {"page": 1},
+            "data": [{"n": i} for i in range(50)],
+            "total": 50,
+        }
+        summary = await _read(
+            json.dumps(doc).encode(), "application/json", max_bytes=32, preview_items=2
+        )
+        assert summary["preview"] == {"meta": {"page": 1}, "data": [{"n": 0}, {"n": 1}], "total": 50}
+        assert summary["counts"]["$.data"] == 50
+        assert "parse_error" not in summary
+
+    async def test_numbers_split_across_chunks(self):
+        body = json.dumps([123456789, 987654321, 5]).encode()
+        summary = await _read(body, "application/json", max_bytes=20, preview_items=10)
+        assert summary["preview"] == [123456789, 987654321, 5]
+
+    async def test_invalid_json_reports_error(self):
+        summary = await _read(b'[{"a": 1}, oops' + b" " * 64, "application/json", max_bytes=8)
+        assert "parse_error" in summary
+        assert summary["preview"] == [{"a": 1}]
+
+
+class TestCsvSummary:
+    async def test_counts_rows_and_keeps_preview(self):
+        lines = ["id,name"] + [f'{i},"name {i}"' for i in range(200)]
+        summary = await _read(
+            "\n".join(lines).encode(), "text/csv", max_bytes=50, preview_items=2
+        )
+        assert summary["format"] == "csv"
+        assert summary["columns"] == ["id", "name"]
+        assert summary["row_count"] == 200
+        assert summary["preview"] == [{"id": "0", "name": "name 0"}, {"id": "1", "name": "name 1"}]
+
+    async def test_quoted_newline_is_one_record(self):
+        body = 'a,b\n1,"multi\nline"\n2,x\n' + "3,y\n" * 20
+        summary = await _read(body.encode(), "text/csv", max_bytes=10, preview_items=5)
+        assert summary["row_count"] == 22
+        assert summary["preview"][0] == {"a": "1", "b": "multi\nline"}
+
+
+class TestXmlSummary:
+    async def test_counts_child_records(self):
+        items = "".join(f"<item id='{i}'><v>{i}</v></item>" for i in range(30))
+        body = f"<items>{items}<total>30</total></items>".encode()
+        summary = await _read(body, "application/xml", max_bytes=40, preview_items=2)
+        assert summary["format"] == "xml"
+        assert summary["root"] == "items"
+        assert summary["row_count"] == 31
+        assert summary["element_counts"] == {"item": 30, "total": 1}
+        assert summary["preview"][0]["item"]["@attributes"] == {"id": "0"}
+
+    async def test_soap_records_found_below_wrappers(self):
+        rows = "".join(f"<Row><Id>{i}</Id><T>a</T><T>b</T></Row>" for i in range(10_000))
+        body = (
+            "<s:Envelope xmlns:s='http://schemas.xmlsoap.org/soap/envelope/'>"
+            "<s:Header><Trace>1</Trace></s:Header>"
+            f"<s:Body><GetRowsResponse>{rows}</GetRowsResponse></s:Body></s:Envelope>"
+        ).encode()
+        summary = await _read(body, "text/xml", max_bytes=1000, preview_items=3)
+        assert summary["root"] == "Envelope"
+        assert summary["record_path"] == "Envelope/Body/GetRowsResponse/*"
+        assert summary["row_count"] == 10_000
+        assert summary["element_counts"] == {"Row": 10_000}
+        assert len(summary["preview"]) == 3
+        assert summary["preview"][0]["Row"]["T"] == [{"T": "a"}, {"T": "b"}]
+
+    async def test_single_wrapper_chain_without_repetition(self):
+        body = b"<a><b><c><x>1</x><y>2</y></c></b></a>"
+        summary = await _read(body, "application/xml", max_bytes=10)
+        assert summary["record_path"] == "a/b/c/*"
+        assert summary["element_counts"] == {"x": 1, "y": 1}
+
+
+class TestPreviewBudget:
+    async def test_json_preview_bounded_by_preview_chars(self):
+        rows = [{"text": "x" * 100} for _ in range(100)]
+        summary = await _read(
+            json.dumps(rows).encode(), "application/json",
+            max_bytes=200, preview_items=50, preview_chars=500,
+        )
+        assert 0 < len(summary["preview"]) < 5
+        assert summary["counts"] == {"$": 100}
+
+    async def test_csv_preview_bounded_by_preview_chars(self):
+        lines = ["id,text"] + [f"{i},{'x' * 100}" for i in range(100)]
+        summary = await _read(
+            "\n".join(lines).encode(), "text/csv",
+            max_bytes=200, preview_items=50, preview_chars=500,
+        )
+        assert 0 < len(summary["preview"]) < 5
+        assert summary["row_count"] == 100
+
+    async def test_xml_preview_bounded_by_preview_chars(self):
+        items = "".join(f"<r>{'x' * 100}</r>" for _ in range(100))
+        summary = await _read(
+            f"<rs>{items}</rs>".encode(), "application/xml",
+            max_bytes=200, preview_items=50, preview_chars=500,
+        )
+        assert 0 < len(summary["preview"]) < 5
+        assert summary["row_count"] == 100
+
+
+class TestTextSummary:
+    async def test_keeps_prefix(self):
+        summary = await _read(b"x" * 500, "text/plain", max_bytes=100, preview_chars=10)
+        assert summary["format"] == "text"
+        assert summary["preview"] == "x" * 10
+        assert summary["total_bytes"] == 500
+
+
+class TestSpillToDisk:
+    async def test_full_body_written_to_spill_file(self, tmp_path):
+        body = json.dumps(list(range(1000))).encode()
+        result = await read_limited_response(
+            _streamed(body, "application/json"),
+            ResponseLimits(max_bytes=100, spill_to_disk=True),
+            spill_dir=str(tmp_path),
+        )
+        assert result.summary is not None
+        spill_id = result.summary["spill_id"]
+        assert os.sep not in spill_id
+        assert str(tmp_path) not in json.dumps(result.summary)
+        spill_file = tmp_path / spill_id
+        assert spill_file.read_bytes() == body
+        assert stat.S_IMODE(spill_file.stat().st_mode) == 0o600
+
+    async def test_spill_dir_created_private(self, tmp_path):
+        spill_dir = tmp_path / "spill"
+        await read_limited_response(
+            _streamed(b"x" * 500, "text/plain"),
+            ResponseLimits(max_bytes=100, spill_to_disk=True),
+            spill_dir=str(spill_dir),
+        )
+        assert stat.S_IMODE(spill_dir.stat().st_mode) == 0o700
+
+    async def test_expired_spill_files_removed(self, tmp_path):
+        expired = tmp_path / "flydesk-old.json"
+        expired.write_bytes(b"{}")
+        old = time.time() - 7200
+        os.utime(expired, (old, old))
+        unrelated = tmp_path / "keep.txt"
+        unrelated.write_bytes(b"")
+        os.utime(unrelated, (old, old))
+
+        await read_limited_response(
+            _streamed(b"x" * 500, "text/plain"),
+            ResponseLimits(max_bytes=100, spill_to_disk=True),
+            spill_dir=str(tmp_path),
+            spill_retention_seconds=3600,
+        )
+        assert not expired.exists()
+        assert unrelated.exists()
+
+    async def test_open_spill_reads_body_back(self, tmp_path):
+        body = b"id,name\n" + b"1,x\n" * 100
+        result = await read_limited_response(
+            _streamed(body, "text/csv"),
+            ResponseLimits(max_bytes=100, spill_to_disk=True),
+            spill_dir=str(tmp_path),
+        )
+        source, fmt = open_spill(result.summary["spill_id"], str(tmp_path))
+        with source:
+            assert source.read() == body
+        assert fmt == "csv"
+
+    def test_open_spill_rejects_other_paths(self, tmp_path):
+        with pytest.raises(ValueError):
+            open_spill("../etc/passwd", str(tmp_path))
+        with pytest.raises(ValueError):
+            open_spill("keep.txt", str(tmp_path))
+        with pytest.raises(FileNotFoundError):
+            open_spill("flydesk-gone.json", str(tmp_path))
+
+
+# ---------------------------------------------------------------------------
+# ToolExecutor integration
+# ---------------------------------------------------------------------------
+
+
+def _endpoint(limits: ResponseLimits | None) -> ServiceEndpoint:
+    return ServiceEndpoint(
+        id="ep-report",
+        system_id="sys-1",
+        name="Report",
+        description="Large report",
+        method=HttpMethod.GET,
+        path="/report",
+        when_to_use="testing",
+        risk_level=RiskLevel.READ,
+        required_permissions=[],
+        response_limits=limits,
+    )
+
+
+def _executor(handler, endpoint: ServiceEndpoint, **kwargs) -> ToolExecutor:
+    catalog_repo = MagicMock()
+    catalog_repo.get_endpoint = AsyncMock(return_value=endpoint)
+    catalog_repo.get_system = AsyncMock(
+        return_value=ExternalSystem(
+            id="sys-1",
+            name="Reports",
+            description="Test system",
+            base_url="https://api.example.com",
+        )
+    )
+    audit_logger = MagicMock()
+    audit_logger.log = AsyncMock(return_value="evt-id")
+    return ToolExecutor(
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        catalog_repo=catalog_repo,
+        credential_store=MagicMock(),
+        audit_logger=audit_logger,
+        **kwargs,
+    )
+
+
+_CALL = ToolCall(call_id="c1", tool_name="report", endpoint_id="ep-report")
+
+
+class TestExecutorStreaming:
+    @pytest.fixture
+    def rows(self) -> list[dict]:
+        return [{"id": i} for i in range(500)]
+
+    async def test_endpoint_limits_produce_summary(self, rows):
+        executor = _executor(
+            lambda request: httpx.Response(200, json=rows),
+            _endpoint(ResponseLimits(max_bytes=100, preview_items=5)),
+        )
+        result = await executor._execute_single(_CALL, "user-1", "conv-1")
+        assert result.success is True
+        assert result.data["truncated"] is True
+        assert result.data["counts"] == {"$": 500}
+        assert len(result.data["preview"]) == 5
+
+    async def test_executor_default_limits_apply(self, rows):
+        executor = _executor(
+            lambda request: httpx.Response(200, json=rows),
+            _endpoint(None),
+            response_limits=ResponseLimits(max_bytes=100, preview_items=1),
+        )
+        result = await executor._execute_single(_CALL, "user-1", "conv-1")
+        assert result.data["preview"] == [{"id": 0}]
+
+    async def test_body_within_limit_parsed_normally(self, rows):
+        executor = _executor(
+            lambda request: httpx.Response(200, json=rows),
+            _endpoint(ResponseLimits(max_bytes=1_000_000)),
+        )
+        result = await executor._execute_single(_CALL, "user-1", "conv-1")
+        assert result.data == rows
+
+    async def test_retryable_status_closes_streamed_response(self):
+        responses = iter([httpx.Response(503), httpx.Response(200, json={"ok": True})])
+        endpoint = _endpoint(ResponseLimits(max_bytes=1024)).model_copy(
+            update={"retry_policy": RetryPolicy(max_retries=1, backoff_factor=0.0)}
+        )
+        executor = _executor(lambda request: next(responses), endpoint)
+        result = await executor._execute_single(_CALL, "user-1", "conv-1")
+        assert result.data == {"ok": True}
@@ -10,55 +10,170 @@
 
 from __future__ import annotations
 
+import asyncio
+import os
+
 import pytest
 
 from flydesk.tools.sandbox import SandboxExecutor, SandboxResult
 
 
 @pytest.fixture
-def executor():
-    return SandboxExecutor()
+async def executor():
+    sandbox = SandboxExecutor()
+    yield sandbox
+    await sandbox.stop()
 
 
 class TestSandboxExecutor:
-    @pytest.mark.anyio
     async def test_simple_execution(self, executor):
         code = 'import json, sys\nparams = json.loads(sys.stdin.read())\nresult = {"doubled": params["value"] * 2}\nprint(json.dumps(result))'
         result = await executor.execute(code, {"value": 5}, timeout=10)
         assert result.success is True
         assert result.data == {"doubled": 10}
 
-    @pytest.mark.anyio
     async def test_timeout(self, executor):
         code = "import time\ntime.sleep(60)"
         result = await executor.execute(code, {}, timeout=1)
         assert result.success is False
         assert "timeout" in result.error.lower()
 
-    @pytest.mark.anyio
     async def test_syntax_error(self, executor):
         code = "def broken(:"
         result = await executor.execute(code, {}, timeout=5)
         assert result.success is False
         assert result.error
 
-    @pytest.mark.anyio
     async def test_runtime_error(self, executor):
         code = "raise ValueError('test error')"
         result = await executor.execute(code, {}, timeout=5)
         assert result.success is False
         assert "test error" in result.error
 
-    @pytest.mark.anyio
     async def test_non_json_output(self, executor):
         code = 'print("not json")'
         result = await executor.execute(code, {}, timeout=5)
         assert result.success is False
         assert "json" in result.error.lower()
 
-    @pytest.mark.anyio
     async def test_no_output(self, executor):
         code = "pass"
         result = await executor.execute(code, {}, timeout=5)
         assert result.success is False
         assert "no output" in result.error.lower()
+
+
+_PID_CODE = "import json, os\nprint(json.dumps({'pid': os.getpid(), 'parent': os.getppid()}))"
+
+
+@pytest.fixture
+async def pool():
+    sandbox = SandboxExecutor(pool_size=1, max_executions_per_worker=3)
+    await sandbox.start()
+    yield sandbox
+    await sandbox.stop()
+
+
+class TestSandboxPool:
+    async def test_each_call_runs_in_fresh_process_from_warm_worker(self, pool):
+        first = await pool.execute(_PID_CODE, {}, timeout=10)
+        second = await pool.execute(_PID_CODE, {}, timeout=10)
+        assert first.data["pid"] != second.data["pid"]
+        assert first.data["parent"] == second.data["parent"]
+
+    async def test_worker_recycled_after_max_executions(self, pool):
+        parents = [(await pool.execute(_PID_CODE, {}, timeout=10)).data["parent"] for _ in range(4)]
+        assert len(set(parents[:3])) == 1
+        assert parents[3] != parents[0]
+
+    async def test_stdlib_monkeypatch_does_not_leak(self, pool):
+        patch = "import json\njson.dumps = lambda *a, **k: 'hijacked'\nprint('{}')"
+        assert (await pool.execute(patch, {}, timeout=10)).success is True
+        result = await pool.execute(
+            "import json\nprint(json.dumps({'clean': json.dumps(1) == '1'}))", {}, timeout=10
+        )
+        assert result.data == {"clean": True}
+
+    async def test_globals_not_shared_between_calls(self, pool):
+        await pool.execute("import json\nleaked = 1\nprint(json.dumps({}))", {}, timeout=10)
+        result = await pool.execute(
+            "import json\nprint(json.dumps({'seen': 'leaked' in globals()}))", {}, timeout=10
+        )
+        assert result.data == {"seen": False}
+
+    async def test_protocol_descriptors_not_inherited(self, pool):
+        code = (
+            "import json, os\n"
+            "print(json.dumps({'fds': sorted(int(f) for f in os.listdir('/proc/self/fd'))}))"
+        )
+        result = await pool.execute(code, {}, timeout=10)
+        # Only stdin/stdout/stderr (pointed at /dev/null), the result pipe
+        # and the descriptor used by listdir itself remain open.
+        assert len(result.data["fds"]) <= 5
+
+    async def test_sys_exit_zero_is_success(self, pool):
+        code = "import json, sys\nprint(json.dumps({'ok': True}))\nsys.exit(0)"
+        result = await pool.execute(code, {}, timeout=10)
+        assert result.data == {"ok": True}
+
+    async def test_hard_exit_reported(self, pool):
+        result = await pool.execute("import os\nos._exit(3)", {}, timeout=10)
+        assert result.success is False
+        assert "exited unexpectedly" in result.error
+        assert (await pool.execute(_PID_CODE, {}, timeout=10)).success is True
+
+    async def test_timeout_keeps_worker(self, pool):
+        before = await pool.execute(_PID_CODE, {}, timeout=10)
+        result = await pool.execute("import time\ntime.sleep(60)", {}, timeout=1)
+        after = await pool.execute(_PID_CODE, {}, timeout=10)
+        assert "timeout" in result.error.lower()
+        assert before.data["parent"] == after.data["parent"]
+
+    async def test_direct_fd_writes_do_not_corrupt_protocol(self, pool):
+        code = "import json, os\nos.write(1, b'garbage')\nprint(json.dumps({'ok': 1}))"
+        result = await pool.execute(code, {}, timeout=10)
+        assert result.data == {"ok": 1}
+
+    async def test_memory_limit_enforced(self):
+        sandbox = SandboxExecutor(pool_size=1, memory_limit_mb=256)
+        try:
+            code = "import json\nblob = bytearray(1024 * 1024 * 1024)\nprint(json.dumps({}))"
+            result = await sandbox.execute(code, {}, timeout=10)
+            assert result.success is False
+            assert "MemoryError" in result.error
+        finally:
+            await sandbox.stop()
+
+    async def test_concurrent_calls_beyond_pool_size(self):
+        sandbox = SandboxExecutor(pool_size=1)
+        try:
+            code = "import json, sys\nprint(json.dumps(json.loads(sys.stdin.read())))"
+            results = await asyncio.gather(
+                *(sandbox.execute(code, {"n": i}, timeout=10) for i in range(6))
+            )
+            assert [r.data for r in results] == [{"n": i} for i in range(6)]
+        finally:
+            await sandbox.stop()
+
+    async def test_queue_wait_counts_against_timeout(self):
+        sandbox = SandboxExecutor(pool_size=1, max_concurrency=1)
+        try:
+            slow = asyncio.create_task(
+                sandbox.execute("import time\ntime.sleep(3)", {}, timeout=10)
+            )
+            await asyncio.sleep(0.2)
+            start = asyncio.get_running_loop().time()
+            result = await sandbox.execute(_PID_CODE, {}, timeout=1)
+            assert "timeout" in result.error.lower()
+            assert asyncio.get_running_loop().time() - start < 2
+            await slow
+        finally:
+            await sandbox.stop()
+
+
+class TestOneShotMode:
+    async def test_pool_size_zero_spawns_per_call(self):
+        sandbox = SandboxExecutor(pool_size=0)
+        first = await sandbox.execute(_PID_CODE, {}, timeout=10)
+        second = await sandbox.execute(_PID_CODE, {}, timeout=10)
+        assert first.data["parent"] == second.data["parent"] == os.getpid()
@@ -0,0 +1,249 @@
+# Copyright 2026 Firefly Software Solutions Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+"""Tests for the OAuth2 token manager (single-flight, proactive refresh, shared cache)."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from flydesk.security.kms import FernetKMSProvider
+from flydesk.tools.token_manager import (
+    ClientCredentialsGrant,
+    OAuth2TokenManager,
+    RedisTokenCache,
+)
+
+_GRANT = ClientCredentialsGrant(
+    system_id="sys-1",
+    credential_id="cred-1",
+    token_url="https://auth.example.com/token",
+    client_id="cid",
+    client_secret="csec",
+    scopes=("read",),
+)
+
+
+def _token_response(token: str, expires_in: int = 3600) -> MagicMock:
+    response = MagicMock()
+    response.json.return_value = {"access_token": token, "expires_in": expires_in}
+    response.raise_for_status = MagicMock()
+    return response
+
+
+def _http_client(*tokens: str, expires_in: int = 3600, delay: float = 0.0) -> AsyncMock:
+    issued = iter(tokens)
+
+    async def post(*args, **kwargs):
+        await asyncio.sleep(delay)
+        return _token_response(next(issued), expires_in)
+
+    client = AsyncMock(spec=httpx.AsyncClient)
+    client.post = AsyncMock(side_effect=post)
+    return client
+
+
+class _FakeRedis:
+    """Just enough of ``redis.asyncio.Redis`` for :class:`RedisTokenCache`."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, str] = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None, px=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def eval(self, script, numkeys, key, token):
+        if self.data.get(key) == token:
+            del self.data[key]
+            return 1
+        return 0
+
+    async def close(self):
+        pass
+
+
+def _shared_cache(redis: _FakeRedis) -> RedisTokenCache:
+    cache = RedisTokenCache("redis://unused", FernetKMSProvider("a" * 32))
+    cache._client = redis
+    return cache
+
+
+# ---------------------------------------------------------------------------
+# Grants
+# ---------------------------------------------------------------------------
+
+
+class TestGrantCacheKey:
+    def test_rotated_secret_changes_key(self):
+        rotated = ClientCredentialsGrant(
+            system_id="sys-1",
+            credential_id="cred-1",
+            token_url=_GRANT.token_url,
+            client_id="cid",
+            client_secret="new-secret",
+            scopes=("read",),
+        )
+        assert rotated.cache_key != _GRANT.cache_key
+        assert "csec" not in _GRANT.cache_key
+
+
+# ---------------------------------------------------------------------------
+# Single-flight and proactive refresh
+# ---------------------------------------------------------------------------
+
+
+class TestSingleFlight:
+    async def test_concurrent_callers_share_one_exchange(self):
+        http = _http_client("tok-1", delay=0.02)
+        manager = OAuth2TokenManager(http)
+        tokens = await asyncio.gather(*(manager.get_token(_GRANT) for _ in range(10)))
+
+        assert tokens == ["tok-1"] * 10
+        assert http.post.await_count == 1
+        await manager.stop()
+
+    async def test_cached_token_reused(self):
+        http = _http_client("tok-1")
+        manager = OAuth2TokenManager(http)
+        await manager.get_token(_GRANT)
+        assert await manager.get_token(_GRANT) == "tok-1"
+        assert http.post.await_count == 1
+        await manager.stop()
+
+
+class TestProactiveRefresh:
+    async def test_token_in_use_refreshed_before_expiry(self):
+        http = _http_client("tok-1", "tok-2", expires_in=1)
+        manager = OAuth2TokenManager(http, refresh_ahead_seconds=300, expiry_buffer_seconds=0)
+        assert await manager.get_token(_GRANT) == "tok-1"
+        await manager.get_token(_GRANT)  # mark as in use
+
+        await asyncio.sleep(0.6)
+        assert http.post.await_count == 2
+        assert await manager.get_token(_GRANT) == "tok-2"
+        await manager.stop()
+
+    async def test_idle_token_not_refreshed(self):
+        http = _http_client("tok-1", "tok-2", expires_in=1)
+        manager = OAuth2TokenManager(http, refresh_ahead_seconds=300, expiry_buffer_seconds=0)
+        await manager.get_token(_GRANT)
+
+        await asyncio.sleep(0.6)
+        assert http.post.await_count == 1
+        await manager.stop()
+
+    async def test_refresh_delay_bounds(self):
+        manager = OAuth2TokenManager(refresh_ahead_seconds=300, expiry_buffer_seconds=60)
+        assert manager._refresh_delay(3600) == 3300
+        # Short-lived tokens renew at half-life, but always before the buffer.
+        assert manager._refresh_delay(400) == 200
+        assert manager._refresh_delay(100) == 40
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+
+class TestStats:
+    async def test_success_and_failure_recorded_per_system(self):
+        error_response = MagicMock(status_code=401, text="Unauthorized")
+        http = AsyncMock(spec=httpx.AsyncClient)
+        http.post = AsyncMock(
+            side_effect=[
+                httpx.HTTPStatusError("401", request=MagicMock(), response=error_response),
+                _token_response("tok-1"),
+            ]
+        )
+        manager = OAuth2TokenManager(http)
+
+        assert await manager.get_token(_GRANT) is None
+        assert await manager.get_token(_GRANT) == "tok-1"
+
+        stats = manager.stats()["sys-1"]
+        assert stats["refreshes"] == 1
+        assert stats["failures"] == 1
+        assert stats["last_error"] == "HTTP 401"
+        assert stats["last_latency_ms"] is not None
+        assert stats["last_refreshed_at"] is not None
+        await manager.stop()
+
+
+# ---------------------------------------------------------------------------
+# Shared cache
+# ---------------------------------------------------------------------------
+
+
+class TestSharedCache:
+    async def test_workers_share_one_token(self):
+        redis = _FakeRedis()
+        http = _http_client("tok-1", "tok-2")
+        worker_a = OAuth2TokenManager(http, shared_cache=_shared_cache(redis))
+        worker_b = OAuth2TokenManager(http, shared_cache=_shared_cache(redis))
+
+        assert await worker_a.get_token(_GRANT) == "tok-1"
+        assert await worker_b.get_token(_GRANT) == "tok-1"
+        assert http.post.await_count == 1
+        await worker_a.stop()
+        await worker_b.stop()
+
+    async def test_token_encrypted_at_rest(self):
+        redis = _FakeRedis()
+        manager = OAuth2TokenManager(_http_client("tok-secret"), shared_cache=_shared_cache(redis))
+        await manager.get_token(_GRANT)
+
+        assert len(redis.data) == 1
+        key, value = next(iter(redis.data.items()))
+        assert "sys-1" not in key
+        assert "tok-secret" not in value
+        await manager.stop()
+
+    async def test_waits_for_peer_holding_lock(self):
+        redis = _FakeRedis()
+        holder = _shared_cache(redis)
+        lock = await holder.acquire_lock(_GRANT.cache_key, 5)
+        assert lock is not None
+
+        http = _http_client("tok-own")
+        manager = OAuth2TokenManager(http, shared_cache=_shared_cache(redis))
+        waiter = asyncio.create_task(manager.get_token(_GRANT))
+        await asyncio.sleep(0.05)
+        await holder.put(_GRANT.cache_key, "tok-peer", time.time() + 3600)
+
+        assert await waiter == "tok-peer"
+        assert http.post.await_count == 0
+        await manager.stop()
+
+    async def test_redis_errors_degrade_to_local_refresh(self):
+        broken = MagicMock()
+        broken.get = AsyncMock(side_effect=ConnectionError("down"))
+        broken.set = AsyncMock(side_effect=ConnectionError("down"))
+        broken.eval = AsyncMock(side_effect=ConnectionError("down"))
+        broken.close = AsyncMock()
+        cache = RedisTokenCache("redis://unused", FernetKMSProvider("a" * 32))
+        cache._client = broken
+
+        manager = OAuth2TokenManager(_http_client("tok-1"), shared_cache=cache)
+        assert await manager.get_token(_GRANT) == "tok-1"
+        await manager.stop()
+
+
+@pytest.fixture(autouse=True)
+def _fast_peer_poll(monkeypatch):
+    monkeypatch.setattr("flydesk.tools.token_manager._PEER_POLL_INTERVAL", 0.01)
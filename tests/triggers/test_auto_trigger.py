@@ -236,3 +236,30 @@ class TestMultipleCycles:
         await trigger.on_catalog_updated("sys-1")
         await asyncio.sleep(0.15)
         assert mock_job_runner.submit.call_count == 3  # kg_recompute + process_discovery + system_discovery
+
+
+# ---------------------------------------------------------------------------
+# Tests: Change listeners
+# ---------------------------------------------------------------------------
+
+
+class TestChangeListeners:
+    """Tests for data-change listeners."""
+
+    async def test_listeners_notified_even_when_disabled(self, trigger_disabled):
+        """Listeners hear about changes regardless of auto-analysis settings."""
+        listener = MagicMock()
+        trigger_disabled.add_change_listener(listener)
+
+        await trigger_disabled.on_document_indexed("doc-1")
+        await trigger_disabled.on_catalog_updated("sys-1")
+
+        assert listener.call_count == 2
+
+    async def test_failing_listener_does_not_block_triggers(self, trigger, mock_job_runner):
+        """A listener error is logged and the trigger still fires."""
+        trigger.add_change_listener(MagicMock(side_effect=RuntimeError("boom")))
+
+        await trigger.on_document_indexed("doc-1")
+
+        mock_job_runner.submit.assert_called_once()
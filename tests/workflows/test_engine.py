@@ -10,14 +10,23 @@
 
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timezone
 
 import pytest
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from flydesk.models.base import Base
+from flydesk.models.workflow import WorkflowStepRow
 from flydesk.workflows.engine import WorkflowEngine
-from flydesk.workflows.models import StepType, Trigger, TriggerType, Workflow, WorkflowStatus
+from flydesk.workflows.models import (
+    StepStatus,
+    StepType,
+    Trigger,
+    TriggerType,
+    Workflow,
+    WorkflowStatus,
+)
 from flydesk.workflows.repository import WorkflowRepository
 
 
@@ -127,3 +136,162 @@ class TestWorkflowEngine:
         await engine.resume(wf.id, trigger)
         result = await repo.get(wf.id)
         assert result.status == WorkflowStatus.COMPLETED  # unchanged
+
+
+def _count_commits(session_factory) -> list[int]:
+    """Count transaction commits issued through *session_factory*'s engine."""
+    from sqlalchemy import event
+
+    commits = [0]
+
+    def _on_commit(_conn):
+        commits[0] += 1
+
+    event.listen(session_factory.kw["bind"].sync_engine, "commit", _on_commit)
+    return commits
+
+
+class TestAdvanceLoop:
+    async def test_start_inserts_workflow_and_steps_in_one_commit(
+        self, engine, repo, session_factory
+    ):
+        commits = _count_commits(session_factory)
+        wf = await engine.start(
+            workflow_type="bulk",
+            params={},
+            user_id="user-1",
+            steps=[{"step_type": "notify"} for _ in range(5)],
+        )
+        assert commits[0] == 1
+        steps = await repo.get_steps(wf.id)
+        assert [s.step_index for s in steps] == [0, 1, 2, 3, 4]
+
+    async def test_automated_steps_checkpoint_once_per_step(
+        self, repo, session_factory
+    ):
+        ran: list[int] = []
+
+        async def handler(step, workflow):
+            ran.append(step.step_index)
+            return {"ok": step.step_index}
+
+        engine = WorkflowEngine(repo, {"notify": handler})
+        wf = await engine.start(
+            workflow_type="auto",
+            params={},
+            user_id="user-1",
+            steps=[{"step_type": "notify"} for _ in range(4)],
+        )
+        commits = _count_commits(session_factory)
+        await engine.resume(wf.id, Trigger(trigger_type=TriggerType.STEP_COMPLETE))
+
+        assert ran == [0, 1, 2, 3]
+        # One checkpoint before each handler plus the final completion.
+        assert commits[0] == 5
+        result = await repo.get(wf.id)
+        assert result.status == WorkflowStatus.COMPLETED
+        steps = await repo.get_steps(wf.id)
+        assert all(s.status == StepStatus.COMPLETED for s in steps)
+        assert steps[2].output == {"ok": 2}
+
+    async def test_condition_runs_target_step(self, repo):
+        ran: list[int] = []
+
+        async def handler(step, workflow):
+            ran.append(step.step_index)
+            return {}
+
+        engine = WorkflowEngine(repo, {"notify": handler})
+        condition = {
+            "field": "state.amount",
+            "operator": "gt",
+            "value": 100,
+            "then_step": 3,
+            "else_step": 1,
+        }
+        wf = await engine.start(
+            workflow_type="branch",
+            params={"amount": 500},
+            user_id="user-1",
+            steps=[
+                {"step_type": "condition", "input": condition},
+                {"step_type": "notify"},
+                {"step_type": "notify"},
+                {"step_type": "notify"},
+            ],
+        )
+        await engine.resume(wf.id, Trigger(trigger_type=TriggerType.STEP_COMPLETE))
+
+        assert ran == [3]
+        steps = await repo.get_steps(wf.id)
+        assert steps[0].output == {"target_step": 3}
+        assert (await repo.get(wf.id)).status == WorkflowStatus.COMPLETED
+
+    async def test_condition_loop_yields_to_scheduler(self, engine, repo):
+        loop = {"field": "state.x", "operator": "eq", "value": 1, "then_step": 0, "else_step": 1}
+        wf = await engine.start(
+            workflow_type="loop",
+            params={"x": 1},
+            user_id="user-1",
+            steps=[{"step_type": "condition", "input": loop}],
+        )
+        scheduled: list[datetime] = []
+        engine.set_schedule_listener(scheduled.append)
+        await engine.resume(wf.id, Trigger(trigger_type=TriggerType.STEP_COMPLETE))
+
+        result = await repo.get(wf.id)
+        assert result.status == WorkflowStatus.WAITING
+        assert result.current_step == 0
+        assert result.next_check_at is not None
+        assert len(scheduled) == 1
+
+    async def test_timeout_schedules_retry_and_counts_attempts(
+        self, repo, session_factory
+    ):
+        async def slow(step, workflow):
+            await asyncio.sleep(1)
+            return {}
+
+        engine = WorkflowEngine(repo, {"tool_call": slow})
+        wf = await engine.start(
+            workflow_type="slow",
+            params={},
+            user_id="user-1",
+            steps=[{"step_type": "tool_call"}],
+        )
+        step = (await repo.get_steps(wf.id))[0]
+        async with session_factory() as session:
+            row = await session.get(WorkflowStepRow, step.id)
+            row.timeout_seconds = 0
+            row.max_retries = 3
+            await session.commit()
+
+        await engine.resume(wf.id, Trigger(trigger_type=TriggerType.STEP_COMPLETE))
+
+        result = await repo.get(wf.id)
+        assert result.status == WorkflowStatus.WAITING
+        assert result.next_check_at is not None
+        steps = await repo.get_steps(wf.id)
+        assert steps[0].status == StepStatus.PENDING
+        assert steps[0].retry_count == 1
+
+    async def test_cancel_during_step_stops_advance(self, repo):
+        ran: list[int] = []
+        engine: WorkflowEngine
+
+        async def handler(step, workflow):
+            ran.append(step.step_index)
+            await engine.cancel(workflow.id)
+            return {}
+
+        engine = WorkflowEngine(repo, {"notify": handler})
+        wf = await engine.start(
+            workflow_type="cancelled",
+            params={},
+            user_id="user-1",
+            steps=[{"step_type": "notify"}, {"step_type": "notify"}],
+        )
+        await engine.resume(wf.id, Trigger(trigger_type=TriggerType.STEP_COMPLETE))
+
+        assert ran == [0]
+        assert (await repo.get(wf.id)).status == WorkflowStatus.CANCELLED
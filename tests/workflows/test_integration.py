@@ -109,3 +109,41 @@ class TestWorkflowIntegration:
         await repo.consume_webhook("wh-test-1")
         found = await repo.get_webhook_by_token("unique-secret-token")
         assert found.status == "consumed"
+
+
+class TestSchedulerIntegration:
+    async def test_poll_step_resumed_when_due(self, engine, repo):
+        """A due poll step is resumed promptly, not on a fixed 30 s tick."""
+        import asyncio
+        from datetime import timedelta
+
+        from flydesk.workflows.scheduler import WorkflowScheduler
+
+        wf = await engine.start(
+            workflow_type="poll_demo",
+            params={},
+            user_id="user-1",
+            steps=[
+                {"step_type": "wait_poll", "description": "Wait for upstream"},
+                {"step_type": "notify", "description": "Done"},
+            ],
+        )
+        await repo.update_status(wf.id, WorkflowStatus.WAITING)
+
+        scheduler = WorkflowScheduler(repo, engine, interval_seconds=30)
+        engine.set_schedule_listener(scheduler.wake)
+        await scheduler.start()
+        try:
+            await asyncio.sleep(0.05)  # scheduler is now asleep (nothing due)
+            await repo.save_checkpoint(
+                wf.id, next_check_at=datetime.now(timezone.utc) + timedelta(milliseconds=100)
+            )
+            scheduler.wake(datetime.now(timezone.utc) + timedelta(milliseconds=100))
+            for _ in range(10):
+                if (await repo.get(wf.id)).status == WorkflowStatus.COMPLETED:
+                    break
+                await asyncio.sleep(0.05)
+        finally:
+            await scheduler.stop()
+
+        assert (await repo.get(wf.id)).status == WorkflowStatus.COMPLETED
@@ -215,6 +215,63 @@ class TestWorkflowRepository:
         assert len(due) == 1
         assert due[0].id == wf_due.id
 
+    async def test_claim_due_pages_in_due_order(self, repo):
+        """claim_due_for_poll leases the earliest due workflows first."""
+        now = _utcnow()
+        for minutes in (3, 1, 2):
+            await repo.create(
+                _make_workflow(
+                    id=f"wf-{minutes}",
+                    status=WorkflowStatus.WAITING,
+                    next_check_at=now - timedelta(minutes=minutes),
+                )
+            )
+
+        first = await repo.claim_due_for_poll("worker-a", limit=2, lease_seconds=60)
+        assert [wf.id for wf in first] == ["wf-3", "wf-2"]
+
+        second = await repo.claim_due_for_poll("worker-b", limit=2, lease_seconds=60)
+        assert [wf.id for wf in second] == ["wf-1"]
+        assert await repo.claim_due_for_poll("worker-b", limit=2, lease_seconds=60) == []
+
+    async def test_released_or_expired_lease_is_claimable(self, repo):
+        await repo.create(
+            _make_workflow(
+                id="wf-1",
+                status=WorkflowStatus.WAITING,
+                next_check_at=_utcnow() - timedelta(minutes=1),
+            )
+        )
+        await repo.claim_due_for_poll("worker-a", limit=10, lease_seconds=60)
+        await repo.release_lease("wf-1", "worker-a")
+        assert len(await repo.claim_due_for_poll("worker-b", limit=10, lease_seconds=0)) == 1
+        # worker-b's zero-length lease has already expired.
+        assert len(await repo.claim_due_for_poll("worker-c", limit=10, lease_seconds=60)) == 1
+
+    async def test_next_due_at(self, repo):
+        assert await repo.next_due_at() is None
+        soon = _utcnow() + timedelta(minutes=5)
+        later = _utcnow() + timedelta(hours=1)
+        await repo.create(_make_workflow(status=WorkflowStatus.WAITING, next_check_at=later))
+        await repo.create(_make_workflow(status=WorkflowStatus.WAITING, next_check_at=soon))
+        await repo.create(_make_workflow(status=WorkflowStatus.RUNNING, next_check_at=_utcnow()))
+
+        next_due = await repo.next_due_at()
+        assert abs((next_due - soon).total_seconds()) < 1
+
+    async def test_next_due_at_accounts_for_leases(self, repo):
+        await repo.create(
+            _make_workflow(
+                id="wf-1",
+                status=WorkflowStatus.WAITING,
+                next_check_at=_utcnow() - timedelta(minutes=1),
+            )
+        )
+        await repo.claim_due_for_poll("worker-a", limit=10, lease_seconds=120)
+
+        next_due = await repo.next_due_at()
+        assert 100 < (next_due - _utcnow()).total_seconds() <= 120
+
     # -- Steps -----------------------------------------------------------------
 
     async def test_create_and_get_steps(self, repo):
@@ -10,6 +10,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock
 
@@ -19,11 +20,18 @@ from flydesk.workflows.models import Workflow, WorkflowStatus
 from flydesk.workflows.scheduler import WorkflowScheduler
 
 
+async def _drain(scheduler: WorkflowScheduler) -> None:
+    """Wait for every resume dispatched by ``_tick`` to finish."""
+    while scheduler._inflight:
+        await asyncio.gather(*list(scheduler._inflight), return_exceptions=True)
+
+
 class TestWorkflowScheduler:
     async def test_start_and_stop(self):
         repo = AsyncMock()
         engine = AsyncMock()
-        repo.list_due_for_poll = AsyncMock(return_value=[])
+        repo.claim_due_for_poll = AsyncMock(return_value=[])
+        repo.next_due_at = AsyncMock(return_value=None)
 
         scheduler = WorkflowScheduler(repo, engine, interval_seconds=1)
         await scheduler.start()
@@ -44,10 +52,11 @@ class TestWorkflowScheduler:
             next_check_at=datetime.now(timezone.utc) - timedelta(minutes=1),
             created_at=datetime.now(timezone.utc),
         )
-        repo.list_due_for_poll = AsyncMock(return_value=[wf])
+        repo.claim_due_for_poll = AsyncMock(return_value=[wf])
 
         scheduler = WorkflowScheduler(repo, engine, interval_seconds=60)
         await scheduler._tick()
+        await _drain(scheduler)
 
         engine.resume.assert_called_once()
         call_args = engine.resume.call_args
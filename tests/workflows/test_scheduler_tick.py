@@ -4,6 +4,8 @@ from __future__ import annotations
 from datetime import UTC, datetime
 from unittest.mock import AsyncMock, patch
 
+import asyncio
+
 import pytest
 
 from flydesk.workflows.models import Trigger, TriggerType, Workflow, WorkflowStatus
@@ -26,6 +28,12 @@ def _make_workflow(**overrides) -> Workflow:
     return Workflow(**defaults)
 
 
+async def _drain(scheduler: WorkflowScheduler) -> None:
+    """Wait for every resume dispatched by ``_tick`` to finish."""
+    while scheduler._inflight:
+        await asyncio.gather(*list(scheduler._inflight), return_exceptions=True)
+
+
 def _make_scheduler(
     repo: AsyncMock | None = None,
     engine: AsyncMock | None = None,
@@ -33,7 +41,8 @@ def _make_scheduler(
 ) -> tuple[WorkflowScheduler, AsyncMock, AsyncMock]:
     repo = repo or AsyncMock()
     engine = engine or AsyncMock()
-    repo.list_due_for_poll = repo.list_due_for_poll or AsyncMock(return_value=[])
+    repo.claim_due_for_poll = AsyncMock(return_value=[])
+    repo.next_due_at = AsyncMock(return_value=None)
     scheduler = WorkflowScheduler(repo, engine, interval_seconds=interval)
     return scheduler, repo, engine
 
@@ -46,20 +55,19 @@ class TestTick:
     async def test_tick_no_due_workflows_is_noop(self):
         """When no workflows are due, tick does nothing."""
         scheduler, repo, engine = _make_scheduler()
-        repo.list_due_for_poll = AsyncMock(return_value=[])
-
         await scheduler._tick()
 
-        repo.list_due_for_poll.assert_awaited_once()
+        repo.claim_due_for_poll.assert_awaited_once()
         engine.resume.assert_not_called()
 
     async def test_tick_resumes_single_due_workflow(self):
         """Tick resumes a single due workflow with POLL trigger."""
         wf = _make_workflow(id="wf-due", current_step=2)
         scheduler, repo, engine = _make_scheduler()
-        repo.list_due_for_poll = AsyncMock(return_value=[wf])
+        repo.claim_due_for_poll = AsyncMock(return_value=[wf])
 
         await scheduler._tick()
+        await _drain(scheduler)
 
         engine.resume.assert_awaited_once()
         call_args = engine.resume.call_args
@@ -74,9 +82,10 @@ class TestTick:
         wf1 = _make_workflow(id="wf-1", current_step=0)
         wf2 = _make_workflow(id="wf-2", current_step=3)
         scheduler, repo, engine = _make_scheduler()
-        repo.list_due_for_poll = AsyncMock(return_value=[wf1, wf2])
+        repo.claim_due_for_poll = AsyncMock(return_value=[wf1, wf2])
 
         await scheduler._tick()
+        await _drain(scheduler)
 
         assert engine.resume.await_count == 2
         ids_called = [c[0][0] for c in engine.resume.call_args_list]
@@ -86,9 +95,10 @@ class TestTick:
         """The trigger's step_index must match the workflow's current_step."""
         wf = _make_workflow(current_step=5)
         scheduler, repo, engine = _make_scheduler()
-        repo.list_due_for_poll = AsyncMock(return_value=[wf])
+        repo.claim_due_for_poll = AsyncMock(return_value=[wf])
 
         await scheduler._tick()
+        await _drain(scheduler)
 
         trigger = engine.resume.call_args[0][1]
         assert trigger.step_index == 5
@@ -121,15 +131,116 @@ class TestErrorRecovery:
         # tick was called at least twice (first fails, second stops)
         assert call_count >= 2
 
-    async def test_engine_resume_error_propagates_in_tick(self):
-        """If engine.resume raises inside _tick, the exception propagates up."""
-        wf = _make_workflow()
+    async def test_engine_resume_error_does_not_block_others(self):
+        """A failing resume is logged, keeps its lease, and others still resume."""
+        wf1 = _make_workflow(id="wf-bad")
+        wf2 = _make_workflow(id="wf-ok")
+        scheduler, repo, engine = _make_scheduler()
+        repo.claim_due_for_poll = AsyncMock(return_value=[wf1, wf2])
+
+        async def resume(workflow_id, trigger):
+            if workflow_id == "wf-bad":
+                raise RuntimeError("engine failed")
+
+        engine.resume = AsyncMock(side_effect=resume)
+
+        await scheduler._tick()
+        await _drain(scheduler)
+
+        assert engine.resume.await_count == 2
+        released = [c.args[0] for c in repo.release_lease.await_args_list]
+        assert released == ["wf-ok"]
+
+
+# ---------------------------------------------------------------------------
+# Paging and concurrency
+# ---------------------------------------------------------------------------
+
+class TestPagingAndConcurrency:
+    async def test_claims_pages_until_short_page(self):
+        pages = [
+            [_make_workflow(id=f"wf-{i}") for i in range(2)],
+            [_make_workflow(id=f"wf-{i}") for i in range(2, 4)],
+            [_make_workflow(id="wf-4")],
+        ]
+        scheduler, repo, engine = _make_scheduler()
+        repo.claim_due_for_poll = AsyncMock(side_effect=pages)
+        scheduler._page_size = 2
+
+        assert await scheduler._tick() == 5
+        await _drain(scheduler)
+
+        assert repo.claim_due_for_poll.await_count == 3
+        assert engine.resume.await_count == 5
+
+    async def test_resumes_concurrently_up_to_limit(self):
+        active = 0
+        peak = 0
+
+        async def resume(workflow_id, trigger):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+
         scheduler, repo, engine = _make_scheduler()
-        repo.list_due_for_poll = AsyncMock(return_value=[wf])
-        engine.resume = AsyncMock(side_effect=RuntimeError("engine failed"))
+        scheduler._slots = asyncio.Semaphore(3)
+        repo.claim_due_for_poll = AsyncMock(
+            return_value=[_make_workflow(id=f"wf-{i}") for i in range(8)]
+        )
+        engine.resume = AsyncMock(side_effect=resume)
+
+        await scheduler._tick()
+        await _drain(scheduler)
+
+        assert peak == 3
+        assert engine.resume.await_count == 8
+
+
+# ---------------------------------------------------------------------------
+# Timer
+# ---------------------------------------------------------------------------
+
+class TestTimer:
+    async def test_sleeps_until_next_due(self):
+        from datetime import timedelta
+
+        scheduler, repo, engine = _make_scheduler(interval=60)
+        repo.next_due_at = AsyncMock(
+            return_value=datetime.now(UTC) + timedelta(seconds=2)
+        )
+        waited = []
+
+        async def fake_wait_for(awaitable, timeout):
+            awaitable.close()
+            waited.append(timeout)
+            raise TimeoutError
+
+        with patch("flydesk.workflows.scheduler.asyncio.wait_for", fake_wait_for):
+            await scheduler._sleep_until_due()
+
+        assert 1.5 < waited[0] <= 2
+
+    async def test_wake_interrupts_sleep(self):
+        scheduler, repo, engine = _make_scheduler(interval=60)
+        sleeper = asyncio.create_task(scheduler._sleep_until_due())
+        await asyncio.sleep(0.01)
+
+        scheduler.wake(datetime.now(UTC))
+        await asyncio.wait_for(sleeper, timeout=1)
+
+    async def test_wake_ignores_later_registrations(self):
+        from datetime import timedelta
+
+        scheduler, repo, engine = _make_scheduler(interval=60)
+        sleeper = asyncio.create_task(scheduler._sleep_until_due())
+        await asyncio.sleep(0.01)
 
-        with pytest.raises(RuntimeError, match="engine failed"):
-            await scheduler._tick()
+        scheduler.wake(datetime.now(UTC) + timedelta(hours=1))
+        await asyncio.sleep(0.02)
+        assert not sleeper.done()
+        sleeper.cancel()
 
 
 # ---------------------------------------------------------------------------
@@ -145,7 +256,7 @@ class TestLifecycle:
     async def test_start_sets_running_and_creates_task(self):
         """start() sets _running and creates a background task."""
         scheduler, repo, engine = _make_scheduler()
-        repo.list_due_for_poll = AsyncMock(return_value=[])
+        repo.claim_due_for_poll = AsyncMock(return_value=[])
 
         await scheduler.start()
         assert scheduler._running is True